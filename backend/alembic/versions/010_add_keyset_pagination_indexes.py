@@ -0,0 +1,37 @@
+# 파일 목적: 분석 조회 keyset 페이지네이션용 복합 인덱스 추가 마이그레이션
+# 주요 기능: link_clicks(user_id, clicked_at DESC, id DESC), profile_views(user_id, viewed_at DESC, id DESC), links(user_id, click_count DESC, id DESC)
+# 사용 방법: alembic upgrade 010 또는 alembic upgrade head
+
+"""add keyset pagination indexes
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+
+revision: str = "010"
+down_revision: Union[str, None] = "009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = (
+    ("ix_link_clicks_user_clicked_at_id", "link_clicks", "user_id, clicked_at DESC, id DESC"),
+    ("ix_profile_views_user_viewed_at_id", "profile_views", "user_id, viewed_at DESC, id DESC"),
+    ("ix_links_user_click_count_id", "links", "user_id, click_count DESC, id DESC"),
+)
+
+
+def upgrade() -> None:
+    # 운영 중인 대용량 이벤트 테이블에 쓰기 잠금을 걸지 않도록 CONCURRENTLY로 생성 (트랜잭션 밖에서 실행)
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({columns})")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _, _ in INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
@@ -0,0 +1,43 @@
+# 파일 목적: raw 분석 이벤트 보존 정책용 일별 집계 테이블 생성 마이그레이션
+# 주요 기능: daily_profile_views(user_id, day), daily_link_clicks(link_id, day) — retention job이 삭제 전 raw 이벤트를 접어 넣음
+# 사용 방법: alembic upgrade 011 또는 alembic upgrade head
+
+"""create daily analytics aggregates
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-19 00:01:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+revision: str = "011"
+down_revision: Union[str, None] = "010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "daily_profile_views",
+        sa.Column("user_id", UUID(as_uuid=True), sa.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("day", sa.Date, primary_key=True),
+        sa.Column("view_count", sa.BigInteger, nullable=False, server_default="0"),
+    )
+    op.create_table(
+        "daily_link_clicks",
+        sa.Column("link_id", UUID(as_uuid=True), sa.ForeignKey("links.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("day", sa.Date, primary_key=True),
+        sa.Column("user_id", UUID(as_uuid=True), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("click_count", sa.BigInteger, nullable=False, server_default="0"),
+    )
+    op.create_index("ix_daily_link_clicks_user_id", "daily_link_clicks", ["user_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_daily_link_clicks_user_id", table_name="daily_link_clicks")
+    op.drop_table("daily_link_clicks")
+    op.drop_table("daily_profile_views")
@@ -0,0 +1,73 @@
+# 파일 목적: User-Agent 사전 인코딩 마이그레이션 (user_agents 차원 테이블 + 이벤트 테이블 정수 FK)
+# 주요 기능: user_agents(id, ua_hash BYTEA md5 UNIQUE, value) 생성 → 기존 profile_views/link_clicks UA 문자열 백필 → user_agent 컬럼 제거
+# 사용 방법: alembic upgrade 012 또는 alembic upgrade head
+
+"""create user_agents dimension
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-19 00:02:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "012"
+down_revision: Union[str, None] = "011"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FACT_TABLES = ("profile_views", "link_clicks")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user_agents",
+        sa.Column("id", sa.Integer, primary_key=True, autoincrement=True),
+        sa.Column("ua_hash", sa.LargeBinary(16), nullable=False, unique=True),
+        sa.Column("value", sa.String(500), nullable=False),
+    )
+
+    # 고유 UA 문자열만 사전에 등록 — 해시는 app.services.user_agents.ua_hash와 동일 (md5 digest)
+    op.execute(
+        """
+        INSERT INTO user_agents (ua_hash, value)
+        SELECT decode(md5(user_agent), 'hex'), user_agent
+        FROM (
+            SELECT user_agent FROM profile_views
+            UNION
+            SELECT user_agent FROM link_clicks
+        ) AS uas
+        WHERE user_agent IS NOT NULL AND user_agent <> ''
+        ON CONFLICT (ua_hash) DO NOTHING
+        """
+    )
+
+    for table in FACT_TABLES:
+        op.add_column(
+            table,
+            sa.Column("user_agent_id", sa.Integer, sa.ForeignKey("user_agents.id"), nullable=True),
+        )
+        op.execute(
+            f"""
+            UPDATE {table} AS t SET user_agent_id = ua.id
+            FROM user_agents AS ua
+            WHERE t.user_agent <> '' AND ua.ua_hash = decode(md5(t.user_agent), 'hex')
+            """
+        )
+        op.drop_column(table, "user_agent")
+
+
+def downgrade() -> None:
+    for table in FACT_TABLES:
+        op.add_column(table, sa.Column("user_agent", sa.String(500), nullable=True))
+        op.execute(
+            f"""
+            UPDATE {table} AS t SET user_agent = ua.value
+            FROM user_agents AS ua
+            WHERE ua.id = t.user_agent_id
+            """
+        )
+        op.drop_column(table, "user_agent_id")
+    op.drop_table("user_agents")
@@ -0,0 +1,130 @@
+# 파일 목적: User-Agent 분류 컬럼 및 봇 플래그 추가 마이그레이션
+# 주요 기능: user_agents에 device_type/browser/os/is_bot 추가 후 기존 UA를 이 리비전 시점의 분류 규칙(고정 사본)으로 백필, profile_views/link_clicks에 is_bot 추가 및 백필
+# 사용 방법: alembic upgrade 013 또는 alembic upgrade head
+
+"""add user agent classification
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-19 00:03:00.000000
+
+"""
+import re
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "013"
+down_revision: Union[str, None] = "012"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FACT_TABLES = ("profile_views", "link_clicks")
+
+# app.services.user_agents의 분류 규칙을 이 리비전 시점 그대로 고정한 사본 — 이후 분류기가 바뀌어도
+# 처음부터 upgrade 했을 때의 백필 결과가 달라지지 않도록 앱 코드를 import 하지 않음
+_BOT = re.compile(
+    r"bot|crawl|spider|slurp|scrap|facebookexternalhit|whatsapp|embedly|preview|headless|lighthouse"
+    r"|monitor|uptime|pingdom|curl|wget|python-|httpx|aiohttp|go-http-client|okhttp|axios|java/|libwww",
+    re.IGNORECASE,
+)
+_BROWSER_RULES = (
+    ("KakaoTalk", re.compile(r"KAKAOTALK", re.IGNORECASE)),
+    ("Naver", re.compile(r"NAVER\(inapp", re.IGNORECASE)),
+    ("Instagram", re.compile(r"Instagram")),
+    ("Facebook", re.compile(r"FBAN|FBAV")),
+    ("Samsung Internet", re.compile(r"SamsungBrowser")),
+    ("Edge", re.compile(r"Edg(e|A|iOS)?/")),
+    ("Opera", re.compile(r"OPR/|Opera")),
+    ("Whale", re.compile(r"Whale/")),
+    ("Firefox", re.compile(r"Firefox/|FxiOS/")),
+    ("Chrome", re.compile(r"Chrome/|CriOS/")),
+    ("Safari", re.compile(r"Safari/")),
+)
+_OS_RULES = (
+    ("Windows", re.compile(r"Windows")),
+    ("Android", re.compile(r"Android")),
+    ("iOS", re.compile(r"iPhone|iPad|iPod")),
+    ("macOS", re.compile(r"Mac OS X|Macintosh")),
+    ("ChromeOS", re.compile(r"CrOS")),
+    ("Linux", re.compile(r"Linux")),
+)
+_TABLET = re.compile(r"iPad|Tablet|Android(?!.*Mobile)", re.IGNORECASE)
+_MOBILE = re.compile(r"Mobi|iPhone|iPod|Android", re.IGNORECASE)
+
+
+def _first_match(rules, user_agent: str) -> str:
+    for name, pattern in rules:
+        if pattern.search(user_agent):
+            return name
+    return "Other"
+
+
+def _classify(user_agent: str) -> dict:
+    is_bot = _BOT.search(user_agent) is not None
+    if is_bot:
+        device_type = "bot"
+    elif _TABLET.search(user_agent):
+        device_type = "tablet"
+    elif _MOBILE.search(user_agent):
+        device_type = "mobile"
+    else:
+        device_type = "desktop"
+    return {
+        "device_type": device_type,
+        "browser": _first_match(_BROWSER_RULES, user_agent),
+        "os": _first_match(_OS_RULES, user_agent),
+        "is_bot": is_bot,
+    }
+
+
+def upgrade() -> None:
+    op.add_column("user_agents", sa.Column("device_type", sa.String(20), nullable=False, server_default="desktop"))
+    op.add_column("user_agents", sa.Column("browser", sa.String(50), nullable=False, server_default="Other"))
+    op.add_column("user_agents", sa.Column("os", sa.String(50), nullable=False, server_default="Other"))
+    op.add_column("user_agents", sa.Column("is_bot", sa.Boolean(), nullable=False, server_default="false"))
+
+    # 고유 UA 수천 개 수준이므로 고정된 분류 규칙으로 한 번씩만 파싱
+    bind = op.get_bind()
+    user_agents = sa.table(
+        "user_agents",
+        sa.column("id", sa.Integer),
+        sa.column("value", sa.String),
+        sa.column("device_type", sa.String),
+        sa.column("browser", sa.String),
+        sa.column("os", sa.String),
+        sa.column("is_bot", sa.Boolean),
+    )
+    rows = bind.execute(sa.select(user_agents.c.id, user_agents.c.value)).all()
+    updates = [{"ua_id": row.id, **_classify(row.value)} for row in rows]
+    if updates:
+        bind.execute(
+            user_agents.update()
+            .where(user_agents.c.id == sa.bindparam("ua_id"))
+            .values(
+                device_type=sa.bindparam("device_type"),
+                browser=sa.bindparam("browser"),
+                os=sa.bindparam("os"),
+                is_bot=sa.bindparam("is_bot"),
+            ),
+            updates,
+        )
+
+    for table in FACT_TABLES:
+        op.add_column(table, sa.Column("is_bot", sa.Boolean(), nullable=False, server_default="false"))
+        op.execute(
+            f"""
+            UPDATE {table} AS t SET is_bot = true
+            FROM user_agents AS ua
+            WHERE ua.id = t.user_agent_id AND ua.is_bot
+            """
+        )
+
+
+def downgrade() -> None:
+    for table in FACT_TABLES:
+        op.drop_column(table, "is_bot")
+    op.drop_column("user_agents", "is_bot")
+    op.drop_column("user_agents", "os")
+    op.drop_column("user_agents", "browser")
+    op.drop_column("user_agents", "device_type")
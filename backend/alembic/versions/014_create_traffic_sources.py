@@ -0,0 +1,54 @@
+# 파일 목적: 유입 경로(referrer 도메인 + UTM) 사전 및 일별 유입 경로 집계 테이블 생성 마이그레이션
+# 주요 기능: traffic_sources(UNIQUE 4개 키), daily_source_stats(user_id, day, source_id PK), profile_views/link_clicks.traffic_source_id FK 추가
+# 사용 방법: alembic upgrade 014 또는 alembic upgrade head
+
+"""create traffic sources
+
+Revision ID: 014
+Revises: 013
+Create Date: 2026-10-19 00:04:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+revision: str = "014"
+down_revision: Union[str, None] = "013"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FACT_TABLES = ("profile_views", "link_clicks")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "traffic_sources",
+        sa.Column("id", sa.Integer, primary_key=True, autoincrement=True),
+        sa.Column("referrer_domain", sa.String(255), nullable=False, server_default=""),
+        sa.Column("utm_source", sa.String(100), nullable=False, server_default=""),
+        sa.Column("utm_medium", sa.String(100), nullable=False, server_default=""),
+        sa.Column("utm_campaign", sa.String(100), nullable=False, server_default=""),
+        sa.UniqueConstraint("referrer_domain", "utm_source", "utm_medium", "utm_campaign"),
+    )
+    op.create_table(
+        "daily_source_stats",
+        sa.Column("user_id", UUID(as_uuid=True), sa.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("day", sa.Date, primary_key=True),
+        sa.Column("source_id", sa.Integer, sa.ForeignKey("traffic_sources.id"), primary_key=True),
+        sa.Column("view_count", sa.BigInteger, nullable=False, server_default="0"),
+        sa.Column("click_count", sa.BigInteger, nullable=False, server_default="0"),
+    )
+    for table in FACT_TABLES:
+        op.add_column(
+            table,
+            sa.Column("traffic_source_id", sa.Integer, sa.ForeignKey("traffic_sources.id"), nullable=True),
+        )
+
+
+def downgrade() -> None:
+    for table in FACT_TABLES:
+        op.drop_column(table, "traffic_source_id")
+    op.drop_table("daily_source_stats")
+    op.drop_table("traffic_sources")
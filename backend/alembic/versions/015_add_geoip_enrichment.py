@@ -0,0 +1,44 @@
+# 파일 목적: 분석 이벤트 GeoIP 보강 컬럼 및 국가별 일별 집계 테이블 생성 마이그레이션
+# 주요 기능: profile_views/link_clicks.country, region 컬럼 추가, daily_geo_stats(user_id, day, country PK) 생성
+# 사용 방법: alembic upgrade 015 또는 alembic upgrade head
+
+"""add geoip enrichment
+
+Revision ID: 015
+Revises: 014
+Create Date: 2026-10-19 00:05:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+revision: str = "015"
+down_revision: Union[str, None] = "014"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FACT_TABLES = ("profile_views", "link_clicks")
+
+
+def upgrade() -> None:
+    # 기존 행은 위치 불명(NULL)으로 남김 — 보강은 기록 시점에만 수행
+    for table in FACT_TABLES:
+        op.add_column(table, sa.Column("country", sa.String(2), nullable=True))
+        op.add_column(table, sa.Column("region", sa.String(100), nullable=True))
+    op.create_table(
+        "daily_geo_stats",
+        sa.Column("user_id", UUID(as_uuid=True), sa.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("day", sa.Date, primary_key=True),
+        sa.Column("country", sa.String(2), primary_key=True),
+        sa.Column("view_count", sa.BigInteger, nullable=False, server_default="0"),
+        sa.Column("click_count", sa.BigInteger, nullable=False, server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("daily_geo_stats")
+    for table in FACT_TABLES:
+        op.drop_column(table, "region")
+        op.drop_column(table, "country")
@@ -0,0 +1,37 @@
+# 파일 목적: 워커 간 공유 rate limit 토큰 버킷 테이블 생성 마이그레이션
+# 주요 기능: UNLOGGED rate_limit_buckets(key PK, tokens, allowed, updated_at) — WAL을 쓰지 않아 쓰기 비용이 낮고 재시작 시 비워져도 무방
+# 사용 방법: alembic upgrade 016 또는 alembic upgrade head (RATE_LIMIT_BACKEND=postgres 일 때 사용)
+
+"""create rate limit buckets
+
+Revision ID: 016
+Revises: 015
+Create Date: 2026-10-19 00:06:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+
+revision: str = "016"
+down_revision: Union[str, None] = "015"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # ORM 모델 없이 PostgresRateLimiter가 asyncpg로 직접 사용하는 테이블
+    op.execute(
+        """
+        CREATE UNLOGGED TABLE rate_limit_buckets (
+            key text PRIMARY KEY,
+            tokens double precision NOT NULL,
+            allowed boolean NOT NULL DEFAULT true,
+            updated_at timestamptz NOT NULL DEFAULT now()
+        )
+        """
+    )
+    op.execute("CREATE INDEX ix_rate_limit_buckets_updated_at ON rate_limit_buckets (updated_at)")
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE rate_limit_buckets")
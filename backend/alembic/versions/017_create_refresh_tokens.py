@@ -0,0 +1,45 @@
+# 파일 목적: refresh token rotation 저장소 테이블 생성 마이그레이션
+# 주요 기능: refresh_tokens(jti PK, family_id, user_id FK CASCADE, expires_at, used_at, revoked_at), 폐기 동기화용 부분 인덱스
+# 사용 방법: alembic upgrade 017 또는 alembic upgrade head
+
+"""create refresh tokens
+
+Revision ID: 017
+Revises: 016
+Create Date: 2026-10-19 00:07:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+revision: str = "017"
+down_revision: Union[str, None] = "016"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "refresh_tokens",
+        sa.Column("jti", UUID(as_uuid=True), primary_key=True),
+        sa.Column("family_id", UUID(as_uuid=True), nullable=False),
+        sa.Column("user_id", UUID(as_uuid=True), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("used_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("revoked_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index("ix_refresh_tokens_family_id", "refresh_tokens", ["family_id"])
+    op.create_index("ix_refresh_tokens_user_id", "refresh_tokens", ["user_id"])
+    op.create_index(
+        "ix_refresh_tokens_revoked_at",
+        "refresh_tokens",
+        ["revoked_at"],
+        postgresql_where=sa.text("revoked_at IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("refresh_tokens")
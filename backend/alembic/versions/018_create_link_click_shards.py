@@ -0,0 +1,41 @@
+# 파일 목적: 링크 클릭 카운터 샤드 테이블 생성 마이그레이션
+# 주요 기능: link_click_shards(link_id FK CASCADE, shard, count — (link_id, shard) PK) — 클릭 가산을 링크당 여러 행으로 분산해 links 행 락 경합 제거
+# 사용 방법: alembic upgrade 018 또는 alembic upgrade head
+
+"""create link click shards
+
+Revision ID: 018
+Revises: 017
+Create Date: 2026-10-19 00:08:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+revision: str = "018"
+down_revision: Union[str, None] = "017"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "link_click_shards",
+        sa.Column("link_id", UUID(as_uuid=True), sa.ForeignKey("links.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("shard", sa.SmallInteger, primary_key=True),
+        sa.Column("count", sa.BigInteger, nullable=False, server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    # 아직 접히지 않은 클릭을 잃지 않도록 삭제 전에 links.click_count에 반영
+    op.execute(
+        """
+        UPDATE links SET click_count = links.click_count + s.total
+        FROM (SELECT link_id, sum(count) AS total FROM link_click_shards GROUP BY link_id) s
+        WHERE links.id = s.link_id
+        """
+    )
+    op.drop_table("link_click_shards")
@@ -0,0 +1,33 @@
+# 파일 목적: 계정 삭제 시 토큰 family 폐기 기록 테이블 생성 마이그레이션
+# 주요 기능: revoked_token_families(family_id PK, revoked_at) — users FK가 없어 refresh_tokens CASCADE 삭제 후에도 워커 간 폐기 동기화에 남음
+# 사용 방법: alembic upgrade 019 또는 alembic upgrade head
+
+"""create revoked token families
+
+Revision ID: 019
+Revises: 018
+Create Date: 2026-10-19 00:09:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+revision: str = "019"
+down_revision: Union[str, None] = "018"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "revoked_token_families",
+        sa.Column("family_id", UUID(as_uuid=True), primary_key=True),
+        sa.Column("revoked_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index("ix_revoked_token_families_revoked_at", "revoked_token_families", ["revoked_at"])
+
+
+def downgrade() -> None:
+    op.drop_table("revoked_token_families")
@@ -0,0 +1,36 @@
+# 파일 목적: 멀티 워커 공유 상태 키-값 테이블 생성 마이그레이션
+# 주요 기능: UNLOGGED shared_state(key PK, value, expires_at) — 워커 간 공유 카운터/값, 재시작 시 비워져도 무방
+# 사용 방법: alembic upgrade 020 또는 alembic upgrade head (SHARED_STATE_BACKEND=postgres 일 때 사용)
+
+"""create shared state
+
+Revision ID: 020
+Revises: 019
+Create Date: 2026-10-19 00:10:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+
+revision: str = "020"
+down_revision: Union[str, None] = "019"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # ORM 모델 없이 PostgresSharedState가 asyncpg로 직접 사용하는 테이블
+    op.execute(
+        """
+        CREATE UNLOGGED TABLE shared_state (
+            key text PRIMARY KEY,
+            value text NOT NULL,
+            expires_at timestamptz
+        )
+        """
+    )
+    op.execute("CREATE INDEX ix_shared_state_expires_at ON shared_state (expires_at) WHERE expires_at IS NOT NULL")
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE shared_state")
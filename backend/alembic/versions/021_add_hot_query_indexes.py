@@ -0,0 +1,62 @@
+# 파일 목적: 핫 쿼리 술어에 맞춘 부분(partial)/커버링(INCLUDE) 인덱스 추가 마이그레이션
+# 주요 기능: links(user_id, position) WHERE is_active — 공개 프로필 링크 조회(정렬 없이 position 순),
+#           links(user_id) INCLUDE (scheduled_start, scheduled_end) WHERE is_active AND 예약 있음 — prerender bootstrap(index-only),
+#           profile_views/link_clicks(user_id, 시각) INCLUDE (...) WHERE NOT is_bot — 요약/일별 방문/분포/최근 클릭(index-only)
+# 사용 방법: alembic upgrade 021 또는 alembic upgrade head
+
+"""add hot query indexes
+
+Revision ID: 021
+Revises: 020
+Create Date: 2026-10-19 00:11:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+
+revision: str = "021"
+down_revision: Union[str, None] = "020"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (이름, 테이블, 키 컬럼, INCLUDE 컬럼, WHERE) — 모델의 Index 선언과 동일
+INDEXES = (
+    ("ix_links_user_position_active", "links", "user_id, position", None, "is_active"),
+    (
+        "ix_links_user_scheduled_active",
+        "links",
+        "user_id",
+        "scheduled_start, scheduled_end",
+        "is_active AND (scheduled_start IS NOT NULL OR scheduled_end IS NOT NULL)",
+    ),
+    (
+        "ix_profile_views_user_viewed_at_human",
+        "profile_views",
+        "user_id, viewed_at",
+        "id, viewer_ip, user_agent_id",
+        "NOT is_bot",
+    ),
+    (
+        "ix_link_clicks_user_clicked_at_id_human",
+        "link_clicks",
+        "user_id, clicked_at, id",
+        "link_id, visitor_ip, user_agent_id",
+        "NOT is_bot",
+    ),
+)
+
+
+def upgrade() -> None:
+    # 010과 같이 운영 중인 테이블에 쓰기 잠금을 걸지 않도록 CONCURRENTLY로 생성 (트랜잭션 밖에서 실행)
+    with op.get_context().autocommit_block():
+        for name, table, columns, include, where in INDEXES:
+            include_sql = f" INCLUDE ({include})" if include else ""
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({columns}){include_sql} WHERE {where}"
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, _, _, _, _ in INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
@@ -0,0 +1,54 @@
+# 파일 목적: 유입 경로/국가 일별 집계 샤드 분산 마이그레이션
+# 주요 기능: daily_source_stats/daily_geo_stats에 shard 컬럼 추가(기존 행은 0) 후 PK에 포함 — 바이럴 링크의 클릭이 같은 경로·국가 행 하나의 락에 줄서지 않도록
+# 사용 방법: alembic upgrade 022 또는 alembic upgrade head
+
+"""shard daily stats
+
+Revision ID: 022
+Revises: 021
+Create Date: 2026-10-19 00:12:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "022"
+down_revision: Union[str, None] = "021"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (테이블, 샤드 앞의 PK 컬럼)
+TABLES = (
+    ("daily_source_stats", ("user_id", "day", "source_id")),
+    ("daily_geo_stats", ("user_id", "day", "country")),
+)
+
+
+def upgrade() -> None:
+    for table, key in TABLES:
+        op.add_column(table, sa.Column("shard", sa.SmallInteger, nullable=False, server_default="0"))
+        op.drop_constraint(f"{table}_pkey", table, type_="primary")
+        op.create_primary_key(f"{table}_pkey", table, [*key, "shard"])
+
+
+def downgrade() -> None:
+    for table, key in TABLES:
+        columns = ", ".join(key)
+        # 샤드 합계를 shard 0 행으로 접은 뒤 원래 PK로 되돌림
+        op.execute(
+            f"""
+            WITH folded AS (
+                DELETE FROM {table} WHERE shard <> 0
+                RETURNING {columns}, view_count, click_count
+            )
+            INSERT INTO {table} AS t ({columns}, shard, view_count, click_count)
+            SELECT {columns}, 0, sum(view_count), sum(click_count) FROM folded GROUP BY {columns}
+            ON CONFLICT ({columns}, shard) DO UPDATE SET
+                view_count = t.view_count + excluded.view_count,
+                click_count = t.click_count + excluded.click_count
+            """
+        )
+        op.drop_constraint(f"{table}_pkey", table, type_="primary")
+        op.drop_column(table, "shard")
+        op.create_primary_key(f"{table}_pkey", table, list(key))
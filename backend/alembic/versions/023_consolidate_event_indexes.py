@@ -0,0 +1,68 @@
+# 파일 목적: profile_views/link_clicks의 사용자별 인덱스를 테이블당 커버링 인덱스 하나로 통합하는 마이그레이션
+# 주요 기능: (user_id, 시각, id) INCLUDE (..., is_bot) 전체 인덱스 생성 후 대체된 003 user_id 단일 컬럼, 010 keyset, 021 봇 제외 부분 인덱스 삭제
+#           (근거 실행 계획: benchmarks/HOT_QUERY_PLANS.md — 대체 후 모든 케이스가 새 인덱스 하나로 처리됨)
+# 사용 방법: alembic upgrade 023 또는 alembic upgrade head
+
+"""consolidate event indexes
+
+Revision ID: 023
+Revises: 022
+Create Date: 2026-10-19 00:13:00.000000
+
+"""
+from typing import Sequence, Union
+from alembic import op
+
+revision: str = "023"
+down_revision: Union[str, None] = "022"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (이름, 테이블, 키 컬럼, INCLUDE 컬럼) — 모델의 Index 선언과 동일
+INDEXES = (
+    (
+        "ix_profile_views_user_viewed_at_covering",
+        "profile_views",
+        "user_id, viewed_at, id",
+        "viewer_ip, user_agent_id, is_bot",
+    ),
+    (
+        "ix_link_clicks_user_clicked_at_covering",
+        "link_clicks",
+        "user_id, clicked_at, id",
+        "link_id, visitor_ip, user_agent_id, is_bot",
+    ),
+)
+
+# 새 인덱스가 대체하는 인덱스 — (이름, CREATE INDEX 본문), downgrade에서 원래 정의대로 다시 생성
+SUPERSEDED = (
+    ("ix_profile_views_user_id", "profile_views (user_id)"),
+    ("ix_link_clicks_user_id", "link_clicks (user_id)"),
+    ("ix_profile_views_user_viewed_at_id", "profile_views (user_id, viewed_at DESC, id DESC)"),
+    ("ix_link_clicks_user_clicked_at_id", "link_clicks (user_id, clicked_at DESC, id DESC)"),
+    (
+        "ix_profile_views_user_viewed_at_human",
+        "profile_views (user_id, viewed_at) INCLUDE (id, viewer_ip, user_agent_id) WHERE NOT is_bot",
+    ),
+    (
+        "ix_link_clicks_user_clicked_at_id_human",
+        "link_clicks (user_id, clicked_at, id) INCLUDE (link_id, visitor_ip, user_agent_id) WHERE NOT is_bot",
+    ),
+)
+
+
+def upgrade() -> None:
+    # 새 인덱스를 먼저 만든 뒤 삭제 — 중간에 사용자별 조회가 순차 스캔으로 떨어지는 구간이 없도록 (CONCURRENTLY, 트랜잭션 밖)
+    with op.get_context().autocommit_block():
+        for name, table, columns, include in INDEXES:
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} ({columns}) INCLUDE ({include})")
+        for name, _ in SUPERSEDED:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, definition in SUPERSEDED:
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {definition}")
+        for name, _, _, _ in INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
@@ -0,0 +1,110 @@
+# 파일 목적: 신뢰할 수 있는 리버스 프록시 뒤에서 실제 클라이언트 IP 해석
+# 주요 기능: TrustedNetworks(CIDR 목록을 prefix 길이별 정수 집합으로 미리 컴파일, 요청당 prefix 길이 수만큼의 set 조회),
+#           resolve_client_ip(X-Forwarded-For 오른쪽부터 신뢰 프록시를 건너뛰고 첫 외부 주소, 없으면 X-Real-IP),
+#           ClientIPMiddleware(request.state.client_ip 설정), get_client_ip(request)
+# 사용 방법: app.add_middleware(ClientIPMiddleware, trusted_proxies=settings.trusted_proxies); ip = get_client_ip(request)
+
+import ipaddress
+from collections.abc import Iterable
+
+from starlette.datastructures import Headers
+from starlette.requests import Request
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class TrustedNetworks:
+    """CIDR 목록 멤버십 검사 — 주소를 정수로 바꾼 뒤 prefix 길이별로 상위 비트만 set에서 찾음"""
+
+    def __init__(self, cidrs: Iterable[str] = ()):
+        # {버전: ((비트 시프트, 네트워크 상위 비트 집합), ...)} — 서로 다른 prefix 길이 수만큼만 set 조회
+        by_prefix: dict[tuple[int, int], set[int]] = {}
+        for cidr in cidrs:
+            cidr = cidr.strip()
+            if not cidr:
+                continue
+            network = ipaddress.ip_network(cidr, strict=False)
+            shift = network.max_prefixlen - network.prefixlen
+            by_prefix.setdefault((network.version, shift), set()).add(int(network.network_address) >> shift)
+        self._tables: dict[int, tuple[tuple[int, frozenset[int]], ...]] = {
+            version: tuple(
+                (shift, frozenset(prefixes))
+                for (v, shift), prefixes in sorted(by_prefix.items())
+                if v == version
+            )
+            for version in (4, 6)
+        }
+
+    @classmethod
+    def parse(cls, value: str) -> "TrustedNetworks":
+        return cls(value.split(","))
+
+    def __bool__(self) -> bool:
+        return any(self._tables.values())
+
+    def __contains__(self, ip: str | None) -> bool:
+        addr = _parse_ip(ip)
+        if addr is None:
+            return False
+        value = int(addr)
+        return any(value >> shift in prefixes for shift, prefixes in self._tables[addr.version])
+
+
+def _parse_ip(ip: str | None) -> ipaddress.IPv4Address | ipaddress.IPv6Address | None:
+    if not ip:
+        return None
+    try:
+        addr = ipaddress.ip_address(ip.strip())
+    except ValueError:
+        return None
+    if addr.version == 6 and addr.ipv4_mapped is not None:
+        return addr.ipv4_mapped
+    return addr
+
+
+def resolve_client_ip(peer: str | None, headers: Headers, trusted: TrustedNetworks) -> str | None:
+    """peer가 신뢰 프록시일 때만 전달 헤더를 믿음 — 그 외에는 클라이언트가 임의로 넣은 헤더이므로 무시"""
+    if peer is None or peer not in trusted:
+        return peer
+
+    # 여러 프록시가 헤더를 따로 붙인 경우도 하나의 목록으로 합침
+    forwarded_for = ",".join(headers.getlist("x-forwarded-for"))
+    if forwarded_for:
+        # nginx $proxy_add_x_forwarded_for는 오른쪽에 덧붙이므로 오른쪽부터 신뢰 프록시를 벗겨냄
+        candidate = peer
+        for hop in reversed(forwarded_for.split(",")):
+            addr = _parse_ip(hop)
+            if addr is None:
+                # 형식이 깨진 hop 이후(왼쪽)는 신뢰할 수 없음 — 마지막으로 확인된 주소 사용
+                break
+            candidate = str(addr)
+            if candidate not in trusted:
+                return candidate
+        # 모든 hop이 신뢰 프록시(내부 요청)이면 가장 왼쪽 주소
+        return candidate
+
+    real_ip = _parse_ip(headers.get("x-real-ip"))
+    return str(real_ip) if real_ip is not None else peer
+
+
+class ClientIPMiddleware:
+    """순수 ASGI 미들웨어 — 응답 본문을 감싸지 않으므로 SSE 스트리밍에도 비용이 없음"""
+
+    def __init__(self, app: ASGIApp, trusted_proxies: str = ""):
+        self.app = app
+        self.trusted = TrustedNetworks.parse(trusted_proxies)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            client = scope.get("client")
+            peer = client[0] if client else None
+            if self.trusted:
+                peer = resolve_client_ip(peer, Headers(scope=scope), self.trusted)
+            scope.setdefault("state", {})["client_ip"] = peer
+        await self.app(scope, receive, send)
+
+
+def get_client_ip(request: Request) -> str | None:
+    client_ip = getattr(request.state, "client_ip", None)
+    if client_ip is not None:
+        return client_ip
+    return request.client.host if request.client else None
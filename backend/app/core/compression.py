@@ -0,0 +1,216 @@
+# 파일 목적: 응답 압축 미들웨어 (Accept-Encoding 협상 gzip/brotli + 본문 해시 ETag + 압축 결과 LRU 캐시)
+# 주요 기능: choose_encoding(q 값 포함 Accept-Encoding 파싱), CompressedBodyCache((본문 해시, 인코딩) → 압축 바이트 LRU, 항목 수/본문 크기 상한),
+#           CompressionMiddleware(순수 ASGI — 한 번에 끝나는 본문만 압축, SSE/스트리밍 export는 그대로 통과, 최소 크기 미만은 원본,
+#           GET/HEAD 200 응답에 ETag 부여 + If-None-Match 일치 시 304 — HEAD는 GET 표현 전체가 본문으로 온 경우에만)
+# 사용 방법: app.add_middleware(CompressionMiddleware, minimum_size=1024, cache=CompressedBodyCache(256))
+
+import gzip
+import hashlib
+from collections import OrderedDict
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:  # pragma: no cover - 선택 의존성
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+GZIP_LEVEL = 6
+# 요청 경로에서 압축하므로 최대 품질(11) 대신 gzip 6과 비슷한 속도의 품질 사용
+BROTLI_QUALITY = 5
+
+_COMPRESSIBLE_TYPES = ("text/", "application/json", "application/graphql-response+json", "application/javascript", "application/xml")
+
+
+def supported_encodings() -> tuple[str, ...]:
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def choose_encoding(accept_encoding: str, supported: tuple[str, ...] | None = None) -> str | None:
+    """가장 높은 q 값의 지원 인코딩 (동률이면 supported 순서 — br 우선), 없으면 None(identity)"""
+    supported = supported or supported_encodings()
+    weights: dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip()] = q
+    wildcard = weights.get("*", 0.0)
+    best, best_q = None, 0.0
+    for encoding in supported:
+        q = weights.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    # mtime=0 — 같은 본문은 항상 같은 바이트 (캐시/ETag와 일관)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def body_digest(body: bytes) -> str:
+    return hashlib.blake2b(body, digest_size=12).hexdigest()
+
+
+class CompressedBodyCache:
+    """(본문 해시, 인코딩) → 압축 결과. 같은 공개 프로필/대시보드 응답이 반복되면 해시만 계산하고 압축은 생략"""
+
+    def __init__(self, max_entries: int = 256, max_body_size: int = 256 * 1024):
+        self.max_entries = max_entries
+        self.max_body_size = max_body_size
+        self._entries: OrderedDict[tuple[str, str], bytes] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compress(self, digest: str, encoding: str, body: bytes) -> bytes:
+        if self.max_entries <= 0 or len(body) > self.max_body_size:
+            return compress(body, encoding)
+        key = (digest, encoding)
+        cached = self._entries.get(key)
+        if cached is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return cached
+        self.misses += 1
+        compressed = self._entries[key] = compress(body, encoding)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return compressed
+
+
+def _is_compressible(content_type: str) -> bool:
+    return content_type.startswith(_COMPRESSIBLE_TYPES) and not content_type.startswith("text/event-stream")
+
+
+def _etag_matches(if_none_match: str, digest: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    for tag in if_none_match.split(","):
+        tag = tag.strip().removeprefix("W/").strip('"')
+        # 인코딩별 ETag("<해시>-gzip")도 같은 본문으로 취급 (약한 비교)
+        if tag.split("-", 1)[0] == digest:
+            return True
+    return False
+
+
+class CompressionMiddleware:
+    """순수 ASGI 미들웨어 — 첫 본문 메시지가 마지막(more_body=False)일 때만 버퍼링해 압축, 스트리밍 응답은 손대지 않음"""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, cache: CompressedBodyCache | None = None):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.cache = cache if cache is not None else CompressedBodyCache()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        responder = _Responder(
+            self,
+            send,
+            encoding=choose_encoding(headers.get("accept-encoding", "")),
+            cacheable=scope["method"] in ("GET", "HEAD"),
+            head=scope["method"] == "HEAD",
+            if_none_match=headers.get("if-none-match"),
+        )
+        await self.app(scope, receive, responder.send)
+
+
+class _Responder:
+    def __init__(
+        self,
+        middleware: CompressionMiddleware,
+        send: Send,
+        encoding: str | None,
+        cacheable: bool,
+        if_none_match: str | None,
+        head: bool = False,
+    ):
+        self.middleware = middleware
+        self._send = send
+        self.encoding = encoding
+        self.cacheable = cacheable
+        self.head = head
+        self.if_none_match = if_none_match
+        self.start: Message | None = None
+        self.passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if self.passthrough:
+            await self._send(message)
+            return
+        if message["type"] == "http.response.start":
+            # 본문 첫 메시지를 보고 결정할 때까지 헤더 전송을 미룸
+            self.start = message
+            return
+        if message["type"] != "http.response.body" or self.start is None:  # pragma: no cover
+            await self._send(message)
+            return
+
+        start, self.start = self.start, None
+        self.passthrough = True
+        if message.get("more_body", False):
+            # 스트리밍 응답(SSE, export) — 전체 크기를 모르므로 원본 그대로
+            await self._send(start)
+            await self._send(message)
+            return
+        await self._send_complete(start, message.get("body", b""))
+
+    def _is_full_representation(self, headers: MutableHeaders, body: bytes) -> bool:
+        """HEAD 응답은 앱에 따라 본문을 비워 보냄 — 빈 본문의 해시는 GET의 ETag와 달라 조건부 요청을 깨뜨리므로 생략"""
+        if not self.head:
+            return True
+        content_length = headers.get("content-length")
+        if content_length is None:
+            return bool(body)
+        return content_length.isdigit() and int(content_length) == len(body)
+
+    async def _send_complete(self, start: Message, body: bytes) -> None:
+        headers = MutableHeaders(scope=start)
+        status = start["status"]
+        content_type = headers.get("content-type", "")
+        compressible = _is_compressible(content_type) and "content-encoding" not in headers
+
+        if compressible:
+            headers.add_vary_header("Accept-Encoding")
+        digest = None
+        if status == 200 and self.cacheable and "etag" not in headers and self._is_full_representation(headers, body):
+            digest = body_digest(body)
+            if self.if_none_match and _etag_matches(self.if_none_match, digest):
+                not_modified = MutableHeaders(
+                    raw=[(k, v) for k, v in headers.raw if k not in (b"content-length", b"content-type")]
+                )
+                not_modified["etag"] = f'"{digest}"'
+                await self._send({"type": "http.response.start", "status": 304, "headers": not_modified.raw})
+                await self._send({"type": "http.response.body", "body": b""})
+                return
+            headers["etag"] = f'"{digest}"'
+
+        if compressible and self.encoding is not None and len(body) >= self.middleware.minimum_size:
+            body = self.middleware.cache.get_or_compress(digest or body_digest(body), self.encoding, body)
+            headers["content-encoding"] = self.encoding
+            headers["content-length"] = str(len(body))
+            if digest is not None:
+                # 표현(인코딩)마다 다른 강한 ETag — RFC 9110
+                headers["etag"] = f'"{digest}-{self.encoding}"'
+
+        await self._send(start)
+        await self._send({"type": "http.response.body", "body": body})
@@ -1,8 +1,13 @@
 # 파일 목적: 비동기 데이터베이스 엔진 및 세션 설정
-# 주요 기능: AsyncEngine, AsyncSessionLocal, Base(DeclarativeBase) 제공
+# 주요 기능: AsyncEngine(풀 크기는 워커 수로 나눈 연결 예산 안에서, prepared statement 캐시는 Settings), AsyncSessionLocal, Base(DeclarativeBase) 제공,
+#           warm_pool(기동 시 풀 연결을 미리 열고 연결마다 핫 쿼리를 prepare — 롤백되는 트랜잭션 안에서 실행)
 # 사용 방법: from app.core.database import AsyncSessionLocal, Base
 
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+import asyncio
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 from app.core.config import settings
 
@@ -11,13 +16,25 @@ class Base(DeclarativeBase):
     pass
 
 
-engine = create_async_engine(
-    settings.database_url,
-    echo=False,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
-)
+def create_engine() -> AsyncEngine:
+    # 워커 수로 나눈 연결 예산 안의 크기 — DB_POOL_SIZE/DB_MAX_OVERFLOW는 상한
+    pool_size, max_overflow, _ = settings.worker_connection_limits
+    return create_async_engine(
+        settings.database_url,
+        echo=False,
+        pool_pre_ping=True,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        connect_args={
+            # SQLAlchemy 어댑터가 SQL 문자열별로 연결에 보관하는 prepared statement 수
+            "prepared_statement_cache_size": settings.db_statement_cache_size,
+            # asyncpg 자체 캐시 (어댑터를 거치지 않는 문장용) — PgBouncer transaction 모드에서는 둘 다 0이어야 함
+            "statement_cache_size": settings.db_statement_cache_size,
+        },
+    )
+
+
+engine = create_engine()
 
 AsyncSessionLocal = async_sessionmaker(
     engine,
@@ -26,3 +43,43 @@ AsyncSessionLocal = async_sessionmaker(
     autocommit=False,
     autoflush=False,
 )
+
+
+async def warm_pool(
+    connections: int = 1,
+    prepare: Callable[[AsyncSession], Awaitable[None]] | None = None,
+    bind: AsyncEngine | None = None,
+) -> int:
+    """풀 연결을 동시에 connections개(pool_size 이하) 열고 반납 — 첫 요청들이 연결 수립 비용을 치르지 않도록. 연 연결 수 반환
+
+    prepare가 주어지면 연결마다 그 연결에 묶인 세션으로 실행한 뒤 롤백 — 요청 경로와 같은 SQL이 연결별 prepared statement 캐시에 남음.
+    """
+    count = min(connections, settings.worker_connection_limits[0])
+    if count <= 0:
+        return 0
+    opened = 0
+
+    async def _open() -> None:
+        nonlocal opened
+        try:
+            async with (bind or engine).connect() as conn:
+                if prepare is None:
+                    await conn.execute(text("SELECT 1"))
+                else:
+                    async with AsyncSession(bind=conn) as session:
+                        await prepare(session)
+                        await session.rollback()
+                opened += 1
+                # 모든 연결이 열릴 때까지 붙잡아 두어야 풀이 같은 연결을 재사용하지 않고 새로 엶
+                await barrier.wait()
+        except BaseException:
+            # 하나라도 실패하면 기다리는 나머지도 풀어 줌
+            await barrier.abort()
+            raise
+
+    barrier = asyncio.Barrier(count)
+    results = await asyncio.gather(*(_open() for _ in range(count)), return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException) and not isinstance(result, asyncio.BrokenBarrierError):
+            raise result
+    return opened
@@ -0,0 +1,155 @@
+# 파일 목적: 분석 이벤트(클릭/방문) 실시간 fan-out 허브
+# 주요 기능: AnalyticsEvent, InMemoryEventHub(단일 워커, 구독자별 asyncio.Queue + 동기 listener), PostgresEventHub(LISTEN/NOTIFY로 워커 간 전달, 워커의 보조 풀·LISTEN 연결(pg_connections) 공유, 끊기면 PgListener가 재연결)
+# 사용 방법: from app.core.events import event_hub; await event_hub.publish(event); async for ev in event_hub.subscribe(user_id)
+
+import asyncio
+import json
+import logging
+import uuid
+from collections import defaultdict
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass
+from datetime import datetime
+
+from app.core.config import settings
+from app.core.pg_connections import PgConnections, pg_connections
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "analytics_events"
+
+
+@dataclass(frozen=True, slots=True)
+class AnalyticsEvent:
+    kind: str  # "click" | "view"
+    user_id: uuid.UUID
+    occurred_at: datetime
+    link_id: uuid.UUID | None = None
+    click_count: int | None = None  # 클릭 반영 후 링크 누적 클릭 수
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "kind": self.kind,
+                "user_id": str(self.user_id),
+                "occurred_at": self.occurred_at.isoformat(),
+                "link_id": str(self.link_id) if self.link_id else None,
+                "click_count": self.click_count,
+            },
+            separators=(",", ":"),
+        )
+
+    @classmethod
+    def from_json(cls, payload: str) -> "AnalyticsEvent":
+        data = json.loads(payload)
+        return cls(
+            kind=data["kind"],
+            user_id=uuid.UUID(data["user_id"]),
+            occurred_at=datetime.fromisoformat(data["occurred_at"]),
+            link_id=uuid.UUID(data["link_id"]) if data.get("link_id") else None,
+            click_count=data.get("click_count"),
+        )
+
+
+class InMemoryEventHub:
+    """단일 프로세스 fan-out: user_id별 구독자 큐에 이벤트를 복사 없이 전달"""
+
+    def __init__(self, queue_size: int = 100):
+        self._queue_size = queue_size
+        self._subscribers: dict[uuid.UUID, set[asyncio.Queue]] = defaultdict(set)
+        self._listeners: list[Callable[[AnalyticsEvent], None]] = []
+
+    async def start(self) -> None:
+        return None
+
+    async def stop(self) -> None:
+        return None
+
+    def add_listener(self, callback: Callable[[AnalyticsEvent], None]) -> None:
+        # 큐 없이 모든 이벤트를 동기 콜백으로 받는 in-process 집계기용 (예: live_counters)
+        self._listeners.append(callback)
+
+    def subscriber_count(self, user_id: uuid.UUID | None = None) -> int:
+        if user_id is not None:
+            return len(self._subscribers.get(user_id, ()))
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    async def publish(self, event: AnalyticsEvent) -> None:
+        self._dispatch(event)
+
+    def _dispatch(self, event: AnalyticsEvent) -> None:
+        for callback in self._listeners:
+            callback(event)
+        for queue in self._subscribers.get(event.user_id, ()):
+            if queue.full():
+                # 느린 구독자가 ingest 경로를 막지 않도록 가장 오래된 이벤트를 버림
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    async def subscribe(self, user_id: uuid.UUID) -> AsyncIterator[AnalyticsEvent]:
+        queue: asyncio.Queue[AnalyticsEvent] = asyncio.Queue(maxsize=self._queue_size)
+        self._subscribers[user_id].add(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            queues = self._subscribers.get(user_id)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self._subscribers[user_id]
+
+
+class PostgresEventHub(InMemoryEventHub):
+    """멀티 워커용: pg_notify로 발행하고 워커마다 LISTEN 연결 하나로 받아 로컬 구독자에게 fan-out (풀/LISTEN 연결은 다른 postgres 백엔드와 공유)"""
+
+    def __init__(
+        self,
+        dsn: str,
+        queue_size: int = 100,
+        channel: str = NOTIFY_CHANNEL,
+        connections: PgConnections | None = None,
+    ):
+        super().__init__(queue_size)
+        self._channel = channel
+        self._pg = connections or PgConnections(dsn, name="분석 이벤트")
+        # 끊겨 있던 동안의 이벤트는 유실 — 실시간 카운터는 delta와 링크 누적값이라 다음 이벤트부터 다시 맞음
+        self._listener = self._pg.listener
+        self._listener.add_channel(channel, self._on_notify)
+        self._pool = None
+
+    async def start(self) -> None:
+        await self._pg.start()
+        self._pool = self._pg.pool
+
+    async def stop(self) -> None:
+        self._pool = None
+        await self._pg.stop()
+
+    def _on_notify(self, connection, pid, channel, payload: str) -> None:
+        try:
+            self._dispatch(AnalyticsEvent.from_json(payload))
+        except (ValueError, KeyError):
+            logger.warning("잘못된 분석 이벤트 payload 무시: %s", payload[:200])
+
+    async def publish(self, event: AnalyticsEvent) -> None:
+        if self._pool is None:
+            # lifespan 밖(테스트, CLI)에서는 로컬 구독자에게만 전달
+            self._dispatch(event)
+            return
+        try:
+            await self._pool.execute("SELECT pg_notify($1, $2)", self._channel, event.to_json())
+        except Exception:
+            # 실시간 푸시는 부가 기능 — 실패해도 클릭/방문 기록 응답은 막지 않음
+            logger.exception("분석 이벤트 NOTIFY 실패")
+
+
+def create_event_hub() -> InMemoryEventHub:
+    if settings.analytics_event_backend == "postgres":
+        return PostgresEventHub(
+            settings.asyncpg_dsn, settings.analytics_event_queue_size, connections=pg_connections
+        )
+    return InMemoryEventHub(settings.analytics_event_queue_size)
+
+
+event_hub = create_event_hub()
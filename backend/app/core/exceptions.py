@@ -1,14 +1,15 @@
 # 파일 목적: 애플리케이션 전용 예외 클래스 계층 정의
-# 주요 기능: AppException 기반 - NotFound, BadRequest, Unauthorized, Conflict, Forbidden
+# 주요 기능: AppException 기반 - NotFound, BadRequest, Unauthorized, Conflict, Forbidden, TooManyRequests(Retry-After 헤더)
 # 사용 방법: from app.core.exceptions import NotFoundException, UnauthorizedException
 
 from fastapi import status
 
 
 class AppException(Exception):
-    def __init__(self, status_code: int, detail: str):
+    def __init__(self, status_code: int, detail: str, headers: dict[str, str] | None = None):
         self.status_code = status_code
         self.detail = detail
+        self.headers = headers
         super().__init__(detail)
 
 
@@ -35,3 +36,12 @@ class ConflictException(AppException):
 class ForbiddenException(AppException):
     def __init__(self, detail: str = "접근 권한이 없습니다."):
         super().__init__(status_code=status.HTTP_403_FORBIDDEN, detail=detail)
+
+
+class TooManyRequestsException(AppException):
+    def __init__(self, detail: str = "요청이 너무 많습니다. 잠시 후 다시 시도해주세요.", retry_after: int = 1):
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=detail,
+            headers={"Retry-After": str(retry_after)},
+        )
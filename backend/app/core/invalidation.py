@@ -0,0 +1,156 @@
+# 파일 목적: 워커 간 캐시 무효화 버스 — 한 워커의 프로필/링크 변경을 다른 워커의 프로세스 로컬 캐시에 반영
+# 주요 기능: InMemoryInvalidationBus(단일 워커 — 발행은 no-op), PostgresInvalidationBus(pg_notify로 {origin, seq, user_id, username} 발행,
+#           워커 공용 LISTEN 연결(pg_connections의 PgListener, 재연결됨)로 수신해 핸들러 호출, 연결이 끊기면 재연결 후 전체 flush, origin별 seq가 건너뛰면 전체 flush)
+# 사용 방법: invalidation_bus.add_handler(cache.discard_user); invalidation_bus.add_flush_handler(cache.clear); invalidation_bus.publish(user_id, username)
+
+import asyncio
+import json
+import logging
+import uuid
+from collections.abc import Callable
+
+from app.core.config import settings
+from app.core.pg_connections import PgConnections, pg_connections
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "cache_invalidation"
+
+InvalidationHandler = Callable[[uuid.UUID, str | None], None]
+FlushHandler = Callable[[], None]
+
+
+class InMemoryInvalidationBus:
+    """단일 워커용: 변경한 워커가 곧 유일한 캐시 보유자이므로 다른 워커에 알릴 것이 없음"""
+
+    def __init__(self) -> None:
+        self._handlers: list[InvalidationHandler] = []
+        self._flush_handlers: list[FlushHandler] = []
+
+    async def start(self) -> None:
+        return None
+
+    async def stop(self) -> None:
+        return None
+
+    def add_handler(self, handler: InvalidationHandler) -> None:
+        self._handlers.append(handler)
+
+    def add_flush_handler(self, handler: FlushHandler) -> None:
+        self._flush_handlers.append(handler)
+
+    def publish(self, user_id: uuid.UUID, username: str | None = None) -> None:
+        return None
+
+    def _apply(self, user_id: uuid.UUID, username: str | None) -> None:
+        for handler in self._handlers:
+            try:
+                handler(user_id, username)
+            except Exception:
+                logger.exception("캐시 무효화 핸들러 실패: %s", user_id)
+
+    def flush(self) -> None:
+        """어떤 변경을 놓쳤는지 모를 때 — 로컬 캐시 전체를 비워 DB에서 다시 읽게 함"""
+        for handler in self._flush_handlers:
+            try:
+                handler()
+            except Exception:
+                logger.exception("캐시 전체 flush 실패")
+
+
+class PostgresInvalidationBus(InMemoryInvalidationBus):
+    """멀티 워커용: 요청 경로는 큐에 넣기만 하고(동기), 발행 task가 pg_notify로 전송. 수신은 워커마다 LISTEN 연결 하나.
+
+    메시지마다 워커 origin과 origin별 연속 seq를 붙임 — 수신 측이 seq 건너뜀(발행 실패, 큐 넘침)을 보면 놓친 무효화가 있다는 뜻이므로 전체 flush.
+    LISTEN 연결이 끊겼다 다시 붙은 경우도 그 사이 알림이 유실되므로 전체 flush.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        channel: str = NOTIFY_CHANNEL,
+        queue_size: int = 1000,
+        connections: PgConnections | None = None,
+    ):
+        super().__init__()
+        self._channel = channel
+        self.origin = uuid.uuid4().hex
+        self._seq = 0
+        self._last_seen: dict[str, int] = {}
+        self._outbox: asyncio.Queue[str] = asyncio.Queue(queue_size)
+        self._pg = connections or PgConnections(dsn, name="캐시 무효화")
+        self._listener = self._pg.listener
+        self._listener.add_channel(channel, self._on_notify)
+        self._listener.add_reconnect_handler(self._on_reconnect)
+        self._sender: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        await self._pg.start()
+        self._sender = asyncio.create_task(self._send_forever())
+
+    async def stop(self) -> None:
+        if self._sender is not None:
+            self._sender.cancel()
+            try:
+                await self._sender
+            except asyncio.CancelledError:
+                pass
+            self._sender = None
+        await self._pg.stop()
+
+    def publish(self, user_id: uuid.UUID, username: str | None = None) -> None:
+        """PublicProfileCache 무효화 리스너 — 커밋 후 서비스 계층에서 호출되므로 await 없이 큐에만 넣음"""
+        self._seq += 1
+        message = {"o": self.origin, "s": self._seq, "u": user_id.hex}
+        if username is not None:
+            message["n"] = username
+        try:
+            self._outbox.put_nowait(json.dumps(message, separators=(",", ":")))
+        except asyncio.QueueFull:
+            # seq는 이미 소비됨 — 다른 워커는 다음 메시지에서 건너뜀을 보고 전체 flush
+            logger.warning("캐시 무효화 발행 큐 가득 참 — 메시지 생략: %s", user_id)
+
+    def _on_notify(self, connection, pid, channel, payload: str) -> None:
+        try:
+            message = json.loads(payload)
+            origin, seq = message["o"], message["s"]
+            user_id = uuid.UUID(message["u"])
+        except (ValueError, KeyError, TypeError):
+            logger.warning("잘못된 캐시 무효화 payload 무시: %s", payload[:200])
+            return
+        if origin == self.origin:
+            # 발행 워커는 커밋 직후 로컬 캐시를 이미 무효화함
+            return
+        last = self._last_seen.get(origin)
+        self._last_seen[origin] = seq
+        if last is not None and seq != last + 1:
+            logger.warning("캐시 무효화 seq 건너뜀 (%s: %d → %d) — 전체 flush", origin[:8], last, seq)
+            self.flush()
+            return
+        self._apply(user_id, message.get("n"))
+
+    def _on_reconnect(self) -> None:
+        # 끊겨 있던 동안의 알림은 유실됨 — 어떤 사용자가 바뀌었는지 모르므로 전체 flush, seq 기준도 새로 시작
+        self._last_seen.clear()
+        self.flush()
+
+    async def _send_forever(self) -> None:
+        while True:
+            payload = await self._outbox.get()
+            try:
+                if not await self._listener.notify(self._channel, payload):
+                    logger.warning("캐시 무효화 연결 없음 — 메시지 생략")
+            except Exception:
+                # 다른 워커는 seq 건너뜀으로 유실을 감지해 전체 flush
+                logger.exception("캐시 무효화 NOTIFY 실패")
+
+
+def create_invalidation_bus() -> InMemoryInvalidationBus:
+    if settings.invalidation_backend == "postgres":
+        return PostgresInvalidationBus(
+            settings.asyncpg_dsn, queue_size=settings.invalidation_queue_size, connections=pg_connections
+        )
+    return InMemoryInvalidationBus()
+
+
+invalidation_bus = create_invalidation_bus()
@@ -0,0 +1,147 @@
+# 파일 목적: 공개 프로필 실시간 카운터 집계기 (SSE 위젯용)
+# 주요 기능: event_hub 이벤트를 사용자별로 합산 → interval마다 한 번 리스너 mailbox에 병합, SSE 텍스트 스트림 생성
+# 사용 방법: from app.core.live_counters import live_counters; StreamingResponse(live_counters.stream(user_id))
+
+import asyncio
+import json
+import uuid
+from collections import defaultdict
+from collections.abc import AsyncIterator
+
+from app.core.config import settings
+from app.core.events import AnalyticsEvent, event_hub
+
+
+class CounterDelta:
+    __slots__ = ("views", "clicks", "link_clicks", "link_totals")
+
+    def __init__(self) -> None:
+        self.views = 0
+        self.clicks = 0
+        self.link_clicks: dict[uuid.UUID, int] = defaultdict(int)
+        self.link_totals: dict[uuid.UUID, int] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self.views or self.clicks)
+
+    def add(self, event: AnalyticsEvent) -> None:
+        if event.kind == "view":
+            self.views += 1
+        elif event.kind == "click":
+            self.clicks += 1
+            if event.link_id is not None:
+                self.link_clicks[event.link_id] += 1
+                if event.click_count is not None:
+                    self.link_totals[event.link_id] = event.click_count
+
+    def merge(self, other: "CounterDelta") -> None:
+        self.views += other.views
+        self.clicks += other.clicks
+        for link_id, count in other.link_clicks.items():
+            self.link_clicks[link_id] += count
+        self.link_totals.update(other.link_totals)
+
+    def to_dict(self) -> dict:
+        return {
+            "views": self.views,
+            "clicks": self.clicks,
+            "links": {
+                str(link_id): {"delta": count, "click_count": self.link_totals.get(link_id)}
+                for link_id, count in self.link_clicks.items()
+            },
+        }
+
+
+class _Mailbox:
+    """리스너 1개분 대기 슬롯 — 소비 전 도착한 delta는 병합되어 큐가 쌓이지 않음"""
+
+    __slots__ = ("delta", "ready")
+
+    def __init__(self) -> None:
+        self.delta = CounterDelta()
+        self.ready = asyncio.Event()
+
+    def put(self, delta: CounterDelta) -> None:
+        self.delta.merge(delta)
+        self.ready.set()
+
+    def take(self) -> CounterDelta:
+        delta, self.delta = self.delta, CounterDelta()
+        self.ready.clear()
+        return delta
+
+
+class LiveCounterAggregator:
+    def __init__(self, interval: float, keepalive: float):
+        self._interval = interval
+        self._keepalive = keepalive
+        self._pending: dict[uuid.UUID, CounterDelta] = {}
+        self._mailboxes: dict[uuid.UUID, set[_Mailbox]] = defaultdict(set)
+        self._flusher: asyncio.Task | None = None
+
+    def listener_count(self, user_id: uuid.UUID | None = None) -> int:
+        if user_id is not None:
+            return len(self._mailboxes.get(user_id, ()))
+        return sum(len(boxes) for boxes in self._mailboxes.values())
+
+    def on_event(self, event: AnalyticsEvent) -> None:
+        # 리스너가 없는 사용자의 이벤트는 집계하지 않음
+        if event.user_id not in self._mailboxes:
+            return
+        delta = self._pending.get(event.user_id)
+        if delta is None:
+            delta = self._pending[event.user_id] = CounterDelta()
+        delta.add(event)
+
+    def flush(self) -> None:
+        pending, self._pending = self._pending, {}
+        for user_id, delta in pending.items():
+            for mailbox in self._mailboxes.get(user_id, ()):
+                mailbox.put(delta)
+
+    async def _run_flusher(self) -> None:
+        # 모든 리스너를 통틀어 flusher task는 하나 — 리스너가 사라지면 종료
+        while self._mailboxes:
+            await asyncio.sleep(self._interval)
+            self.flush()
+        self._flusher = None
+
+    def listen(self, user_id: uuid.UUID) -> _Mailbox:
+        mailbox = _Mailbox()
+        self._mailboxes[user_id].add(mailbox)
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._run_flusher())
+        return mailbox
+
+    def unlisten(self, user_id: uuid.UUID, mailbox: _Mailbox) -> None:
+        boxes = self._mailboxes.get(user_id)
+        if boxes is None:
+            return
+        boxes.discard(mailbox)
+        if not boxes:
+            del self._mailboxes[user_id]
+            self._pending.pop(user_id, None)
+
+    async def stream(self, user_id: uuid.UUID) -> AsyncIterator[str]:
+        mailbox = self.listen(user_id)
+        try:
+            yield f"retry: {int(self._keepalive * 1000)}\n\n"
+            while True:
+                try:
+                    async with asyncio.timeout(self._keepalive):
+                        await mailbox.ready.wait()
+                except TimeoutError:
+                    # 프록시가 유휴 연결을 끊지 않도록 주석 라인 전송
+                    yield ": keepalive\n\n"
+                    continue
+                payload = json.dumps(mailbox.take().to_dict(), separators=(",", ":"))
+                yield f"event: counters\ndata: {payload}\n\n"
+        finally:
+            self.unlisten(user_id, mailbox)
+
+
+live_counters = LiveCounterAggregator(
+    interval=settings.live_counter_interval_seconds,
+    keepalive=settings.live_counter_keepalive_seconds,
+)
+event_hub.add_listener(live_counters.on_event)
@@ -0,0 +1,163 @@
+# 파일 목적: 로그인 무차별 대입 방어용 적응형 throttle (DB 조회·bcrypt 검증 전에 거부)
+# 주요 기능: BackoffTable(키별 연속 실패 수 → 허용 횟수 초과 시 지수 backoff 잠금, 실패 수/잠금은 shared_state의 incr/expire 키 —
+#           멀티 워커에서도 워커 수만큼 시도 횟수가 늘지 않음, window 동안 실패가 없으면 키가 만료되어 초기화),
+#           LoginThrottle(email 테이블 + IP 테이블 조합, check(허용 시 DB 조회·bcrypt 전에 시도 1회 선점)/record_failure/record_success(선점 환불),
+#           stats 카운터도 shared_state에 가산해 전체 워커 합계)
+# 사용 방법: from app.core.login_throttle import login_throttle; retry_after = await login_throttle.check(email, ip)
+
+import hashlib
+import time
+from collections.abc import Callable
+
+from app.core.config import settings
+from app.core.shared_state import InMemorySharedState, shared_state
+
+_STATS = ("checked", "rejected", "failures", "successes")
+
+
+class BackoffTable:
+    """키마다 shared_state 키 3개: 연속 실패 수(:n), 잠금 중 통과 1회 선점(:gate, 잠금 시간 TTL), 잠금 해제 시각(:until)
+
+    허용 횟수를 넘긴 뒤에는 gate를 처음 가산한 시도 하나만 통과 — 동시 요청이 여러 워커로 흩어져도 잠금 1회당 1번만 검증까지 진행
+    """
+
+    def __init__(
+        self,
+        state: InMemorySharedState,
+        prefix: str,
+        free_attempts: int,
+        base_delay: float = 1.0,
+        max_delay: float = 900.0,
+        window: float = 900.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.state = state
+        self.prefix = prefix
+        self.free_attempts = free_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.window = window
+        # 잠금 해제 시각은 여러 워커/호스트가 비교하므로 벽시계
+        self._clock = clock
+
+    def _key(self, key: str, suffix: str) -> str:
+        # 공유 테이블에 email/IP 원본을 남기지 않고 키 길이도 고정
+        digest = hashlib.sha256(key.encode()).hexdigest()[:32]
+        return f"{self.prefix}{digest}:{suffix}"
+
+    def _delay(self, failures: int) -> float:
+        return min(self.max_delay, self.base_delay * 2 ** (failures - self.free_attempts - 1))
+
+    async def failures(self, key: str) -> int:
+        value = await self.state.get(self._key(key, "n"))
+        return 0 if value is None else int(value)
+
+    async def retry_after(self, key: str) -> float:
+        until = await self.state.get(self._key(key, "until"))
+        if until is None:
+            return 0.0
+        return max(0.0, float(until) - self._clock())
+
+    async def reserve(self, key: str) -> float:
+        """시도 1회를 실패로 선점 — 통과면 0, 다른 시도가 먼저 잠금 구간을 차지했으면 남은 대기 시간(선점은 되돌림)"""
+        count_key = self._key(key, "n")
+        failures = await self.state.incr(count_key, ttl=self.window)
+        if failures <= self.free_attempts:
+            if failures > 1:
+                await self.state.expire(count_key, self.window)
+            return 0.0
+        delay = self._delay(failures)
+        if await self.state.incr(self._key(key, "gate"), ttl=delay) > 1:
+            await self.state.incr(count_key, -1)
+            return await self.retry_after(key) or delay
+        await self.state.set(self._key(key, "until"), repr(self._clock() + delay), ttl=delay)
+        # 잠금이 끝나기 전에 실패 수가 먼저 만료되지 않도록
+        await self.state.expire(count_key, max(self.window, delay))
+        return 0.0
+
+    async def reset(self, key: str) -> None:
+        for suffix in ("n", "gate", "until"):
+            await self.state.delete(self._key(key, suffix))
+
+    async def release(self, key: str) -> None:
+        """reserve로 선점한 시도 1회를 되돌림 (성공한 시도 환불)"""
+        count_key = self._key(key, "n")
+        if await self.state.get(count_key) is None:
+            return
+        failures = await self.state.incr(count_key, -1)
+        if failures <= 0:
+            await self.state.delete(count_key)
+        if failures <= self.free_attempts:
+            # 선점이 만든 잠금만 해제 — 허용 횟수를 넘긴 상태의 잠금은 유지
+            await self.state.delete(self._key(key, "gate"))
+            await self.state.delete(self._key(key, "until"))
+
+
+class LoginThrottle:
+    """email과 IP를 따로 추적 — 한 계정을 여러 IP로 노리는 공격과 한 IP에서 여러 계정을 도는 공격을 모두 막음"""
+
+    def __init__(
+        self,
+        email_free_attempts: int = 5,
+        ip_free_attempts: int = 20,
+        max_delay: float = 900.0,
+        state: InMemorySharedState = shared_state,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.state = state
+        self.emails = BackoffTable(state, "login:email:", email_free_attempts, max_delay=max_delay, clock=clock)
+        # 같은 NAT 뒤 사용자를 고려해 IP는 더 많은 실패를 허용
+        self.ips = BackoffTable(state, "login:ip:", ip_free_attempts, max_delay=max_delay, clock=clock)
+
+    @staticmethod
+    def _email_key(email: str) -> str:
+        return email.strip().lower()
+
+    async def _count(self, name: str) -> None:
+        await self.state.incr(f"login:stats:{name}")
+
+    async def check(self, email: str, ip: str | None) -> float:
+        """거부해야 하면 남은 대기 시간(초), 허용이면 시도 1회를 실패로 선점하고 0
+
+        DB 조회·bcrypt 검증 전에 선점해야 동시 요청 N개가 모두 허용 횟수 검사를 통과하지 못함
+        """
+        await self._count("checked")
+        key = self._email_key(email)
+        wait = await self.emails.retry_after(key)
+        if ip:
+            wait = max(wait, await self.ips.retry_after(ip))
+        if wait <= 0:
+            wait = await self.emails.reserve(key)
+            if wait <= 0 and ip:
+                wait = await self.ips.reserve(ip)
+                if wait > 0:
+                    # IP에서 막힌 시도는 email 허용 횟수에서도 빼지 않음
+                    await self.emails.release(key)
+        if wait > 0:
+            await self._count("rejected")
+        return wait
+
+    async def record_failure(self, email: str, ip: str | None) -> None:
+        # 실패 횟수는 check에서 이미 선점됨 — 통계만 기록
+        await self._count("failures")
+
+    async def record_success(self, email: str, ip: str | None) -> None:
+        # IP는 이번 선점만 환불하고 이전 실패 기록은 유지 — 공격자가 자기 계정 로그인으로 IP 실패 횟수를 초기화하지 못하도록
+        await self._count("successes")
+        await self.emails.reset(self._email_key(email))
+        if ip:
+            await self.ips.release(ip)
+
+    async def stats(self) -> dict[str, int]:
+        return {name: int(await self.state.get(f"login:stats:{name}") or 0) for name in _STATS}
+
+    def clear(self) -> None:
+        """테스트용 — 워커 로컬 값만 비움 (memory 백엔드)"""
+        self.state.clear()
+
+
+login_throttle = LoginThrottle(
+    settings.login_throttle_email_attempts,
+    settings.login_throttle_ip_attempts,
+    settings.login_throttle_max_delay_seconds,
+)
@@ -0,0 +1,69 @@
+# 파일 목적: 배포 시 1회 실행하는 마이그레이션 단계 — 서버 기동과 분리해 롤링 재시작/오토스케일링 때마다 alembic을 돌리지 않음
+# 주요 기능: script_heads(마이그레이션 파일의 head 리비전), current_revisions(DB alembic_version — asyncpg 쿼리 1번),
+#           is_at_head(이미 최신이면 env.py/모델 import 없이 바로 판단), main(최신이 아니면 alembic upgrade head, --check는 확인만)
+# 사용 방법: python -m app.core.migrations  (docker compose의 migrate 서비스)  /  python -m app.core.migrations --check (최신이 아니면 종료 코드 1)
+
+import argparse
+import asyncio
+import logging
+import os
+
+from alembic import command
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def alembic_config() -> Config:
+    # 작업 디렉터리와 무관하게 backend/alembic.ini 사용
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "alembic"))
+    config.set_main_option("sqlalchemy.url", settings.database_url)
+    return config
+
+
+def script_heads(config: Config | None = None) -> set[str]:
+    return set(ScriptDirectory.from_config(config or alembic_config()).get_heads())
+
+
+async def current_revisions(dsn: str = settings.asyncpg_dsn) -> set[str]:
+    import asyncpg
+
+    conn = await asyncpg.connect(dsn)
+    try:
+        # 빈 DB(최초 배포)에는 alembic_version 테이블이 없음
+        if await conn.fetchval("SELECT to_regclass('alembic_version')") is None:
+            return set()
+        return {row["version_num"] for row in await conn.fetch("SELECT version_num FROM alembic_version")}
+    finally:
+        await conn.close()
+
+
+async def is_at_head(config: Config | None = None, dsn: str = settings.asyncpg_dsn) -> bool:
+    return await current_revisions(dsn) == script_heads(config)
+
+
+def main(argv: list[str] | None = None) -> int:  # pragma: no cover
+    parser = argparse.ArgumentParser(description="DB가 최신 마이그레이션이 아니면 alembic upgrade head 실행")
+    parser.add_argument("--check", action="store_true", help="업그레이드하지 않고 최신 여부만 확인 (최신이 아니면 종료 코드 1)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    config = alembic_config()
+    if asyncio.run(is_at_head(config)):
+        print("already at head")
+        return 0
+    if args.check:
+        print("pending migrations")
+        return 1
+    command.upgrade(config, "head")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
@@ -0,0 +1,42 @@
+# 파일 목적: keyset(seek) 페이지네이션용 불투명 커서 인코딩/디코딩
+# 주요 기능: encode_cursor(정렬 키 값들 → URL-safe base64 문자열), decode_cursor(문자열 → 타입 변환된 튜플, 실패 시 BadRequestException)
+# 사용 방법: cursor = encode_cursor(row.clicked_at, row.id); clicked_at, click_id = decode_cursor(after, datetime, int)
+
+import base64
+import binascii
+import json
+import uuid
+from datetime import datetime
+
+from app.core.exceptions import BadRequestException
+
+
+def _to_json(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def encode_cursor(*values) -> str:
+    # 클라이언트는 내용을 해석하지 않고 다음 요청의 after로 그대로 돌려보냄
+    raw = json.dumps(values, default=_to_json, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, *types: type) -> tuple:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError("cursor arity mismatch")
+        decoded = []
+        for kind, value in zip(types, values):
+            if kind is datetime:
+                decoded.append(datetime.fromisoformat(value))
+            elif kind is uuid.UUID:
+                decoded.append(uuid.UUID(value))
+            else:
+                decoded.append(kind(value))
+        return tuple(decoded)
+    except (ValueError, TypeError, binascii.Error, UnicodeDecodeError):
+        raise BadRequestException("잘못된 페이지 커서입니다.")
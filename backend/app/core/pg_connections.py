@@ -0,0 +1,46 @@
+# 파일 목적: 워커당 보조 PostgreSQL 연결 묶음 — 이벤트 허브/rate limiter/공유 상태/캐시 무효화 버스가 풀 하나와 LISTEN 연결 하나를 공유
+# 주요 기능: PgConnections(asyncpg 풀 + PgListener, 사용하는 백엔드 수만큼 start/stop을 세어 첫 start에 열고 마지막 stop에 닫음),
+#           pg_connections(설정 DSN·워커별 보조 풀 크기로 만든 모듈 싱글턴 — postgres 백엔드 팩토리가 주입)
+# 사용 방법: self._pg = connections or PgConnections(dsn); self._pg.listener.add_channel("ch", cb); await self._pg.start(); self._pg.pool
+
+from app.core.config import settings
+from app.core.pg_listener import PgListener
+
+
+class PgConnections:
+    """요청 트랜잭션(SQLAlchemy 풀)과 무관한 보조 연결 — 워커당 최대 pool_size + 1(LISTEN)개"""
+
+    def __init__(self, dsn: str, pool_size: int = 4, name: str = "PostgreSQL"):
+        self._dsn = dsn
+        self.pool_size = pool_size
+        self.listener = PgListener(dsn, name)
+        self.pool = None
+        self._users = 0
+
+    async def start(self) -> None:
+        """백엔드마다 호출 — 채널은 첫 start 전에(백엔드 생성 시) 등록되어 있어야 LISTEN 연결 하나로 모두 받음"""
+        self._users += 1
+        if self._users > 1:
+            return
+        import asyncpg
+
+        try:
+            self.pool = await asyncpg.create_pool(self._dsn, min_size=1, max_size=self.pool_size)
+        except BaseException:
+            self._users -= 1
+            raise
+        await self.listener.start()
+
+    async def stop(self) -> None:
+        if self._users == 0:
+            return
+        self._users -= 1
+        if self._users:
+            return
+        await self.listener.stop()
+        if self.pool is not None:
+            await self.pool.close()
+            self.pool = None
+
+
+pg_connections = PgConnections(settings.asyncpg_dsn, settings.worker_connection_limits[2])
@@ -0,0 +1,116 @@
+# 파일 목적: 끊겨도 스스로 다시 붙는 asyncpg LISTEN 연결 — 이벤트 허브/공유 상태/캐시 무효화 버스가 같은 재연결 루프를 사용
+# 주요 기능: PgListener(채널별 asyncpg 리스너 등록, termination listener로 끊김 감지 → 지수 백오프 재연결 후 채널 재등록,
+#           재연결 핸들러 호출 — 끊겨 있던 동안의 알림은 유실되므로 각 사용처가 복구), notify(LISTEN 연결로 pg_notify 전송)
+# 사용 방법: listener = PgListener(dsn, "분석 이벤트"); listener.add_channel("ch", on_notify); listener.add_reconnect_handler(resync); await listener.start()
+
+import asyncio
+import logging
+from collections.abc import Callable
+
+logger = logging.getLogger(__name__)
+
+# 재연결 대기 (지수 증가, 상한)
+_RECONNECT_MIN_SECONDS = 0.5
+_RECONNECT_MAX_SECONDS = 30.0
+
+# asyncpg 리스너 시그니처: (connection, pid, channel, payload)
+NotifyCallback = Callable[[object, int, str, str], None]
+ReconnectHandler = Callable[[], None]
+
+
+class PgListener:
+    """워커당 LISTEN 연결 하나. 첫 연결 실패가 기동을 막지 않도록 연결도 재연결 루프에서 시도"""
+
+    def __init__(self, dsn: str, name: str = "PostgreSQL"):
+        self._dsn = dsn
+        self.name = name
+        self._channels: dict[str, list[NotifyCallback]] = {}
+        self._reconnect_handlers: list[ReconnectHandler] = []
+        self._conn = None
+        self._disconnected: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+
+    def add_channel(self, channel: str, callback: NotifyCallback) -> None:
+        """start 전에 등록 — 연결(재연결 포함)마다 모든 채널을 다시 LISTEN"""
+        self._channels.setdefault(channel, []).append(callback)
+
+    def add_reconnect_handler(self, handler: ReconnectHandler) -> None:
+        self._reconnect_handlers.append(handler)
+
+    @property
+    def connection(self):
+        """열려 있는 LISTEN 연결 또는 None (끊겨 재연결 중)"""
+        conn = self._conn
+        return None if conn is None or conn.is_closed() else conn
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen_forever())
+
+    async def stop(self) -> None:
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await self._close()
+
+    async def notify(self, channel: str, payload: str) -> bool:
+        """LISTEN 연결로 pg_notify 전송 — 연결이 없으면 False (호출자가 유실 처리)"""
+        conn = self.connection
+        if conn is None:
+            return False
+        await conn.execute("SELECT pg_notify($1, $2)", channel, payload)
+        return True
+
+    def _on_terminate(self, connection) -> None:
+        if self._disconnected is not None:
+            self._disconnected.set()
+
+    async def _connect(self) -> None:
+        import asyncpg
+
+        self._disconnected = asyncio.Event()
+        self._conn = await asyncpg.connect(self._dsn)
+        self._conn.add_termination_listener(self._on_terminate)
+        for channel, callbacks in self._channels.items():
+            for callback in callbacks:
+                await self._conn.add_listener(channel, callback)
+
+    async def _close(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is not None and not conn.is_closed():
+            try:
+                await conn.close()
+            except Exception:
+                logger.exception("%s LISTEN 연결 종료 실패", self.name)
+
+    def _reconnected(self) -> None:
+        for handler in self._reconnect_handlers:
+            try:
+                handler()
+            except Exception:
+                logger.exception("%s 재연결 핸들러 실패", self.name)
+
+    async def _listen_forever(self) -> None:
+        delay = _RECONNECT_MIN_SECONDS
+        connected_before = False
+        while True:
+            try:
+                await self._connect()
+            except Exception:
+                logger.exception("%s LISTEN 연결 실패 — %.1f초 후 재시도", self.name, delay)
+                await self._close()
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, _RECONNECT_MAX_SECONDS)
+                continue
+            delay = _RECONNECT_MIN_SECONDS
+            if connected_before:
+                # 끊겨 있던 동안의 알림은 유실됨 — 사용처가 복구(캐시 flush 등)
+                self._reconnected()
+            connected_before = True
+            await self._disconnected.wait()
+            logger.warning("%s LISTEN 연결 끊김 — 재연결", self.name)
+            await self._close()
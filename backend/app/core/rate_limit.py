@@ -0,0 +1,150 @@
+# 파일 목적: 공개 기록 엔드포인트용 토큰 버킷 rate limiter
+# 주요 기능: RateLimit("60/minute" 파싱), InMemoryRateLimiter(키 해시로 나눈 shard별 LRU 버킷 — 메모리 상한 고정, 단일 워커),
+#           PostgresRateLimiter(UNLOGGED rate_limit_buckets 테이블 원자적 upsert로 워커 간 공유, 요청 세션과 별도인 워커 공용 보조 풀)
+# 사용 방법: from app.core.rate_limit import rate_limiter, RateLimit; allowed = await rate_limiter.allow(key, RateLimit.parse("60/minute"))
+
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from app.core.config import settings
+from app.core.pg_connections import PgConnections, pg_connections
+
+logger = logging.getLogger(__name__)
+
+_PERIODS = {"second": 1.0, "minute": 60.0, "hour": 3600.0}
+
+# 공유 모드에서 이 횟수만큼 호출될 때마다 오래된 버킷 행을 정리
+_PURGE_EVERY = 10_000
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimit:
+    rate: float  # 초당 보충 토큰 수
+    burst: int  # 버킷 용량 (연속 허용 요청 수)
+
+    @classmethod
+    def parse(cls, value: str) -> "RateLimit":
+        """'60/minute' → 분당 60회, 최대 60회 연속 허용"""
+        count, _, period = value.partition("/")
+        seconds = _PERIODS.get(period.strip().rstrip("s"))
+        if seconds is None or not count.strip().isdigit() or int(count) <= 0:
+            raise ValueError(f"잘못된 rate limit 형식: {value!r} (예: 60/minute)")
+        return cls(rate=int(count) / seconds, burst=int(count))
+
+    @property
+    def idle_seconds(self) -> float:
+        # 이 시간 동안 요청이 없으면 버킷이 가득 찬 상태와 같으므로 버려도 됨
+        return self.burst / self.rate
+
+
+class InMemoryRateLimiter:
+    """키를 shard로 나눠 shard마다 LRU 상한을 둠 — IP를 바꿔 가며 보내는 공격에도 메모리가 고정, 축출은 O(1)"""
+
+    def __init__(
+        self,
+        shards: int = 16,
+        max_keys_per_shard: int = 4096,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._max_keys = max_keys_per_shard
+        self._clock = clock
+        # 버킷 = [남은 토큰, 마지막 갱신 시각]
+        self._shards: list[OrderedDict[str, list[float]]] = [OrderedDict() for _ in range(shards)]
+
+    async def start(self) -> None:
+        return None
+
+    async def stop(self) -> None:
+        return None
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+    def clear(self) -> None:
+        for shard in self._shards:
+            shard.clear()
+
+    async def allow(self, key: str, limit: RateLimit) -> bool:
+        return self.consume(key, limit)
+
+    def consume(self, key: str, limit: RateLimit) -> bool:
+        shard = self._shards[hash(key) % len(self._shards)]
+        now = self._clock()
+        bucket = shard.get(key)
+        if bucket is None:
+            shard[key] = [limit.burst - 1.0, now]
+            if len(shard) > self._max_keys:
+                shard.popitem(last=False)
+            return True
+
+        shard.move_to_end(key)
+        tokens = min(limit.burst, bucket[0] + (now - bucket[1]) * limit.rate)
+        bucket[1] = now
+        if tokens >= 1.0:
+            bucket[0] = tokens - 1.0
+            return True
+        bucket[0] = tokens
+        return False
+
+
+# 보충 계산과 차감을 한 문장으로 — 동시 요청이 같은 행을 갱신해도 행 잠금으로 직렬화됨
+_CONSUME_SQL = """
+INSERT INTO rate_limit_buckets AS b (key, tokens, allowed, updated_at)
+VALUES ($1, $3 - 1, true, clock_timestamp())
+ON CONFLICT (key) DO UPDATE SET
+    allowed = LEAST($3, b.tokens + EXTRACT(EPOCH FROM clock_timestamp() - b.updated_at) * $2) >= 1,
+    tokens = LEAST($3, b.tokens + EXTRACT(EPOCH FROM clock_timestamp() - b.updated_at) * $2)
+             - CASE WHEN LEAST($3, b.tokens + EXTRACT(EPOCH FROM clock_timestamp() - b.updated_at) * $2) >= 1
+                    THEN 1 ELSE 0 END,
+    updated_at = clock_timestamp()
+RETURNING allowed
+"""
+
+_PURGE_SQL = "DELETE FROM rate_limit_buckets WHERE updated_at < clock_timestamp() - make_interval(secs => $1)"
+
+
+class PostgresRateLimiter(InMemoryRateLimiter):
+    """멀티 워커용: 버킷을 UNLOGGED 테이블에 두고 워커가 공유. 요청 트랜잭션과 무관한 보조 asyncpg 풀(pg_connections) 사용"""
+
+    def __init__(self, dsn: str, connections: PgConnections | None = None, **kwargs):
+        super().__init__(**kwargs)
+        self._pg = connections or PgConnections(dsn, name="rate limit")
+        self._pool = None
+        self._calls = 0
+        self._max_idle = 0.0
+
+    async def start(self) -> None:
+        await self._pg.start()
+        self._pool = self._pg.pool
+
+    async def stop(self) -> None:
+        self._pool = None
+        await self._pg.stop()
+
+    async def allow(self, key: str, limit: RateLimit) -> bool:
+        if self._pool is None:
+            # lifespan 밖(테스트, CLI)에서는 프로세스 로컬 버킷 사용
+            return self.consume(key, limit)
+        self._max_idle = max(self._max_idle, limit.idle_seconds)
+        try:
+            allowed = await self._pool.fetchval(_CONSUME_SQL, key, limit.rate, float(limit.burst))
+            self._calls += 1
+            if self._calls % _PURGE_EVERY == 0:
+                await self._pool.execute(_PURGE_SQL, self._max_idle)
+            return bool(allowed)
+        except Exception:
+            # 공유 저장소 장애 시 기록 경로를 막지 않고 로컬 버킷으로 대체
+            logger.exception("공유 rate limit 조회 실패 — 로컬 버킷 사용")
+            return self.consume(key, limit)
+
+
+def create_rate_limiter() -> InMemoryRateLimiter:
+    if settings.rate_limit_backend == "postgres":
+        return PostgresRateLimiter(settings.asyncpg_dsn, connections=pg_connections)
+    return InMemoryRateLimiter()
+
+
+rate_limiter = create_rate_limiter()
@@ -0,0 +1,119 @@
+# 파일 목적: 폐기된 토큰 family 목록 (프로세스 내 deny-set, 주기적 DB 동기화)
+# 주요 기능: RevocationSet - revoke(family 즉시 추가), __contains__(O(1) 조회, DB 접근 없음),
+#           sync(refresh_tokens.revoked_at + 계정 삭제로 남긴 revoked_token_families 증분 조회),
+#           access token 수명이 지난 항목은 prune으로 제거해 크기 제한, purge_expired_refresh_tokens(만료 행/오래된 삭제 계정 폐기 기록 삭제)
+# 사용 방법: from app.core.revocation import revoked_families; if family_id in revoked_families: ...
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable, Iterable
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.refresh_token import RefreshToken, RevokedTokenFamily
+
+logger = logging.getLogger(__name__)
+
+SYNC_OVERLAP = timedelta(seconds=60)
+
+
+class RevocationSet:
+    """family_id(str) → 폐기 시각. access token은 수명이 짧으므로 그 시간만큼만 기억하면 충분"""
+
+    def __init__(self, ttl_seconds: float, clock: Callable[[], float] = time.time):
+        self._ttl = ttl_seconds
+        self._clock = clock
+        self._families: dict[str, float] = {}
+        self._synced_until: datetime | None = None
+
+    def __len__(self) -> int:
+        return len(self._families)
+
+    @property
+    def ttl_seconds(self) -> float:
+        return self._ttl
+
+    def __contains__(self, family_id: object) -> bool:
+        return family_id in self._families
+
+    def clear(self) -> None:
+        self._families.clear()
+        self._synced_until = None
+
+    def revoke(self, family_ids: Iterable[object], revoked_at: float | None = None) -> None:
+        revoked_at = self._clock() if revoked_at is None else revoked_at
+        for family_id in family_ids:
+            self._families[str(family_id)] = revoked_at
+
+    def prune(self) -> None:
+        cutoff = self._clock() - self._ttl
+        for family_id in [f for f, at in self._families.items() if at < cutoff]:
+            del self._families[family_id]
+
+    async def sync(self, db: AsyncSession) -> int:
+        """마지막 동기화 이후 다른 워커가 폐기한 family를 가져옴 (첫 동기화는 TTL 범위 전체)"""
+        if self._synced_until is None:
+            since = datetime.now(timezone.utc) - timedelta(seconds=self._ttl)
+        else:
+            # revoked_at은 트랜잭션 시작 시각이라 늦게 커밋된 행이 워터마크보다 과거일 수 있음 — 겹쳐서 다시 조회
+            since = self._synced_until - SYNC_OVERLAP
+        result = await db.execute(
+            select(RefreshToken.family_id, RefreshToken.revoked_at)
+            .where(RefreshToken.revoked_at >= since)
+            # 계정 삭제로 refresh_tokens 행이 CASCADE 삭제된 family
+            .union(
+                select(RevokedTokenFamily.family_id, RevokedTokenFamily.revoked_at)
+                .where(RevokedTokenFamily.revoked_at >= since)
+            )
+        )
+        rows = result.all()
+        for row in rows:
+            self._families[str(row.family_id)] = row.revoked_at.timestamp()
+            if self._synced_until is None or row.revoked_at > self._synced_until:
+                self._synced_until = row.revoked_at
+        if self._synced_until is None:
+            self._synced_until = since + SYNC_OVERLAP
+        self.prune()
+        return len(rows)
+
+
+revoked_families = RevocationSet(settings.jwt_access_token_expire_minutes * 60)
+
+
+async def purge_expired_refresh_tokens(db: AsyncSession) -> int:
+    # 만료된 토큰은 검증 단계에서 이미 거부되므로 행을 남길 이유가 없음
+    now = datetime.now(timezone.utc)
+    result = await db.execute(
+        delete(RefreshToken)
+        .where(RefreshToken.expires_at < now)
+        .execution_options(synchronize_session=False)
+    )
+    # 삭제 계정의 폐기 기록은 그 계정의 access token이 모두 만료되면 필요 없음
+    await db.execute(
+        delete(RevokedTokenFamily)
+        .where(RevokedTokenFamily.revoked_at < now - timedelta(seconds=revoked_families.ttl_seconds))
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return result.rowcount
+
+
+async def sync_revocations_forever(interval: float) -> None:  # pragma: no cover
+    """lifespan 백그라운드 task — interval마다 다른 워커의 폐기를 반영, 약 1시간마다 만료 토큰 정리"""
+    purge_every = max(1, int(3600 / interval))
+    tick = 0
+    while True:
+        try:
+            async with AsyncSessionLocal() as db:
+                await revoked_families.sync(db)
+                tick += 1
+                if tick % purge_every == 0:
+                    await purge_expired_refresh_tokens(db)
+        except Exception:
+            logger.exception("토큰 폐기 목록 동기화 실패")
+        await asyncio.sleep(interval)
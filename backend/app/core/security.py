@@ -1,12 +1,14 @@
 # 파일 목적: 보안 유틸리티 - 비밀번호 해싱 및 JWT 토큰 생성/검증
-# 주요 기능: bcrypt 해싱, access/refresh JWT 생성, 토큰 페이로드 검증
+# 주요 기능: bcrypt 해싱, access/refresh JWT 생성(family id·jti 포함), 토큰 페이로드 검증(폐기된 family는 메모리 deny-set으로 거부)
+#           서명/검증은 app.core.tokens의 코덱(JWT_BACKEND, JWT_ALGORITHM)에 위임
 # 사용 방법: from app.core.security import hash_password, verify_password, create_access_token
 
-from datetime import datetime, timedelta, timezone
-from typing import Any
+import time
+from typing import Any, NamedTuple
 import bcrypt
-from jose import JWTError, jwt
 from app.core.config import settings
+from app.core.revocation import revoked_families
+from app.core.tokens import token_codec
 
 
 def hash_password(password: str) -> str:
@@ -17,34 +19,55 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
 
 
-def create_access_token(subject: str) -> str:
-    expire = datetime.now(timezone.utc) + timedelta(minutes=settings.jwt_access_token_expire_minutes)
+class RefreshClaims(NamedTuple):
+    user_id: str
+    family_id: str
+    jti: str
+
+
+def create_access_token(subject: str, family_id: str | None = None) -> str:
+    # exp는 정수 epoch 초 — datetime 변환 없이 바로 직렬화
     payload: dict[str, Any] = {
         "sub": subject,
         "type": "access",
-        "exp": expire,
+        "exp": int(time.time()) + settings.jwt_access_token_expire_minutes * 60,
     }
-    return jwt.encode(payload, settings.secret_key, algorithm=settings.jwt_algorithm)
+    if family_id is not None:
+        payload["fam"] = family_id
+    return token_codec.encode(payload)
 
 
-def create_refresh_token(subject: str) -> str:
-    expire = datetime.now(timezone.utc) + timedelta(days=settings.jwt_refresh_token_expire_days)
+def create_refresh_token(subject: str, family_id: str | None = None, jti: str | None = None) -> str:
     payload: dict[str, Any] = {
         "sub": subject,
         "type": "refresh",
-        "exp": expire,
+        "exp": int(time.time()) + settings.jwt_refresh_token_expire_days * 86400,
     }
-    return jwt.encode(payload, settings.secret_key, algorithm=settings.jwt_algorithm)
+    if family_id is not None:
+        payload["fam"] = family_id
+    if jti is not None:
+        payload["jti"] = jti
+    return token_codec.encode(payload)
+
+
+def _decode(token: str, token_type: str) -> dict[str, Any] | None:
+    payload = token_codec.decode(token)
+    if payload is None or payload.get("type") != token_type or payload.get("sub") is None:
+        return None
+    # 폐기된 로그인 세션(family) — DB 조회 없이 프로세스 내 set 조회 한 번
+    if payload.get("fam") in revoked_families:
+        return None
+    return payload
 
 
 def verify_token(token: str, token_type: str = "access") -> str | None:
-    try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.jwt_algorithm])
-        if payload.get("type") != token_type:
-            return None
-        sub = payload.get("sub")
-        if sub is None:
-            return None
-        return str(sub)
-    except JWTError:
+    payload = _decode(token, token_type)
+    return str(payload["sub"]) if payload is not None else None
+
+
+def verify_refresh_token(token: str) -> RefreshClaims | None:
+    """rotation 저장소와 대조할 refresh token 클레임 — family/jti가 없는 이전 형식 토큰은 거부"""
+    payload = _decode(token, "refresh")
+    if payload is None or not payload.get("fam") or not payload.get("jti"):
         return None
+    return RefreshClaims(str(payload["sub"]), str(payload["fam"]), str(payload["jti"]))
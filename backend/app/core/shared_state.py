@@ -0,0 +1,438 @@
+# 파일 목적: 멀티 워커 공유 상태 추상화 (키-값 + 카운터 + TTL + pub/sub)
+# 주요 기능: InMemorySharedState(단일 워커, 프로세스 로컬 dict), SqliteSharedState(같은 호스트의 워커끼리 WAL 모드 SQLite 파일 공유,
+#           pub/sub은 messages 테이블 폴링), PostgresSharedState(UNLOGGED shared_state 테이블 + pg_notify/LISTEN으로 호스트 간 공유),
+#           공통 인터페이스 get/set/incr/expire/delete/publish/subscribe, process_local_settings(멀티 워커에서 워커별로 갈라지는 설정 목록)
+#           (사용처: login_throttle의 실패 수/잠금/통계 카운터)
+# 사용 방법: from app.core.shared_state import shared_state; count = await shared_state.incr("key", ttl=60); shared_state.subscribe("ch", callback)
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from collections import defaultdict
+from collections.abc import Callable
+
+from app.core.config import Settings, settings
+from app.core.pg_connections import PgConnections, pg_connections
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "shared_state"
+
+# 이 횟수만큼 쓰기마다 만료된 키를 정리
+_PURGE_EVERY = 1024
+
+Subscriber = Callable[[str], None]
+
+
+class InMemorySharedState:
+    """단일 워커용: 값은 문자열(카운터는 정수 문자열), 만료는 조회 시점에 판단하고 쓰기가 쌓이면 일괄 정리"""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        # key → (값, 만료 시각 또는 None)
+        self._values: dict[str, tuple[str, float | None]] = {}
+        self._subscribers: dict[str, list[Subscriber]] = defaultdict(list)
+        self._writes = 0
+
+    async def start(self) -> None:
+        return None
+
+    async def stop(self) -> None:
+        return None
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def clear(self) -> None:
+        self._values.clear()
+        self._subscribers.clear()
+        self._writes = 0
+
+    def _deadline(self, ttl: float | None) -> float | None:
+        return None if ttl is None else self._clock() + ttl
+
+    def _live(self, key: str) -> tuple[str, float | None] | None:
+        item = self._values.get(key)
+        if item is not None and item[1] is not None and item[1] <= self._clock():
+            del self._values[key]
+            return None
+        return item
+
+    def _wrote(self) -> None:
+        self._writes += 1
+        if self._writes % _PURGE_EVERY == 0:
+            now = self._clock()
+            for key in [k for k, (_, at) in self._values.items() if at is not None and at <= now]:
+                del self._values[key]
+
+    async def get(self, key: str) -> str | None:
+        return self.local_get(key)
+
+    async def set(self, key: str, value: str, ttl: float | None = None) -> None:
+        self.local_set(key, value, ttl)
+
+    async def incr(self, key: str, amount: int = 1, ttl: float | None = None) -> int:
+        """정수 가산 후 새 값 — ttl은 키가 새로 만들어질 때만 적용 (고정 윈도 카운터)"""
+        return self.local_incr(key, amount, ttl)
+
+    async def expire(self, key: str, ttl: float) -> bool:
+        return self.local_expire(key, ttl)
+
+    async def delete(self, key: str) -> bool:
+        return self.local_delete(key)
+
+    # 백엔드가 시작되지 않았거나 장애일 때 하위 클래스가 대체 경로로 쓰는 로컬 연산
+    def local_get(self, key: str) -> str | None:
+        item = self._live(key)
+        return None if item is None else item[0]
+
+    def local_set(self, key: str, value: str, ttl: float | None = None) -> None:
+        self._values[key] = (value, self._deadline(ttl))
+        self._wrote()
+
+    def local_incr(self, key: str, amount: int = 1, ttl: float | None = None) -> int:
+        item = self._live(key)
+        if item is None:
+            value, deadline = amount, self._deadline(ttl)
+        else:
+            value, deadline = int(item[0]) + amount, item[1]
+        self._values[key] = (str(value), deadline)
+        self._wrote()
+        return value
+
+    def local_expire(self, key: str, ttl: float) -> bool:
+        item = self._live(key)
+        if item is None:
+            return False
+        self._values[key] = (item[0], self._deadline(ttl))
+        return True
+
+    def local_delete(self, key: str) -> bool:
+        return self._values.pop(key, None) is not None
+
+    def subscribe(self, channel: str, callback: Subscriber) -> None:
+        self._subscribers[channel].append(callback)
+
+    def unsubscribe(self, channel: str, callback: Subscriber) -> None:
+        callbacks = self._subscribers.get(channel)
+        if callbacks and callback in callbacks:
+            callbacks.remove(callback)
+
+    async def publish(self, channel: str, message: str) -> None:
+        self._dispatch(channel, message)
+
+    def _dispatch(self, channel: str, message: str) -> None:
+        for callback in list(self._subscribers.get(channel, ())):
+            try:
+                callback(message)
+            except Exception:
+                # 구독자 하나의 실패가 다른 구독자/발행 경로를 막지 않도록
+                logger.exception("공유 상태 구독자 실패: %s", channel)
+
+
+_SQLITE_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS kv (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL)",
+    "CREATE TABLE IF NOT EXISTS messages ("
+    " id INTEGER PRIMARY KEY AUTOINCREMENT, channel TEXT NOT NULL, payload TEXT NOT NULL,"
+    " origin TEXT NOT NULL, created_at REAL NOT NULL)",
+)
+
+# 만료된 행은 새 값으로 교체, 아니면 기존 값에 가산 — 한 문장이라 다른 워커 프로세스와 경합해도 원자적
+_SQLITE_INCR = """
+INSERT INTO kv (key, value, expires_at) VALUES (:key, :amount, :deadline)
+ON CONFLICT (key) DO UPDATE SET
+    value = CASE WHEN kv.expires_at IS NOT NULL AND kv.expires_at <= :now
+                 THEN excluded.value ELSE CAST(kv.value AS INTEGER) + :amount END,
+    expires_at = CASE WHEN kv.expires_at IS NOT NULL AND kv.expires_at <= :now
+                      THEN excluded.expires_at ELSE kv.expires_at END
+RETURNING CAST(value AS INTEGER)
+"""
+
+# 폴링이 늦은 워커도 놓치지 않을 만큼만 메시지를 보관
+_MESSAGE_RETENTION_SECONDS = 60.0
+
+
+class SqliteSharedState(InMemorySharedState):
+    """같은 호스트의 워커(gunicorn 등)끼리 공유: WAL 모드 SQLite 파일. 호출은 스레드에서 실행해 이벤트 루프를 막지 않음"""
+
+    def __init__(self, path: str, poll_interval: float = 0.2, clock: Callable[[], float] = time.time):
+        # 여러 프로세스가 같은 만료 시각을 비교하므로 단조 시계 대신 벽시계 사용
+        super().__init__(clock)
+        self.path = path
+        self.poll_interval = poll_interval
+        self._origin = uuid.uuid4().hex
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+        self._last_message_id = 0
+        self._poller: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        await asyncio.to_thread(self._open)
+        self._poller = asyncio.create_task(self._poll_forever())
+
+    async def stop(self) -> None:
+        if self._poller is not None:
+            self._poller.cancel()
+            try:
+                await self._poller
+            except asyncio.CancelledError:
+                pass
+            self._poller = None
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _open(self) -> None:
+        conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        for statement in _SQLITE_SCHEMA:
+            conn.execute(statement)
+        self._last_message_id = conn.execute("SELECT coalesce(max(id), 0) FROM messages").fetchone()[0]
+        self._conn = conn
+
+    def _run(self, sql: str, params: dict | tuple = ()) -> list[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    async def _call(self, sql: str, params: dict | tuple = ()) -> list[tuple]:
+        return await asyncio.to_thread(self._run, sql, params)
+
+    async def get(self, key: str) -> str | None:
+        if self._conn is None:
+            return self.local_get(key)
+        rows = await self._call(
+            "SELECT value FROM kv WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)", (key, self._clock())
+        )
+        return rows[0][0] if rows else None
+
+    async def set(self, key: str, value: str, ttl: float | None = None) -> None:
+        if self._conn is None:
+            self.local_set(key, value, ttl)
+            return
+        await self._call(
+            "INSERT INTO kv (key, value, expires_at) VALUES (?, ?, ?)"
+            " ON CONFLICT (key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at",
+            (key, value, self._deadline(ttl)),
+        )
+        await self._maybe_purge()
+
+    async def incr(self, key: str, amount: int = 1, ttl: float | None = None) -> int:
+        if self._conn is None:
+            return self.local_incr(key, amount, ttl)
+        rows = await self._call(
+            _SQLITE_INCR, {"key": key, "amount": amount, "deadline": self._deadline(ttl), "now": self._clock()}
+        )
+        await self._maybe_purge()
+        return rows[0][0]
+
+    async def expire(self, key: str, ttl: float) -> bool:
+        if self._conn is None:
+            return self.local_expire(key, ttl)
+        now = self._clock()
+        rows = await self._call(
+            "UPDATE kv SET expires_at = ? WHERE key = ? AND (expires_at IS NULL OR expires_at > ?) RETURNING 1",
+            (now + ttl, key, now),
+        )
+        return bool(rows)
+
+    async def delete(self, key: str) -> bool:
+        if self._conn is None:
+            return self.local_delete(key)
+        return bool(await self._call("DELETE FROM kv WHERE key = ? RETURNING 1", (key,)))
+
+    async def _maybe_purge(self) -> None:
+        self._writes += 1
+        if self._writes % _PURGE_EVERY == 0:
+            now = self._clock()
+            await self._call("DELETE FROM kv WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+            await self._call("DELETE FROM messages WHERE created_at < ?", (now - _MESSAGE_RETENTION_SECONDS,))
+
+    async def publish(self, channel: str, message: str) -> None:
+        # 같은 워커의 구독자에게는 즉시 전달, 다른 워커는 폴링으로 수신 (자기 origin 메시지는 폴링에서 건너뜀)
+        self._dispatch(channel, message)
+        if self._conn is not None:
+            await self._call(
+                "INSERT INTO messages (channel, payload, origin, created_at) VALUES (?, ?, ?, ?)",
+                (channel, message, self._origin, self._clock()),
+            )
+            await self._maybe_purge()
+
+    async def poll(self) -> int:
+        """다른 워커가 발행한 새 메시지를 구독자에게 전달 — 전달한 메시지 수"""
+        if self._conn is None:
+            return 0
+        rows = await self._call(
+            "SELECT id, channel, payload FROM messages WHERE id > ? AND origin != ? ORDER BY id",
+            (self._last_message_id, self._origin),
+        )
+        if not rows:
+            # 자기 메시지만 있었던 구간도 건너뛰도록 워터마크 전진
+            latest = await self._call("SELECT coalesce(max(id), 0) FROM messages")
+            self._last_message_id = max(self._last_message_id, latest[0][0])
+            return 0
+        for message_id, channel, payload in rows:
+            self._last_message_id = message_id
+            self._dispatch(channel, payload)
+        return len(rows)
+
+    async def _poll_forever(self) -> None:  # pragma: no cover
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await self.poll()
+            except Exception:
+                logger.exception("공유 상태 메시지 폴링 실패")
+
+
+# 만료된 행은 새 값으로 교체, 아니면 기존 값에 가산 — 행 잠금으로 워커 간 직렬화
+_PG_INCR = """
+INSERT INTO shared_state AS s (key, value, expires_at)
+VALUES ($1, $2::bigint::text, CASE WHEN $3::float8 IS NULL THEN NULL ELSE now() + make_interval(secs => $3) END)
+ON CONFLICT (key) DO UPDATE SET
+    value = (CASE WHEN s.expires_at IS NOT NULL AND s.expires_at <= now() THEN 0 ELSE s.value::bigint END + $2)::text,
+    expires_at = CASE WHEN s.expires_at IS NOT NULL AND s.expires_at <= now() THEN excluded.expires_at ELSE s.expires_at END
+RETURNING value::bigint
+"""
+
+_PG_SET = """
+INSERT INTO shared_state (key, value, expires_at)
+VALUES ($1, $2, CASE WHEN $3::float8 IS NULL THEN NULL ELSE now() + make_interval(secs => $3) END)
+ON CONFLICT (key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at
+"""
+
+_PG_GET = "SELECT value FROM shared_state WHERE key = $1 AND (expires_at IS NULL OR expires_at > now())"
+
+_PG_EXPIRE = """
+UPDATE shared_state SET expires_at = now() + make_interval(secs => $2)
+WHERE key = $1 AND (expires_at IS NULL OR expires_at > now())
+"""
+
+_PG_PURGE = "DELETE FROM shared_state WHERE expires_at <= now()"
+
+
+class PostgresSharedState(InMemorySharedState):
+    """호스트 간 공유: UNLOGGED shared_state 테이블 + pg_notify. 요청 트랜잭션과 무관한 워커 공용 보조 풀과 재연결되는 LISTEN 연결(pg_connections) 사용
+    — 풀이 없거나 DB 장애면 요청을 막지 않고 워커 로컬 값으로 대체"""
+
+    def __init__(
+        self,
+        dsn: str,
+        channel: str = NOTIFY_CHANNEL,
+        clock: Callable[[], float] = time.monotonic,
+        connections: PgConnections | None = None,
+    ):
+        super().__init__(clock)
+        self._channel = channel
+        self._origin = uuid.uuid4().hex
+        self._pool = None
+        self._pg = connections or PgConnections(dsn, name="공유 상태")
+        # 끊겨 있던 동안의 메시지는 유실 — 구독자 캐시는 각자의 TTL로 수렴
+        self._listener = self._pg.listener
+        self._listener.add_channel(channel, self._on_notify)
+
+    async def start(self) -> None:
+        await self._pg.start()
+        self._pool = self._pg.pool
+
+    async def stop(self) -> None:
+        self._pool = None
+        await self._pg.stop()
+
+    async def get(self, key: str) -> str | None:
+        if self._pool is not None:
+            try:
+                return await self._pool.fetchval(_PG_GET, key)
+            except Exception:
+                logger.exception("공유 상태 조회 실패 — 로컬 값 사용")
+        return self.local_get(key)
+
+    async def set(self, key: str, value: str, ttl: float | None = None) -> None:
+        if self._pool is not None:
+            try:
+                await self._pool.execute(_PG_SET, key, value, ttl)
+                await self._maybe_purge()
+                return
+            except Exception:
+                logger.exception("공유 상태 저장 실패 — 로컬 값 사용")
+        self.local_set(key, value, ttl)
+
+    async def incr(self, key: str, amount: int = 1, ttl: float | None = None) -> int:
+        if self._pool is not None:
+            try:
+                value = await self._pool.fetchval(_PG_INCR, key, amount, ttl)
+                await self._maybe_purge()
+                return value
+            except Exception:
+                logger.exception("공유 카운터 가산 실패 — 로컬 카운터 사용")
+        return self.local_incr(key, amount, ttl)
+
+    async def expire(self, key: str, ttl: float) -> bool:
+        if self._pool is not None:
+            try:
+                return await self._pool.execute(_PG_EXPIRE, key, ttl) == "UPDATE 1"
+            except Exception:
+                logger.exception("공유 상태 만료 설정 실패 — 로컬 값 사용")
+        return self.local_expire(key, ttl)
+
+    async def delete(self, key: str) -> bool:
+        if self._pool is not None:
+            try:
+                return await self._pool.execute("DELETE FROM shared_state WHERE key = $1", key) == "DELETE 1"
+            except Exception:
+                logger.exception("공유 상태 삭제 실패 — 로컬 값 사용")
+        return self.local_delete(key)
+
+    async def _maybe_purge(self) -> None:
+        self._writes += 1
+        if self._writes % _PURGE_EVERY == 0:
+            await self._pool.execute(_PG_PURGE)
+
+    async def publish(self, channel: str, message: str) -> None:
+        self._dispatch(channel, message)
+        if self._pool is None:
+            return
+        payload = json.dumps({"c": channel, "m": message, "o": self._origin}, separators=(",", ":"))
+        try:
+            await self._pool.execute("SELECT pg_notify($1, $2)", self._channel, payload)
+        except Exception:
+            # 로컬 구독자에게는 이미 전달됨 — 다른 워커는 각 캐시의 TTL로 수렴
+            logger.exception("공유 상태 NOTIFY 실패: %s", channel)
+
+    def _on_notify(self, connection, pid, channel, payload: str) -> None:
+        try:
+            data = json.loads(payload)
+            if data["o"] != self._origin:
+                self._dispatch(data["c"], data["m"])
+        except (ValueError, KeyError, TypeError):
+            logger.warning("잘못된 공유 상태 payload 무시: %s", payload[:200])
+
+
+def process_local_settings(config: Settings = settings) -> list[str]:
+    """멀티 워커로 띄우면 워커마다 따로 동작하는 백엔드 설정 — gunicorn 기동 시 경고에 사용"""
+    local = []
+    if config.shared_state_backend == "memory":
+        # 로그인 throttle의 실패 수/잠금이 워커별로 갈라져 시도 허용 횟수가 워커 수만큼 늘어남
+        local.append("SHARED_STATE_BACKEND=memory (로그인 throttle)")
+    if config.invalidation_backend == "memory":
+        local.append("INVALIDATION_BACKEND=memory")
+    if config.rate_limit_backend == "memory":
+        local.append("RATE_LIMIT_BACKEND=memory")
+    if config.analytics_event_backend == "memory":
+        local.append("ANALYTICS_EVENT_BACKEND=memory")
+    return local
+
+
+def create_shared_state() -> InMemorySharedState:
+    if settings.shared_state_backend == "postgres":
+        return PostgresSharedState(settings.asyncpg_dsn, connections=pg_connections)
+    if settings.shared_state_backend == "sqlite":
+        return SqliteSharedState(settings.shared_state_sqlite_path, settings.shared_state_poll_interval_seconds)
+    return InMemorySharedState()
+
+
+shared_state = create_shared_state()
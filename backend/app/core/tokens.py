@@ -0,0 +1,231 @@
+# 파일 목적: JWT 서명/검증 코덱 (교체 가능한 구현 + 비대칭 키 지원)
+# 주요 기능: HMACCodec(HS256/384/512, 헤더·키 사전 계산, hmac 표준 라이브러리로 직접 서명), AsymmetricCodec(EdDSA/ES256, 키는 기동 시 한 번 로드,
+#           공개키만 있으면 검증 전용), JoseCodec(기존 python-jose 구현), create_token_codec(설정 → 코덱), jwks(검증용 공개키 JWK 목록)
+# 사용 방법: from app.core.tokens import token_codec; token = token_codec.encode(claims); claims = token_codec.decode(token)  # 실패 시 None
+
+import base64
+import hashlib
+import hmac
+import json
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Protocol
+
+from app.core.config import settings
+
+# 서버 간 시계 오차 허용 (exp 검증)
+LEEWAY_SECONDS = 0
+
+_HMAC_DIGESTS = {"HS256": hashlib.sha256, "HS384": hashlib.sha384, "HS512": hashlib.sha512}
+ASYMMETRIC_ALGORITHMS = ("EdDSA", "ES256")
+
+
+class TokenCodec(Protocol):
+    algorithm: str
+
+    def encode(self, claims: dict[str, Any]) -> str: ...
+
+    def decode(self, token: str) -> dict[str, Any] | None: ...
+
+
+def _b64encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _b64decode(data: str | bytes) -> bytes:
+    if isinstance(data, str):
+        data = data.encode("ascii")
+    return base64.urlsafe_b64decode(data + b"=" * (-len(data) % 4))
+
+
+def _json(value: dict[str, Any]) -> bytes:
+    return json.dumps(value, separators=(",", ":")).encode()
+
+
+class _CompactJWS(ABC):
+    """header.payload.signature 조립/분해 공통부 — 헤더 세그먼트는 한 번만 직렬화, 서명/검증은 하위 클래스가 구현"""
+
+    algorithm: str
+
+    def __init__(self, algorithm: str, kid: str | None = None):
+        self.algorithm = algorithm
+        header = {"alg": algorithm, "typ": "JWT"}
+        if kid is not None:
+            header["kid"] = kid
+        self._header_segment = _b64encode(_json(header))
+
+    @abstractmethod
+    def _sign(self, signing_input: bytes) -> bytes: ...
+
+    @abstractmethod
+    def _verify(self, signing_input: bytes, signature: bytes) -> bool: ...
+
+    def encode(self, claims: dict[str, Any]) -> str:
+        signing_input = self._header_segment + b"." + _b64encode(_json(claims))
+        return (signing_input + b"." + _b64encode(self._sign(signing_input))).decode("ascii")
+
+    def decode(self, token: str) -> dict[str, Any] | None:
+        try:
+            encoded = token.encode("ascii")
+            signing_input, _, signature = encoded.rpartition(b".")
+            header_segment, _, payload_segment = signing_input.partition(b".")
+            if not header_segment or not payload_segment or b"." in payload_segment:
+                return None
+            # 설정된 알고리즘 외(none, 다른 키 유형)는 서명 검증 전에 거부 — 알고리즘 혼동 공격 방지
+            if header_segment != self._header_segment:
+                header = json.loads(_b64decode(header_segment))
+                if not isinstance(header, dict) or header.get("alg") != self.algorithm:
+                    return None
+            if not self._verify(signing_input, _b64decode(signature)):
+                return None
+            claims = json.loads(_b64decode(payload_segment))
+        except (ValueError, UnicodeError, TypeError):
+            return None
+        if not isinstance(claims, dict):
+            return None
+        exp = claims.get("exp")
+        if exp is not None and (not isinstance(exp, (int, float)) or exp + LEEWAY_SECONDS <= time.time()):
+            return None
+        return claims
+
+
+class HMACCodec(_CompactJWS):
+    """HS256 등 대칭키 — hmac 객체를 키로 한 번 초기화해 두고 요청마다 copy()만 수행"""
+
+    def __init__(self, secret: str, algorithm: str = "HS256"):
+        super().__init__(algorithm)
+        self._mac = hmac.new(secret.encode(), digestmod=_HMAC_DIGESTS[algorithm])
+
+    def _sign(self, signing_input: bytes) -> bytes:
+        mac = self._mac.copy()
+        mac.update(signing_input)
+        return mac.digest()
+
+    def _verify(self, signing_input: bytes, signature: bytes) -> bool:
+        return hmac.compare_digest(self._sign(signing_input), signature)
+
+
+def _load_private_key(path: str):
+    from cryptography.hazmat.primitives.serialization import load_pem_private_key
+
+    with open(path, "rb") as f:
+        return load_pem_private_key(f.read(), password=None)
+
+
+def _load_public_key(path: str):
+    from cryptography.hazmat.primitives.serialization import load_pem_public_key
+
+    with open(path, "rb") as f:
+        return load_pem_public_key(f.read())
+
+
+class AsymmetricCodec(_CompactJWS):
+    """EdDSA(Ed25519) / ES256(P-256) — 비밀키 없이 공개키만으로 검증 가능(엣지, 다른 서비스)"""
+
+    def __init__(self, algorithm: str, private_key=None, public_key=None):
+        if private_key is None and public_key is None:
+            raise ValueError(f"{algorithm} 토큰에는 JWT_PRIVATE_KEY_PATH 또는 JWT_PUBLIC_KEY_PATH가 필요합니다.")
+        self._private_key = private_key
+        self._public_key = public_key if public_key is not None else private_key.public_key()
+        self.jwk = _public_jwk(algorithm, self._public_key)
+        super().__init__(algorithm, kid=self.jwk["kid"])
+
+    @classmethod
+    def from_files(cls, algorithm: str, private_key_path: str = "", public_key_path: str = "") -> "AsymmetricCodec":
+        private_key = _load_private_key(private_key_path) if private_key_path else None
+        public_key = _load_public_key(public_key_path) if public_key_path else None
+        return cls(algorithm, private_key, public_key)
+
+    def _sign(self, signing_input: bytes) -> bytes:
+        if self._private_key is None:
+            raise RuntimeError("검증 전용 코덱(공개키만 로드됨)으로는 토큰을 발급할 수 없습니다.")
+        if self.algorithm == "EdDSA":
+            return self._private_key.sign(signing_input)
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.asymmetric import ec
+        from cryptography.hazmat.primitives.asymmetric.utils import decode_dss_signature
+
+        # JWS ES256 서명은 DER이 아닌 r || s (각 32바이트)
+        r, s = decode_dss_signature(self._private_key.sign(signing_input, ec.ECDSA(hashes.SHA256())))
+        return r.to_bytes(32, "big") + s.to_bytes(32, "big")
+
+    def _verify(self, signing_input: bytes, signature: bytes) -> bool:
+        from cryptography.exceptions import InvalidSignature
+
+        try:
+            if self.algorithm == "EdDSA":
+                self._public_key.verify(signature, signing_input)
+                return True
+            from cryptography.hazmat.primitives import hashes
+            from cryptography.hazmat.primitives.asymmetric import ec
+            from cryptography.hazmat.primitives.asymmetric.utils import encode_dss_signature
+
+            if len(signature) != 64:
+                return False
+            der = encode_dss_signature(
+                int.from_bytes(signature[:32], "big"), int.from_bytes(signature[32:], "big")
+            )
+            self._public_key.verify(der, signing_input, ec.ECDSA(hashes.SHA256()))
+            return True
+        except InvalidSignature:
+            return False
+
+
+def _public_jwk(algorithm: str, public_key) -> dict[str, str]:
+    from cryptography.hazmat.primitives.serialization import Encoding, PublicFormat
+
+    if algorithm == "EdDSA":
+        raw = public_key.public_bytes(Encoding.Raw, PublicFormat.Raw)
+        jwk = {"kty": "OKP", "crv": "Ed25519", "x": _b64encode(raw).decode()}
+    else:
+        numbers = public_key.public_numbers()
+        jwk = {
+            "kty": "EC",
+            "crv": "P-256",
+            "x": _b64encode(numbers.x.to_bytes(32, "big")).decode(),
+            "y": _b64encode(numbers.y.to_bytes(32, "big")).decode(),
+        }
+    der = public_key.public_bytes(Encoding.DER, PublicFormat.SubjectPublicKeyInfo)
+    return {**jwk, "alg": algorithm, "use": "sig", "kid": _b64encode(hashlib.sha256(der).digest()[:12]).decode()}
+
+
+class JoseCodec:
+    """기존 python-jose 구현 — JWT_BACKEND=jose로 되돌릴 때 사용"""
+
+    def __init__(self, secret: str, algorithm: str = "HS256"):
+        self.algorithm = algorithm
+        self._secret = secret
+
+    def encode(self, claims: dict[str, Any]) -> str:
+        from jose import jwt
+
+        return jwt.encode(claims, self._secret, algorithm=self.algorithm)
+
+    def decode(self, token: str) -> dict[str, Any] | None:
+        from jose import JWTError, jwt
+
+        try:
+            return jwt.decode(token, self._secret, algorithms=[self.algorithm])
+        except JWTError:
+            return None
+
+
+def create_token_codec() -> TokenCodec:
+    algorithm = settings.jwt_algorithm
+    if algorithm in ASYMMETRIC_ALGORITHMS:
+        return AsymmetricCodec.from_files(
+            algorithm, settings.jwt_private_key_path, settings.jwt_public_key_path
+        )
+    if settings.jwt_backend == "jose":
+        return JoseCodec(settings.secret_key, algorithm)
+    return HMACCodec(settings.secret_key, algorithm)
+
+
+# 키 파일은 import(기동) 시 한 번만 읽음 — 설정 오류는 첫 요청이 아니라 기동 시점에 드러남
+token_codec = create_token_codec()
+
+
+def jwks(codec: TokenCodec | None = None) -> dict[str, list[dict[str, str]]]:
+    # 대칭키(HS*)는 공개할 키가 없음
+    jwk = getattr(codec or token_codec, "jwk", None)
+    return {"keys": [jwk] if jwk is not None else []}
@@ -0,0 +1,36 @@
+# 파일 목적: 공개 방문/클릭 기록 엔드포인트용 rate limit 의존성
+# 주요 기능: 클라이언트 IP 버킷 → IP+대상(프로필/링크) 버킷 순으로 토큰 차감, 초과 시 reject 모드는 429, skip 모드는 False 반환(기록 생략)
+# 사용 방법: async def record_view(..., allowed: bool = Depends(view_rate_limit)): if not allowed: return ...
+
+import math
+import uuid
+from fastapi import Request
+from app.core.client_ip import get_client_ip
+from app.core.config import settings
+from app.core.exceptions import TooManyRequestsException
+from app.core.rate_limit import RateLimit, rate_limiter
+
+PER_IP_LIMIT = RateLimit.parse(settings.public_rate_limit_per_ip) if settings.public_rate_limit_per_ip else None
+PER_TARGET_LIMIT = (
+    RateLimit.parse(settings.public_rate_limit_per_target) if settings.public_rate_limit_per_target else None
+)
+
+
+async def _check(request: Request, target: str) -> bool:
+    # DB 세션을 사용하기 전에 실행되는 의존성 — 초과 요청은 커넥션을 잡지 않음
+    ip = get_client_ip(request) or "unknown"
+    for key, limit in ((f"ip:{ip}", PER_IP_LIMIT), (f"{target}:{ip}", PER_TARGET_LIMIT)):
+        if limit is None or await rate_limiter.allow(key, limit):
+            continue
+        if settings.public_rate_limit_action == "reject":
+            raise TooManyRequestsException(retry_after=math.ceil(1 / limit.rate))
+        return False
+    return True
+
+
+async def view_rate_limit(username: str, request: Request) -> bool:
+    return await _check(request, f"view:{username}")
+
+
+async def click_rate_limit(link_id: uuid.UUID, request: Request) -> bool:
+    return await _check(request, f"click:{link_id}")
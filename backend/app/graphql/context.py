@@ -1,33 +1,48 @@
 # 파일 목적: GraphQL 컨텍스트 - JWT 파싱, DB 세션, 현재 사용자 정보 제공
-# 주요 기능: get_context() → GraphQLContext(db, user_id)
+# 주요 기능: get_context() → GraphQLContext(db, user_id), HTTP 요청과 WebSocket(subscription) 연결 모두 지원
 # 사용 방법: strawberry schema의 context_getter로 등록
 
 import uuid
-from fastapi import Request, Depends
+from fastapi import Depends
+from fastapi.requests import HTTPConnection
 from sqlalchemy.ext.asyncio import AsyncSession
 from strawberry.fastapi import BaseContext
 from app.core.security import verify_token
 from app.dependencies.db import get_db
 
 
+def user_id_from_authorization(value: str) -> uuid.UUID | None:
+    if not value.startswith("Bearer "):
+        return None
+    uid_str = verify_token(value[7:], token_type="access")
+    if not uid_str:
+        return None
+    try:
+        return uuid.UUID(uid_str)
+    except ValueError:
+        return None
+
+
 class GraphQLContext(BaseContext):
     def __init__(self, db: AsyncSession, user_id: uuid.UUID | None = None):
+        super().__init__()
         self.db = db
         self.user_id = user_id
 
+    @property
+    def subscriber_id(self) -> uuid.UUID | None:
+        # WebSocket은 브라우저가 헤더를 못 보내므로 connection_init payload의 Authorization도 허용
+        if self.user_id is not None:
+            return self.user_id
+        params = self.connection_params
+        if isinstance(params, dict):
+            return user_id_from_authorization(str(params.get("Authorization", "")))
+        return None
+
 
 async def get_context(
-    request: Request,
+    request: HTTPConnection,
     db: AsyncSession = Depends(get_db),
 ) -> GraphQLContext:
-    user_id = None
-    auth_header = request.headers.get("Authorization", "")
-    if auth_header.startswith("Bearer "):
-        token = auth_header[7:]
-        uid_str = verify_token(token, token_type="access")
-        if uid_str:
-            try:
-                user_id = uuid.UUID(uid_str)
-            except ValueError:
-                pass
+    user_id = user_id_from_authorization(request.headers.get("Authorization", ""))
     return GraphQLContext(db=db, user_id=user_id)
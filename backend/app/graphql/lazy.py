@@ -0,0 +1,44 @@
+# 파일 목적: GraphQL 엔드포인트 지연 생성 — app.main import 시 strawberry/스키마/리졸버를 불러오지 않음
+# 주요 기능: LazyGraphQLApp(ASGI 앱 — 첫 요청 또는 lifespan 사전 준비 때 app.graphql.schema를 import해 GraphQLRouter 생성, 이후 그대로 위임)
+# 사용 방법: graphql_app = LazyGraphQLApp("/graphql", app); app.add_route("/graphql", graphql_app); app.add_websocket_route("/graphql", graphql_app)
+
+import threading
+from typing import Any
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+class LazyGraphQLApp:
+    """strawberry import + 스키마 조합(기동 시간의 큰 부분)을 서버가 요청을 받기 시작한 뒤로 미룸"""
+
+    def __init__(self, path: str, dependency_overrides_provider: Any = None):
+        self.path = path
+        # include_router로 붙였을 때처럼 앱의 dependency_overrides(테스트의 get_db 대체 등)를 따르도록
+        self.dependency_overrides_provider = dependency_overrides_provider
+        self._router: ASGIApp | None = None
+        # lifespan의 스레드 사전 준비와 첫 요청이 겹쳐도 한 번만 생성
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self._router is not None
+
+    def build(self) -> ASGIApp:
+        if self._router is None:
+            with self._lock:
+                if self._router is None:
+                    from strawberry.fastapi import GraphQLRouter
+
+                    from app.graphql.context import get_context
+                    from app.graphql.schema import schema
+
+                    self._router = GraphQLRouter(
+                        schema,
+                        path=self.path,
+                        context_getter=get_context,
+                        dependency_overrides_provider=self.dependency_overrides_provider,
+                    )
+        return self._router
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.build()(scope, receive, send)
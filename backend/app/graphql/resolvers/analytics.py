@@ -1,8 +1,10 @@
-# 파일 목적: 분석/통계 GraphQL resolver (Query만)
-# 주요 기능: summary, linkStats, viewStats, topLinks, recentClicks
-# 사용 방법: AnalyticsQuery를 schema.py에서 조합
+# 파일 목적: 분석/통계 GraphQL resolver (Query + Subscription)
+# 주요 기능: summary, linkStats(limit/after), viewStats, topLinks, recentClicks(limit/after 커서), breakdown(기기/브라우저/OS 분포), geoBreakdown(국가 분포), topSources,
+#           analyticsEvents(실시간 클릭/방문 푸시)
+# 사용 방법: AnalyticsQuery, AnalyticsSubscription을 schema.py에서 조합
 
 import uuid
+from collections.abc import AsyncGenerator
 import strawberry
 from strawberry.types import Info
 
@@ -11,10 +13,14 @@ from app.graphql.types.analytics import (
     AnalyticsSummaryType,
     LinkAnalyticsType,
     ViewStatsType,
-    DailyViewStatsType,
     TopLinkType,
     RecentClickType,
+    BreakdownItemType,
+    TopSourceType,
+    AnalyticsEventType,
 )
+from app.core.events import event_hub
+from app.core.exceptions import AppException
 from app.services import analytics as analytics_service
 
 
@@ -26,75 +32,88 @@ def _require_auth(info: Info) -> uuid.UUID:
 
 @strawberry.type
 class AnalyticsQuery:
+    # 서비스가 만든 Pydantic 객체를 그대로 반환 — strawberry가 속성 이름으로 필드를 해석하므로 재복사 불필요
     @strawberry.field
     async def summary(self, info: Info[GraphQLContext, None]) -> AnalyticsSummaryType:
         user_id = _require_auth(info)
-        result = await analytics_service.get_summary(info.context.db, user_id)
-        return AnalyticsSummaryType(
-            total_clicks=result.total_clicks,
-            total_views=result.total_views,
-            total_links=result.total_links,
-            today_clicks=result.today_clicks,
-            today_views=result.today_views,
-            click_through_rate=result.click_through_rate,
-        )
+        return await analytics_service.get_summary(info.context.db, user_id)
 
     @strawberry.field
-    async def link_stats(self, info: Info[GraphQLContext, None]) -> list[LinkAnalyticsType]:
+    async def link_stats(
+        self,
+        info: Info[GraphQLContext, None],
+        limit: int | None = None,
+        after: str | None = None,
+    ) -> list[LinkAnalyticsType]:
         user_id = _require_auth(info)
-        results = await analytics_service.get_link_stats(info.context.db, user_id)
-        return [
-            LinkAnalyticsType(
-                id=r.id,
-                title=r.title,
-                url=r.url,
-                click_count=r.click_count,
-                is_active=r.is_active,
-            )
-            for r in results
-        ]
+        try:
+            return await analytics_service.get_link_stats(info.context.db, user_id, limit, after)
+        except AppException as e:
+            raise strawberry.exceptions.GraphQLError(e.detail)
 
     @strawberry.field
     async def view_stats(self, info: Info[GraphQLContext, None], days: int = 7) -> ViewStatsType:
         user_id = _require_auth(info)
-        result = await analytics_service.get_view_stats(info.context.db, user_id, days)
-        daily = [
-            DailyViewStatsType(
-                date=d.date,
-                view_count=d.view_count,
-                unique_visitors=d.unique_visitors,
-            )
-            for d in result.daily
-        ]
-        return ViewStatsType(days=result.days, total_views=result.total_views, daily=daily)
+        return await analytics_service.get_view_stats(info.context.db, user_id, days)
 
     @strawberry.field
     async def top_links(self, info: Info[GraphQLContext, None], limit: int = 5) -> list[TopLinkType]:
         user_id = _require_auth(info)
-        results = await analytics_service.get_top_links(info.context.db, user_id, limit)
-        return [
-            TopLinkType(
-                id=r.id,
-                title=r.title,
-                url=r.url,
-                click_count=r.click_count,
-                ctr=r.ctr,
-            )
-            for r in results
-        ]
+        return await analytics_service.get_top_links(info.context.db, user_id, limit)
 
     @strawberry.field
     async def recent_clicks(
-        self, info: Info[GraphQLContext, None], limit: int = 10
+        self, info: Info[GraphQLContext, None], limit: int = 10, after: str | None = None
     ) -> list[RecentClickType]:
         user_id = _require_auth(info)
-        results = await analytics_service.get_recent_clicks(info.context.db, user_id, limit)
-        return [
-            RecentClickType(
-                link_id=r.link_id,
-                title=r.title,
-                clicked_at=r.clicked_at,
-                visitor_ip=r.visitor_ip,
+        try:
+            return await analytics_service.get_recent_clicks(info.context.db, user_id, limit, after)
+        except AppException as e:
+            raise strawberry.exceptions.GraphQLError(e.detail)
+
+    @strawberry.field
+    async def breakdown(
+        self,
+        info: Info[GraphQLContext, None],
+        dimension: str = "device",
+        kind: str = "clicks",
+        days: int = 30,
+    ) -> list[BreakdownItemType]:
+        user_id = _require_auth(info)
+        try:
+            return await analytics_service.get_breakdown(
+                info.context.db, user_id, dimension, kind, days
             )
-            for r in results
-        ]
+        except AppException as e:
+            raise strawberry.exceptions.GraphQLError(e.detail)
+
+    @strawberry.field
+    async def geo_breakdown(
+        self, info: Info[GraphQLContext, None], kind: str = "views", days: int = 30
+    ) -> list[BreakdownItemType]:
+        user_id = _require_auth(info)
+        try:
+            return await analytics_service.get_geo_breakdown(info.context.db, user_id, kind, days)
+        except AppException as e:
+            raise strawberry.exceptions.GraphQLError(e.detail)
+
+    @strawberry.field
+    async def top_sources(
+        self, info: Info[GraphQLContext, None], days: int = 30, limit: int = 10
+    ) -> list[TopSourceType]:
+        user_id = _require_auth(info)
+        return await analytics_service.get_top_sources(info.context.db, user_id, days, limit)
+
+
+@strawberry.type
+class AnalyticsSubscription:
+    @strawberry.subscription
+    async def analytics_events(
+        self, info: Info[GraphQLContext, None]
+    ) -> AsyncGenerator[AnalyticsEventType, None]:
+        # 폴링 대신 public 라우터의 클릭/방문 기록 시점에 발행된 이벤트를 그대로 푸시
+        user_id = info.context.subscriber_id
+        if user_id is None:
+            raise strawberry.exceptions.GraphQLError("인증이 필요합니다.")
+        async for event in event_hub.subscribe(user_id):
+            yield event
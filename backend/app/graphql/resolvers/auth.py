@@ -12,8 +12,8 @@ from app.graphql.types.user import UserType
 from app.graphql.types.auth import TokenType
 from app.graphql.inputs.user import RegisterInput, LoginInput, ChangePasswordInput, RefreshTokenInput
 from app.schemas.user import RegisterRequest, LoginRequest, ChangePasswordRequest
-from app.schemas.token import TokenResponse
 from app.services import auth as auth_service
+from app.core.client_ip import get_client_ip
 from app.core.exceptions import AppException
 from app.models.user import User
 
@@ -24,30 +24,6 @@ def _require_auth(info: Info) -> uuid.UUID:
     return info.context.user_id
 
 
-def _user_to_type(user: User) -> UserType:
-    return UserType(
-        id=user.id,
-        username=user.username,
-        email=user.email,
-        display_name=user.display_name,
-        bio=user.bio,
-        avatar_url=user.avatar_url,
-        theme=user.theme,
-        bg_color=user.bg_color,
-        is_active=user.is_active,
-        created_at=user.created_at,
-        updated_at=user.updated_at,
-    )
-
-
-def _token_to_type(token: TokenResponse) -> TokenType:
-    return TokenType(
-        access_token=token.access_token,
-        refresh_token=token.refresh_token,
-        token_type=token.token_type,
-    )
-
-
 @strawberry.type
 class AuthQuery:
     @strawberry.field
@@ -57,7 +33,7 @@ class AuthQuery:
         user = result.scalar_one_or_none()
         if not user:
             raise strawberry.exceptions.GraphQLError("사용자를 찾을 수 없습니다.")
-        return _user_to_type(user)
+        return user
 
 
 @strawberry.type
@@ -71,8 +47,7 @@ class AuthMutation:
                 password=input.password,
                 display_name=input.display_name,
             )
-            user = await auth_service.register(info.context.db, data)
-            return _user_to_type(user)
+            return await auth_service.register(info.context.db, data)
         except AppException as e:
             raise strawberry.exceptions.GraphQLError(e.detail)
         except Exception as e:
@@ -82,16 +57,14 @@ class AuthMutation:
     async def login(self, input: LoginInput, info: Info[GraphQLContext, None]) -> TokenType:
         try:
             data = LoginRequest(email=input.email, password=input.password)
-            token = await auth_service.login(info.context.db, data)
-            return _token_to_type(token)
+            return await auth_service.login(info.context.db, data, get_client_ip(info.context.request))
         except AppException as e:
             raise strawberry.exceptions.GraphQLError(e.detail)
 
     @strawberry.mutation
     async def refresh_token(self, input: RefreshTokenInput, info: Info[GraphQLContext, None]) -> TokenType:
         try:
-            token = await auth_service.refresh_token(info.context.db, input.refresh_token)
-            return _token_to_type(token)
+            return await auth_service.refresh_token(info.context.db, input.refresh_token)
         except AppException as e:
             raise strawberry.exceptions.GraphQLError(e.detail)
 
@@ -21,34 +21,13 @@ def _require_auth(info: Info) -> uuid.UUID:
     return info.context.user_id
 
 
-def _link_to_type(link) -> LinkType:
-    return LinkType(
-        id=link.id,
-        user_id=link.user_id,
-        title=link.title,
-        url=link.url,
-        description=link.description,
-        thumbnail_url=link.thumbnail_url,
-        favicon_url=link.favicon_url,
-        position=link.position,
-        is_active=link.is_active,
-        click_count=link.click_count,
-        scheduled_start=link.scheduled_start,
-        scheduled_end=link.scheduled_end,
-        is_sensitive=link.is_sensitive,
-        link_type=link.link_type,
-        created_at=link.created_at,
-        updated_at=link.updated_at,
-    )
-
-
 @strawberry.type
 class LinksQuery:
     @strawberry.field
     async def links(self, info: Info[GraphQLContext, None]) -> list[LinkType]:
         user_id = _require_auth(info)
-        links = await link_service.list_links(info.context.db, user_id)
-        return [_link_to_type(lnk) for lnk in links]
+        # ORM 객체를 그대로 반환 — LinkType 필드는 속성 이름으로 직접 해석됨
+        return await link_service.list_links(info.context.db, user_id)
 
 
 @strawberry.type
@@ -67,8 +46,7 @@ class LinksMutation:
                 is_sensitive=input.is_sensitive,
                 link_type=input.link_type,
             )
-            link = await link_service.create_link(info.context.db, user_id, data)
-            return _link_to_type(link)
+            return await link_service.create_link(info.context.db, user_id, data)
         except (AppException, HTTPException) as e:
             detail = e.detail if hasattr(e, "detail") else str(e)
             raise strawberry.exceptions.GraphQLError(detail)
@@ -92,8 +70,7 @@ class LinksMutation:
                 is_sensitive=input.is_sensitive,
                 link_type=input.link_type,
             )
-            link = await link_service.update_link(info.context.db, link_id, user_id, data)
-            return _link_to_type(link)
+            return await link_service.update_link(info.context.db, link_id, user_id, data)
         except (AppException, HTTPException) as e:
             detail = e.detail if hasattr(e, "detail") else str(e)
             raise strawberry.exceptions.GraphQLError(detail)
@@ -114,15 +91,13 @@ class LinksMutation:
     ) -> list[LinkType]:
         user_id = _require_auth(info)
         pydantic_items = [ReorderItem(id=item.id, position=item.position) for item in items]
-        links = await link_service.reorder_links(info.context.db, user_id, pydantic_items)
-        return [_link_to_type(lnk) for lnk in links]
+        return await link_service.reorder_links(info.context.db, user_id, pydantic_items)
 
     @strawberry.mutation
     async def toggle_link(self, link_id: uuid.UUID, info: Info[GraphQLContext, None]) -> LinkType:
         user_id = _require_auth(info)
         try:
-            link = await link_service.toggle_link(info.context.db, link_id, user_id)
-            return _link_to_type(link)
+            return await link_service.toggle_link(info.context.db, link_id, user_id)
         except (AppException, HTTPException) as e:
             detail = e.detail if hasattr(e, "detail") else str(e)
             raise strawberry.exceptions.GraphQLError(detail)
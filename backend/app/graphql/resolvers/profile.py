@@ -21,30 +21,13 @@ def _require_auth(info: Info) -> uuid.UUID:
     return info.context.user_id
 
 
-def _user_to_type(user) -> UserType:
-    return UserType(
-        id=user.id,
-        username=user.username,
-        email=user.email,
-        display_name=user.display_name,
-        bio=user.bio,
-        avatar_url=user.avatar_url,
-        theme=user.theme,
-        bg_color=user.bg_color,
-        is_active=user.is_active,
-        created_at=user.created_at,
-        updated_at=user.updated_at,
-    )
-
-
 @strawberry.type
 class ProfileQuery:
     @strawberry.field
     async def my_profile(self, info: Info[GraphQLContext, None]) -> UserType:
         user_id = _require_auth(info)
         try:
-            user = await profile_service.get_my_profile(info.context.db, user_id)
-            return _user_to_type(user)
+            return await profile_service.get_my_profile(info.context.db, user_id)
         except AppException as e:
             raise strawberry.exceptions.GraphQLError(e.detail)
 
@@ -64,8 +47,7 @@ class ProfileMutation:
                 theme=input.theme,
                 bg_color=input.bg_color,
             )
-            user = await profile_service.update_profile(info.context.db, user_id, data)
-            return _user_to_type(user)
+            return await profile_service.update_profile(info.context.db, user_id, data)
         except (AppException, HTTPException) as e:
             detail = e.detail if hasattr(e, "detail") else str(e)
             raise strawberry.exceptions.GraphQLError(detail)
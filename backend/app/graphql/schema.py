@@ -1,15 +1,13 @@
-# 파일 목적: GraphQL 스키마 조합 및 FastAPI 라우터 생성
-# 주요 기능: Query/Mutation 통합, strawberry FastAPI 라우터 생성
-# 사용 방법: from app.graphql.schema import graphql_router
+# 파일 목적: GraphQL 스키마 조합
+# 주요 기능: Query/Mutation/Subscription 통합 스키마 (FastAPI 라우터는 app.graphql.lazy가 첫 요청/기동 사전 준비 때 생성, subscription은 /graphql WebSocket)
+# 사용 방법: from app.graphql.schema import schema
 
 import strawberry
-from strawberry.fastapi import GraphQLRouter
 
-from app.graphql.context import get_context
 from app.graphql.resolvers.auth import AuthQuery, AuthMutation
 from app.graphql.resolvers.links import LinksQuery, LinksMutation
 from app.graphql.resolvers.profile import ProfileQuery, ProfileMutation
-from app.graphql.resolvers.analytics import AnalyticsQuery
+from app.graphql.resolvers.analytics import AnalyticsQuery, AnalyticsSubscription
 
 
 @strawberry.type
@@ -22,6 +20,9 @@ class Mutation(AuthMutation, LinksMutation, ProfileMutation):
     pass
 
 
-schema = strawberry.Schema(query=Query, mutation=Mutation)
+@strawberry.type
+class Subscription(AnalyticsSubscription):
+    pass
+
 
-graphql_router = GraphQLRouter(schema, context_getter=get_context)
+schema = strawberry.Schema(query=Query, mutation=Mutation, subscription=Subscription)
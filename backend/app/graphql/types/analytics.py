@@ -1,11 +1,14 @@
 # 파일 목적: 분석/통계 관련 GraphQL 타입 정의
-# 주요 기능: AnalyticsSummaryType, LinkAnalyticsType, ViewStatsType, DailyViewStatsType, TopLinkType, RecentClickType
+# 주요 기능: AnalyticsSummaryType, LinkAnalyticsType, ViewStatsType, DailyViewStatsType, TopLinkType, RecentClickType, BreakdownItemType, TopSourceType, AnalyticsEventType
 # 사용 방법: from app.graphql.types.analytics import AnalyticsSummaryType
+#           (resolver는 app.schemas.analytics의 Pydantic 객체를 복사 없이 그대로 반환)
 
 import uuid
 import strawberry
 from datetime import date, datetime
 
+from app.core.pagination import encode_cursor
+
 
 @strawberry.type
 class AnalyticsSummaryType:
@@ -25,6 +28,11 @@ class LinkAnalyticsType:
     click_count: int
     is_active: bool
 
+    @strawberry.field
+    def cursor(self) -> str:
+        # self는 서비스가 반환한 Row — 다음 페이지 요청의 after 값
+        return encode_cursor(self.click_count, self.id)
+
 
 @strawberry.type
 class DailyViewStatsType:
@@ -55,3 +63,29 @@ class RecentClickType:
     title: str
     clicked_at: datetime
     visitor_ip: str | None
+    cursor: str | None
+
+
+@strawberry.type
+class BreakdownItemType:
+    label: str
+    count: int
+    percentage: float
+
+
+@strawberry.type
+class TopSourceType:
+    referrer_domain: str | None
+    utm_source: str | None
+    utm_medium: str | None
+    utm_campaign: str | None
+    view_count: int
+    click_count: int
+
+
+@strawberry.type
+class AnalyticsEventType:
+    kind: str
+    occurred_at: datetime
+    link_id: uuid.UUID | None
+    click_count: int | None
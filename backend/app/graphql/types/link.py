@@ -1,5 +1,5 @@
 # 파일 목적: 링크 관련 GraphQL 타입 정의
-# 주요 기능: LinkType (Link 모델 → GraphQL 타입)
+# 주요 기능: LinkType (Link 모델 → GraphQL 타입, resolver가 ORM 객체를 그대로 반환해도 속성 이름으로 해석)
 # 사용 방법: from app.graphql.types.link import LinkType
 
 import uuid
@@ -1,22 +1,106 @@
 # 파일 목적: FastAPI 애플리케이션 진입점 및 라우터 등록
-# 주요 기능: lifespan 컨텍스트, CORS 미들웨어, GraphQL + REST public 라우터 마운트
-# 사용 방법: uvicorn app.main:app --host 0.0.0.0 --port 8000
+# 주요 기능: lifespan 컨텍스트(사전 준비 — GraphQL 스키마·DB 풀 연결과 핫 쿼리 prepare·인기 공개 프로필 캐시, 이벤트 허브, rate limiter 공유 풀, 멀티 워커 공유 상태, 워커 간 캐시 무효화 버스, 토큰 폐기 목록 동기화 task, 공개 프로필 예약 경계 스케줄러 task, 공개 프로필 정적 사전 렌더링 task, 클릭 카운터 샤드 접기 task, 분석 이벤트 retention task), CORS 미들웨어, 신뢰 프록시 기반 클라이언트 IP 미들웨어, 응답 압축(gzip/br + ETag) 미들웨어, GraphQL(지연 생성) + REST public/analytics 라우터 마운트
+# 사용 방법: uvicorn app.main:app --host 0.0.0.0 --port 8000  /  gunicorn -c gunicorn.conf.py app.main:app (멀티 워커)
 
-from contextlib import asynccontextmanager
+import asyncio
+import logging
+from contextlib import asynccontextmanager, suppress
 from collections.abc import AsyncGenerator
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from app.core.client_ip import ClientIPMiddleware
+from app.core.compression import CompressedBodyCache, CompressionMiddleware
 from app.core.config import settings
+from app.core.database import AsyncSessionLocal, warm_pool
 from app.core.exception_handlers import register_exception_handlers
-from app.routers import health, public
-from app.graphql.schema import graphql_router
+from app.core.events import event_hub
+from app.core.invalidation import invalidation_bus
+from app.core.rate_limit import rate_limiter
+from app.core.revocation import sync_revocations_forever
+from app.core.shared_state import shared_state
+from app.graphql.lazy import LazyGraphQLApp
+from app.routers import analytics, health, public
+from app.services.click_counters import run_click_fold_forever
+from app.services.prerender import profile_renderer, run_prerender_forever
+from app.services.hot_queries import prepare_hot_statements
+from app.services.profile import warm_public_profiles
+from app.services.profile_timeline import run_timeline_scheduler_forever
+from app.services.retention import run_retention_forever
+
+logger = logging.getLogger(__name__)
+
+
+async def warm_up() -> None:
+    """첫 요청이 치를 비용을 기동 중에 미리 — GraphQL 스키마 생성(스레드), DB 풀 연결 + 핫 쿼리 prepare, 인기 공개 프로필 캐시. 실패해도 기동은 계속"""
+
+    async def _profiles() -> None:
+        async with AsyncSessionLocal() as db:
+            await warm_public_profiles(db, settings.public_profile_cache_warm_size)
+
+    steps = {
+        "graphql": asyncio.to_thread(graphql_app.build),
+        "db_pool": warm_pool(settings.db_pool_warm_connections, prepare=prepare_hot_statements),
+        "public_profiles": _profiles(),
+    }
+    try:
+        async with asyncio.timeout(settings.startup_warmup_timeout_seconds):
+            results = await asyncio.gather(*steps.values(), return_exceptions=True)
+    except TimeoutError:
+        logger.warning("기동 사전 준비 시간 초과 — 나머지는 첫 요청 때 준비")
+        return
+    for name, result in zip(steps, results):
+        if isinstance(result, Exception):
+            logger.warning("기동 사전 준비 실패 (%s): %s", name, result)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     # 시작 시 초기화 작업
+    await event_hub.start()  # pragma: no cover
+    await rate_limiter.start()  # pragma: no cover
+    await shared_state.start()  # pragma: no cover
+    await invalidation_bus.start()  # pragma: no cover
+    await warm_up()  # pragma: no cover
+    retention_task = (  # pragma: no cover
+        asyncio.create_task(run_retention_forever())
+        if settings.analytics_retention_days > 0
+        else None
+    )
+    revocation_task = asyncio.create_task(  # pragma: no cover
+        sync_revocations_forever(settings.token_revocation_sync_seconds)
+    )
+    timeline_task = asyncio.create_task(run_timeline_scheduler_forever())  # pragma: no cover
+    click_fold_task = asyncio.create_task(  # pragma: no cover
+        run_click_fold_forever(settings.click_counter_fold_interval_seconds)
+    )
+    prerender_task = None  # pragma: no cover
+    if profile_renderer is not None:  # pragma: no cover
+        profile_renderer.start()
+        prerender_task = asyncio.create_task(run_prerender_forever(profile_renderer))
     yield  # pragma: no cover
     # 종료 시 정리 작업
+    if prerender_task is not None:  # pragma: no cover
+        profile_renderer.stop()
+        prerender_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await prerender_task
+    click_fold_task.cancel()  # pragma: no cover
+    with suppress(asyncio.CancelledError):  # pragma: no cover
+        await click_fold_task
+    timeline_task.cancel()  # pragma: no cover
+    with suppress(asyncio.CancelledError):  # pragma: no cover
+        await timeline_task
+    revocation_task.cancel()  # pragma: no cover
+    with suppress(asyncio.CancelledError):  # pragma: no cover
+        await revocation_task
+    if retention_task is not None:  # pragma: no cover
+        retention_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await retention_task
+    await invalidation_bus.stop()  # pragma: no cover
+    await shared_state.stop()  # pragma: no cover
+    await rate_limiter.stop()  # pragma: no cover
+    await event_hub.stop()  # pragma: no cover
 
 
 app = FastAPI(
@@ -37,8 +121,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+app.add_middleware(ClientIPMiddleware, trusted_proxies=settings.trusted_proxies)
+
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.compression_minimum_size,
+    cache=CompressedBodyCache(settings.compression_cache_size),
+)
+
 register_exception_handlers(app)
 
 app.include_router(health.router, prefix="/api")
 app.include_router(public.router, prefix="/api/public", tags=["public"])
-app.include_router(graphql_router, prefix="/graphql")
+app.include_router(analytics.router, prefix="/api/analytics", tags=["analytics"])
+# strawberry 스키마/리졸버는 import 시점이 아니라 lifespan 사전 준비(또는 첫 요청) 때 생성
+graphql_app = LazyGraphQLApp("/graphql", dependency_overrides_provider=app)
+app.add_route("/graphql", graphql_app)
+app.add_websocket_route("/graphql", graphql_app)
@@ -1,9 +1,33 @@
 # 파일 목적: models 패키지 초기화 및 모든 모델 export
-# 주요 기능: User, Link, ProfileView, LinkClick 모델 import
+# 주요 기능: User, Link, LinkClickShard, RefreshToken, RevokedTokenFamily, ProfileView, LinkClick, UserAgent, TrafficSource, DailySourceStats, DailyGeoStats, DailyProfileViews, DailyLinkClicks 모델 import
 # 사용 방법: from app.models import User, Link, ProfileView, LinkClick
 
 from app.models.user import User
-from app.models.link import Link
-from app.models.analytics import ProfileView, LinkClick
+from app.models.link import Link, LinkClickShard
+from app.models.refresh_token import RefreshToken, RevokedTokenFamily
+from app.models.analytics import (
+    ProfileView,
+    LinkClick,
+    UserAgent,
+    TrafficSource,
+    DailySourceStats,
+    DailyGeoStats,
+    DailyProfileViews,
+    DailyLinkClicks,
+)
 
-__all__ = ["User", "Link", "ProfileView", "LinkClick"]
+__all__ = [
+    "User",
+    "Link",
+    "LinkClickShard",
+    "RefreshToken",
+    "RevokedTokenFamily",
+    "ProfileView",
+    "LinkClick",
+    "UserAgent",
+    "TrafficSource",
+    "DailySourceStats",
+    "DailyGeoStats",
+    "DailyProfileViews",
+    "DailyLinkClicks",
+]
@@ -1,15 +1,58 @@
 # 파일 목적: 분석 데이터 모델 정의 (프로필 방문 및 링크 클릭 추적)
-# 주요 기능: ProfileView - 방문 기록, LinkClick - 클릭 기록 (BigSerial PK, IP/UA 추적)
-# 사용 방법: from app.models.analytics import ProfileView, LinkClick
+# 주요 기능: ProfileView - 방문 기록, LinkClick - 클릭 기록 (BigSerial PK, IP/UA 추적, 테이블당 사용자별 커버링 인덱스 하나),
+#           UserAgent - UA 문자열 사전(md5 해시 키, 등록 시 분류한 device_type/browser/os/is_bot), 이벤트 테이블은 user_agent_id(int FK) + is_bot만 저장,
+#           TrafficSource - (referrer 도메인, utm_source/medium/campaign) 사전, DailySourceStats - 유입 경로별 일별 방문/클릭 집계(샤드 분산),
+#           country/region - 기록 시 로컬 GeoIP DB로 보강한 위치, DailyGeoStats - 국가별 일별 방문/클릭 집계(샤드 분산),
+#           DailyProfileViews/DailyLinkClicks - 보존 기간이 지난 raw 이벤트를 접어 둔 일별 집계
+# 사용 방법: from app.models.analytics import ProfileView, LinkClick, UserAgent, TrafficSource, DailySourceStats, DailyGeoStats
 
 import uuid
-from datetime import datetime, timezone
-from sqlalchemy import BigInteger, String, DateTime, ForeignKey
+from datetime import date, datetime, timezone
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    SmallInteger,
+    String,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID, INET
 from app.core.database import Base
 
 
+class UserAgent(Base):
+    __tablename__ = "user_agents"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    ua_hash: Mapped[bytes] = mapped_column(LargeBinary(16), nullable=False, unique=True)
+    value: Mapped[str] = mapped_column(String(500), nullable=False)
+    device_type: Mapped[str] = mapped_column(String(20), default="desktop", nullable=False)
+    browser: Mapped[str] = mapped_column(String(50), default="Other", nullable=False)
+    os: Mapped[str] = mapped_column(String(50), default="Other", nullable=False)
+    is_bot: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+
+
+class TrafficSource(Base):
+    """유입 경로 사전 — 빈 문자열은 '없음', 네 값이 모두 빈 행은 직접 유입(direct)"""
+
+    __tablename__ = "traffic_sources"
+    __table_args__ = (
+        UniqueConstraint("referrer_domain", "utm_source", "utm_medium", "utm_campaign"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    referrer_domain: Mapped[str] = mapped_column(String(255), default="", nullable=False)
+    utm_source: Mapped[str] = mapped_column(String(100), default="", nullable=False)
+    utm_medium: Mapped[str] = mapped_column(String(100), default="", nullable=False)
+    utm_campaign: Mapped[str] = mapped_column(String(100), default="", nullable=False)
+
+
 class ProfileView(Base):
     __tablename__ = "profile_views"
 
@@ -18,10 +61,13 @@ class ProfileView(Base):
         UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     viewer_ip: Mapped[str | None] = mapped_column(INET, nullable=True)
-    user_agent: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    country: Mapped[str | None] = mapped_column(String(2), nullable=True)
+    region: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    user_agent_id: Mapped[int | None] = mapped_column(ForeignKey("user_agents.id"), nullable=True)
+    traffic_source_id: Mapped[int | None] = mapped_column(ForeignKey("traffic_sources.id"), nullable=True)
+    is_bot: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     viewed_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False
     )
@@ -43,12 +89,89 @@ class LinkClick(Base):
         UUID(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
-        index=True,
     )
     visitor_ip: Mapped[str | None] = mapped_column(INET, nullable=True)
-    user_agent: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    country: Mapped[str | None] = mapped_column(String(2), nullable=True)
+    region: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    user_agent_id: Mapped[int | None] = mapped_column(ForeignKey("user_agents.id"), nullable=True)
+    traffic_source_id: Mapped[int | None] = mapped_column(ForeignKey("traffic_sources.id"), nullable=True)
+    is_bot: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     clicked_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False
     )
 
     link: Mapped["Link"] = relationship("Link", back_populates="clicks")  # type: ignore[name-defined]
+
+
+
+class DailySourceStats(Base):
+    """기록 시점에 가산 upsert되는 (사용자, 날짜, 유입 경로, 샤드)별 방문/클릭 수 — 유입 경로 조회는 이 테이블만 샤드 합산으로 읽음"""
+
+    __tablename__ = "daily_source_stats"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    source_id: Mapped[int] = mapped_column(ForeignKey("traffic_sources.id"), primary_key=True)
+    shard: Mapped[int] = mapped_column(SmallInteger, primary_key=True, default=0)
+    view_count: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+    click_count: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+
+
+class DailyGeoStats(Base):
+    """기록 시점에 가산 upsert되는 (사용자, 날짜, 국가, 샤드)별 방문/클릭 수 — 빈 문자열 국가는 위치 불명"""
+
+    __tablename__ = "daily_geo_stats"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    country: Mapped[str] = mapped_column(String(2), primary_key=True)
+    shard: Mapped[int] = mapped_column(SmallInteger, primary_key=True, default=0)
+    view_count: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+    click_count: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+
+
+class DailyProfileViews(Base):
+    """retention job이 삭제한 profile_views의 (사용자, 날짜)별 방문 수"""
+
+    __tablename__ = "daily_profile_views"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    view_count: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+
+
+class DailyLinkClicks(Base):
+    """retention job이 삭제한 link_clicks의 (링크, 날짜)별 클릭 수"""
+
+    __tablename__ = "daily_link_clicks"
+
+    link_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("links.id", ondelete="CASCADE"), primary_key=True
+    )
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    click_count: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+
+# 사용자별 이벤트 인덱스는 테이블당 하나 — 봇 제외 집계(요약, 일별 방문, 분포, 최근 클릭)는 is_bot을 INCLUDE에서 걸러 index-only,
+# raw export keyset·방문 중복 확인·계정 삭제 CASCADE는 봇 행까지 같은 인덱스로 조회 (023 마이그레이션과 동일, 실행 계획은 benchmarks/HOT_QUERY_PLANS.md)
+Index(
+    "ix_profile_views_user_viewed_at_covering",
+    ProfileView.user_id, ProfileView.viewed_at, ProfileView.id,
+    postgresql_include=["viewer_ip", "user_agent_id", "is_bot"],
+)
+Index(
+    "ix_link_clicks_user_clicked_at_covering",
+    LinkClick.user_id, LinkClick.clicked_at, LinkClick.id,
+    postgresql_include=["link_id", "visitor_ip", "user_agent_id", "is_bot"],
+)
@@ -1,10 +1,11 @@
 # 파일 목적: 링크 데이터베이스 모델 정의
 # 주요 기능: Link 테이블 - UUID PK, user_id FK, title/url/position/is_active/click_count/description/thumbnail_url/scheduled_start/scheduled_end/is_sensitive/link_type/favicon_url
-# 사용 방법: from app.models.link import Link
+#           LinkClickShard 테이블 - (link_id, shard) PK, 아직 click_count에 접히지 않은 클릭 수 (링크당 N개 슬롯에 분산)
+# 사용 방법: from app.models.link import Link, LinkClickShard
 
 import uuid
 from datetime import datetime, timezone
-from sqlalchemy import String, Boolean, DateTime, Integer, Text, ForeignKey
+from sqlalchemy import BigInteger, String, Boolean, DateTime, Integer, SmallInteger, Text, ForeignKey, Index, and_, or_
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import UUID
 from app.core.database import Base
@@ -48,3 +49,27 @@ class Link(Base):
     clicks: Mapped[list["LinkClick"]] = relationship(  # type: ignore[name-defined]
         "LinkClick", back_populates="link", cascade="all, delete-orphan"
     )
+
+
+class LinkClickShard(Base):
+    """클릭 카운터 샤드 — 클릭마다 links 행 대신 임의 슬롯 하나를 가산, 주기적으로 links.click_count에 접고 삭제"""
+
+    __tablename__ = "link_click_shards"
+
+    link_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("links.id", ondelete="CASCADE"), primary_key=True
+    )
+    shard: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    count: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+
+
+# 링크별 통계 keyset 페이지네이션 ((click_count, id) 내림차순)용 복합 인덱스 — 010 마이그레이션과 동일
+Index("ix_links_user_click_count_id", Link.user_id, Link.click_count.desc(), Link.id.desc())
+# 공개 프로필 링크 조회(활성 링크를 position 순으로) / prerender bootstrap(예약 경계가 있는 활성 링크)용 부분 인덱스 — 021 마이그레이션과 동일
+Index("ix_links_user_position_active", Link.user_id, Link.position, postgresql_where=Link.is_active)
+Index(
+    "ix_links_user_scheduled_active",
+    Link.user_id,
+    postgresql_include=["scheduled_start", "scheduled_end"],
+    postgresql_where=and_(Link.is_active, or_(Link.scheduled_start.is_not(None), Link.scheduled_end.is_not(None))),
+)
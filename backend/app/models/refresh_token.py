@@ -0,0 +1,47 @@
+# 파일 목적: refresh token 저장소 모델 (토큰 family 단위 rotation 및 재사용 탐지)
+# 주요 기능: RefreshToken - jti PK, family_id(로그인 1회 = family 1개), used_at(rotation 완료), revoked_at(family 폐기), 폐기 동기화용 부분 인덱스
+#           RevokedTokenFamily - 계정 삭제로 refresh_tokens 행이 CASCADE 삭제돼도 남는 폐기 기록 (users FK 없음)
+# 사용 방법: from app.models.refresh_token import RefreshToken, RevokedTokenFamily
+
+import uuid
+from datetime import datetime, timezone
+from sqlalchemy import DateTime, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.dialects.postgresql import UUID
+from app.core.database import Base
+
+
+class RefreshToken(Base):
+    __tablename__ = "refresh_tokens"
+
+    jti: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    family_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), nullable=False, index=True)
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    used_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    revoked_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False
+    )
+
+
+class RevokedTokenFamily(Base):
+    """삭제된 계정의 family 폐기 기록 — 다른 워커의 동기화가 access token 만료 전까지 거부할 수 있도록 users와 독립적으로 보관"""
+
+    __tablename__ = "revoked_token_families"
+
+    family_id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True)
+    revoked_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, index=True)
+
+
+# 워커의 폐기 목록 동기화(revoked_at > 마지막 동기화 시각)용 — 폐기된 행만 인덱싱
+Index(
+    "ix_refresh_tokens_revoked_at",
+    RefreshToken.revoked_at,
+    postgresql_where=RefreshToken.revoked_at.isnot(None),
+)
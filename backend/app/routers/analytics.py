@@ -1,9 +1,15 @@
 # 파일 목적: 통계/분석 HTTP 엔드포인트 라우터
-# 주요 기능: GET /analytics/summary, /analytics/links, /analytics/views, /analytics/top-links, /analytics/recent-clicks
+# 주요 기능: GET /analytics/summary, /analytics/links, /analytics/views, /analytics/top-links, /analytics/recent-clicks (links·recent-clicks는 after 커서 페이지네이션),
+#           GET /analytics/breakdown (기기/브라우저/OS 분포), GET /analytics/geo-breakdown (국가 분포, 일별 집계만 조회), GET /analytics/top-sources (유입 경로 Top N, 일별 집계만 조회), GET /analytics/export (raw 클릭/방문 로그 CSV·NDJSON·gzip 스트리밍)
 # 사용 방법: app.include_router(analytics.router, prefix="/api/analytics", tags=["analytics"])
 
+import uuid
+from collections.abc import AsyncIterator
+from datetime import datetime
 from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import AsyncSessionLocal
 from app.dependencies.db import get_db
 from app.dependencies.auth import get_current_user
 from app.schemas.analytics import (
@@ -12,8 +18,11 @@ from app.schemas.analytics import (
     ViewStats,
     TopLink,
     RecentClick,
+    BreakdownItem,
+    TopSource,
 )
 from app.services import analytics as analytics_service
+from app.services import export as export_service
 from app.models.user import User
 
 router = APIRouter()
@@ -29,10 +38,12 @@ async def get_summary(
 
 @router.get("/links", response_model=list[LinkAnalytics])
 async def get_link_stats(
+    limit: int | None = Query(default=None, ge=1, le=100, description="반환할 링크 수 (생략 시 전체)"),
+    after: str | None = Query(default=None, description="이전 페이지 마지막 항목의 cursor"),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> list:
-    return await analytics_service.get_link_stats(db, current_user.id)
+    return await analytics_service.get_link_stats(db, current_user.id, limit, after)
 
 
 @router.get("/views", response_model=ViewStats)
@@ -56,7 +67,79 @@ async def get_top_links(
 @router.get("/recent-clicks", response_model=list[RecentClick])
 async def get_recent_clicks(
     limit: int = Query(default=10, ge=1, le=100, description="반환할 클릭 수 (최대 100)"),
+    after: str | None = Query(default=None, description="이전 페이지 마지막 항목의 cursor"),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ) -> list[RecentClick]:
-    return await analytics_service.get_recent_clicks(db, current_user.id, limit)
+    return await analytics_service.get_recent_clicks(db, current_user.id, limit, after)
+
+
+@router.get("/breakdown", response_model=list[BreakdownItem])
+async def get_breakdown(
+    dimension: str = Query(default="device", pattern="^(device|browser|os)$", description="device, browser 또는 os"),
+    kind: str = Query(default="clicks", pattern="^(clicks|views)$", description="clicks 또는 views"),
+    days: int = Query(default=30, ge=1, le=90, description="조회 기간 (일), 1~90 사이 값"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> list[BreakdownItem]:
+    return await analytics_service.get_breakdown(db, current_user.id, dimension, kind, days)
+
+
+@router.get("/geo-breakdown", response_model=list[BreakdownItem])
+async def get_geo_breakdown(
+    kind: str = Query(default="views", pattern="^(clicks|views)$", description="clicks 또는 views"),
+    days: int = Query(default=30, ge=1, le=365, description="조회 기간 (일), 1~365 사이 값"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> list[BreakdownItem]:
+    return await analytics_service.get_geo_breakdown(db, current_user.id, kind, days)
+
+
+@router.get("/top-sources", response_model=list[TopSource])
+async def get_top_sources(
+    days: int = Query(default=30, ge=1, le=365, description="조회 기간 (일), 1~365 사이 값"),
+    limit: int = Query(default=10, ge=1, le=50, description="반환할 유입 경로 수 (최대 50)"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> list[TopSource]:
+    return await analytics_service.get_top_sources(db, current_user.id, days, limit)
+
+
+async def _export_stream(
+    user_id: uuid.UUID,
+    kind: str,
+    fmt: str,
+    compress: bool,
+    since: datetime | None,
+    until: datetime | None,
+) -> AsyncIterator[bytes]:
+    # 요청 세션은 응답 전송 전에 닫히므로 스트리밍 동안 쓸 세션을 직접 연다
+    async with AsyncSessionLocal() as db:
+        if kind == "clicks":
+            rows = analytics_service.stream_link_clicks(db, user_id, since, until)
+            fields = export_service.CLICK_EXPORT_FIELDS
+        else:
+            rows = analytics_service.stream_profile_views(db, user_id, since, until)
+            fields = export_service.VIEW_EXPORT_FIELDS
+        async for chunk in export_service.encode_rows(rows, fmt, fields, compress):
+            yield chunk
+
+
+@router.get("/export")
+async def export_events(
+    kind: str = Query(default="clicks", pattern="^(clicks|views)$", description="clicks 또는 views"),
+    fmt: str = Query(default="csv", alias="format", pattern="^(csv|ndjson)$", description="csv 또는 ndjson"),
+    gzip: bool = Query(default=False, description="gzip 압축 파일로 받기"),
+    since: datetime | None = Query(default=None, description="이 시각 이후 (포함)"),
+    until: datetime | None = Query(default=None, description="이 시각 이전 (미포함)"),
+    current_user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    return StreamingResponse(
+        _export_stream(current_user.id, kind, fmt, gzip, since, until),
+        media_type=export_service.media_type(fmt, gzip),
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="{export_service.filename(kind, fmt, gzip)}"'
+            ),
+        },
+    )
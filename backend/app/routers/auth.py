@@ -2,8 +2,9 @@
 # 주요 기능: POST /register(201), POST /login, POST /refresh, GET /me
 # 사용 방법: app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.client_ip import get_client_ip
 from app.dependencies.db import get_db
 from app.dependencies.auth import get_current_user
 from app.schemas.user import RegisterRequest, LoginRequest, UserResponse, ChangePasswordRequest
@@ -20,8 +21,8 @@ async def register(data: RegisterRequest, db: AsyncSession = Depends(get_db)) ->
 
 
 @router.post("/login", response_model=TokenResponse)
-async def login(data: LoginRequest, db: AsyncSession = Depends(get_db)) -> TokenResponse:
-    return await auth_service.login(db, data)
+async def login(data: LoginRequest, request: Request, db: AsyncSession = Depends(get_db)) -> TokenResponse:
+    return await auth_service.login(db, data, get_client_ip(request))
 
 
 @router.post("/refresh", response_model=TokenResponse)
@@ -1,8 +1,11 @@
 # 파일 목적: 서버 상태 확인 엔드포인트
-# 주요 기능: GET /api/health - 서비스 정상 작동 여부 반환
+# 주요 기능: GET /api/health - 서비스 정상 작동 여부 반환, GET /api/health/login-throttle - 로그인 throttle 카운터(집계값만),
+#           GET /api/.well-known/jwks.json - 토큰 검증용 공개키 (EdDSA/ES256일 때만, HS*는 빈 목록)
 # 사용 방법: app.include_router(health.router, prefix="/api")
 
 from fastapi import APIRouter
+from app.core.login_throttle import login_throttle
+from app.core.tokens import jwks
 
 router = APIRouter()
 
@@ -10,3 +13,15 @@ router = APIRouter()
 @router.get("/health", tags=["health"])
 async def health_check() -> dict:
     return {"status": "ok", "service": "linktree-api"}
+
+
+@router.get("/health/login-throttle", tags=["health"])
+async def login_throttle_stats() -> dict[str, int]:
+    # email/IP 원본은 노출하지 않고 shared_state에 모인 전체 워커 카운터만 반환
+    return await login_throttle.stats()
+
+
+@router.get("/.well-known/jwks.json", tags=["health"])
+async def jwks_keys() -> dict:
+    # 엣지/다른 서비스가 비밀키 없이 access token을 검증할 수 있도록 공개키만 노출
+    return jwks()
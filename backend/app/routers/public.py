@@ -1,20 +1,38 @@
 # 파일 목적: 공개 프로필 및 클릭 추적 엔드포인트 (인증 불필요)
-# 주요 기능: GET /public/{username}, POST /public/{username}/view, GET /public/links/{id}/click (302)
+# 주요 기능: GET /public/{username}, POST /public/{username}/view, GET /public/links/{id}/click (302), 기록 시 실시간 이벤트 발행
+#           (UA는 user_agent_cache LRU로 user_agents.id 정수 키만 저장, 봇은 is_bot으로 표시하고 카운트/이벤트에서 제외,
+#            유입 경로는 ref/utm_* 쿼리 또는 Referer 헤더 → traffic_sources.id + daily_source_stats 가산,
+#            위치는 로컬 GeoIP DB로 country/region 보강 + daily_geo_stats 가산, raw IP는 ANALYTICS_IP_STORAGE에 따라 절삭/미저장)
+#           (클라이언트 IP는 ClientIPMiddleware가 신뢰 프록시 헤더로 해석한 request.state.client_ip)
+#           (IP당, IP+프로필/링크당 토큰 버킷 초과 시 DB 기록 없이 skip 또는 429)
+#           (누적 클릭 수는 links 행 대신 link_click_shards의 임의 샤드에 가산, 유입 경로/국가 일별 집계도 임의 샤드 행에 가산
+#            — 인기 링크도 행 락 하나에 줄서지 않음)
+#           GET /public/{username}/stream (SSE, 병합된 카운터 delta 푸시)
+#           (GET /public/{username}이 백엔드까지 왔다면 사전 렌더링 파일이 없는 것 — 렌더러 대기열에 추가)
 # 사용 방법: app.include_router(public.router, prefix="/api/public", tags=["public"])
 
 import uuid
 from datetime import datetime, timezone, timedelta
 from fastapi import APIRouter, Depends, Request
-from fastapi.responses import RedirectResponse
+from fastapi.responses import RedirectResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.dependencies.db import get_db
+from app.dependencies.rate_limit import click_rate_limit, view_rate_limit
 from app.schemas.profile import PublicProfileResponse
 from app.services import profile as profile_service
-from app.models.link import Link
 from app.models.analytics import ProfileView, LinkClick
 from app.models.user import User
+from app.core.client_ip import get_client_ip
 from app.core.exceptions import NotFoundException
+from app.core.events import AnalyticsEvent, event_hub
+from app.core.live_counters import live_counters
+from app.services.click_counters import increment_click
+from app.services.hot_queries import active_link_by_id, active_user_by_username, recent_view
+from app.services.prerender import profile_renderer
+from app.services.geoip import geoip_resolver, record_daily_geo, stored_ip
+from app.services.traffic_sources import record_daily_source, source_from_request, traffic_source_cache
+from app.services.user_agents import user_agent_cache
 
 router = APIRouter()
 
@@ -24,45 +42,81 @@ async def get_public_profile(
     username: str,
     db: AsyncSession = Depends(get_db),
 ) -> dict:
-    return await profile_service.get_public_profile(db, username)
+    profile = await profile_service.get_public_profile(db, username)
+    if profile_renderer is not None:
+        profile_renderer.ensure_rendered(username)
+    return profile
+
+
+@router.get("/{username}/stream")
+async def stream_counters(
+    username: str,
+    db: AsyncSession = Depends(get_db),
+) -> StreamingResponse:
+    result = await db.execute(
+        select(User.id).where(User.username == username, User.is_active == True)  # noqa: E712
+    )
+    user_id = result.scalar_one_or_none()
+    if not user_id:
+        raise NotFoundException(f"'{username}' 사용자를 찾을 수 없습니다.")
+    # 스트림이 열려 있는 동안 DB 커넥션을 점유하지 않도록 즉시 반환 (이후 DB 조회 없음)
+    await db.close()
+
+    return StreamingResponse(
+        live_counters.stream(user_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.post("/{username}/view")
 async def record_view(
     username: str,
     request: Request,
+    allowed: bool = Depends(view_rate_limit),
     db: AsyncSession = Depends(get_db),
 ) -> dict:
-    result = await db.execute(
-        select(User).where(User.username == username, User.is_active == True)  # noqa: E712
-    )
+    if not allowed:
+        return {"status": "skipped"}
+
+    result = await db.execute(active_user_by_username(username))
     user = result.scalar_one_or_none()
     if not user:
         raise NotFoundException(f"'{username}' 사용자를 찾을 수 없습니다.")
 
-    client_ip = request.client.host if request.client else None
+    client_ip = get_client_ip(request)
     user_agent = request.headers.get("user-agent", "")[:500]
+    ua = await user_agent_cache.resolve(db, user_agent)
+    location = geoip_resolver.lookup(client_ip)
+    viewer_ip = stored_ip(client_ip)
 
-    # 중복 방문 방지: 같은 IP에서 1시간 이내 재방문은 기록하지 않음
-    if client_ip:
+    # 중복 방문 방지: 같은 IP(절삭 저장 시 같은 대역)에서 1시간 이내 재방문은 기록하지 않음
+    if viewer_ip:
         one_hour_ago = datetime.now(timezone.utc) - timedelta(hours=1)
-        existing = await db.execute(
-            select(ProfileView).where(
-                ProfileView.user_id == user.id,
-                ProfileView.viewer_ip == client_ip,
-                ProfileView.viewed_at >= one_hour_ago,
-            )
-        )
+        existing = await db.execute(recent_view(user.id, viewer_ip, one_hour_ago))
         if existing.scalar_one_or_none() is not None:
             return {"status": "already_recorded"}
 
+    source_id = await traffic_source_cache.resolve(db, source_from_request(request))
     view = ProfileView(
         user_id=user.id,
-        viewer_ip=client_ip,
-        user_agent=user_agent,
+        viewer_ip=viewer_ip,
+        country=location.country,
+        region=location.region,
+        user_agent_id=ua.id,
+        traffic_source_id=source_id,
+        is_bot=ua.is_bot,
     )
     db.add(view)
+    if not ua.is_bot:
+        await record_daily_source(db, user.id, source_id, "view")
+        await record_daily_geo(db, user.id, location.country, "view")
     await db.commit()
+    # 봇 방문은 기록만 하고 집계/실시간 카운터에서는 제외
+    if not ua.is_bot:
+        await event_hub.publish(
+            AnalyticsEvent(kind="view", user_id=user.id, occurred_at=datetime.now(timezone.utc))
+        )
     return {"status": "recorded"}
 
 
@@ -70,27 +124,52 @@ async def record_view(
 async def record_click(
     link_id: uuid.UUID,
     request: Request,
+    allowed: bool = Depends(click_rate_limit),
     db: AsyncSession = Depends(get_db),
 ) -> RedirectResponse:
-    result = await db.execute(
-        select(Link).where(Link.id == link_id, Link.is_active == True)  # noqa: E712
-    )
+    result = await db.execute(active_link_by_id(link_id))
     link = result.scalar_one_or_none()
 
     if not link:
         raise NotFoundException("링크를 찾을 수 없습니다.")
+    # 한도 초과 클릭도 방문자는 목적지로 보냄 — UA/유입 경로 해석, 쓰기, 이벤트 발행은 모두 생략
+    if not allowed:
+        return RedirectResponse(url=link.url, status_code=302)
 
-    client_ip = request.client.host if request.client else None
+    client_ip = get_client_ip(request)
     user_agent = request.headers.get("user-agent", "")[:500]
 
+    ua = await user_agent_cache.resolve(db, user_agent)
+    source_id = await traffic_source_cache.resolve(db, source_from_request(request))
+    location = geoip_resolver.lookup(client_ip)
+
     click = LinkClick(
         link_id=link.id,
         user_id=link.user_id,
-        visitor_ip=client_ip,
-        user_agent=user_agent,
+        visitor_ip=stored_ip(client_ip),
+        country=location.country,
+        region=location.region,
+        user_agent_id=ua.id,
+        traffic_source_id=source_id,
+        is_bot=ua.is_bot,
     )
     db.add(click)
-    link.click_count += 1
+    # 링크 미리보기 크롤러 등 봇 클릭은 누적 클릭 수, 유입 경로/국가 집계, 실시간 카운터에 반영하지 않음
+    click_count = None
+    if not ua.is_bot:
+        click_count = await increment_click(db, link.id)
+        await record_daily_source(db, link.user_id, source_id, "click")
+        await record_daily_geo(db, link.user_id, location.country, "click")
     await db.commit()
+    if not ua.is_bot:
+        await event_hub.publish(
+            AnalyticsEvent(
+                kind="click",
+                user_id=link.user_id,
+                occurred_at=datetime.now(timezone.utc),
+                link_id=link.id,
+                click_count=click_count,
+            )
+        )
 
     return RedirectResponse(url=link.url, status_code=302)
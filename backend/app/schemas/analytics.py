@@ -1,10 +1,12 @@
 # 파일 목적: 분석/통계 관련 Pydantic 응답 스키마 정의
-# 주요 기능: AnalyticsSummary, LinkAnalytics, ViewStats, DailyViewStats, TopLink, RecentClick
+# 주요 기능: AnalyticsSummary, LinkAnalytics, ViewStats, DailyViewStats, TopLink, RecentClick, BreakdownItem, TopSource
 # 사용 방법: from app.schemas.analytics import AnalyticsSummary, ViewStats, TopLink, RecentClick
 
 import uuid
 from datetime import date, datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, computed_field
+
+from app.core.pagination import encode_cursor
 
 
 class AnalyticsSummary(BaseModel):
@@ -25,6 +27,12 @@ class LinkAnalytics(BaseModel):
     click_count: int
     is_active: bool
 
+    @computed_field
+    @property
+    def cursor(self) -> str:
+        # 다음 페이지 요청의 after 값 — (click_count, id) 정렬 키
+        return encode_cursor(self.click_count, self.id)
+
 
 class DailyViewStats(BaseModel):
     date: date
@@ -51,3 +59,20 @@ class RecentClick(BaseModel):
     title: str
     clicked_at: datetime
     visitor_ip: str | None
+    cursor: str | None = None  # 다음 페이지 요청의 after 값 — (clicked_at, id) 정렬 키
+
+
+class BreakdownItem(BaseModel):
+    label: str
+    count: int
+    percentage: float
+
+
+class TopSource(BaseModel):
+    # 모든 값이 None이면 직접 유입(direct)
+    referrer_domain: str | None
+    utm_source: str | None
+    utm_medium: str | None
+    utm_campaign: str | None
+    view_count: int
+    click_count: int
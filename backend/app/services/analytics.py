@@ -1,22 +1,60 @@
 # 파일 목적: 통계 데이터 조회 비즈니스 로직
-# 주요 기능: get_summary(총합계+오늘+CTR), get_link_stats(링크별), get_view_stats(기간별+unique), get_top_links, get_recent_clicks
+# 주요 기능: get_summary(총합계+오늘+CTR), get_link_stats(링크별, (click_count, id) keyset), get_view_stats(기간별+unique), get_top_links,
+#           get_recent_clicks((clicked_at, id) keyset), get_breakdown(UA 분류 컬럼 기준 기기/브라우저/OS 분포, 봇 제외),
+#           get_geo_breakdown(daily_geo_stats 집계만 읽는 국가 분포), get_top_sources(daily_source_stats 집계만 읽는 유입 경로 Top N),
+#           stream_link_clicks/stream_profile_views(raw 이벤트 keyset + 서버 사이드 커서 스트리밍)
 # 사용 방법: from app.services.analytics import get_summary, get_view_stats, get_top_links, get_recent_clicks
 
 import uuid
+from collections.abc import AsyncIterator
 from datetime import datetime, timedelta, timezone, date
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, cast, Date, distinct
+from sqlalchemy import Row, Select, select, func, cast, Date, distinct, tuple_
+from app.core.exceptions import BadRequestException
+from app.core.pagination import encode_cursor, decode_cursor
 from app.models.link import Link
-from app.models.analytics import ProfileView, LinkClick
+from app.models.analytics import (
+    ProfileView,
+    LinkClick,
+    UserAgent,
+    TrafficSource,
+    DailySourceStats,
+    DailyGeoStats,
+    DailyProfileViews,
+)
 from app.schemas.analytics import (
     AnalyticsSummary,
-    LinkAnalytics,
     ViewStats,
     DailyViewStats,
     TopLink,
     RecentClick,
+    BreakdownItem,
+    TopSource,
 )
 
+# get_breakdown dimension → user_agents의 사전 분류 컬럼 (조회 시 UA 문자열 파싱 없음)
+BREAKDOWN_DIMENSIONS = {
+    "device": UserAgent.device_type,
+    "browser": UserAgent.browser,
+    "os": UserAgent.os,
+}
+
+# raw 이벤트 export 시 keyset 페이지 크기 (페이지마다 서버 사이드 커서로 스트리밍)
+EXPORT_BATCH_SIZE = 5000
+
+
+def mask_ip(ip: str | None) -> str | None:
+    """IP 마스킹: 마지막 옥텟을 ***로 치환"""
+    if ip is None:
+        return None
+    ip = str(ip)
+    parts = ip.split(".")
+    if len(parts) == 4:
+        return f"{parts[0]}.{parts[1]}.{parts[2]}.*"
+    # IPv6 또는 기타 형식
+    return ip[:max(0, len(ip) - 3)] + "***"
+
+
 async def get_summary(db: AsyncSession, user_id: uuid.UUID) -> AnalyticsSummary:
     today_start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
 
@@ -36,19 +74,26 @@ async def get_summary(db: AsyncSession, user_id: uuid.UUID) -> AnalyticsSummary:
         select(func.count(LinkClick.id)).where(
             LinkClick.user_id == user_id,
             LinkClick.clicked_at >= today_start,
+            LinkClick.is_bot == False,  # noqa: E712
         )
     )
     today_clicks = int(today_clicks_result.scalar() or 0)
 
-    # 총 방문 수 + 오늘 방문 수를 단일 쿼리로
+    # 총 방문 수 + 오늘 방문 수 + retention으로 접힌 과거 방문 수를 단일 쿼리로
+    archived_views = (
+        select(func.coalesce(func.sum(DailyProfileViews.view_count), 0))
+        .where(DailyProfileViews.user_id == user_id)
+        .scalar_subquery()
+    )
     view_result = await db.execute(
         select(
             func.count(ProfileView.id).label("total_views"),
             func.count(ProfileView.id).filter(ProfileView.viewed_at >= today_start).label("today_views"),
-        ).where(ProfileView.user_id == user_id)
+            archived_views.label("archived_views"),
+        ).where(ProfileView.user_id == user_id, ProfileView.is_bot == False)  # noqa: E712
     )
     view_row = view_result.one()
-    total_views = int(view_row.total_views or 0)
+    total_views = int(view_row.total_views or 0) + int(view_row.archived_views or 0)
     today_views = int(view_row.today_views or 0)
 
     # CTR: 방문 대비 클릭 비율 (%)
@@ -64,21 +109,26 @@ async def get_summary(db: AsyncSession, user_id: uuid.UUID) -> AnalyticsSummary:
     )
 
 
-async def get_link_stats(db: AsyncSession, user_id: uuid.UUID) -> list[LinkAnalytics]:
-    result = await db.execute(
-        select(Link).where(Link.user_id == user_id).order_by(Link.click_count.desc())
+async def get_link_stats(
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    limit: int | None = None,
+    after: str | None = None,
+) -> list[Row]:
+    # LinkAnalytics에 필요한 5개 컬럼만 Row로 조회 — REST는 from_attributes, GraphQL은 속성 해석으로 그대로 사용
+    # (user_id, click_count DESC, id DESC) 인덱스를 따라 seek 하므로 깊은 페이지도 첫 페이지와 비용이 같음
+    stmt = (
+        select(Link.id, Link.title, Link.url, Link.click_count, Link.is_active)
+        .where(Link.user_id == user_id)
+        .order_by(Link.click_count.desc(), Link.id.desc())
     )
-    links = result.scalars().all()
-    return [
-        LinkAnalytics(
-            id=link.id,
-            title=link.title,
-            url=link.url,
-            click_count=link.click_count,
-            is_active=link.is_active,
-        )
-        for link in links
-    ]
+    if after is not None:
+        click_count, link_id = decode_cursor(after, int, uuid.UUID)
+        stmt = stmt.where(tuple_(Link.click_count, Link.id) < (click_count, link_id))
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    result = await db.execute(stmt)
+    return list(result.all())
 
 
 async def get_view_stats(db: AsyncSession, user_id: uuid.UUID, days: int = 7) -> ViewStats:
@@ -92,7 +142,11 @@ async def get_view_stats(db: AsyncSession, user_id: uuid.UUID, days: int = 7) ->
             func.count(ProfileView.id).label("view_count"),
             func.count(distinct(ProfileView.viewer_ip)).label("unique_visitors"),
         )
-        .where(ProfileView.user_id == user_id, ProfileView.viewed_at >= since)
+        .where(
+            ProfileView.user_id == user_id,
+            ProfileView.viewed_at >= since,
+            ProfileView.is_bot == False,  # noqa: E712
+        )
         .group_by("view_date")
         .order_by("view_date")
     )
@@ -127,17 +181,20 @@ async def get_view_stats(db: AsyncSession, user_id: uuid.UUID, days: int = 7) ->
 async def get_top_links(db: AsyncSession, user_id: uuid.UUID, limit: int = 5) -> list[TopLink]:
     # 총 방문 수 조회 (CTR 계산용)
     view_result = await db.execute(
-        select(func.count(ProfileView.id)).where(ProfileView.user_id == user_id)
+        select(func.count(ProfileView.id)).where(
+            ProfileView.user_id == user_id,
+            ProfileView.is_bot == False,  # noqa: E712
+        )
     )
     total_views = int(view_result.scalar() or 0)
 
     result = await db.execute(
-        select(Link)
+        select(Link.id, Link.title, Link.url, Link.click_count)
         .where(Link.user_id == user_id)
         .order_by(Link.click_count.desc())
         .limit(limit)
     )
-    links = result.scalars().all()
+    links = result.all()
 
     return [
         TopLink(
@@ -152,34 +209,225 @@ async def get_top_links(db: AsyncSession, user_id: uuid.UUID, limit: int = 5) ->
 
 
 async def get_recent_clicks(
-    db: AsyncSession, user_id: uuid.UUID, limit: int = 10
+    db: AsyncSession, user_id: uuid.UUID, limit: int = 10, after: str | None = None
 ) -> list[RecentClick]:
-    # Link와 LinkClick 조인하여 최근 클릭 내역 조회
-    result = await db.execute(
-        select(LinkClick, Link.title)
+    # Link와 LinkClick 조인하여 최근 클릭 내역 조회 — 봇 제외 부분 인덱스 (user_id, clicked_at, id)를 역방향 seek (index-only)
+    stmt = (
+        select(LinkClick.id, LinkClick.link_id, LinkClick.clicked_at, LinkClick.visitor_ip, Link.title)
         .join(Link, LinkClick.link_id == Link.id)
-        .where(LinkClick.user_id == user_id)
-        .order_by(LinkClick.clicked_at.desc())
+        .where(LinkClick.user_id == user_id, LinkClick.is_bot == False)  # noqa: E712
+        .order_by(LinkClick.clicked_at.desc(), LinkClick.id.desc())
         .limit(limit)
     )
+    if after is not None:
+        clicked_at, click_id = decode_cursor(after, datetime, int)
+        stmt = stmt.where(tuple_(LinkClick.clicked_at, LinkClick.id) < (clicked_at, click_id))
+    result = await db.execute(stmt)
     rows = result.all()
 
-    def mask_ip(ip: str | None) -> str | None:
-        """IP 마스킹: 마지막 옥텟을 ***로 치환"""
-        if ip is None:
-            return None
-        parts = ip.split(".")
-        if len(parts) == 4:
-            return f"{parts[0]}.{parts[1]}.{parts[2]}.*"
-        # IPv6 또는 기타 형식
-        return ip[:max(0, len(ip) - 3)] + "***"
-
     return [
         RecentClick(
-            link_id=click.link_id,
-            title=title,
-            clicked_at=click.clicked_at,
-            visitor_ip=mask_ip(click.visitor_ip),
+            link_id=row.link_id,
+            title=row.title,
+            clicked_at=row.clicked_at,
+            visitor_ip=mask_ip(row.visitor_ip),
+            cursor=encode_cursor(row.clicked_at, row.id),
+        )
+        for row in rows
+    ]
+
+
+async def get_breakdown(
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    dimension: str = "device",
+    kind: str = "clicks",
+    days: int = 30,
+) -> list[BreakdownItem]:
+    column = BREAKDOWN_DIMENSIONS.get(dimension)
+    if column is None or kind not in ("clicks", "views"):
+        raise BadRequestException("지원하지 않는 분포 기준입니다.")
+    if kind == "clicks":
+        fact, ts_col = LinkClick, LinkClick.clicked_at
+    else:
+        fact, ts_col = ProfileView, ProfileView.viewed_at
+    since = datetime.now(timezone.utc) - timedelta(days=days)
+
+    # UA가 없는 이벤트는 user_agents와 매칭되지 않으므로 Unknown으로 묶음
+    label = func.coalesce(column, "Unknown").label("label")
+    event_count = func.count(fact.id)
+    result = await db.execute(
+        select(label, event_count.label("count"))
+        .select_from(fact)
+        .outerjoin(UserAgent, fact.user_agent_id == UserAgent.id)
+        .where(fact.user_id == user_id, ts_col >= since, fact.is_bot == False)  # noqa: E712
+        .group_by(label)
+        .order_by(event_count.desc())
+    )
+    rows = result.all()
+    total = sum(row.count for row in rows)
+
+    return [
+        BreakdownItem(
+            label=row.label,
+            count=row.count,
+            percentage=round(row.count / total * 100, 2) if total > 0 else 0.0,
         )
-        for click, title in rows
+        for row in rows
     ]
+
+
+async def get_geo_breakdown(
+    db: AsyncSession, user_id: uuid.UUID, kind: str = "views", days: int = 30
+) -> list[BreakdownItem]:
+    if kind not in ("clicks", "views"):
+        raise BadRequestException("지원하지 않는 분포 기준입니다.")
+    since = (datetime.now(timezone.utc) - timedelta(days=days - 1)).date()
+    count_col = DailyGeoStats.click_count if kind == "clicks" else DailyGeoStats.view_count
+    event_count = func.sum(count_col)
+    result = await db.execute(
+        select(DailyGeoStats.country.label("label"), event_count.label("count"))
+        .where(DailyGeoStats.user_id == user_id, DailyGeoStats.day >= since)
+        .group_by(DailyGeoStats.country)
+        .having(event_count > 0)
+        .order_by(event_count.desc())
+    )
+    rows = result.all()
+    total = sum(row.count for row in rows)
+
+    # 빈 문자열 국가는 GeoIP DB에 없거나 보강이 비활성인 이벤트
+    return [
+        BreakdownItem(
+            label=row.label or "Unknown",
+            count=row.count,
+            percentage=round(row.count / total * 100, 2) if total > 0 else 0.0,
+        )
+        for row in rows
+    ]
+
+
+async def get_top_sources(
+    db: AsyncSession, user_id: uuid.UUID, days: int = 30, limit: int = 10
+) -> list[TopSource]:
+    # raw 이벤트는 읽지 않음 — (user_id, day) PK 범위 스캔 후 사전 테이블과 조인
+    since = (datetime.now(timezone.utc) - timedelta(days=days - 1)).date()
+    views = func.sum(DailySourceStats.view_count)
+    clicks = func.sum(DailySourceStats.click_count)
+    result = await db.execute(
+        select(
+            TrafficSource.referrer_domain,
+            TrafficSource.utm_source,
+            TrafficSource.utm_medium,
+            TrafficSource.utm_campaign,
+            views.label("view_count"),
+            clicks.label("click_count"),
+        )
+        .join(TrafficSource, DailySourceStats.source_id == TrafficSource.id)
+        .where(DailySourceStats.user_id == user_id, DailySourceStats.day >= since)
+        .group_by(TrafficSource.id)
+        .order_by((views + clicks).desc(), TrafficSource.id)
+        .limit(limit)
+    )
+
+    return [
+        TopSource(
+            referrer_domain=row.referrer_domain or None,
+            utm_source=row.utm_source or None,
+            utm_medium=row.utm_medium or None,
+            utm_campaign=row.utm_campaign or None,
+            view_count=int(row.view_count or 0),
+            click_count=int(row.click_count or 0),
+        )
+        for row in result.all()
+    ]
+
+
+async def _keyset_stream(
+    db: AsyncSession,
+    stmt: Select,
+    ts_col,
+    id_col,
+    batch_size: int,
+) -> AsyncIterator[Row]:
+    # (시각, id) keyset으로 페이지를 넘기고, 각 페이지는 서버 사이드 커서로 받아 메모리 사용량을 일정하게 유지
+    last: tuple[datetime, int] | None = None
+    while True:
+        page = stmt
+        if last is not None:
+            page = page.where(tuple_(ts_col, id_col) > last)
+        page = page.order_by(ts_col, id_col).limit(batch_size)
+        result = await db.stream(page.execution_options(yield_per=min(batch_size, 1000)))
+        count = 0
+        async for row in result:
+            count += 1
+            last = (row[0], row[1])
+            yield row
+        if count < batch_size:
+            return
+
+
+async def stream_link_clicks(
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> AsyncIterator[dict]:
+    stmt = (
+        select(
+            LinkClick.clicked_at,
+            LinkClick.id,
+            LinkClick.link_id,
+            Link.title,
+            LinkClick.visitor_ip,
+            UserAgent.value.label("user_agent"),
+        )
+        .join(Link, LinkClick.link_id == Link.id)
+        .outerjoin(UserAgent, LinkClick.user_agent_id == UserAgent.id)
+        .where(LinkClick.user_id == user_id)
+    )
+    if since is not None:
+        stmt = stmt.where(LinkClick.clicked_at >= since)
+    if until is not None:
+        stmt = stmt.where(LinkClick.clicked_at < until)
+
+    async for row in _keyset_stream(db, stmt, LinkClick.clicked_at, LinkClick.id, batch_size):
+        yield {
+            "id": row.id,
+            "clicked_at": row.clicked_at.isoformat(),
+            "link_id": str(row.link_id),
+            "title": row.title,
+            "visitor_ip": mask_ip(row.visitor_ip),
+            "user_agent": row.user_agent,
+        }
+
+
+async def stream_profile_views(
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> AsyncIterator[dict]:
+    stmt = (
+        select(
+            ProfileView.viewed_at,
+            ProfileView.id,
+            ProfileView.viewer_ip,
+            UserAgent.value.label("user_agent"),
+        )
+        .outerjoin(UserAgent, ProfileView.user_agent_id == UserAgent.id)
+        .where(ProfileView.user_id == user_id)
+    )
+    if since is not None:
+        stmt = stmt.where(ProfileView.viewed_at >= since)
+    if until is not None:
+        stmt = stmt.where(ProfileView.viewed_at < until)
+
+    async for row in _keyset_stream(db, stmt, ProfileView.viewed_at, ProfileView.id, batch_size):
+        yield {
+            "id": row.id,
+            "viewed_at": row.viewed_at.isoformat(),
+            "viewer_ip": mask_ip(row.viewer_ip),
+            "user_agent": row.user_agent,
+        }
@@ -1,10 +1,16 @@
 # 파일 목적: 인증 비즈니스 로직 (회원가입, 로그인, 토큰 갱신)
-# 주요 기능: register(중복확인→User생성), login(비번검증→JWT), refresh_token
+# 주요 기능: register(중복확인→User생성), login(throttle 확인→비번검증→새 token family 발급, 실패 시 email/IP backoff 기록),
+#           refresh_token(jti 행 잠금 → rotation, 이미 사용된 토큰 재제출 시 family 전체 폐기), change_password(모든 세션 폐기),
+#           delete_account(모든 family 폐기 기록을 users와 독립된 테이블에 남긴 뒤 삭제, 공개 프로필 캐시 무효화 — 사전 렌더링 파일도 username으로 삭제)
 # 사용 방법: from app.services.auth import register, login, refresh_token
 
+import math
 import uuid
+from datetime import datetime, timedelta, timezone
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update
+from app.core.config import settings
+from app.models.refresh_token import RefreshToken, RevokedTokenFamily
 from app.models.user import User
 from app.schemas.user import RegisterRequest, LoginRequest, ChangePasswordRequest
 from app.schemas.token import TokenResponse
@@ -13,9 +19,12 @@ from app.core.security import (
     verify_password,
     create_access_token,
     create_refresh_token,
-    verify_token,
+    verify_refresh_token,
 )
-from app.core.exceptions import ConflictException, UnauthorizedException
+from app.core.exceptions import ConflictException, TooManyRequestsException, UnauthorizedException
+from app.core.login_throttle import login_throttle
+from app.core.revocation import revoked_families
+from app.services.profile_timeline import public_profile_cache
 
 
 async def register(db: AsyncSession, data: RegisterRequest) -> User:
@@ -42,37 +51,87 @@ async def register(db: AsyncSession, data: RegisterRequest) -> User:
     return user
 
 
-async def login(db: AsyncSession, data: LoginRequest) -> TokenResponse:
-    result = await db.execute(select(User).where(User.email == str(data.email)))
+async def login(db: AsyncSession, data: LoginRequest, client_ip: str | None = None) -> TokenResponse:
+    email = str(data.email)
+    # 잠금 중인 email/IP는 DB 조회와 bcrypt 검증 없이 즉시 거부, 허용이면 이 시도를 실패로 선점 (성공 시 환불)
+    retry_after = await login_throttle.check(email, client_ip)
+    if retry_after > 0:
+        raise TooManyRequestsException(
+            "로그인 시도가 너무 많습니다. 잠시 후 다시 시도해주세요.", retry_after=math.ceil(retry_after)
+        )
+
+    result = await db.execute(select(User).where(User.email == email))
     user = result.scalar_one_or_none()
 
     if not user or not verify_password(data.password, user.password_hash):
+        await login_throttle.record_failure(email, client_ip)
         raise UnauthorizedException("이메일 또는 비밀번호가 올바르지 않습니다.")
+    await login_throttle.record_success(email, client_ip)
 
     if not user.is_active:
         raise UnauthorizedException("비활성화된 계정입니다.")
 
+    return await _issue_tokens(db, user.id, uuid.uuid4())
+
+
+async def _issue_tokens(db: AsyncSession, user_id: uuid.UUID, family_id: uuid.UUID) -> TokenResponse:
+    jti = uuid.uuid4()
+    db.add(
+        RefreshToken(
+            jti=jti,
+            family_id=family_id,
+            user_id=user_id,
+            expires_at=datetime.now(timezone.utc) + timedelta(days=settings.jwt_refresh_token_expire_days),
+        )
+    )
+    await db.commit()
     return TokenResponse(
-        access_token=create_access_token(str(user.id)),
-        refresh_token=create_refresh_token(str(user.id)),
+        access_token=create_access_token(str(user_id), str(family_id)),
+        refresh_token=create_refresh_token(str(user_id), str(family_id), str(jti)),
     )
 
 
+async def _revoke_families(db: AsyncSession, *criteria) -> list[uuid.UUID]:
+    result = await db.execute(
+        update(RefreshToken)
+        .where(*criteria, RefreshToken.revoked_at.is_(None))
+        .values(revoked_at=datetime.now(timezone.utc))
+        .returning(RefreshToken.family_id)
+        .execution_options(synchronize_session=False)
+    )
+    return list(set(result.scalars().all()))
+
+
 async def refresh_token(db: AsyncSession, token: str) -> TokenResponse:
-    user_id = verify_token(token, token_type="refresh")
-    if not user_id:
+    claims = verify_refresh_token(token)
+    if claims is None:
         raise UnauthorizedException("유효하지 않은 refresh token입니다.")
 
-    result = await db.execute(select(User).where(User.id == uuid.UUID(user_id)))
-    user = result.scalar_one_or_none()
+    # 같은 토큰으로 동시에 갱신하는 요청은 행 잠금으로 직렬화 — 두 번째 요청은 재사용으로 판정
+    result = await db.execute(
+        select(RefreshToken, User.is_active)
+        .join(User, RefreshToken.user_id == User.id)
+        .where(RefreshToken.jti == uuid.UUID(claims.jti))
+        .with_for_update(of=RefreshToken)
+    )
+    row = result.one_or_none()
+    if row is None:
+        raise UnauthorizedException("유효하지 않은 refresh token입니다.")
+    stored, is_active = row
 
-    if not user or not user.is_active:
+    if stored.revoked_at is not None or stored.expires_at <= datetime.now(timezone.utc):
+        raise UnauthorizedException("유효하지 않은 refresh token입니다.")
+    if stored.used_at is not None:
+        # 이미 교체된 토큰이 다시 제출됨 = 탈취 가능성 → 이 로그인 세션(family) 전체 폐기
+        families = await _revoke_families(db, RefreshToken.family_id == stored.family_id)
+        await db.commit()
+        revoked_families.revoke(families)
+        raise UnauthorizedException("이미 사용된 refresh token입니다. 다시 로그인해주세요.")
+    if not is_active:
         raise UnauthorizedException("사용자를 찾을 수 없습니다.")
 
-    return TokenResponse(
-        access_token=create_access_token(str(user.id)),
-        refresh_token=create_refresh_token(str(user.id)),
-    )
+    stored.used_at = datetime.now(timezone.utc)
+    return await _issue_tokens(db, stored.user_id, stored.family_id)
 
 
 async def change_password(db: AsyncSession, user: User, data: ChangePasswordRequest) -> None:
@@ -80,9 +139,19 @@ async def change_password(db: AsyncSession, user: User, data: ChangePasswordRequ
         raise UnauthorizedException("현재 비밀번호가 올바르지 않습니다.")
 
     user.password_hash = hash_password(data.new_password)
+    # 기존 로그인 세션 전체 폐기 — 이 워커는 즉시, 다른 워커는 다음 동기화 때 access token까지 거부
+    families = await _revoke_families(db, RefreshToken.user_id == user.id)
     await db.commit()
+    revoked_families.revoke(families)
 
 
 async def delete_account(db: AsyncSession, user: User) -> None:
+    # refresh_tokens 행은 CASCADE로 사라지므로 다른 워커가 동기화할 수 있도록 폐기 기록을 따로 남김
+    revoked_at = datetime.now(timezone.utc)
+    families = await _revoke_families(db, RefreshToken.user_id == user.id)
+    for family_id in families:
+        db.add(RevokedTokenFamily(family_id=family_id, revoked_at=revoked_at))
     await db.delete(user)
     await db.commit()
+    revoked_families.revoke(families)
+    public_profile_cache.invalidate_user(user.id, user.username)
@@ -0,0 +1,156 @@
+# 파일 목적: 샤딩된 링크 클릭 카운터 — 인기 링크의 클릭이 links 행 하나의 락에 줄서지 않도록 link_click_shards에 분산 가산
+# 주요 기능: increment_click(임의 샤드 upsert + 같은 문장에서 누적 클릭 수 근사값 반환), fold_click_shards(샤드를 DELETE ... RETURNING으로 비우며
+#           links.click_count에 합산 — 워커 간 advisory lock으로 한 곳만 실행), reconcile_click_counts(link_clicks + daily_link_clicks 기준으로
+#           click_count 드리프트 보정), run_click_fold_forever(lifespan task)
+# 사용 방법: total = await increment_click(db, link.id)  /  python -m app.services.click_counters [--user-id UUID]  (드리프트 보정)
+
+import argparse
+import asyncio
+import logging
+import random
+import uuid
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.analytics import DailyLinkClicks, LinkClick
+from app.models.link import Link, LinkClickShard
+
+logger = logging.getLogger(__name__)
+
+# 접기와 보정이 같은 links 행을 서로 다른 스냅샷으로 덮어쓰지 않도록 공유하는 트랜잭션 advisory lock 키
+CLICK_COUNTER_LOCK_KEY = 0x434C_4B43
+
+
+async def increment_click(db: AsyncSession, link_id: uuid.UUID, shards: int | None = None) -> int:
+    """임의 샤드 1개 가산 — 커밋 전까지 잡히는 행 락은 그 샤드뿐. 반환값은 이번 클릭을 포함한 누적 클릭 수 (동시 클릭만큼 오차 허용)"""
+    shard = random.randrange(max(shards or settings.click_counter_shards, 1))
+    bump = (
+        pg_insert(LinkClickShard)
+        .values(link_id=link_id, shard=shard, count=1)
+        .on_conflict_do_update(
+            index_elements=[LinkClickShard.link_id, LinkClickShard.shard],
+            set_={"count": LinkClickShard.count + 1},
+        )
+        .returning(LinkClickShard.count)
+        .cte("bump")
+    )
+    # 바깥 SELECT는 문장 시작 시점 스냅샷을 보므로 이번 가산은 +1로 더함
+    pending = (
+        select(func.coalesce(func.sum(LinkClickShard.count), 0))
+        .where(LinkClickShard.link_id == link_id)
+        .scalar_subquery()
+    )
+    return await db.scalar(select(Link.click_count + pending + 1).where(Link.id == link_id).add_cte(bump))
+
+
+async def fold_click_shards(db: AsyncSession) -> int:
+    """샤드를 비우며 links.click_count에 합산 (커밋은 호출자) — 갱신한 링크 수, 다른 워커가 실행 중이면 0"""
+    if not await db.scalar(select(func.pg_try_advisory_xact_lock(CLICK_COUNTER_LOCK_KEY))):
+        return 0
+    drained = (
+        delete(LinkClickShard)
+        .returning(LinkClickShard.link_id, LinkClickShard.count)
+        .cte("drained")
+    )
+    totals = (
+        select(drained.c.link_id, func.sum(drained.c.count).label("total"))
+        .group_by(drained.c.link_id)
+        .subquery("totals")
+    )
+    result = await db.execute(
+        update(Link)
+        .where(Link.id == totals.c.link_id)
+        # 클릭은 링크 편집이 아니므로 updated_at(onupdate)을 그대로 유지
+        .values(click_count=Link.click_count + totals.c.total, updated_at=Link.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+async def reconcile_click_counts(db: AsyncSession, user_id: uuid.UUID | None = None) -> int:
+    """click_count = 봇 제외 link_clicks + retention이 접은 daily_link_clicks − 아직 접히지 않은 샤드 — 보정한 링크 수 (커밋은 호출자)"""
+    # 진행 중인 접기가 끝날 때까지 대기 — 같은 스냅샷에서 원본과 샤드를 함께 읽어야 이중 계산이 없음
+    await db.execute(select(func.pg_advisory_xact_lock(CLICK_COUNTER_LOCK_KEY)))
+
+    raw = (
+        select(LinkClick.link_id, func.count().label("n"))
+        .where(LinkClick.is_bot == False)  # noqa: E712
+        .group_by(LinkClick.link_id)
+    )
+    archived = (
+        select(DailyLinkClicks.link_id, func.sum(DailyLinkClicks.click_count).label("n"))
+        .group_by(DailyLinkClicks.link_id)
+    )
+    if user_id is not None:
+        # 집계 서브쿼리 안까지 사용자 조건을 넣어 user_id 인덱스로 해당 사용자 행만 읽음
+        raw = raw.where(LinkClick.user_id == user_id)
+        archived = archived.where(DailyLinkClicks.user_id == user_id)
+    raw = raw.subquery("raw")
+    archived = archived.subquery("archived")
+    pending = (
+        select(LinkClickShard.link_id, func.sum(LinkClickShard.count).label("n"))
+        .group_by(LinkClickShard.link_id)
+        .subquery("pending")
+    )
+    target = aliased(Link, name="target")
+    expected = (
+        select(
+            target.id,
+            (
+                func.coalesce(raw.c.n, 0) + func.coalesce(archived.c.n, 0) - func.coalesce(pending.c.n, 0)
+            ).label("total"),
+        )
+        .outerjoin(raw, raw.c.link_id == target.id)
+        .outerjoin(archived, archived.c.link_id == target.id)
+        .outerjoin(pending, pending.c.link_id == target.id)
+    )
+    if user_id is not None:
+        expected = expected.where(target.user_id == user_id)
+    expected = expected.subquery("expected")
+
+    result = await db.execute(
+        update(Link)
+        .where(Link.id == expected.c.id, Link.click_count.is_distinct_from(expected.c.total))
+        .values(click_count=expected.c.total, updated_at=Link.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+async def run_click_fold_forever(interval: float) -> None:  # pragma: no cover
+    """lifespan 백그라운드 task — interval마다 샤드를 links.click_count에 접음 (links 행 락은 링크당 주기마다 1번)"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with AsyncSessionLocal() as db:
+                await fold_click_shards(db)
+                await db.commit()
+        except Exception:
+            logger.exception("클릭 카운터 샤드 접기 실패")
+
+
+async def _reconcile(user_id: uuid.UUID | None) -> int:  # pragma: no cover
+    async with AsyncSessionLocal() as db:
+        corrected = await reconcile_click_counts(db, user_id)
+        await db.commit()
+    return corrected
+
+
+def main(argv: list[str] | None = None) -> int:  # pragma: no cover
+    parser = argparse.ArgumentParser(description="link_clicks 원본 기준으로 links.click_count 드리프트 보정")
+    parser.add_argument("--user-id", type=uuid.UUID, default=None, help="특정 사용자의 링크만 보정")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    corrected = asyncio.run(_reconcile(args.user_id))
+    print(f"corrected={corrected}")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
@@ -0,0 +1,70 @@
+# 파일 목적: raw 분석 이벤트 export 인코더 (CSV / NDJSON, 선택적 gzip)
+# 주요 기능: dict row 비동기 스트림 → 일정 크기 bytes 청크 스트림 (전체 결과를 메모리에 올리지 않음)
+# 사용 방법: from app.services.export import encode_rows; StreamingResponse(encode_rows(rows, "csv", fields, compress=True))
+
+import csv
+import io
+import json
+import zlib
+from collections.abc import AsyncIterator
+
+EXPORT_FORMATS = {"csv", "ndjson"}
+
+# 너무 잦은 send를 피하기 위해 이 크기만큼 모아서 내보냄
+CHUNK_SIZE = 64 * 1024
+
+CLICK_EXPORT_FIELDS = ("id", "clicked_at", "link_id", "title", "visitor_ip", "user_agent")
+VIEW_EXPORT_FIELDS = ("id", "viewed_at", "viewer_ip", "user_agent")
+
+
+def media_type(fmt: str, compress: bool) -> str:
+    if compress:
+        return "application/gzip"
+    return "text/csv; charset=utf-8" if fmt == "csv" else "application/x-ndjson"
+
+
+def filename(kind: str, fmt: str, compress: bool) -> str:
+    return f"{kind}.{fmt}" + (".gz" if compress else "")
+
+
+async def _encode_text(
+    rows: AsyncIterator[dict], fmt: str, fields: tuple[str, ...]
+) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields, extrasaction="ignore") if fmt == "csv" else None
+    if writer is not None:
+        writer.writeheader()
+
+    async for row in rows:
+        if writer is not None:
+            writer.writerow(row)
+        else:
+            buffer.write(json.dumps(row, ensure_ascii=False, separators=(",", ":")))
+            buffer.write("\n")
+        if buffer.tell() >= CHUNK_SIZE:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+async def encode_rows(
+    rows: AsyncIterator[dict],
+    fmt: str,
+    fields: tuple[str, ...],
+    compress: bool = False,
+) -> AsyncIterator[bytes]:
+    if not compress:
+        async for chunk in _encode_text(rows, fmt, fields):
+            yield chunk
+        return
+
+    # wbits=31 → gzip 헤더/트레일러 포함 스트림 압축
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    async for chunk in _encode_text(rows, fmt, fields):
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
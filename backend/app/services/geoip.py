@@ -0,0 +1,161 @@
+# 파일 목적: 로컬 GeoIP 데이터베이스(MaxMind .mmdb, 메모리 맵)로 방문자 IP → 국가/지역 보강 (네트워크 조회 없음)
+# 주요 기능: GeoIPResolver.lookup(IP → GeoLocation, IPv4 /24·IPv6 /48 prefix 단위 LRU), stored_ip(설정에 따라 원본/절삭/미저장),
+#           record_daily_geo(daily_geo_stats 국가별 임의 샤드 가산 upsert)
+# 사용 방법: location = geoip_resolver.lookup(client_ip); await record_daily_geo(db, user_id, location.country, "view")
+
+import ipaddress
+import logging
+import random
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Literal, NamedTuple
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.analytics import DailyGeoStats
+
+try:
+    import maxminddb
+except ImportError:  # pragma: no cover - 선택 의존성, 없으면 보강 비활성
+    maxminddb = None
+
+logger = logging.getLogger(__name__)
+
+# 같은 /24(IPv6는 /48) 안의 주소는 GeoIP DB에서도 사실상 같은 위치 — 캐시 키이자 절삭 저장 단위
+IPV4_PREFIX = 24
+IPV6_PREFIX = 48
+
+IPNetwork = ipaddress.IPv4Network | ipaddress.IPv6Network
+
+
+class GeoLocation(NamedTuple):
+    country: str | None = None  # ISO 3166-1 alpha-2
+    region: str | None = None
+
+
+UNKNOWN_LOCATION = GeoLocation()
+
+
+def ip_prefix(ip: str | None) -> IPNetwork | None:
+    if not ip:
+        return None
+    try:
+        addr = ipaddress.ip_address(ip)
+    except ValueError:
+        return None
+    if addr.version == 6 and addr.ipv4_mapped is not None:
+        addr = addr.ipv4_mapped
+    prefix = IPV4_PREFIX if addr.version == 4 else IPV6_PREFIX
+    return ipaddress.ip_network(f"{addr}/{prefix}", strict=False)
+
+
+def stored_ip(ip: str | None, mode: str | None = None) -> str | None:
+    """ANALYTICS_IP_STORAGE에 따라 raw 이벤트에 남길 IP — 위치 보강은 저장 전 원본 IP로 이미 끝난 상태"""
+    mode = mode or settings.analytics_ip_storage
+    if mode == "none" or not ip:
+        return None
+    if mode == "truncated":
+        network = ip_prefix(ip)
+        return str(network.network_address) if network is not None else None
+    return ip
+
+
+def _location_from_record(record: dict | None) -> GeoLocation:
+    if not record:
+        return UNKNOWN_LOCATION
+    country = (record.get("country") or record.get("registered_country") or {}).get("iso_code")
+    region = None
+    subdivisions = record.get("subdivisions") or []
+    if subdivisions:
+        first = subdivisions[0]
+        region = (first.get("names") or {}).get("en") or first.get("iso_code")
+    return GeoLocation(country=country, region=region[:100] if region else None)
+
+
+def _open_reader(path: str):
+    if not path:
+        return None
+    if maxminddb is None:
+        logger.warning("maxminddb 패키지가 설치되지 않아 GeoIP 보강을 비활성화합니다.")
+        return None
+    try:
+        # MODE_MMAP: 파일을 메모리 맵으로 열어 워커 간 페이지 캐시를 공유하고 조회마다 파일 I/O가 없음
+        return maxminddb.open_database(path, maxminddb.MODE_MMAP)
+    except (OSError, ValueError, RuntimeError):
+        logger.warning("GeoIP 데이터베이스를 열 수 없어 보강을 비활성화합니다: %s", path, exc_info=True)
+        return None
+
+
+class GeoIPResolver:
+    """IP prefix → GeoLocation LRU. DB 파일은 첫 조회 시 한 번만 열고, 열 수 없으면 항상 UNKNOWN_LOCATION"""
+
+    def __init__(self, path: str = "", maxsize: int = 8192, reader=None):
+        self._path = path
+        self._maxsize = maxsize
+        self._reader = reader
+        self._opened = reader is not None
+        self._locations: OrderedDict[IPNetwork, GeoLocation] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._locations)
+
+    def clear(self) -> None:
+        self._locations.clear()
+
+    def _get_reader(self):
+        if not self._opened:
+            self._opened = True
+            self._reader = _open_reader(self._path)
+        return self._reader
+
+    def lookup(self, ip: str | None) -> GeoLocation:
+        network = ip_prefix(ip)
+        if network is None:
+            return UNKNOWN_LOCATION
+        location = self._locations.get(network)
+        if location is not None:
+            self._locations.move_to_end(network)
+            return location
+
+        reader = self._get_reader()
+        if reader is None:
+            return UNKNOWN_LOCATION
+        try:
+            location = _location_from_record(reader.get(ip))
+        except ValueError:
+            return UNKNOWN_LOCATION
+        # 사설망 등 DB에 없는 주소도 UNKNOWN으로 캐시해 반복 조회를 막음
+        self._locations[network] = location
+        if len(self._locations) > self._maxsize:
+            self._locations.popitem(last=False)
+        return location
+
+
+async def record_daily_geo(
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    country: str | None,
+    kind: Literal["view", "click"],
+    shards: int | None = None,
+) -> None:
+    # record_daily_source와 같은 방식(임의 샤드 가산) — 국가 분포 조회는 raw 이벤트가 아닌 이 집계만 읽음
+    column = "view_count" if kind == "view" else "click_count"
+    stmt = pg_insert(DailyGeoStats).values(
+        user_id=user_id,
+        day=datetime.now(timezone.utc).date(),
+        country=country or "",
+        shard=random.randrange(max(shards or settings.daily_stats_shards, 1)),
+        **{column: 1},
+    )
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[DailyGeoStats.user_id, DailyGeoStats.day, DailyGeoStats.country, DailyGeoStats.shard],
+            set_={column: getattr(DailyGeoStats, column) + 1},
+        )
+    )
+
+
+geoip_resolver = GeoIPResolver(settings.geoip_database_path, settings.geoip_cache_size)
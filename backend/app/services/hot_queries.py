@@ -0,0 +1,63 @@
+# 파일 목적: 공개 경로의 핫 쿼리 — 라우터와 기동 사전 준비가 같은 문장을 써서 prepared statement 캐시 키(SQL 문자열)가 일치하도록
+# 주요 기능: active_user_by_username / active_link_by_id / recent_view(방문·클릭 기록 경로의 조회 문장),
+#           prepare_hot_statements(연결마다 공개 프로필 조회·클릭 링크 조회·방문 INSERT를 실행해 prepare — 호출자가 롤백)
+# 사용 방법: await db.execute(active_link_by_id(link_id))  /  await warm_pool(n, prepare=prepare_hot_statements)
+
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import Select, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.analytics import ProfileView
+from app.models.link import Link
+from app.models.user import User
+from app.services.profile import load_public_timeline
+
+# 조회 문장은 식별자 값과 무관하게 prepare 되므로 존재하지 않는 값으로 실행
+_NIL_UUID = uuid.UUID(int=0)
+
+
+def active_user_by_username(username: str) -> Select:
+    return select(User).where(User.username == username, User.is_active == True)  # noqa: E712
+
+
+def active_link_by_id(link_id: uuid.UUID) -> Select:
+    return select(Link).where(Link.id == link_id, Link.is_active == True)  # noqa: E712
+
+
+def recent_view(user_id: uuid.UUID, viewer_ip: str, since: datetime) -> Select:
+    return select(ProfileView).where(
+        ProfileView.user_id == user_id,
+        # 문자열 그대로 비교하면 asyncpg 바인드가 $n::VARCHAR로 캐스팅돼 inet = varchar 연산자 오류 — 컬럼 타입으로 바인드
+        ProfileView.viewer_ip == literal(viewer_ip, ProfileView.viewer_ip.type),
+        ProfileView.viewed_at >= since,
+    )
+
+
+async def prepare_hot_statements(db: AsyncSession) -> None:
+    """배포 직후 첫 요청들이 연결마다 parse/plan 왕복을 치르지 않도록 요청 경로와 같은 SQL을 한 번씩 실행 (커밋하지 않음 — 호출자가 롤백)"""
+    await db.execute(active_user_by_username(""))
+    await db.execute(active_link_by_id(_NIL_UUID))
+    await db.execute(recent_view(_NIL_UUID, "0.0.0.0", datetime.now(timezone.utc)))
+
+    # 공개 프로필의 링크 조회와 방문 INSERT는 실제 사용자가 있어야 끝까지 실행됨 (빈 DB면 생략)
+    username = await db.scalar(
+        select(User.username).where(User.is_active == True).limit(1)  # noqa: E712
+    )
+    if username is None:
+        return
+    timeline = await load_public_timeline(db, username)
+    # 라우터와 같은 컬럼 집합을 지정해야 ORM이 같은 INSERT 문장을 만듦
+    db.add(
+        ProfileView(
+            user_id=timeline.user_id,
+            viewer_ip=None,
+            country=None,
+            region=None,
+            user_agent_id=None,
+            traffic_source_id=None,
+            is_bot=False,
+        )
+    )
+    await db.flush()
@@ -1,23 +1,28 @@
 # 파일 목적: 링크 CRUD 비즈니스 로직
-# 주요 기능: list_links, create_link, update_link, delete_link, reorder_links, toggle_link
+# 주요 기능: list_links(컬럼 projection Row 반환), create_link, update_link, delete_link, reorder_links, toggle_link
+#           (변경 커밋 후 해당 사용자의 공개 프로필 캐시 무효화 — 무효화 버스로 다른 워커에도 전파)
 # 사용 방법: from app.services.link import create_link, list_links
 
 import uuid
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import Row, select, func
 from app.models.link import Link
 from app.schemas.link import CreateLinkRequest, UpdateLinkRequest, ReorderItem
 from app.core.exceptions import NotFoundException, ForbiddenException
+from app.services.profile_timeline import public_profile_cache
 from fastapi import HTTPException, status
 
 MAX_LINKS_PER_USER = 50
 
+# 읽기 전용 조회용 컬럼 목록 — ORM 인스턴스(identity map, 변경 추적) 대신 Row(named tuple)로 받음
+LINK_COLUMNS = tuple(Link.__table__.columns)
 
-async def list_links(db: AsyncSession, user_id: uuid.UUID) -> list[Link]:
+
+async def list_links(db: AsyncSession, user_id: uuid.UUID) -> list[Row]:
     result = await db.execute(
-        select(Link).where(Link.user_id == user_id).order_by(Link.position)
+        select(*LINK_COLUMNS).where(Link.user_id == user_id).order_by(Link.position)
     )
-    return list(result.scalars().all())
+    return list(result.all())
 
 
 async def create_link(db: AsyncSession, user_id: uuid.UUID, data: CreateLinkRequest) -> Link:
@@ -55,6 +60,7 @@ async def create_link(db: AsyncSession, user_id: uuid.UUID, data: CreateLinkRequ
     db.add(link)
     await db.commit()
     await db.refresh(link)
+    public_profile_cache.invalidate_user(user_id)
     return link
 
 
@@ -78,6 +84,7 @@ async def update_link(
 
     await db.commit()
     await db.refresh(link)
+    public_profile_cache.invalidate_user(user_id)
     return link
 
 
@@ -92,13 +99,14 @@ async def delete_link(db: AsyncSession, link_id: uuid.UUID, user_id: uuid.UUID)
 
     await db.delete(link)
     await db.commit()
+    public_profile_cache.invalidate_user(user_id)
 
 
 async def reorder_links(
     db: AsyncSession,
     user_id: uuid.UUID,
     items: list[ReorderItem],
-) -> list[Link]:
+) -> list[Row]:
     for item in items:
         result = await db.execute(
             select(Link).where(Link.id == item.id, Link.user_id == user_id)
@@ -108,6 +116,7 @@ async def reorder_links(
             link.position = item.position
 
     await db.commit()
+    public_profile_cache.invalidate_user(user_id)
     return await list_links(db, user_id)
 
 
@@ -123,4 +132,5 @@ async def toggle_link(db: AsyncSession, link_id: uuid.UUID, user_id: uuid.UUID)
     link.is_active = not link.is_active
     await db.commit()
     await db.refresh(link)
+    public_profile_cache.invalidate_user(user_id)
     return link
@@ -0,0 +1,258 @@
+# 파일 목적: 공개 프로필 JSON 정적 사전 렌더링 — nginx가 try_files로 직접 서빙, 파일이 없으면 백엔드로 fallback
+# 주요 기능: write_profile_files({dir}/{username}.json + .json.gz, brotli 설치 시 .json.br — 임시 파일 후 원자적 교체), remove_profile_files,
+#           ProfileRenderer(프로필/링크 변경 알림·공개 조회 미스·예약 경계/최대 보존 시간 도달 시 재렌더링 대기열, 짧은 debounce로 연속 변경 병합),
+#           run_prerender_forever(lifespan task), render_all(전체 활성 사용자 렌더링 + 사라진 사용자 파일 정리 — 배포 시 1회)
+# 사용 방법: python -m app.services.prerender --dir /srv/prerender  (또는 PUBLIC_PROFILE_PRERENDER_DIR 설정 시 lifespan에서 증분 렌더링)
+
+import argparse
+import asyncio
+import gzip
+import logging
+import os
+import re
+import uuid
+from collections.abc import Iterable
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.exceptions import NotFoundException
+from app.models.link import Link
+from app.models.user import User
+from app.schemas.profile import PublicProfileResponse
+from app.services import profile as profile_service
+from app.services.profile_timeline import BoundaryScheduler, public_profile_cache
+
+try:  # pragma: no cover - 선택 의존성
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# 가입 시 username 검증 규칙과 같음 — 파일 이름/nginx location 정규식으로 그대로 쓸 수 있는 값만 렌더링
+_SAFE_USERNAME = re.compile(r"[A-Za-z0-9_]{1,30}")
+
+# 변경 알림 후 잠시 기다렸다가 렌더링 — 순서 변경 등 연속 요청을 한 번의 쓰기로 병합
+_DEBOUNCE_SECONDS = 0.5
+
+PROFILE_SUFFIXES = (".json", ".json.gz", ".json.br")
+
+
+def render_profile_json(response: dict[str, Any]) -> bytes:
+    # GET /api/public/{username} 응답과 같은 스키마로 직렬화
+    return PublicProfileResponse.model_validate(response, from_attributes=True).model_dump_json().encode()
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    # nginx가 쓰다 만 파일을 읽지 않도록 같은 디렉터리에서 rename
+    os.replace(tmp, path)
+
+
+def write_profile_files(directory: str, username: str, body: bytes) -> None:
+    if not _SAFE_USERNAME.fullmatch(username):
+        raise ValueError(f"사전 렌더링할 수 없는 username: {username!r}")
+    base = os.path.join(directory, username)
+    # gzip_static이 .gz를 먼저 찾으므로 원본보다 먼저 교체
+    _atomic_write(base + ".json.gz", gzip.compress(body, compresslevel=9, mtime=0))
+    if brotli is not None:
+        _atomic_write(base + ".json.br", brotli.compress(body, quality=11))
+    _atomic_write(base + ".json", body)
+
+
+def remove_profile_files(directory: str, username: str) -> None:
+    if not _SAFE_USERNAME.fullmatch(username):
+        return
+    # 원본을 먼저 지워야 try_files가 즉시 백엔드로 넘어감
+    for suffix in PROFILE_SUFFIXES:
+        try:
+            os.remove(os.path.join(directory, username + suffix))
+        except FileNotFoundError:
+            pass
+
+
+class ProfileRenderer:
+    """변경된 사용자만 다시 렌더링 — 요청 경로에서는 대기열에 넣기만 하고, 쓰기는 백그라운드 task가 스레드에서 수행"""
+
+    def __init__(self, directory: str, max_age_seconds: float = 300.0):
+        self.directory = directory
+        self.max_age_seconds = max_age_seconds
+        self.schedule = BoundaryScheduler()
+        self._dirty: set[uuid.UUID] = set()
+        self._dirty_usernames: set[str] = set()
+        # 렌더링한 사용자 id → username (계정 삭제 시 지울 파일 이름)
+        self._rendered: dict[uuid.UUID, str] = {}
+        self._rendered_usernames: set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._rendered)
+
+    @property
+    def pending(self) -> int:
+        return len(self._dirty) + len(self._dirty_usernames)
+
+    def mark_dirty(self, user_id: uuid.UUID, username: str | None = None) -> None:
+        """PublicProfileCache 무효화 리스너 — 서비스 계층의 링크/프로필 변경마다 호출됨"""
+        if username is not None and user_id not in self._rendered:
+            # 이 워커가 렌더링한 적 없는 사용자도 삭제 시 파일 이름을 알 수 있도록
+            self._rendered[user_id] = username
+        self._dirty.add(user_id)
+        self.schedule.wake()
+
+    def ensure_rendered(self, username: str) -> None:
+        """공개 조회가 백엔드까지 왔다면 파일이 없다는 뜻 — 아직 렌더링하지 않은 사용자면 대기열에 추가"""
+        if username not in self._rendered_usernames and _SAFE_USERNAME.fullmatch(username):
+            self._dirty_usernames.add(username)
+            self.schedule.wake()
+
+    async def bootstrap(self, db: AsyncSession) -> int:
+        """기동 시 예약 경계가 남은 사용자를 다음 경계 시각에 재렌더링하도록 등록 (다른 프로세스가 렌더링한 파일 포함)"""
+        now = datetime.now(timezone.utc)
+        next_start = func.min(Link.scheduled_start).filter(Link.scheduled_start > now)
+        next_end = func.min(Link.scheduled_end).filter(Link.scheduled_end > now)
+        result = await db.execute(
+            select(Link.user_id, next_start, next_end)
+            .where(
+                Link.is_active == True,  # noqa: E712
+                or_(Link.scheduled_start > now, Link.scheduled_end > now),
+            )
+            .group_by(Link.user_id)
+        )
+        rows = result.all()
+        for user_id, start, end in rows:
+            self.schedule.schedule(user_id, min(at for at in (start, end) if at is not None))
+        return len(rows)
+
+    def take_pending(self, now: datetime | None = None) -> tuple[set[uuid.UUID], set[str]]:
+        due = self.schedule.pop_due(now or datetime.now(timezone.utc))
+        user_ids = self._dirty | set(due)
+        usernames = self._dirty_usernames - self._rendered_usernames
+        self._dirty = set()
+        self._dirty_usernames = set()
+        return user_ids, usernames
+
+    async def render_user(self, db: AsyncSession, user_id: uuid.UUID) -> bool:
+        username = (
+            await db.execute(
+                select(User.username).where(User.id == user_id, User.is_active == True)  # noqa: E712
+            )
+        ).scalar_one_or_none()
+        if username is None:
+            await self._remove(user_id)
+            return False
+        return await self.render_username(db, username)
+
+    async def render_username(self, db: AsyncSession, username: str) -> bool:
+        try:
+            timeline = await profile_service.load_public_timeline(db, username)
+        except NotFoundException:
+            await asyncio.to_thread(remove_profile_files, self.directory, username)
+            self._rendered_usernames.discard(username)
+            return False
+        body = render_profile_json(timeline.response)
+        await asyncio.to_thread(write_profile_files, self.directory, username, body)
+        self._rendered[timeline.user_id] = username
+        self._rendered_usernames.add(username)
+        # 다음 예약 경계, 또는 click_count 등 비편집 값 갱신을 위한 최대 보존 시간 중 이른 쪽에 다시 렌더링
+        at = timeline.valid_until
+        if self.max_age_seconds > 0:
+            refresh_at = datetime.now(timezone.utc) + timedelta(seconds=self.max_age_seconds)
+            at = refresh_at if at is None else min(at, refresh_at)
+        self.schedule.schedule(timeline.user_id, at)
+        return True
+
+    async def _remove(self, user_id: uuid.UUID) -> None:
+        self.schedule.cancel(user_id)
+        username = self._rendered.pop(user_id, None)
+        if username is not None:
+            self._rendered_usernames.discard(username)
+            await asyncio.to_thread(remove_profile_files, self.directory, username)
+
+    async def flush(self, db: AsyncSession, now: datetime | None = None) -> int:
+        user_ids, usernames = self.take_pending(now)
+        rendered = 0
+        for user_id in user_ids:
+            try:
+                rendered += await self.render_user(db, user_id)
+            except Exception:
+                logger.exception("공개 프로필 사전 렌더링 실패: %s", user_id)
+        for username in usernames:
+            try:
+                rendered += await self.render_username(db, username)
+            except Exception:
+                logger.exception("공개 프로필 사전 렌더링 실패: %s", username)
+        return rendered
+
+    def start(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        public_profile_cache.add_listener(self.mark_dirty)
+
+    def stop(self) -> None:
+        public_profile_cache.remove_listener(self.mark_dirty)
+
+
+profile_renderer = (
+    ProfileRenderer(settings.public_profile_prerender_dir, settings.public_profile_prerender_max_age_seconds)
+    if settings.public_profile_prerender_dir
+    else None
+)
+
+
+async def run_prerender_forever(renderer: ProfileRenderer) -> None:  # pragma: no cover
+    """lifespan 백그라운드 task — 변경 알림 또는 예약 시각에 깨어나 대기열의 사용자만 다시 렌더링"""
+    try:
+        async with AsyncSessionLocal() as db:
+            await renderer.bootstrap(db)
+    except Exception:
+        logger.exception("공개 프로필 사전 렌더링 예약 초기화 실패")
+    while True:
+        await renderer.schedule.wait()
+        await asyncio.sleep(_DEBOUNCE_SECONDS)
+        try:
+            async with AsyncSessionLocal() as db:
+                await renderer.flush(db)
+        except Exception:
+            logger.exception("공개 프로필 사전 렌더링 실패")
+
+
+async def render_all(db: AsyncSession, renderer: ProfileRenderer) -> tuple[int, int]:
+    """전체 활성 사용자 렌더링 후 디렉터리에 남은(삭제/비활성) 사용자 파일 정리 — (렌더링 수, 삭제 수)"""
+    result = await db.execute(select(User.username).where(User.is_active == True))  # noqa: E712
+    usernames = [name for name in result.scalars().all() if _SAFE_USERNAME.fullmatch(name)]
+    rendered = 0
+    for username in usernames:
+        rendered += await renderer.render_username(db, username)
+    removed = 0
+    for stale in _stale_usernames(os.listdir(renderer.directory), set(usernames)):
+        remove_profile_files(renderer.directory, stale)
+        removed += 1
+    return rendered, removed
+
+
+def _stale_usernames(filenames: Iterable[str], active: set[str]) -> set[str]:
+    return {name[: -len(".json")] for name in filenames if name.endswith(".json")} - active
+
+
+async def _main() -> None:  # pragma: no cover
+    parser = argparse.ArgumentParser(description="공개 프로필 JSON 정적 사전 렌더링")
+    parser.add_argument("--dir", default=settings.public_profile_prerender_dir)
+    args = parser.parse_args()
+    if not args.dir:
+        parser.error("--dir 또는 PUBLIC_PROFILE_PRERENDER_DIR가 필요합니다.")
+
+    renderer = ProfileRenderer(args.dir)
+    os.makedirs(args.dir, exist_ok=True)
+    async with AsyncSessionLocal() as db:
+        rendered, removed = await render_all(db, renderer)
+    print(f"rendered={rendered} removed={removed} dir={args.dir}")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    asyncio.run(_main())
@@ -1,13 +1,19 @@
 # 파일 목적: 프로필 조회 및 수정 비즈니스 로직
-# 주요 기능: get_my_profile, update_profile, get_public_profile(username→활성 링크 포함, 예약 필터링)
+# 주요 기능: get_my_profile, update_profile, get_public_profile(username→활성 링크 포함, 컬럼 projection 조회,
+#           예약 필터링은 public_profile_cache 타임라인으로 — 캐시 히트 시 DB 조회 없음, 미스 시 시각 조건 없는 단순 쿼리),
+#           load_public_timeline(캐시를 거치지 않고 타임라인 조회 — 정적 사전 렌더러용),
+#           warm_public_profiles(기동 시 최근 조회가 많은 프로필을 캐시에 미리 적재)
 # 사용 방법: from app.services.profile import get_my_profile, get_public_profile
 
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, or_
+from sqlalchemy import func, select
+from app.models.analytics import ProfileView
 from app.models.user import User
 from app.models.link import Link
+from app.services.link import LINK_COLUMNS
+from app.services.profile_timeline import ProfileTimeline, public_profile_cache
 from app.schemas.profile import UpdateProfileRequest
 from app.core.exceptions import NotFoundException
 from fastapi import HTTPException
@@ -24,6 +30,19 @@ _ALLOWED_PROFILE_FIELDS = {
     "bg_color",
 }
 
+# 공개 프로필 응답에 쓰이는 User 컬럼
+_PUBLIC_USER_COLUMNS = (
+    User.id,
+    User.username,
+    User.display_name,
+    User.bio,
+    User.avatar_url,
+    User.social_links,
+    User.seo_settings,
+    User.theme,
+    User.bg_color,
+)
+
 
 async def get_my_profile(db: AsyncSession, user_id: uuid.UUID) -> User:
     result = await db.execute(select(User).where(User.id == user_id))
@@ -61,31 +80,64 @@ async def update_profile(
 
     await db.commit()
     await db.refresh(user)
+    public_profile_cache.invalidate_user(user_id)
     return user
 
 
 async def get_public_profile(db: AsyncSession, username: str) -> dict:
+    cached = public_profile_cache.get(username)
+    if cached is not None:
+        return cached
+    return public_profile_cache.put(username, await load_public_timeline(db, username))
+
+
+async def warm_public_profiles(db: AsyncSession, limit: int, window: timedelta = timedelta(days=1)) -> int:
+    """최근 window 동안 조회가 많은 활성 사용자 limit명을 캐시에 적재 — 배포 직후 첫 요청들이 모두 미스로 DB에 몰리지 않도록"""
+    if limit <= 0:
+        return 0
+    since = datetime.now(timezone.utc) - window
     result = await db.execute(
-        select(User).where(User.username == username, User.is_active == True)  # noqa: E712
+        select(User.username)
+        .join(ProfileView, ProfileView.user_id == User.id)
+        .where(
+            ProfileView.viewed_at >= since,
+            ProfileView.is_bot == False,  # noqa: E712
+            User.is_active == True,  # noqa: E712
+        )
+        .group_by(User.id, User.username)
+        .order_by(func.count().desc())
+        .limit(limit)
     )
-    user = result.scalar_one_or_none()
+    warmed = 0
+    for username in result.scalars().all():
+        if public_profile_cache.get(username) is None:
+            public_profile_cache.put(username, await load_public_timeline(db, username))
+            warmed += 1
+    return warmed
+
+
+async def load_public_timeline(db: AsyncSession, username: str) -> ProfileTimeline:
+    # 공개 응답에 필요한 컬럼만 조회 (password_hash, email 등은 읽지 않음)
+    result = await db.execute(
+        select(*_PUBLIC_USER_COLUMNS).where(
+            User.username == username, User.is_active == True  # noqa: E712
+        )
+    )
+    user = result.one_or_none()
     if not user:
         raise NotFoundException(f"'{username}' 사용자를 찾을 수 없습니다.")
 
-    now = datetime.now(timezone.utc)
+    # 예약 조건은 SQL이 아닌 타임라인에서 평가 — 예약 전/만료 링크까지 받아 두고 경계마다 DB 없이 활성 집합 재계산
     links_result = await db.execute(
-        select(Link)
+        select(*LINK_COLUMNS)
         .where(
             Link.user_id == user.id,
             Link.is_active == True,  # noqa: E712
-            or_(Link.scheduled_start == None, Link.scheduled_start <= now),  # noqa: E711
-            or_(Link.scheduled_end == None, Link.scheduled_end > now),  # noqa: E711
         )
         .order_by(Link.position)
     )
-    links = list(links_result.scalars().all())
 
-    return {
+    profile = {
         "username": user.username,
         "display_name": user.display_name,
         "bio": user.bio,
@@ -94,5 +146,5 @@ async def get_public_profile(db: AsyncSession, username: str) -> dict:
         "seo_settings": user.seo_settings,
         "theme": user.theme,
         "bg_color": user.bg_color,
-        "links": links,
     }
+    return ProfileTimeline.build(user.id, profile, links_result.all())
@@ -0,0 +1,263 @@
+# 파일 목적: 공개 프로필 캐시 — 사용자별 예약 경계(schedule timeline)를 미리 계산해 다음 경계 전까지 "현재 활성 링크" 응답 재사용
+# 주요 기능: schedule_boundaries(scheduled_start/end 정렬 목록), active_links(시각 기준 필터), ProfileTimeline(프로필 + 링크 전체 + 경계),
+#           BoundaryScheduler(키별 다음 경계 최소 힙 + 가장 이른 경계까지 대기), PublicProfileCache(username → 타임라인 LRU,
+#           경계가 지나면 DB 없이 활성 집합만 재계산, TTL로 다른 워커의 변경 수렴, 사용자 단위 무효화 + 무효화 리스너, 무효화 버스로 워커 간 전파),
+#           run_timeline_scheduler_forever(lifespan task — 가장 이른 경계에 깨어나 해당 항목을 미리 재계산)
+# 사용 방법: from app.services.profile_timeline import public_profile_cache; profile = public_profile_cache.get(username)
+
+import asyncio
+import bisect
+import heapq
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable, Sequence
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+from app.core.config import settings
+from app.core.invalidation import invalidation_bus
+
+logger = logging.getLogger(__name__)
+
+# 경계가 없어도 TTL 만료 항목 정리를 위해 스케줄러가 최소 이 주기로 깨어남
+_MAX_SCHEDULER_SLEEP = 60.0
+
+
+def schedule_boundaries(links: Iterable[Any]) -> tuple[datetime, ...]:
+    """활성 집합이 바뀔 수 있는 모든 시각(시작/종료)의 정렬된 목록"""
+    points = set()
+    for link in links:
+        if link.scheduled_start is not None:
+            points.add(link.scheduled_start)
+        if link.scheduled_end is not None:
+            points.add(link.scheduled_end)
+    return tuple(sorted(points))
+
+
+def active_links(links: Iterable[Any], now: datetime) -> list[Any]:
+    # 기존 쿼리 조건과 동일: start <= now < end
+    return [
+        link
+        for link in links
+        if (link.scheduled_start is None or link.scheduled_start <= now)
+        and (link.scheduled_end is None or link.scheduled_end > now)
+    ]
+
+
+@dataclass(slots=True)
+class ProfileTimeline:
+    user_id: uuid.UUID
+    profile: dict[str, Any]  # links 제외 프로필 필드
+    links: tuple[Any, ...]  # is_active 링크 전체 (position 순, 예약 무관)
+    boundaries: tuple[datetime, ...]
+    response: dict[str, Any] | None = None  # 현재 활성 집합으로 만든 응답
+    valid_until: datetime | None = None  # 다음 경계 (None이면 더 이상 바뀌지 않음)
+    loaded_at: float = 0.0
+
+    @classmethod
+    def build(
+        cls,
+        user_id: uuid.UUID,
+        profile: dict[str, Any],
+        links: Sequence[Any],
+        now: datetime | None = None,
+    ) -> "ProfileTimeline":
+        timeline = cls(user_id, profile, tuple(links), schedule_boundaries(links))
+        timeline.rebuild(now or datetime.now(timezone.utc))
+        return timeline
+
+    def rebuild(self, now: datetime) -> None:
+        self.response = {**self.profile, "links": active_links(self.links, now)}
+        index = bisect.bisect_right(self.boundaries, now)
+        self.valid_until = self.boundaries[index] if index < len(self.boundaries) else None
+
+
+class BoundaryScheduler:
+    """키 → 다음 처리 시각. 힙의 오래된 항목은 꺼낼 때 건너뛰고, 쌓이면 현재 예약 기준으로 다시 만듦"""
+
+    def __init__(self) -> None:
+        self._due: dict[Hashable, float] = {}
+        self._heap: list[tuple[float, Hashable]] = []
+        self._wakeup = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def clear(self) -> None:
+        self._due.clear()
+        self._heap.clear()
+        # 실행 중 비우면(무효화 버스의 전체 flush) 이전 Event를 기다리던 스케줄러를 깨워 새 Event로 다시 대기하게 함
+        self._wakeup.set()
+        # 모듈 전역 캐시의 Event가 이전 이벤트 루프/테스트에서 set 된 채 남지 않도록
+        self._wakeup = asyncio.Event()
+
+    def schedule(self, key: Hashable, at: datetime | None) -> None:
+        if at is None:
+            self.cancel(key)
+            return
+        ts = at.timestamp()
+        if self._due.get(key) == ts:
+            return
+        self._due[key] = ts
+        if not self._heap or ts < self._heap[0][0]:
+            self._wakeup.set()
+        heapq.heappush(self._heap, (ts, key))
+        if len(self._heap) > 2 * len(self._due) + 64:
+            # 재예약/취소로 쌓인 죽은 항목 정리 — 힙 크기를 예약 수에 비례하게 유지
+            self._heap = [(at, k) for k, at in self._due.items()]
+            heapq.heapify(self._heap)
+
+    def cancel(self, key: Hashable) -> None:
+        self._due.pop(key, None)
+
+    def next_at(self) -> float | None:
+        while self._heap and self._due.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: datetime) -> list[Hashable]:
+        due = []
+        cutoff = now.timestamp()
+        while (at := self.next_at()) is not None and at <= cutoff:
+            _, key = heapq.heappop(self._heap)
+            del self._due[key]
+            due.append(key)
+        return due
+
+    def wake(self) -> None:
+        self._wakeup.set()
+
+    async def wait(self, max_sleep: float = _MAX_SCHEDULER_SLEEP) -> None:
+        """다음 예약 시각까지 대기 — 더 이른 예약이 새로 들어오거나 wake() 되면 즉시 깨어남"""
+        at = self.next_at()
+        timeout = max_sleep if at is None else min(max_sleep, max(0.0, at - time.time()))
+        try:
+            # wait_for와 달리 취소(lifespan 종료)를 삼키지 않고 그대로 전파
+            async with asyncio.timeout(timeout):
+                await self._wakeup.wait()
+        except TimeoutError:
+            pass
+        # 처리 중에 들어온 wake()도 놓치지 않도록 대기 후에 clear
+        self._wakeup.clear()
+
+
+class PublicProfileCache:
+    """username → 타임라인 LRU. 요청은 valid_until 전까지 캐시된 응답을 그대로 반환하고, DB는 미스/TTL 만료 때만 조회"""
+
+    def __init__(
+        self,
+        maxsize: int = 10_000,
+        ttl_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: OrderedDict[str, ProfileTimeline] = OrderedDict()
+        self._usernames: dict[uuid.UUID, str] = {}
+        self.boundaries = BoundaryScheduler()
+        # 프로필/링크 변경 알림 구독자 (user_id, 알려진 경우 username) — 예: 정적 사전 렌더러
+        self._listeners: list[Callable[[uuid.UUID, str | None], None]] = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._usernames.clear()
+        self.boundaries.clear()
+
+    def add_listener(self, listener: Callable[[uuid.UUID, str | None], None]) -> None:
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[uuid.UUID, str | None], None]) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def get(self, username: str, now: datetime | None = None) -> dict[str, Any] | None:
+        if self.maxsize <= 0:
+            return None
+        entry = self._entries.get(username)
+        if entry is None:
+            return None
+        if self._clock() - entry.loaded_at > self.ttl_seconds:
+            self._drop(username)
+            return None
+        now = now or datetime.now(timezone.utc)
+        if entry.valid_until is not None and now >= entry.valid_until:
+            # 경계가 지남 — 스케줄러보다 요청이 먼저 와도 DB 없이 재계산
+            entry.rebuild(now)
+            self.boundaries.schedule(username, entry.valid_until)
+        self._entries.move_to_end(username)
+        return entry.response
+
+    def put(self, username: str, timeline: ProfileTimeline) -> dict[str, Any]:
+        if self.maxsize <= 0:
+            return timeline.response
+        timeline.loaded_at = self._clock()
+        self._drop(username)
+        self._entries[username] = timeline
+        self._usernames[timeline.user_id] = username
+        self.boundaries.schedule(username, timeline.valid_until)
+        while len(self._entries) > self.maxsize:
+            oldest, _ = next(iter(self._entries.items()))
+            self._drop(oldest)
+        return timeline.response
+
+    def invalidate_user(self, user_id: uuid.UUID, username: str | None = None) -> None:
+        """사용자의 프로필/링크가 바뀜 — 캐시 항목을 버리고 구독자에게 알림"""
+        cached = self._usernames.get(user_id)
+        if cached is not None:
+            self._drop(cached)
+        for listener in self._listeners:
+            listener(user_id, username or cached)
+
+    def discard_user(self, user_id: uuid.UUID, username: str | None = None) -> None:
+        """다른 워커의 변경 알림(무효화 버스) — 로컬 항목만 버리고 리스너에는 알리지 않음 (재발행/중복 렌더링 방지)"""
+        cached = self._usernames.get(user_id)
+        if cached is not None:
+            self._drop(cached)
+        if username is not None:
+            self._drop(username)
+
+    def advance(self, now: datetime | None = None) -> list[str]:
+        """경계가 지난 항목의 활성 집합을 미리 재계산 — 재계산된 username 목록 반환"""
+        now = now or datetime.now(timezone.utc)
+        changed = []
+        for username in self.boundaries.pop_due(now):
+            entry = self._entries.get(username)
+            if entry is None:
+                continue
+            entry.rebuild(now)
+            self.boundaries.schedule(username, entry.valid_until)
+            changed.append(username)
+        return changed
+
+    def _drop(self, username: str) -> None:
+        entry = self._entries.pop(username, None)
+        if entry is not None and self._usernames.get(entry.user_id) == username:
+            del self._usernames[entry.user_id]
+        self.boundaries.cancel(username)
+
+
+public_profile_cache = PublicProfileCache(
+    settings.public_profile_cache_size,
+    settings.public_profile_cache_ttl_seconds,
+)
+# 이 워커의 변경은 다른 워커로 발행, 다른 워커의 변경은 로컬 항목만 버림 (알림 유실이 의심되면 전체 비움)
+public_profile_cache.add_listener(invalidation_bus.publish)
+invalidation_bus.add_handler(public_profile_cache.discard_user)
+invalidation_bus.add_flush_handler(public_profile_cache.clear)
+
+
+async def run_timeline_scheduler_forever() -> None:  # pragma: no cover
+    """lifespan 백그라운드 task — 예약 경계 시각에 깨어나 해당 사용자의 활성 링크 집합을 재계산"""
+    while True:
+        await public_profile_cache.boundaries.wait()
+        try:
+            public_profile_cache.advance()
+        except Exception:
+            logger.exception("공개 프로필 예약 경계 재계산 실패")
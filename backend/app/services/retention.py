@@ -0,0 +1,276 @@
+# 파일 목적: raw 분석 이벤트(profile_views, link_clicks) 보존 정책 실행 job
+# 주요 기능: 보존 기간이 지난 행을 배치 단위로 DELETE ... RETURNING → 일별 집계 테이블에 가산 upsert → 날짜별 NDJSON.gz 아카이브,
+#           배치 사이 pause + lock_timeout + SKIP LOCKED로 OLTP 트래픽을 막지 않음, advisory lock으로 워커 간 중복 실행 방지
+# 사용 방법: python -m app.services.retention --days 180  (또는 ANALYTICS_RETENTION_DAYS 설정 시 lifespan에서 주기 실행)
+
+import argparse
+import asyncio
+import gzip
+import json
+import logging
+import os
+from collections import Counter
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import Row, delete, func, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.analytics import DailyLinkClicks, DailyProfileViews, LinkClick, ProfileView
+from app.services.user_agents import user_agent_values
+
+logger = logging.getLogger(__name__)
+
+# get_view_stats가 raw 테이블에서 최대 90일을 조회하므로 그보다 짧게는 지우지 않음
+RETENTION_MIN_DAYS = 90
+
+# 여러 워커의 lifespan task가 동시에 같은 행을 다투지 않도록 배치마다 잡는 트랜잭션 advisory lock 키
+RETENTION_LOCK_KEY = 0x4C4B_5254
+
+# 대기 중인 OLTP 쓰기와 락 경합이 생기면 오래 기다리지 않고 이번 배치를 포기
+BATCH_LOCK_TIMEOUT = "2s"
+
+
+@dataclass
+class RetentionResult:
+    cutoff: datetime
+    views: int = 0
+    clicks: int = 0
+    archived_files: set[str] = field(default_factory=set)
+
+
+def retention_cutoff(days: int, now: datetime | None = None) -> datetime:
+    # 날짜 경계로 내림 — 하루치가 여러 실행에 걸쳐 쪼개져 접히지 않도록
+    days = max(days, RETENTION_MIN_DAYS)
+    now = now or datetime.now(timezone.utc)
+    return (now - timedelta(days=days)).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _utc_day(ts: datetime) -> date:
+    return ts.astimezone(timezone.utc).date()
+
+
+def _archive_rows(archive_dir: str, table: str, records: list[dict]) -> set[str]:
+    """레코드를 날짜별 {archive_dir}/{table}/{YYYY-MM-DD}.ndjson.gz 에 gzip member로 이어 붙임"""
+    by_day: dict[str, list[str]] = {}
+    for record in records:
+        by_day.setdefault(record["day"], []).append(
+            json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+        )
+
+    directory = os.path.join(archive_dir, table)
+    os.makedirs(directory, exist_ok=True)
+    written = set()
+    for day, lines in by_day.items():
+        path = os.path.join(directory, f"{day}.ndjson.gz")
+        # 연결된 gzip member도 하나의 유효한 gzip 스트림 — 기존 파일을 다시 읽지 않고 append
+        with open(path, "ab") as f:
+            f.write(gzip.compress(("\n".join(lines) + "\n").encode()))
+        written.add(path)
+    return written
+
+
+async def _try_lock_batch(db: AsyncSession) -> bool:
+    await db.execute(text(f"SET LOCAL lock_timeout = '{BATCH_LOCK_TIMEOUT}'"))
+    return bool(await db.scalar(select(func.pg_try_advisory_xact_lock(RETENTION_LOCK_KEY))))
+
+
+def _oldest_ids(model, ts_col, cutoff: datetime, batch_size: int):
+    # 다른 트랜잭션이 잡고 있는 행은 건너뛰어 대기하지 않음
+    return (
+        select(model.id)
+        .where(ts_col < cutoff)
+        .order_by(model.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+
+
+async def _purge_views_batch(db: AsyncSession, cutoff: datetime, batch_size: int) -> Sequence[Row]:
+    result = await db.execute(
+        delete(ProfileView)
+        .where(ProfileView.id.in_(_oldest_ids(ProfileView, ProfileView.viewed_at, cutoff, batch_size)))
+        .returning(
+            ProfileView.id,
+            ProfileView.user_id,
+            ProfileView.viewed_at,
+            ProfileView.viewer_ip,
+            ProfileView.country,
+            ProfileView.region,
+            ProfileView.user_agent_id,
+            ProfileView.is_bot,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    rows = result.all()
+    # 봇 트래픽은 집계에서 제외 (raw 아카이브에는 is_bot과 함께 남김)
+    counts = Counter((row.user_id, _utc_day(row.viewed_at)) for row in rows if not row.is_bot)
+    if counts:
+        stmt = pg_insert(DailyProfileViews).values(
+            [{"user_id": user_id, "day": day, "view_count": n} for (user_id, day), n in counts.items()]
+        )
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[DailyProfileViews.user_id, DailyProfileViews.day],
+                set_={"view_count": DailyProfileViews.view_count + stmt.excluded.view_count},
+            )
+        )
+    return rows
+
+
+async def _purge_clicks_batch(db: AsyncSession, cutoff: datetime, batch_size: int) -> Sequence[Row]:
+    result = await db.execute(
+        delete(LinkClick)
+        .where(LinkClick.id.in_(_oldest_ids(LinkClick, LinkClick.clicked_at, cutoff, batch_size)))
+        .returning(
+            LinkClick.id,
+            LinkClick.link_id,
+            LinkClick.user_id,
+            LinkClick.clicked_at,
+            LinkClick.visitor_ip,
+            LinkClick.country,
+            LinkClick.region,
+            LinkClick.user_agent_id,
+            LinkClick.is_bot,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    rows = result.all()
+    counts = Counter(
+        (row.link_id, row.user_id, _utc_day(row.clicked_at)) for row in rows if not row.is_bot
+    )
+    if counts:
+        stmt = pg_insert(DailyLinkClicks).values(
+            [
+                {"link_id": link_id, "user_id": user_id, "day": day, "click_count": n}
+                for (link_id, user_id, day), n in counts.items()
+            ]
+        )
+        await db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[DailyLinkClicks.link_id, DailyLinkClicks.day],
+                set_={"click_count": DailyLinkClicks.click_count + stmt.excluded.click_count},
+            )
+        )
+    return rows
+
+
+def _view_record(row: Row, user_agents: dict[int, str]) -> dict:
+    return {
+        "day": _utc_day(row.viewed_at).isoformat(),
+        "id": row.id,
+        "user_id": str(row.user_id),
+        "viewed_at": row.viewed_at.isoformat(),
+        "viewer_ip": str(row.viewer_ip) if row.viewer_ip is not None else None,
+        "country": row.country,
+        "region": row.region,
+        "user_agent": user_agents.get(row.user_agent_id),
+        "is_bot": row.is_bot,
+    }
+
+
+def _click_record(row: Row, user_agents: dict[int, str]) -> dict:
+    return {
+        "day": _utc_day(row.clicked_at).isoformat(),
+        "id": row.id,
+        "link_id": str(row.link_id),
+        "user_id": str(row.user_id),
+        "clicked_at": row.clicked_at.isoformat(),
+        "visitor_ip": str(row.visitor_ip) if row.visitor_ip is not None else None,
+        "country": row.country,
+        "region": row.region,
+        "user_agent": user_agents.get(row.user_agent_id),
+        "is_bot": row.is_bot,
+    }
+
+
+_TABLES = (
+    ("profile_views", _purge_views_batch, _view_record),
+    ("link_clicks", _purge_clicks_batch, _click_record),
+)
+
+
+async def run_retention(
+    days: int,
+    batch_size: int = 2000,
+    pause: float = 0.2,
+    archive_dir: str = "",
+    session_factory: Callable[[], AsyncSession] = AsyncSessionLocal,
+    now: datetime | None = None,
+) -> RetentionResult:
+    result = RetentionResult(cutoff=retention_cutoff(days, now))
+
+    for table, purge, to_record in _TABLES:
+        while True:
+            # 배치마다 짧은 트랜잭션 하나 — 집계 upsert와 삭제가 함께 커밋되어 카운트가 유실/중복되지 않음
+            async with session_factory() as db:
+                if not await _try_lock_batch(db):
+                    logger.info("다른 워커가 retention 실행 중 — 이번 실행 건너뜀")
+                    return result
+                rows = await purge(db, result.cutoff, batch_size)
+                if rows and archive_dir:
+                    # 커밋 전에 디스크에 먼저 기록 — 커밋 실패 시 재실행으로 중복 기록될 수 있음(at-least-once)
+                    # 아카이브는 DB 없이도 읽을 수 있도록 UA id 대신 원문 문자열로 기록
+                    user_agents = await user_agent_values(db, (row.user_agent_id for row in rows))
+                    records = [to_record(row, user_agents) for row in rows]
+                    result.archived_files |= await asyncio.to_thread(
+                        _archive_rows, archive_dir, table, records
+                    )
+                await db.commit()
+
+            if table == "profile_views":
+                result.views += len(rows)
+            else:
+                result.clicks += len(rows)
+            if len(rows) < batch_size:
+                break
+            await asyncio.sleep(pause)
+
+    logger.info(
+        "retention 완료: cutoff=%s views=%d clicks=%d",
+        result.cutoff.isoformat(), result.views, result.clicks,
+    )
+    return result
+
+
+async def run_retention_forever() -> None:  # pragma: no cover
+    """lifespan 백그라운드 task — interval마다 설정값으로 run_retention 실행"""
+    while True:
+        try:
+            await run_retention(
+                settings.analytics_retention_days,
+                settings.analytics_retention_batch_size,
+                settings.analytics_retention_pause_seconds,
+                settings.analytics_archive_dir,
+            )
+        except Exception:
+            logger.exception("retention 실행 실패")
+        await asyncio.sleep(settings.analytics_retention_interval_seconds)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="보존 기간이 지난 raw 분석 이벤트를 일별 집계로 접고 삭제")
+    parser.add_argument("--days", type=int, default=settings.analytics_retention_days)
+    parser.add_argument("--batch-size", type=int, default=settings.analytics_retention_batch_size)
+    parser.add_argument("--pause", type=float, default=settings.analytics_retention_pause_seconds)
+    parser.add_argument("--archive-dir", default=settings.analytics_archive_dir)
+    args = parser.parse_args(argv)
+
+    if args.days <= 0:
+        parser.error("--days 또는 ANALYTICS_RETENTION_DAYS 를 1 이상으로 지정하세요.")
+
+    logging.basicConfig(level=logging.INFO)
+    result = asyncio.run(run_retention(args.days, args.batch_size, args.pause, args.archive_dir))
+    print(
+        f"cutoff={result.cutoff.isoformat()} views={result.views} clicks={result.clicks} "
+        f"archives={len(result.archived_files)}"
+    )
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
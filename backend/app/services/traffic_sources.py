@@ -0,0 +1,152 @@
+# 파일 목적: 유입 경로(referrer 도메인 + UTM) 정규화, 사전 인코딩 및 일별 집계 기록
+# 주요 기능: source_from_request(쿼리 ref/utm_* 또는 Referer 헤더 → TrafficSourceKey), TrafficSourceCache.resolve(키 → traffic_sources.id, LRU),
+#           record_daily_source(daily_source_stats 임의 샤드 가산 upsert — 같은 경로로 몰리는 기록이 한 행 락에 줄서지 않음)
+# 사용 방법: key = source_from_request(request); source_id = await traffic_source_cache.resolve(db, key)
+
+import random
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Literal, NamedTuple
+from urllib.parse import urlsplit
+
+from fastapi import Request
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.analytics import DailySourceStats, TrafficSource
+
+# 모바일/리다이렉트 shim 서브도메인은 같은 유입 경로로 묶음 (l.facebook.com, m.youtube.com 등)
+_SHIM_PREFIXES = ("www.", "m.", "l.", "lm.", "mobile.")
+
+
+class TrafficSourceKey(NamedTuple):
+    referrer_domain: str = ""
+    utm_source: str = ""
+    utm_medium: str = ""
+    utm_campaign: str = ""
+
+
+DIRECT = TrafficSourceKey()
+
+
+def _own_hosts() -> frozenset[str]:
+    return frozenset(
+        host for host in (urlsplit(origin).hostname for origin in settings.cors_origins_list) if host
+    )
+
+
+_OWN_HOSTS = _own_hosts()
+
+
+def normalize_referrer(referrer: str | None, request_host: str | None = None) -> str:
+    """Referer URL → 소문자 도메인, 자기 사이트 내부 이동이나 파싱 불가 값은 빈 문자열"""
+    if not referrer:
+        return ""
+    try:
+        host = urlsplit(referrer.strip()).hostname
+    except ValueError:
+        return ""
+    if not host:
+        return ""
+    if host in _OWN_HOSTS or host == request_host:
+        return ""
+    for prefix in _SHIM_PREFIXES:
+        if host.startswith(prefix) and host.count(".") > 1:
+            host = host[len(prefix):]
+            break
+    return host[:255]
+
+
+def _utm(value: str | None) -> str:
+    return (value or "").strip().lower()[:100]
+
+
+def source_from_request(request: Request) -> TrafficSourceKey:
+    params = request.query_params
+    # 프론트엔드가 fetch로 기록할 때는 Referer가 프로필 페이지 자신이므로 원래 document.referrer를 ref로 전달
+    referrer = params.get("ref") or request.headers.get("referer")
+    request_host = request.url.hostname
+    return TrafficSourceKey(
+        referrer_domain=normalize_referrer(referrer, request_host),
+        utm_source=_utm(params.get("utm_source")),
+        utm_medium=_utm(params.get("utm_medium")),
+        utm_campaign=_utm(params.get("utm_campaign")),
+    )
+
+
+class TrafficSourceCache:
+    """유입 경로 키 → id LRU (UserAgentCache와 같은 규칙: 커밋 전 새로 만든 id는 캐시하지 않음)"""
+
+    def __init__(self, maxsize: int = 4096):
+        self._maxsize = maxsize
+        self._ids: OrderedDict[TrafficSourceKey, int] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def clear(self) -> None:
+        self._ids.clear()
+
+    async def resolve(self, db: AsyncSession, key: TrafficSourceKey) -> int:
+        source_id = self._ids.get(key)
+        if source_id is not None:
+            self._ids.move_to_end(key)
+            return source_id
+
+        source_id = await db.scalar(
+            select(TrafficSource.id).where(
+                TrafficSource.referrer_domain == key.referrer_domain,
+                TrafficSource.utm_source == key.utm_source,
+                TrafficSource.utm_medium == key.utm_medium,
+                TrafficSource.utm_campaign == key.utm_campaign,
+            )
+        )
+        if source_id is not None:
+            self._ids[key] = source_id
+            if len(self._ids) > self._maxsize:
+                self._ids.popitem(last=False)
+            return source_id
+
+        stmt = pg_insert(TrafficSource).values(**key._asdict())
+        return await db.scalar(
+            stmt.on_conflict_do_update(
+                index_elements=list(TrafficSourceKey._fields),
+                set_={"utm_campaign": stmt.excluded.utm_campaign},
+            ).returning(TrafficSource.id)
+        )
+
+
+async def record_daily_source(
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    source_id: int,
+    kind: Literal["view", "click"],
+    shards: int | None = None,
+) -> None:
+    # 기록 트랜잭션 안에서 가산 upsert — 커밋까지 잡히는 행 락은 임의 샤드 하나뿐 (increment_click과 같은 방식),
+    # 유입 경로 조회는 raw 이벤트가 아닌 이 집계를 샤드 합산으로 읽음
+    column = "view_count" if kind == "view" else "click_count"
+    stmt = pg_insert(DailySourceStats).values(
+        user_id=user_id,
+        day=datetime.now(timezone.utc).date(),
+        source_id=source_id,
+        shard=random.randrange(max(shards or settings.daily_stats_shards, 1)),
+        **{column: 1},
+    )
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[
+                DailySourceStats.user_id,
+                DailySourceStats.day,
+                DailySourceStats.source_id,
+                DailySourceStats.shard,
+            ],
+            set_={column: getattr(DailySourceStats, column) + 1},
+        )
+    )
+
+
+traffic_source_cache = TrafficSourceCache(settings.traffic_source_cache_size)
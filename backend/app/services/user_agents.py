@@ -0,0 +1,160 @@
+# 파일 목적: User-Agent 문자열 사전 인코딩 및 기기/브라우저/OS/봇 분류 (user_agents 차원 테이블 + 프로세스 내 LRU)
+# 주요 기능: classify_user_agent(메모이즈된 UA → UAClass), UserAgentCache.resolve(UA 문자열 → UserAgentRef(id, is_bot), 캐시 hit 시 DB 조회 없음),
+#           user_agent_values(id → 문자열 역조회)
+# 사용 방법: from app.services.user_agents import user_agent_cache; ua = await user_agent_cache.resolve(db, user_agent)
+
+import hashlib
+import re
+from collections import OrderedDict
+from collections.abc import Iterable
+from functools import lru_cache
+from typing import NamedTuple
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.analytics import UserAgent
+
+
+BOT_PATTERN = re.compile(
+    r"bot|crawl|spider|slurp|scrap|facebookexternalhit|whatsapp|embedly|preview|headless|lighthouse"
+    r"|monitor|uptime|pingdom|curl|wget|python-|httpx|aiohttp|go-http-client|okhttp|axios|java/|libwww",
+    re.IGNORECASE,
+)
+
+# 앞선 규칙이 우선 — 인앱 브라우저와 Chromium 파생 브라우저는 "Chrome"/"Safari" 토큰을 함께 보내므로 먼저 검사
+_BROWSER_RULES = (
+    ("KakaoTalk", re.compile(r"KAKAOTALK", re.IGNORECASE)),
+    ("Naver", re.compile(r"NAVER\(inapp", re.IGNORECASE)),
+    ("Instagram", re.compile(r"Instagram")),
+    ("Facebook", re.compile(r"FBAN|FBAV")),
+    ("Samsung Internet", re.compile(r"SamsungBrowser")),
+    ("Edge", re.compile(r"Edg(e|A|iOS)?/")),
+    ("Opera", re.compile(r"OPR/|Opera")),
+    ("Whale", re.compile(r"Whale/")),
+    ("Firefox", re.compile(r"Firefox/|FxiOS/")),
+    ("Chrome", re.compile(r"Chrome/|CriOS/")),
+    ("Safari", re.compile(r"Safari/")),
+)
+
+_OS_RULES = (
+    ("Windows", re.compile(r"Windows")),
+    ("Android", re.compile(r"Android")),
+    ("iOS", re.compile(r"iPhone|iPad|iPod")),
+    ("macOS", re.compile(r"Mac OS X|Macintosh")),
+    ("ChromeOS", re.compile(r"CrOS")),
+    ("Linux", re.compile(r"Linux")),
+)
+
+_TABLET = re.compile(r"iPad|Tablet|Android(?!.*Mobile)", re.IGNORECASE)
+_MOBILE = re.compile(r"Mobi|iPhone|iPod|Android", re.IGNORECASE)
+
+OTHER = "Other"
+
+
+class UAClass(NamedTuple):
+    device_type: str  # "desktop" | "mobile" | "tablet" | "bot"
+    browser: str
+    os: str
+    is_bot: bool
+
+
+class UserAgentRef(NamedTuple):
+    id: int | None
+    is_bot: bool
+
+
+UNKNOWN_USER_AGENT = UserAgentRef(None, False)
+
+
+def _first_match(rules: tuple[tuple[str, re.Pattern], ...], user_agent: str) -> str:
+    for name, pattern in rules:
+        if pattern.search(user_agent):
+            return name
+    return OTHER
+
+
+@lru_cache(maxsize=4096)
+def classify_user_agent(user_agent: str) -> UAClass:
+    # 분류는 UA가 사전에 처음 등록될 때만 수행 — 조회 시점에는 미리 계산된 컬럼으로 GROUP BY
+    is_bot = BOT_PATTERN.search(user_agent) is not None
+    if is_bot:
+        device_type = "bot"
+    elif _TABLET.search(user_agent):
+        device_type = "tablet"
+    elif _MOBILE.search(user_agent):
+        device_type = "mobile"
+    else:
+        device_type = "desktop"
+    return UAClass(
+        device_type=device_type,
+        browser=_first_match(_BROWSER_RULES, user_agent),
+        os=_first_match(_OS_RULES, user_agent),
+        is_bot=is_bot,
+    )
+
+
+def ua_hash(user_agent: str) -> bytes:
+    # 마이그레이션 백필의 decode(md5(user_agent), 'hex')와 같은 값 — 보안 용도가 아닌 조회 키
+    return hashlib.md5(user_agent.encode(), usedforsecurity=False).digest()
+
+
+class UserAgentCache:
+    """UA 문자열 → (id, is_bot) LRU. 실제 UA 종류는 수천 개 수준이라 대부분의 기록 요청은 DB 조회 없이 해석됨"""
+
+    def __init__(self, maxsize: int = 4096):
+        self._maxsize = maxsize
+        self._ids: OrderedDict[str, UserAgentRef] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def clear(self) -> None:
+        self._ids.clear()
+
+    def _remember(self, user_agent: str, ref: UserAgentRef) -> None:
+        self._ids[user_agent] = ref
+        if len(self._ids) > self._maxsize:
+            self._ids.popitem(last=False)
+
+    async def resolve(self, db: AsyncSession, user_agent: str | None) -> UserAgentRef:
+        if not user_agent:
+            return UNKNOWN_USER_AGENT
+        ref = self._ids.get(user_agent)
+        if ref is not None:
+            self._ids.move_to_end(user_agent)
+            return ref
+
+        key = ua_hash(user_agent)
+        row = (
+            await db.execute(select(UserAgent.id, UserAgent.is_bot).where(UserAgent.ua_hash == key))
+        ).one_or_none()
+        if row is not None:
+            ref = UserAgentRef(row.id, row.is_bot)
+            self._remember(user_agent, ref)
+            return ref
+
+        # 처음 보는 UA — 호출자 트랜잭션이 롤백되면 사라질 id이므로 캐시에 넣지 않음 (다음 요청의 SELECT에서 캐시됨)
+        parsed = classify_user_agent(user_agent)
+        stmt = pg_insert(UserAgent).values(ua_hash=key, value=user_agent, **parsed._asdict())
+        ua_id = await db.scalar(
+            stmt.on_conflict_do_update(
+                index_elements=[UserAgent.ua_hash], set_={"value": stmt.excluded.value}
+            ).returning(UserAgent.id)
+        )
+        return UserAgentRef(ua_id, parsed.is_bot)
+
+
+async def user_agent_values(db: AsyncSession, ids: Iterable[int | None]) -> dict[int, str]:
+    wanted = {ua_id for ua_id in ids if ua_id is not None}
+    if not wanted:
+        return {}
+    result = await db.execute(
+        select(UserAgent.id, UserAgent.value).where(UserAgent.id.in_(wanted))
+    )
+    return {row.id: row.value for row in result.all()}
+
+
+user_agent_cache = UserAgentCache(settings.user_agent_cache_size)
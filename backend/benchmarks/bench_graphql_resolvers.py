@@ -0,0 +1,124 @@
+# 파일 목적: GraphQL resolver 변환 비용 벤치마크 (복사 방식 vs 직접 반환)
+# 주요 기능: links/linkStats 쿼리 1회당 복사 객체 수, 최대 할당량(tracemalloc peak), 실행 시간 비교
+# 사용 방법: cd backend && python -m benchmarks.bench_graphql_resolvers [--rows 50] [--repeat 200]
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+import uuid
+from dataclasses import fields
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from app.graphql.context import GraphQLContext
+from app.graphql.schema import schema
+from app.graphql.types.analytics import LinkAnalyticsType
+from app.graphql.types.link import LinkType
+from app.models.link import Link
+from app.schemas.analytics import LinkAnalytics
+
+USER_ID = uuid.UUID("00000000-0000-0000-0000-000000000001")
+
+GQL_LINKS = "query { links { id title url position isActive clickCount createdAt } }"
+GQL_LINK_STATS = "query { linkStats { id title url clickCount isActive } }"
+
+
+def _make_links(rows: int) -> list[Link]:
+    now = datetime.now(timezone.utc)
+    return [
+        Link(
+            id=uuid.uuid4(),
+            user_id=USER_ID,
+            title=f"link {i}",
+            url=f"https://example.com/{i}",
+            description="설명 " * 20,
+            thumbnail_url=None,
+            favicon_url=None,
+            position=i,
+            is_active=True,
+            click_count=i * 3,
+            scheduled_start=None,
+            scheduled_end=None,
+            is_sensitive=False,
+            link_type="link",
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(rows)
+    ]
+
+
+def _copy_to(type_cls, obj):
+    # 변경 전 resolver의 필드 단위 복사(_link_to_type 등)를 재현
+    return type_cls(**{f.name: getattr(obj, f.name) for f in fields(type_cls)})
+
+
+async def _measure(query: str, target: str, factory, repeat: int) -> tuple[float, float]:
+    context = GraphQLContext(db=SimpleNamespace(), user_id=USER_ID)
+
+    async def fake_service(*args, **kwargs):
+        return factory()
+
+    with patch(target, new=fake_service):
+        # 워밍업: 스키마/파서 캐시가 측정에 섞이지 않도록
+        await schema.execute(query, context_value=context)
+
+        tracemalloc.start()
+        peak_total = 0
+        start = time.perf_counter()
+        for _ in range(repeat):
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+            result = await schema.execute(query, context_value=context)
+            _, peak = tracemalloc.get_traced_memory()
+            assert result.errors is None, result.errors
+            peak_total += peak - base
+        elapsed = time.perf_counter() - start
+        tracemalloc.stop()
+
+    return peak_total / repeat / 1024, elapsed / repeat * 1000
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="GraphQL resolver 변환 비용 벤치마크")
+    parser.add_argument("--rows", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    links = _make_links(args.rows)
+    stats = [
+        LinkAnalytics(
+            id=lnk.id, title=lnk.title, url=lnk.url, click_count=lnk.click_count, is_active=lnk.is_active
+        )
+        for lnk in links
+    ]
+
+    cases = [
+        (
+            "links",
+            GQL_LINKS,
+            "app.graphql.resolvers.links.link_service.list_links",
+            lambda: [_copy_to(LinkType, lnk) for lnk in links],
+            lambda: links,
+        ),
+        (
+            "linkStats",
+            GQL_LINK_STATS,
+            "app.graphql.resolvers.analytics.analytics_service.get_link_stats",
+            lambda: [_copy_to(LinkAnalyticsType, s) for s in stats],
+            lambda: stats,
+        ),
+    ]
+
+    print(f"rows={args.rows} repeat={args.repeat}")
+    print(f"{'query':<10} {'mode':<7} {'copies/req':>10} {'peak KiB/req':>13} {'ms/req':>8}")
+    for name, query, target, copied, direct in cases:
+        for mode, factory, copies in (("copy", copied, args.rows), ("direct", direct, 0)):
+            kib, ms = await _measure(query, target, factory, args.repeat)
+            print(f"{name:<10} {mode:<7} {copies:>10} {kib:>13.1f} {ms:>8.3f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,226 @@
+# 파일 목적: 분석/공개 프로필 핫 쿼리의 실제 실행 계획 리포트 — 시드한 PostgreSQL에서 요청 경로 SQL을 그대로 EXPLAIN ANALYZE
+# 주요 기능: 사용자 N명 × 링크 10개 / 사용자당 방문·클릭 M건(5% 봇, 최근 30일) 시드 후 VACUUM ANALYZE,
+#           서비스 함수가 실행한 SQL·파라미터를 캡처해 EXPLAIN (ANALYZE, BUFFERS) — 노드별 인덱스, 실제 행 수, 시간, 버퍼 요약 출력,
+#           이벤트 1만 건 INSERT 비용(인덱스 유지), 테이블별 인덱스 크기와 각 인덱스를 쓴 쿼리 목록 (어느 케이스에서도 안 쓰인 인덱스 표시)
+# 사용 방법: cd backend && DATABASE_URL=postgresql+asyncpg://.../linktree_bench python -m benchmarks.bench_hot_query_plans [--users 5000] [--events 100] [--repeat 7]
+#           (테이블을 만들고 지우므로 비어 있는 벤치마크 전용 DB를 지정) — 결과는 benchmarks/HOT_QUERY_PLANS.md에 기록
+
+import argparse
+import asyncio
+import json
+import statistics
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+
+from sqlalchemy import event, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, create_async_engine
+
+from app.core.config import settings
+from app.core.database import Base
+from app.models.user import User
+from app.services.analytics import (
+    get_breakdown,
+    get_recent_clicks,
+    get_summary,
+    get_view_stats,
+    stream_link_clicks,
+    stream_profile_views,
+)
+from app.services.hot_queries import recent_view
+from app.services.prerender import ProfileRenderer
+from app.services.profile import load_public_timeline, warm_public_profiles
+
+TABLES = ("users", "links", "profile_views", "link_clicks")
+
+
+def seed_sql(users: int, events: int) -> tuple[str, ...]:
+    links = max(events // 10, 1)
+    return (
+        f"""
+        INSERT INTO users (id, username, email, password_hash, theme, bg_color, is_active, created_at, updated_at)
+        SELECT gen_random_uuid(), 'user' || g, 'user' || g || '@example.com', 'x', 'default', '#ffffff', true, now(), now()
+        FROM generate_series(1, {users}) g
+        """,
+        """
+        INSERT INTO links (id, user_id, title, url, position, is_active, click_count, is_sensitive, link_type,
+                           scheduled_start, created_at, updated_at)
+        SELECT gen_random_uuid(), u.id, 'link ' || p, 'https://example.com/' || p, p, p % 5 <> 0, 0, false, 'link',
+               CASE WHEN p = 9 AND right(u.username, 1) = '0' THEN now() + interval '1 day' END, now(), now()
+        FROM users u CROSS JOIN generate_series(0, 9) p
+        """,
+        f"""
+        INSERT INTO profile_views (user_id, viewer_ip, is_bot, viewed_at)
+        SELECT u.id, ('10.0.' || g % 250 || '.' || g % 200)::inet, g % 20 = 0, now() - (g * 293 % 43200) * interval '1 minute'
+        FROM users u CROSS JOIN generate_series(1, {events}) g
+        """,
+        f"""
+        INSERT INTO link_clicks (link_id, user_id, visitor_ip, is_bot, clicked_at)
+        SELECT l.id, l.user_id, ('10.1.' || g % 250 || '.' || g % 200)::inet, g % 20 = 0,
+               now() - (g * 293 % 43200) * interval '1 minute'
+        FROM links l CROSS JOIN generate_series(1, {links}) g
+        """,
+    )
+
+
+async def _first_rows(stream, count: int = 500) -> None:
+    # export 첫 페이지만 — 이후 페이지도 같은 SQL에 keyset 조건만 다름
+    async for _ in stream:
+        count -= 1
+        if count <= 0:
+            break
+
+
+def cases(user_id, username: str, renderer_dir: str) -> dict:
+    return {
+        "public_timeline": lambda db: load_public_timeline(db, username),
+        "prerender_bootstrap": lambda db: ProfileRenderer(renderer_dir).bootstrap(db),
+        "warm_public_profiles": lambda db: warm_public_profiles(db, 50),
+        "view_dedup": lambda db: db.execute(recent_view(user_id, "10.0.1.1", datetime.now(timezone.utc) - timedelta(hours=1))),
+        "summary": lambda db: get_summary(db, user_id),
+        "view_stats": lambda db: get_view_stats(db, user_id, 7),
+        "breakdown_views": lambda db: get_breakdown(db, user_id, "device", "views"),
+        "breakdown_clicks": lambda db: get_breakdown(db, user_id, "device", "clicks"),
+        "recent_clicks": lambda db: get_recent_clicks(db, user_id, 10),
+        "export_clicks": lambda db: _first_rows(stream_link_clicks(db, user_id, batch_size=500)),
+        "export_views": lambda db: _first_rows(stream_profile_views(db, user_id, batch_size=500)),
+        # 계정 삭제 시 FK ON DELETE CASCADE가 실행하는 삭제 (EXPLAIN ANALYZE 후 롤백)
+        "cascade_views": lambda db: db.execute(text("DELETE FROM profile_views WHERE user_id = :u"), {"u": user_id}),
+        "cascade_clicks": lambda db: db.execute(text("DELETE FROM link_clicks WHERE user_id = :u"), {"u": user_id}),
+        # 기록 경로의 인덱스 유지 비용 — 이벤트 1만 건 INSERT (인덱스 수만큼 갱신, 측정 후 롤백)
+        "insert_views": lambda db: db.execute(
+            text(
+                "INSERT INTO profile_views (user_id, viewer_ip, is_bot, viewed_at)"
+                " SELECT :u, '10.2.0.1'::inet, false, now() FROM generate_series(1, 10000)"
+            ),
+            {"u": user_id},
+        ),
+        "insert_clicks": lambda db: db.execute(
+            text(
+                "INSERT INTO link_clicks (link_id, user_id, visitor_ip, is_bot, clicked_at)"
+                " SELECT (SELECT id FROM links WHERE user_id = :u LIMIT 1), :u, '10.2.0.1'::inet, false, now()"
+                " FROM generate_series(1, 10000)"
+            ),
+            {"u": user_id},
+        ),
+    }
+
+
+async def capture(conn: AsyncConnection, call) -> list[tuple[str, object]]:
+    statements: list[tuple[str, object]] = []
+
+    def _capture(_conn, _cursor, statement, parameters, _context, _executemany):
+        statements.append((statement, parameters))
+
+    event.listen(conn.sync_connection, "before_cursor_execute", _capture)
+    try:
+        async with AsyncSession(bind=conn) as db:
+            await call(db)
+            await db.rollback()
+    finally:
+        event.remove(conn.sync_connection, "before_cursor_execute", _capture)
+    return statements
+
+
+def _walk(node: dict, depth: int = 0):
+    yield depth, node
+    for child in node.get("Plans", ()):
+        yield from _walk(child, depth + 1)
+
+
+def summarize(plan: dict, timings: list[float]) -> list[str]:
+    lines = []
+    for depth, node in _walk(plan["Plan"]):
+        label = node["Node Type"]
+        if "Index Name" in node:
+            label += f" using {node['Index Name']}"
+        if "Heap Fetches" in node:
+            label += f" (heap fetches {node['Heap Fetches']})"
+        lines.append(
+            f"{'  ' * depth}{label}  rows={node.get('Actual Rows', 0)} loops={node.get('Actual Loops', 1)}"
+            f" time={node.get('Actual Total Time', 0):.2f}ms"
+        )
+    top = plan["Plan"]
+    lines.append(
+        f"execution median {statistics.median(timings):.2f}ms (n={len(timings)}), buffers hit={top.get('Shared Hit Blocks', 0)}"
+        f" read={top.get('Shared Read Blocks', 0)}"
+    )
+    return lines
+
+
+async def explain(conn: AsyncConnection, statement: str, parameters) -> dict:
+    # DML도 실제로 실행되므로 savepoint 안에서 측정 후 되돌림
+    async with conn.begin_nested() as savepoint:
+        value = (
+            await conn.exec_driver_sql(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}", parameters)
+        ).scalar_one()
+        await savepoint.rollback()
+    return (json.loads(value) if isinstance(value, str) else value)[0]
+
+
+async def index_sizes(conn: AsyncConnection) -> list[tuple[str, str, str]]:
+    rows = await conn.execute(
+        text(
+            "SELECT tablename, indexname, pg_size_pretty(pg_relation_size(quote_ident(indexname)::regclass))"
+            " FROM pg_indexes WHERE tablename IN ('profile_views', 'link_clicks') ORDER BY tablename, indexname"
+        )
+    )
+    return [tuple(row) for row in rows]
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="핫 쿼리 실행 계획 리포트")
+    parser.add_argument("--users", type=int, default=5000)
+    parser.add_argument("--events", type=int, default=100, help="사용자당 방문·클릭 수")
+    parser.add_argument("--repeat", type=int, default=7, help="문장별 EXPLAIN ANALYZE 반복 횟수 (실행 시간 중앙값)")
+    args = parser.parse_args()
+
+    engine = create_async_engine(settings.database_url)
+    try:
+        started = time.perf_counter()
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            for sql in seed_sql(args.users, args.events):
+                await conn.exec_driver_sql(sql)
+        async with engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await conn.exec_driver_sql(f"VACUUM ANALYZE {', '.join(TABLES)}")
+        print(f"seeded users={args.users} events/user={args.events} in {time.perf_counter() - started:.1f}s")
+
+        used_by: dict[str, set[str]] = defaultdict(set)
+        async with engine.connect() as conn:
+            # 크기는 케이스 실행 전에 — 롤백한 INSERT의 dead tuple이 인덱스를 부풀리기 전
+            sizes = await index_sizes(conn)
+            user_id, username = (await conn.execute(select(User.id, User.username).limit(1))).one()
+            await conn.commit()
+            with tempfile.TemporaryDirectory() as renderer_dir:
+                for name, call in cases(user_id, username, renderer_dir).items():
+                    statements = await capture(conn, call)
+                    await conn.rollback()
+                    print(f"\n## {name}")
+                    # 조회 경로의 부가 SQL(사용자 조회 등)은 생략하고 이벤트 테이블을 읽는 문장만
+                    relevant = [s for s in statements if any(table in s[0] for table in ("profile_views", "link_clicks", "links"))]
+                    for statement, parameters in islice(relevant or statements, 3):
+                        timings = []
+                        for _ in range(args.repeat):
+                            plan = await explain(conn, statement, parameters)
+                            await conn.rollback()
+                            timings.append(plan["Execution Time"])
+                        for _, node in _walk(plan["Plan"]):
+                            if "Index Name" in node:
+                                used_by[node["Index Name"]].add(name)
+                        print("\n".join(summarize(plan, timings)))
+            print("\n## index sizes")
+            for table, index, size in sizes:
+                cases_using = ", ".join(sorted(used_by.get(index, ()))) or "UNUSED"
+                print(f"{table:14} {index:44} {size:>8}  {cases_using}")
+    finally:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
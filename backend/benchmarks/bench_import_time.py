@@ -0,0 +1,74 @@
+# 파일 목적: 기동(import) 시간 프로파일링 리포트 — python -X importtime 결과를 반복 측정해 중앙값으로 집계
+# 주요 기능: 모듈별 누적(cumulative) import 시간 상위 N개, 최상위 패키지별 자체(self) 시간 합계, 전체 import 시간
+#           (측정할 때마다 새 인터프리터를 띄워 .pyc 외의 캐시가 섞이지 않음)
+# 사용 방법: cd backend && python -m benchmarks.bench_import_time [--module app.main] [--repeat 5] [--top 20]
+#           결과는 benchmarks/IMPORT_TIME.md에 기록
+
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def parse_importtime(stderr: str) -> dict[str, tuple[int, int]]:
+    """모듈 → (self µs, cumulative µs). 같은 모듈이 여러 번 나오면 첫 줄만 (실제 import는 한 번)"""
+    modules: dict[str, tuple[int, int]] = {}
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if match and match.group(4) not in modules:
+            modules[match.group(4)] = (int(match.group(1)), int(match.group(2)))
+    return modules
+
+
+def measure(module: str) -> dict[str, tuple[int, int]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def _median(runs: list[dict[str, tuple[int, int]]], index: int) -> dict[str, float]:
+    values: dict[str, list[int]] = defaultdict(list)
+    for run in runs:
+        for name, times in run.items():
+            values[name].append(times[index])
+    return {name: statistics.median(samples) for name, samples in values.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="import 시간 프로파일링 리포트")
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=20)
+    args = parser.parse_args()
+
+    # 첫 실행은 .pyc 생성 비용이 섞일 수 있으므로 버림
+    measure(args.module)
+    runs = [measure(args.module) for _ in range(args.repeat)]
+    cumulative = _median(runs, 1)
+    self_time = _median(runs, 0)
+
+    by_package: dict[str, float] = defaultdict(float)
+    for name, us in self_time.items():
+        by_package[name.split(".")[0]] += us
+
+    print(f"module={args.module} repeat={args.repeat} total={cumulative.get(args.module, 0) / 1000:.1f} ms")
+    print()
+    print(f"{'cumulative ms':>13}  module")
+    for name, us in sorted(cumulative.items(), key=lambda item: item[1], reverse=True)[: args.top]:
+        print(f"{us / 1000:>13.1f}  {name}")
+    print()
+    print(f"{'self ms':>13}  top-level package")
+    for name, us in sorted(by_package.items(), key=lambda item: item[1], reverse=True)[: args.top]:
+        print(f"{us / 1000:>13.1f}  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# 파일 목적: 배포 직후 첫 트래픽 지연 벤치마크 — 빈 커넥션 풀(cold) vs 기동 사전 준비 후(warm)의 p50/p99
+# 주요 기능: 라운드마다 새 엔진을 만들어 공개 프로필 조회 + 클릭 링크 조회 요청 burst를 동시에 실행,
+#           warm은 warm_pool(연결 사전 수립 + prepare_hot_statements)을 먼저 실행. 요청 지연은 세션 획득부터 마지막 쿼리까지
+# 사용 방법: cd backend && DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.bench_pool_warmup [--burst 10] [--connections 10] [--rounds 5]
+#           (활성 링크가 있는 사용자가 1명 이상 있는 DB 필요 — 읽기 전용, warm의 prepare는 롤백)
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.database import create_engine, warm_pool
+from app.models.link import Link
+from app.models.user import User
+from app.services.hot_queries import active_link_by_id, prepare_hot_statements
+from app.services.profile import load_public_timeline
+
+
+async def _target(sessionmaker: async_sessionmaker) -> tuple[str, object] | None:
+    async with sessionmaker() as db:
+        row = (
+            await db.execute(
+                select(User.username, Link.id)
+                .join(Link, Link.user_id == User.id)
+                .where(User.is_active == True, Link.is_active == True)  # noqa: E712
+                .limit(1)
+            )
+        ).one_or_none()
+    return None if row is None else (row[0], row[1])
+
+
+async def _request(sessionmaker: async_sessionmaker, username: str, link_id) -> float:
+    start = time.perf_counter()
+    async with sessionmaker() as db:
+        await load_public_timeline(db, username)
+        await db.execute(active_link_by_id(link_id))
+    return (time.perf_counter() - start) * 1000
+
+
+async def _round(warm: bool, burst: int, connections: int, username: str, link_id) -> list[float]:
+    engine = create_engine()
+    sessionmaker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    try:
+        if warm:
+            await warm_pool(connections, prepare=prepare_hot_statements, bind=engine)
+        return list(await asyncio.gather(*(_request(sessionmaker, username, link_id) for _ in range(burst))))
+    finally:
+        await engine.dispose()
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="cold vs warm 커넥션 풀 첫 burst 지연 벤치마크")
+    parser.add_argument("--burst", type=int, default=settings.db_pool_size, help="동시에 보내는 요청 수")
+    parser.add_argument("--connections", type=int, default=settings.db_pool_size, help="warm에서 미리 열 연결 수")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_engine()
+    try:
+        target = await _target(async_sessionmaker(engine, class_=AsyncSession))
+    finally:
+        await engine.dispose()
+    if target is None:
+        raise SystemExit("활성 링크가 있는 사용자가 없습니다 — 시드 데이터가 필요합니다")
+    username, link_id = target
+
+    print(
+        f"burst={args.burst} connections={args.connections} rounds={args.rounds} "
+        f"statement_cache_size={settings.db_statement_cache_size}"
+    )
+    print(f"{'mode':<5} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    for mode in ("cold", "warm"):
+        samples: list[float] = []
+        for _ in range(args.rounds):
+            samples += await _round(mode == "warm", args.burst, args.connections, username, link_id)
+        print(
+            f"{mode:<5} {statistics.median(samples):>8.2f} {_percentile(samples, 99):>8.2f} {max(samples):>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
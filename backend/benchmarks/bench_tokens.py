@@ -0,0 +1,59 @@
+# 파일 목적: JWT 코덱 처리량 벤치마크 (python-jose vs fast HMAC vs EdDSA/ES256)
+# 주요 기능: 코덱별 access token 서명/검증 초당 처리 횟수와 토큰 길이 비교 (login/refresh 1회 = 서명 2회)
+# 사용 방법: cd backend && python -m benchmarks.bench_tokens [--repeat 20000]
+
+import argparse
+import time
+
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+
+from app.core.tokens import AsymmetricCodec, HMACCodec, JoseCodec
+
+SECRET = "benchmark-secret-key-minimum-32-characters"
+
+
+def _per_second(fn, repeat: int) -> float:
+    # 워밍업: 첫 호출의 import/캐시 비용 제외
+    for _ in range(min(100, repeat)):
+        fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return repeat / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="JWT 코덱 처리량 벤치마크")
+    parser.add_argument("--repeat", type=int, default=20_000)
+    args = parser.parse_args()
+
+    claims = {
+        "sub": "00000000-0000-0000-0000-000000000001",
+        "type": "access",
+        "exp": int(time.time()) + 1800,
+        "fam": "00000000-0000-0000-0000-000000000002",
+    }
+    codecs = [
+        ("jose HS256", JoseCodec(SECRET)),
+        ("fast HS256", HMACCodec(SECRET)),
+        ("EdDSA", AsymmetricCodec("EdDSA", private_key=ed25519.Ed25519PrivateKey.generate())),
+        ("ES256", AsymmetricCodec("ES256", private_key=ec.generate_private_key(ec.SECP256R1()))),
+    ]
+
+    print(f"repeat={args.repeat}")
+    print(f"{'codec':<11} {'sign/s':>10} {'verify/s':>10} {'bytes':>6}")
+    baseline = None
+    for name, codec in codecs:
+        token = codec.encode(claims)
+        assert codec.decode(token) == claims
+        sign = _per_second(lambda: codec.encode(claims), args.repeat)
+        verify = _per_second(lambda: codec.decode(token), args.repeat)
+        baseline = baseline or (sign, verify)
+        print(
+            f"{name:<11} {sign:>10.0f} {verify:>10.0f} {len(token):>6}"
+            f"   (x{sign / baseline[0]:.1f} / x{verify / baseline[1]:.1f} vs jose)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# 파일 목적: 멀티 워커 운영 모드 gunicorn 설정 (uvicorn 워커)
+# 주요 기능: 코어 수만큼 UvicornWorker 실행(WEB_CONCURRENCY로 조정, DB_MAX_CONNECTIONS 연결 예산 안으로 제한 — 기동 시 워커별 연결 예산 로그), 워커별 lifespan(풀/LISTEN 연결)을 위해 preload 없이 fork,
+#           워커가 2개 이상인데 프로세스 로컬 백엔드(memory)를 쓰면 기동 시 경고
+# 사용 방법: gunicorn -c gunicorn.conf.py app.main:app
+
+import logging
+import os
+
+from app.core.config import settings
+
+bind = f"{os.getenv('BACKEND_HOST', '0.0.0.0')}:{os.getenv('BACKEND_PORT', '8000')}"
+worker_class = "uvicorn.workers.UvicornWorker"
+# WEB_CONCURRENCY(비우면 코어 수)를 DB_MAX_CONNECTIONS 예산 안으로 제한 — 워커도 같은 값으로 자기 풀 크기를 나눠 가짐
+workers = settings.worker_count
+# asyncpg 풀과 LISTEN 연결은 fork 이후 워커 이벤트 루프에서 열어야 하므로 앱을 마스터에서 미리 import하지 않음
+preload_app = False
+graceful_timeout = 30
+# SSE 실시간 카운터 연결이 keepalive 주기보다 오래 열려 있으므로 워커 타임아웃은 heartbeat 기준으로만 적용
+timeout = 60
+forwarded_allow_ips = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1")
+accesslog = "-"
+
+
+def on_starting(server) -> None:
+    log = logging.getLogger("gunicorn.error")
+    pool_size, max_overflow, aux = settings.worker_connection_limits
+    log.info(
+        "워커 %d개 × PostgreSQL 연결 최대 %d개 (풀 %d + 초과 %d + 보조 풀 %d + LISTEN 1) — 예산 %d",
+        server.cfg.workers,
+        pool_size + max_overflow + aux + 1,
+        pool_size,
+        max_overflow,
+        aux,
+        settings.db_max_connections,
+    )
+    if server.cfg.workers > settings.worker_count:
+        # -w 등으로 덮어쓴 경우 — 워커는 WEB_CONCURRENCY 기준으로 풀을 나누므로 예산을 넘을 수 있음
+        log.warning("워커 수가 연결 예산 기준(%d)보다 많음 — WEB_CONCURRENCY로 지정 권장", settings.worker_count)
+    if server.cfg.workers <= 1:
+        return
+    from app.core.shared_state import process_local_settings
+
+    local = process_local_settings()
+    if local:
+        log.warning(
+            "워커 %d개가 다음 상태를 프로세스별로 따로 가짐: %s — sqlite/postgres 백엔드 권장",
+            server.cfg.workers,
+            ", ".join(local),
+        )
@@ -1,5 +1,5 @@
 # 파일 목적: pytest 공통 픽스처 정의 - 테스트 앱, DB mock, 인증 헬퍼, GraphQL 클라이언트
-# 주요 기능: AsyncClient fixture, AsyncSession mock, JWT 토큰 생성, gql_client/auth_gql_client
+# 주요 기능: AsyncClient fixture, AsyncSession mock, JWT 토큰 생성, gql_client/auth_gql_client, 공개 프로필 캐시 초기화(autouse)
 # 사용 방법: 테스트 파일에서 fixture 이름으로 자동 주입 (pytest dependency injection)
 
 import uuid
@@ -14,6 +14,15 @@ from app.dependencies.db import get_db
 from app.dependencies.auth import get_current_user
 from app.main import app
 from app.models.user import User
+from app.services.profile_timeline import public_profile_cache
+
+
+@pytest.fixture(autouse=True)
+def reset_public_profile_cache():
+    """테스트마다 다른 mock DB를 쓰므로 이전 테스트의 공개 프로필 캐시가 섞이지 않도록 비움"""
+    public_profile_cache.clear()
+    yield
+    public_profile_cache.clear()
 
 
 @pytest.fixture
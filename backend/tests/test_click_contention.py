@@ -0,0 +1,128 @@
+# 파일 목적: 클릭 트랜잭션의 행 락 경합 테스트
+# 주요 기능: GET /api/public/links/{id}/click이 커밋 전에 가산하는 모든 upsert가 샤드 행을 대상으로 하는지(단일 행 upsert 없음),
+#           실제 PostgreSQL에서 같은 링크·유입 경로·국가의 클릭 두 건이 서로의 커밋을 기다리지 않는지 (lock_timeout으로 확인,
+#           샤드를 하나로 줄이면 대기가 생기는 것도 함께 확인 — TEST_DATABASE_URL이 없으면 건너뜀)
+# 사용 방법: pytest tests/test_click_contention.py
+#           TEST_DATABASE_URL=postgresql+asyncpg://.../linktree_test pytest tests/test_click_contention.py
+#           (테이블을 만들고 지우므로 비어 있는 테스트 전용 DB를 지정)
+
+import os
+import re
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.database import Base
+from app.models.analytics import DailyGeoStats, DailySourceStats
+from app.models.link import Link, LinkClickShard
+from app.services.click_counters import increment_click
+from app.services.geoip import GeoLocation, record_daily_geo
+from app.services.traffic_sources import record_daily_source
+from app.services.user_agents import UserAgentRef
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+USER_ID = uuid.UUID("00000000-0000-0000-0000-000000000001")
+LINK_ID = uuid.UUID("00000000-0000-0000-0000-000000000002")
+
+
+def _conflict_targets(statements) -> list[str]:
+    targets = []
+    for statement in statements:
+        if not hasattr(statement, "compile"):
+            continue
+        sql = str(statement.compile(dialect=postgresql.dialect()))
+        targets += re.findall(r"ON CONFLICT \(([^)]*)\)", sql)
+    return targets
+
+
+class TestClickTransaction:
+    async def test_every_upsert_targets_a_shard_row(self, client, mock_db, mocker):
+        """클릭 한 건이 커밋 전에 가산하는 행(클릭 카운터, 유입 경로/국가 일별 집계)은 모두 샤드 PK에 포함된 행"""
+        mocker.patch("app.routers.public.user_agent_cache.resolve", new_callable=AsyncMock, return_value=UserAgentRef(1, False))
+        mocker.patch("app.routers.public.traffic_source_cache.resolve", new_callable=AsyncMock, return_value=3)
+        mocker.patch("app.routers.public.geoip_resolver.lookup", return_value=GeoLocation("KR", "Seoul"))
+        mocker.patch("app.routers.public.event_hub.publish", new_callable=AsyncMock)
+        link = MagicMock(spec=Link)
+        link.id, link.user_id, link.url = LINK_ID, USER_ID, "https://example.com"
+        link_result = MagicMock()
+        link_result.scalar_one_or_none.return_value = link
+        mock_db.execute.return_value = link_result
+        mock_db.scalar = AsyncMock(return_value=1)
+
+        response = await client.get(f"/api/public/links/{LINK_ID}/click", follow_redirects=False)
+
+        assert response.status_code == 302
+        statements = [call.args[0] for call in mock_db.execute.await_args_list + mock_db.scalar.await_args_list]
+        targets = _conflict_targets(statements)
+        assert len(targets) == 3
+        for target in targets:
+            assert "shard" in target.split(", "), target
+
+
+async def _click(db: AsyncSession, source_id: int, shards: int) -> None:
+    """record_click의 봇 아닌 클릭 가산 순서 그대로 (커밋은 호출자)"""
+    await increment_click(db, LINK_ID, shards=shards)
+    await record_daily_source(db, USER_ID, source_id, "click", shards=shards)
+    await record_daily_geo(db, USER_ID, "KR", "click", shards=shards)
+
+
+@pytest.fixture
+async def engine():
+    engine = create_async_engine(TEST_DATABASE_URL)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.exec_driver_sql(
+                "INSERT INTO users (id, username, email, password_hash, theme, bg_color, is_active, created_at, updated_at) "
+                f"VALUES ('{USER_ID}', 'viral', 'viral@example.com', 'x', 'default', '#ffffff', true, now(), now())"
+            )
+            await conn.exec_driver_sql(
+                "INSERT INTO links (id, user_id, title, url, position, is_active, click_count, is_sensitive, link_type, "
+                "created_at, updated_at) "
+                f"VALUES ('{LINK_ID}', '{USER_ID}', 'viral', 'https://example.com', 0, true, 0, false, 'link', now(), now())"
+            )
+            await conn.exec_driver_sql("INSERT INTO traffic_sources (referrer_domain, utm_source, utm_medium, utm_campaign) VALUES ('instagram.com', '', '', '')")
+        yield engine
+    finally:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+        await engine.dispose()
+
+
+@pytest.mark.skipif(TEST_DATABASE_URL is None, reason="TEST_DATABASE_URL이 없으면 실제 행 락 대기를 확인할 수 없음")
+class TestConcurrentClicks:
+    async def test_second_click_does_not_wait_for_first(self, engine, mocker):
+        randrange = mocker.patch("random.randrange", return_value=0)
+        source_id = 1
+        async with AsyncSession(engine) as first, AsyncSession(engine) as second:
+            # 첫 클릭은 샤드 0 행들을 잡은 채 커밋하지 않음
+            await _click(first, source_id, shards=2)
+
+            # 두 번째 클릭은 다른 샤드 — 첫 트랜잭션의 행 락을 기다리면 lock_timeout으로 실패
+            randrange.return_value = 1
+            await second.execute(select(func.set_config("lock_timeout", "500ms", True)))
+            await _click(second, source_id, shards=2)
+            await second.commit()
+            await first.commit()
+
+        async with AsyncSession(engine) as db:
+            assert await db.scalar(select(func.sum(LinkClickShard.count))) == 2
+            assert await db.scalar(select(func.sum(DailySourceStats.click_count))) == 2
+            assert await db.scalar(select(func.sum(DailyGeoStats.click_count))) == 2
+
+    async def test_single_shard_would_wait(self, engine, mocker):
+        """샤드가 하나뿐이면 같은 행 upsert가 첫 커밋을 기다림 — 위 테스트가 실제 경합을 잡아낸다는 대조군"""
+        mocker.patch("random.randrange", return_value=0)
+        async with AsyncSession(engine) as first, AsyncSession(engine) as second:
+            await _click(first, 1, shards=1)
+
+            await second.execute(select(func.set_config("lock_timeout", "500ms", True)))
+            with pytest.raises(DBAPIError, match="lock timeout"):
+                await _click(second, 1, shards=1)
+            await first.rollback()
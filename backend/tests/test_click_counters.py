@@ -0,0 +1,91 @@
+# 파일 목적: 샤딩된 링크 클릭 카운터 테스트
+# 주요 기능: 임의 샤드 upsert + 누적 클릭 수 반환, 샤드 접기(DELETE ... RETURNING → click_count 합산, updated_at 유지, lock 실패 시 생략),
+#           link_clicks/daily_link_clicks 기준 드리프트 보정 (봇 제외, 미접힘 샤드 차감, 사용자 범위)
+# 사용 방법: pytest tests/test_click_counters.py
+
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+from sqlalchemy.dialects import postgresql
+
+from app.services.click_counters import fold_click_shards, increment_click, reconcile_click_counts
+
+USER_ID = uuid.UUID("00000000-0000-0000-0000-000000000001")
+LINK_ID = uuid.UUID("00000000-0000-0000-0000-000000000002")
+
+
+def _sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+class TestIncrementClick:
+    async def test_upserts_random_shard_and_returns_total(self, mock_db, mocker):
+        mocker.patch("app.services.click_counters.random.randrange", return_value=3)
+        mock_db.scalar = AsyncMock(return_value=42)
+
+        assert await increment_click(mock_db, LINK_ID, shards=8) == 42
+
+        statement = mock_db.scalar.await_args.args[0]
+        sql = _sql(statement)
+        assert sql.startswith("WITH bump AS")
+        assert "ON CONFLICT (link_id, shard) DO UPDATE SET count = (link_click_shards.count +" in sql
+        # links 행은 읽기만 함 — UPDATE links / FOR UPDATE 없음
+        assert "UPDATE links" not in sql and "FOR UPDATE" not in sql
+        params = statement.compile(dialect=postgresql.dialect()).params
+        assert 3 in params.values()
+
+    async def test_shard_range_from_settings(self, mock_db, mocker):
+        randrange = mocker.patch("app.services.click_counters.random.randrange", return_value=0)
+        mocker.patch("app.services.click_counters.settings.click_counter_shards", 16)
+        mock_db.scalar = AsyncMock(return_value=1)
+
+        await increment_click(mock_db, LINK_ID)
+
+        randrange.assert_called_once_with(16)
+
+
+class TestFoldClickShards:
+    async def test_drains_shards_into_click_count(self, mock_db):
+        mock_db.scalar = AsyncMock(return_value=True)
+        mock_db.execute.return_value = MagicMock(rowcount=2)
+
+        assert await fold_click_shards(mock_db) == 2
+
+        sql = _sql(mock_db.execute.await_args.args[0])
+        assert "WITH drained AS" in sql
+        assert "DELETE FROM link_click_shards RETURNING link_click_shards.link_id, link_click_shards.count" in sql
+        assert "click_count=(links.click_count + totals.total)" in sql
+        # 클릭 반영은 링크 편집이 아님 — updated_at 유지
+        assert "updated_at=links.updated_at" in sql
+        mock_db.commit.assert_not_awaited()
+
+    async def test_skips_when_other_worker_folding(self, mock_db):
+        mock_db.scalar = AsyncMock(return_value=False)
+
+        assert await fold_click_shards(mock_db) == 0
+        mock_db.execute.assert_not_awaited()
+
+
+class TestReconcileClickCounts:
+    async def test_recomputes_from_raw_archive_and_pending(self, mock_db):
+        mock_db.execute.side_effect = [MagicMock(), MagicMock(rowcount=1)]
+
+        assert await reconcile_click_counts(mock_db) == 1
+
+        lock_sql = _sql(mock_db.execute.await_args_list[0].args[0])
+        assert "pg_advisory_xact_lock" in lock_sql
+        sql = _sql(mock_db.execute.await_args_list[1].args[0])
+        assert "link_clicks.is_bot = false" in sql
+        assert "sum(daily_link_clicks.click_count)" in sql
+        assert "- coalesce(pending.n" in sql
+        assert "links.click_count IS DISTINCT FROM expected.total" in sql
+
+    async def test_scoped_to_user(self, mock_db):
+        mock_db.execute.side_effect = [MagicMock(), MagicMock(rowcount=0)]
+
+        assert await reconcile_click_counts(mock_db, USER_ID) == 0
+
+        sql = _sql(mock_db.execute.await_args_list[1].args[0])
+        assert "link_clicks.user_id =" in sql
+        assert "daily_link_clicks.user_id =" in sql
+        assert "target.user_id =" in sql
@@ -0,0 +1,89 @@
+# 파일 목적: 신뢰 프록시 기반 클라이언트 IP 해석 테스트
+# 주요 기능: CIDR 멤버십(IPv4/IPv6/IPv4-mapped), X-Forwarded-For 오른쪽부터 신뢰 hop 제거, X-Real-IP 대체, 비신뢰 peer의 헤더 무시, 미들웨어 request.state 설정
+# 사용 방법: pytest tests/test_client_ip.py
+
+import pytest
+from fastapi import FastAPI, Request
+from httpx import ASGITransport, AsyncClient
+from starlette.datastructures import Headers
+
+from app.core.client_ip import ClientIPMiddleware, TrustedNetworks, get_client_ip, resolve_client_ip
+
+TRUSTED = TrustedNetworks.parse("10.0.0.0/8, 172.16.0.0/12,192.168.1.7/32,fd00::/8")
+
+
+def _headers(**values: str) -> Headers:
+    return Headers({key.replace("_", "-"): value for key, value in values.items()})
+
+
+class TestTrustedNetworks:
+    @pytest.mark.parametrize(
+        ("ip", "expected"),
+        [
+            ("10.1.2.3", True),
+            ("172.20.0.5", True),
+            ("172.32.0.1", False),
+            ("192.168.1.7", True),
+            ("192.168.1.8", False),
+            ("fd12::1", True),
+            ("2001:db8::1", False),
+            ("::ffff:10.0.0.1", True),
+            ("garbage", False),
+            (None, False),
+        ],
+    )
+    def test_membership(self, ip, expected):
+        assert (ip in TRUSTED) is expected
+
+    def test_empty(self):
+        assert not TrustedNetworks.parse("")
+        assert "127.0.0.1" not in TrustedNetworks.parse("")
+
+
+class TestResolveClientIp:
+    def test_untrusted_peer_headers_ignored(self):
+        """프록시를 거치지 않은 요청의 X-Forwarded-For는 위조 가능하므로 무시"""
+        headers = _headers(x_forwarded_for="1.2.3.4")
+        assert resolve_client_ip("203.0.113.9", headers, TRUSTED) == "203.0.113.9"
+
+    def test_rightmost_untrusted_hop(self):
+        """클라이언트가 넣은 왼쪽 값은 건너뛰고 신뢰 프록시 직전 주소를 사용"""
+        headers = _headers(x_forwarded_for="6.6.6.6, 198.51.100.2, 10.0.0.3")
+        assert resolve_client_ip("10.0.0.2", headers, TRUSTED) == "198.51.100.2"
+
+    def test_malformed_hop_stops_walk(self):
+        headers = _headers(x_forwarded_for="198.51.100.2, not-an-ip, 10.0.0.3")
+        assert resolve_client_ip("10.0.0.2", headers, TRUSTED) == "10.0.0.3"
+
+    def test_all_trusted_uses_leftmost(self):
+        headers = _headers(x_forwarded_for="10.0.0.9, 10.0.0.3")
+        assert resolve_client_ip("10.0.0.2", headers, TRUSTED) == "10.0.0.9"
+
+    def test_x_real_ip_fallback(self):
+        assert resolve_client_ip("10.0.0.2", _headers(x_real_ip="198.51.100.7"), TRUSTED) == "198.51.100.7"
+        assert resolve_client_ip("10.0.0.2", _headers(x_real_ip="bogus"), TRUSTED) == "10.0.0.2"
+
+
+class TestClientIPMiddleware:
+    @staticmethod
+    def _app(trusted: str) -> FastAPI:
+        app = FastAPI()
+        app.add_middleware(ClientIPMiddleware, trusted_proxies=trusted)
+
+        @app.get("/ip")
+        async def ip(request: Request) -> dict:
+            return {"ip": get_client_ip(request)}
+
+        return app
+
+    async def test_sets_request_state_behind_trusted_proxy(self):
+        transport = ASGITransport(app=self._app("127.0.0.1/32"), client=("127.0.0.1", 5000))
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.get("/ip", headers={"X-Forwarded-For": "198.51.100.2"})
+        assert response.json() == {"ip": "198.51.100.2"}
+
+    async def test_no_trusted_proxies_keeps_peer(self):
+        transport = ASGITransport(app=self._app(""), client=("127.0.0.1", 5000))
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.get("/ip", headers={"X-Forwarded-For": "198.51.100.2"})
+        assert response.json() == {"ip": "127.0.0.1"}
@@ -0,0 +1,235 @@
+# 파일 목적: 응답 압축 미들웨어 테스트
+# 주요 기능: Accept-Encoding 협상(q 값, 와일드카드), 압축 결과 LRU 캐시, 최소 크기, ETag/304(GET/HEAD 일치), 스트리밍·SSE 통과, 이미 인코딩된 응답 유지
+# 사용 방법: pytest tests/test_compression.py
+
+import gzip
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from app.core.compression import (
+    CompressedBodyCache,
+    CompressionMiddleware,
+    _etag_matches,
+    body_digest,
+    choose_encoding,
+)
+
+BIG = {"items": ["링크 설명 " * 10 for _ in range(50)]}
+
+
+async def _big(request):
+    return JSONResponse(BIG)
+
+
+async def _small(request):
+    return JSONResponse({"ok": True})
+
+
+async def _stream(request):
+    async def chunks():
+        yield b"a" * 2000
+        yield b"b" * 2000
+
+    return StreamingResponse(chunks(), media_type="application/json")
+
+
+async def _sse(request):
+    async def events():
+        yield b"data: 1\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+async def _encoded(request):
+    return Response(gzip.compress(b"x" * 4000), media_type="application/json", headers={"content-encoding": "gzip"})
+
+
+async def _image(request):
+    return Response(b"\x89PNG" * 1000, media_type="image/png")
+
+
+def _app() -> CompressionMiddleware:
+    inner = Starlette(
+        routes=[
+            Route("/big", _big, methods=["GET", "POST"]),
+            Route("/small", _small),
+            Route("/stream", _stream),
+            Route("/sse", _sse),
+            Route("/encoded", _encoded),
+            Route("/image", _image),
+        ]
+    )
+    return CompressionMiddleware(inner, minimum_size=1024, cache=CompressedBodyCache())
+
+
+@pytest.fixture
+def compressed():
+    middleware = _app()
+    client = AsyncClient(transport=ASGITransport(app=middleware), base_url="http://test")
+    return client, middleware
+
+
+class TestChooseEncoding:
+    @pytest.mark.parametrize(
+        "header,expected",
+        [
+            ("gzip, deflate, br", "br"),
+            ("gzip;q=1.0, br;q=0.5", "gzip"),
+            ("br;q=0, gzip", "gzip"),
+            ("identity", None),
+            ("", None),
+            ("*", "br"),
+            ("*;q=0.5, br;q=0", "gzip"),
+            ("gzip;q=abc", None),
+        ],
+    )
+    def test_negotiation(self, header, expected):
+        assert choose_encoding(header, ("br", "gzip")) == expected
+
+    def test_gzip_only_without_brotli(self):
+        assert choose_encoding("br", ("gzip",)) is None
+        assert choose_encoding("br, gzip", ("gzip",)) == "gzip"
+
+
+class TestCompressedBodyCache:
+    def test_compresses_once_per_body_and_encoding(self):
+        cache = CompressedBodyCache(max_entries=2)
+        body = b"x" * 5000
+        first = cache.get_or_compress(body_digest(body), "gzip", body)
+        second = cache.get_or_compress(body_digest(body), "gzip", body)
+
+        assert first is second
+        assert gzip.decompress(first) == body
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_lru_and_size_limits(self):
+        cache = CompressedBodyCache(max_entries=2, max_body_size=100)
+        for body in (b"a" * 50, b"b" * 50, b"c" * 50):
+            cache.get_or_compress(body_digest(body), "gzip", body)
+        assert len(cache) == 2
+
+        cache.get_or_compress(body_digest(b"d" * 500), "gzip", b"d" * 500)
+        assert len(cache) == 2  # 큰 본문은 캐시하지 않음
+
+
+class TestCompressionMiddleware:
+    async def test_large_json_is_gzipped(self, compressed):
+        client, _ = compressed
+        response = await client.get("/big", headers={"accept-encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert "accept-encoding" in response.headers["vary"].lower()
+        assert int(response.headers["content-length"]) < len(response.content)
+        assert response.json() == BIG
+
+    async def test_repeated_body_hits_cache(self, compressed):
+        client, middleware = compressed
+        for _ in range(3):
+            await client.get("/big", headers={"accept-encoding": "gzip"})
+        assert (middleware.cache.hits, middleware.cache.misses) == (2, 1)
+
+    async def test_small_and_identity_responses_not_compressed(self, compressed):
+        client, _ = compressed
+        small = await client.get("/small", headers={"accept-encoding": "gzip"})
+        identity = await client.get("/big", headers={"accept-encoding": "identity"})
+
+        assert "content-encoding" not in small.headers
+        assert "content-encoding" not in identity.headers
+        assert identity.json() == BIG
+
+    async def test_etag_and_not_modified(self, compressed):
+        """같은 본문이면 If-None-Match로 304 — 인코딩별 ETag도 같은 본문으로 인정"""
+        client, _ = compressed
+        plain = await client.get("/big", headers={"accept-encoding": "identity"})
+        gzipped = await client.get("/big", headers={"accept-encoding": "gzip"})
+        assert gzipped.headers["etag"] == plain.headers["etag"][:-1] + '-gzip"'
+
+        for etag in (plain.headers["etag"], gzipped.headers["etag"], f'W/{plain.headers["etag"]}'):
+            response = await client.get("/big", headers={"if-none-match": etag})
+            assert response.status_code == 304
+            assert response.content == b""
+
+        changed = await client.get("/big", headers={"if-none-match": '"other"'})
+        assert changed.status_code == 200
+
+    async def test_head_etag_matches_get(self, compressed):
+        """HEAD는 GET과 같은 ETag — HEAD로 받은 ETag로 GET 조건부 요청 가능"""
+        client, _ = compressed
+        for encoding in ("identity", "gzip"):
+            get = await client.get("/big", headers={"accept-encoding": encoding})
+            head = await client.head("/big", headers={"accept-encoding": encoding})
+            assert head.headers["etag"] == get.headers["etag"]
+
+        head = await client.head("/big")
+        revalidated = await client.get("/big", headers={"if-none-match": head.headers["etag"]})
+        assert revalidated.status_code == 304
+
+    async def test_head_with_empty_body_gets_no_etag(self):
+        """본문 없이 헤더만 보내는 HEAD 응답에는 빈 바이트 해시 ETag를 붙이지 않음"""
+
+        async def bodiless_head(scope, receive, send):
+            headers = [(b"content-type", b"application/json"), (b"content-length", b"4000")]
+            await send({"type": "http.response.start", "status": 200, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+
+        middleware = CompressionMiddleware(bodiless_head, minimum_size=1024, cache=CompressedBodyCache())
+        client = AsyncClient(transport=ASGITransport(app=middleware), base_url="http://test")
+
+        response = await client.head("/big")
+
+        assert response.status_code == 200
+        assert "etag" not in response.headers
+        assert response.headers["content-length"] == "4000"
+
+    async def test_post_gets_no_etag_but_is_compressed(self, compressed):
+        client, _ = compressed
+        response = await client.post("/big", headers={"accept-encoding": "gzip"})
+        assert "etag" not in response.headers
+        assert response.headers["content-encoding"] == "gzip"
+
+    @pytest.mark.parametrize("path", ["/stream", "/sse"])
+    async def test_streaming_passthrough(self, compressed, path):
+        client, _ = compressed
+        response = await client.get(path, headers={"accept-encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+        assert "etag" not in response.headers
+
+    async def test_already_encoded_and_binary_untouched(self, compressed):
+        client, _ = compressed
+        encoded = await client.get("/encoded", headers={"accept-encoding": "gzip"})
+        image = await client.get("/image", headers={"accept-encoding": "gzip"})
+
+        assert encoded.content == b"x" * 4000  # httpx가 한 번만 해제
+        assert "content-encoding" not in image.headers
+
+    def test_etag_match_helper(self):
+        assert _etag_matches("*", "abc")
+        assert _etag_matches('"x", "abc-br"', "abc")
+        assert not _etag_matches('"abcd"', "abc")
+
+
+class TestAppCompression:
+    async def test_public_profile_compressed(self, client, mocker):
+        """실제 앱: 큰 공개 프로필 응답은 gzip으로 전송"""
+        profile = {
+            "username": "alice",
+            "display_name": "Alice",
+            "bio": "소개 " * 300,
+            "avatar_url": None,
+            "social_links": None,
+            "seo_settings": None,
+            "theme": "default",
+            "bg_color": "#ffffff",
+            "links": [],
+        }
+        mocker.patch("app.routers.public.profile_service.get_public_profile", return_value=profile)
+
+        response = await client.get("/api/public/alice", headers={"accept-encoding": "gzip"})
+
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.json()["bio"] == profile["bio"]
@@ -0,0 +1,125 @@
+# 파일 목적: 실시간 분석 이벤트 허브 단위 테스트
+# 주요 기능: InMemoryEventHub fan-out/사용자 격리/큐 overflow, AnalyticsEvent 직렬화, PostgresEventHub 로컬 fallback
+# 사용 방법: pytest tests/test_events.py
+
+import asyncio
+import uuid
+from datetime import datetime, timezone
+
+from app.core.events import AnalyticsEvent, InMemoryEventHub, PostgresEventHub
+
+USER_A = uuid.UUID("00000000-0000-0000-0000-00000000000a")
+USER_B = uuid.UUID("00000000-0000-0000-0000-00000000000b")
+
+
+def _event(user_id: uuid.UUID = USER_A, kind: str = "click", click_count: int | None = 1) -> AnalyticsEvent:
+    return AnalyticsEvent(
+        kind=kind,
+        user_id=user_id,
+        occurred_at=datetime.now(timezone.utc),
+        link_id=uuid.uuid4() if kind == "click" else None,
+        click_count=click_count if kind == "click" else None,
+    )
+
+
+async def _next(stream):
+    return await asyncio.wait_for(stream.__anext__(), timeout=1)
+
+
+async def _start(hub, stream, user_id: uuid.UUID = USER_A, expected: int = 1) -> asyncio.Future:
+    # async generator 본문은 첫 __anext__ 에서 실행되므로 구독 등록까지 양보
+    task = asyncio.ensure_future(_next(stream))
+    while hub.subscriber_count(user_id) < expected:
+        await asyncio.sleep(0)
+    return task
+
+
+class TestInMemoryEventHub:
+    async def test_fan_out_to_all_subscribers(self):
+        """같은 사용자의 구독자 모두에게 전달"""
+        hub = InMemoryEventHub()
+        s1, s2 = hub.subscribe(USER_A), hub.subscribe(USER_A)
+        t1 = await _start(hub, s1)
+        t2 = await _start(hub, s2, expected=2)
+
+        event = _event()
+        await hub.publish(event)
+
+        assert await t1 is event
+        assert await t2 is event
+        await s1.aclose()
+        await s2.aclose()
+
+    async def test_other_user_events_not_delivered(self):
+        """다른 사용자의 이벤트는 전달되지 않음"""
+        hub = InMemoryEventHub()
+        stream = hub.subscribe(USER_A)
+        task = await _start(hub, stream)
+
+        await hub.publish(_event(USER_B))
+        mine = _event(USER_A, kind="view")
+        await hub.publish(mine)
+
+        assert await task is mine
+        await stream.aclose()
+
+    async def test_unsubscribe_on_close(self):
+        """구독 종료 시 큐 정리"""
+        hub = InMemoryEventHub()
+        stream = hub.subscribe(USER_A)
+        task = await _start(hub, stream)
+        assert hub.subscriber_count(USER_A) == 1
+
+        await hub.publish(_event())
+        await task
+        await stream.aclose()
+
+        assert hub.subscriber_count() == 0
+
+    async def test_slow_subscriber_drops_oldest(self):
+        """큐가 가득 차면 가장 오래된 이벤트를 버리고 발행은 막히지 않음"""
+        hub = InMemoryEventHub(queue_size=2)
+        stream = hub.subscribe(USER_A)
+        task = await _start(hub, stream)
+        first = _event(click_count=1)
+        await hub.publish(first)
+        assert await task is first
+
+        for count in (2, 3, 4):
+            await hub.publish(_event(click_count=count))
+
+        assert (await _next(stream)).click_count == 3
+        assert (await _next(stream)).click_count == 4
+        await stream.aclose()
+
+
+class TestAnalyticsEventSerialization:
+    def test_json_round_trip(self):
+        event = _event(click_count=42)
+        restored = AnalyticsEvent.from_json(event.to_json())
+        assert restored == event
+
+    def test_view_event_without_link(self):
+        event = _event(kind="view")
+        restored = AnalyticsEvent.from_json(event.to_json())
+        assert restored.link_id is None
+        assert restored.click_count is None
+
+
+class TestPostgresEventHub:
+    async def test_publish_before_start_dispatches_locally(self):
+        """start() 전(풀 없음)에는 로컬 구독자에게만 전달"""
+        hub = PostgresEventHub("postgresql://unused")
+        stream = hub.subscribe(USER_A)
+        task = await _start(hub, stream)
+
+        event = _event()
+        await hub.publish(event)
+
+        assert await task is event
+        await stream.aclose()
+
+    def test_invalid_notify_payload_ignored(self):
+        hub = PostgresEventHub("postgresql://unused")
+        hub._on_notify(None, 1, "analytics_events", "not-json")
+        hub._on_notify(None, 1, "analytics_events", '{"kind": "click"}')
@@ -0,0 +1,163 @@
+# 파일 목적: raw 분석 이벤트 export 테스트 (인코더, keyset 스트리밍, /api/analytics/export)
+# 주요 기능: CSV/NDJSON/gzip 인코딩, (시각, id) keyset 페이지 전환, IP 마스킹 재사용, 엔드포인트 응답 헤더
+# 사용 방법: pytest tests/test_export.py
+
+import csv
+import gzip
+import io
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from app.services import analytics as analytics_service
+from app.services import export as export_service
+
+USER_ID = uuid.UUID("00000000-0000-0000-0000-000000000001")
+LINK_ID = uuid.UUID("00000000-0000-0000-0000-000000000002")
+
+
+async def _aiter(items):
+    for item in items:
+        yield item
+
+
+async def _collect(stream) -> bytes:
+    return b"".join([chunk async for chunk in stream])
+
+
+def _click_rows(n: int, start: int = 0) -> list[SimpleNamespace]:
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    return [
+        SimpleNamespace(
+            clicked_at=base + timedelta(seconds=i),
+            id=i,
+            link_id=LINK_ID,
+            title=f"링크 {i}",
+            visitor_ip=f"10.0.0.{i % 250}",
+            user_agent="Mozilla/5.0",
+        )
+        for i in range(start, start + n)
+    ]
+
+
+class _FakeStreamResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def __aiter__(self):
+        return _aiter([_RowLike(r) for r in self._rows])
+
+
+class _RowLike(SimpleNamespace):
+    def __init__(self, ns: SimpleNamespace):
+        super().__init__(**vars(ns))
+
+    def __getitem__(self, index):
+        return (self.clicked_at, self.id)[index]
+
+
+class TestEncodeRows:
+    async def test_csv_with_header(self):
+        rows = [{"id": 1, "viewed_at": "t", "viewer_ip": "1.2.3.*", "user_agent": "ua, with comma"}]
+        body = await _collect(
+            export_service.encode_rows(_aiter(rows), "csv", export_service.VIEW_EXPORT_FIELDS)
+        )
+
+        parsed = list(csv.DictReader(io.StringIO(body.decode())))
+        assert parsed == [{"id": "1", "viewed_at": "t", "viewer_ip": "1.2.3.*", "user_agent": "ua, with comma"}]
+
+    async def test_ndjson_one_object_per_line(self):
+        rows = [{"id": 1, "title": "한글"}, {"id": 2, "title": "b"}]
+        body = await _collect(export_service.encode_rows(_aiter(rows), "ndjson", ("id", "title")))
+
+        lines = body.decode().splitlines()
+        assert [json.loads(line) for line in lines] == rows
+
+    async def test_gzip_round_trip(self):
+        rows = [{"id": i, "title": "x" * 50} for i in range(5000)]
+        body = await _collect(
+            export_service.encode_rows(_aiter(rows), "ndjson", ("id", "title"), compress=True)
+        )
+
+        assert len(gzip.decompress(body).decode().splitlines()) == 5000
+
+    async def test_large_output_emitted_in_chunks(self):
+        """결과 전체를 한 번에 만들지 않고 CHUNK_SIZE 단위로 내보냄"""
+        rows = [{"id": i, "title": "y" * 100} for i in range(3000)]
+        chunks = [
+            chunk
+            async for chunk in export_service.encode_rows(_aiter(rows), "ndjson", ("id", "title"))
+        ]
+
+        assert len(chunks) > 1
+        assert max(len(c) for c in chunks) < export_service.CHUNK_SIZE * 2
+
+    def test_media_type_and_filename(self):
+        assert export_service.media_type("csv", False).startswith("text/csv")
+        assert export_service.media_type("ndjson", False) == "application/x-ndjson"
+        assert export_service.media_type("csv", True) == "application/gzip"
+        assert export_service.filename("clicks", "csv", True) == "clicks.csv.gz"
+
+
+class TestStreamLinkClicks:
+    async def test_keyset_pages_until_short_page(self):
+        """페이지가 batch_size보다 작으면 종료, 다음 페이지는 마지막 (시각, id) 이후부터"""
+        db = MagicMock()
+        pages = [_click_rows(2, 0), _click_rows(2, 2), _click_rows(1, 4)]
+        db.stream = AsyncMock(side_effect=[_FakeStreamResult(p) for p in pages])
+
+        rows = [
+            row async for row in analytics_service.stream_link_clicks(db, USER_ID, batch_size=2)
+        ]
+
+        assert [r["id"] for r in rows] == [0, 1, 2, 3, 4]
+        assert db.stream.await_count == 3
+        second_page_sql = str(db.stream.await_args_list[1].args[0])
+        assert "(link_clicks.clicked_at, link_clicks.id) >" in second_page_sql
+
+    async def test_ip_masked_and_serialized(self):
+        db = MagicMock()
+        db.stream = AsyncMock(return_value=_FakeStreamResult(_click_rows(1, 7)))
+
+        rows = [row async for row in analytics_service.stream_link_clicks(db, USER_ID)]
+
+        assert rows[0]["visitor_ip"] == "10.0.0.*"
+        assert rows[0]["link_id"] == str(LINK_ID)
+        assert rows[0]["clicked_at"].startswith("2026-01-01T00:00:07")
+
+    async def test_uses_server_side_cursor(self):
+        """stream() + yield_per 실행 옵션으로 서버 사이드 커서 사용"""
+        db = MagicMock()
+        db.stream = AsyncMock(return_value=_FakeStreamResult([]))
+
+        _ = [row async for row in analytics_service.stream_profile_views(db, USER_ID)]
+
+        stmt = db.stream.await_args.args[0]
+        assert stmt.get_execution_options()["yield_per"] > 0
+
+
+class TestExportEndpoint:
+    async def test_export_clicks_csv(self, auth_client, mocker):
+        session_cm = MagicMock()
+        session_cm.__aenter__ = AsyncMock(return_value=MagicMock())
+        session_cm.__aexit__ = AsyncMock(return_value=False)
+        mocker.patch("app.routers.analytics.AsyncSessionLocal", return_value=session_cm)
+        mocker.patch(
+            "app.routers.analytics.analytics_service.stream_link_clicks",
+            return_value=_aiter([{"id": 1, "clicked_at": "t", "link_id": "l", "title": "a",
+                                  "visitor_ip": "1.2.3.*", "user_agent": "ua"}]),
+        )
+
+        response = await auth_client.get("/api/analytics/export?kind=clicks&format=csv")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/csv")
+        assert 'filename="clicks.csv"' in response.headers["content-disposition"]
+        assert response.text.splitlines()[0] == ",".join(export_service.CLICK_EXPORT_FIELDS)
+        session_cm.__aexit__.assert_awaited_once()
+
+    async def test_invalid_format_422(self, auth_client):
+        response = await auth_client.get("/api/analytics/export?format=xml")
+        assert response.status_code == 422
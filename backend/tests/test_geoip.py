@@ -0,0 +1,129 @@
+# 파일 목적: 오프라인 GeoIP 보강 테스트
+# 주요 기능: prefix 단위 LRU(같은 /24는 한 번만 조회), 레코드 → 국가/지역 변환, DB 미설정/오류 시 UNKNOWN, IP 절삭 저장, 국가별 집계 upsert SQL(임의 샤드 행)
+# 사용 방법: pytest tests/test_geoip.py
+
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services import geoip
+from app.services.geoip import GeoIPResolver, GeoLocation, UNKNOWN_LOCATION, record_daily_geo, stored_ip
+
+USER_ID = uuid.UUID("00000000-0000-0000-0000-000000000001")
+
+SEOUL = {
+    "country": {"iso_code": "KR"},
+    "subdivisions": [{"iso_code": "11", "names": {"en": "Seoul"}}],
+}
+
+
+def _reader(record=SEOUL) -> MagicMock:
+    reader = MagicMock()
+    reader.get.return_value = record
+    return reader
+
+
+class TestGeoIPResolver:
+    def test_same_prefix_looked_up_once(self):
+        """같은 /24 대역은 LRU에서 해석되어 DB 파일을 다시 조회하지 않음"""
+        reader = _reader()
+        resolver = GeoIPResolver(reader=reader)
+
+        assert resolver.lookup("211.45.1.10") == GeoLocation("KR", "Seoul")
+        assert resolver.lookup("211.45.1.200") == GeoLocation("KR", "Seoul")
+        assert reader.get.call_count == 1
+        assert len(resolver) == 1
+
+        resolver.lookup("211.45.2.10")
+        assert reader.get.call_count == 2
+
+    def test_ipv6_cached_per_48(self):
+        reader = _reader()
+        resolver = GeoIPResolver(reader=reader)
+
+        resolver.lookup("2001:db8:1:aaaa::1")
+        resolver.lookup("2001:db8:1:bbbb::2")
+        assert reader.get.call_count == 1
+
+    def test_lru_eviction(self):
+        resolver = GeoIPResolver(maxsize=1, reader=_reader())
+
+        resolver.lookup("1.1.1.1")
+        resolver.lookup("2.2.2.2")
+        assert len(resolver) == 1
+
+    def test_unknown_address_cached_as_unknown(self):
+        """사설망 등 DB에 없는 주소도 캐시해 반복 조회 방지"""
+        reader = _reader(record=None)
+        resolver = GeoIPResolver(reader=reader)
+
+        assert resolver.lookup("10.0.0.1") == UNKNOWN_LOCATION
+        assert resolver.lookup("10.0.0.2") == UNKNOWN_LOCATION
+        assert reader.get.call_count == 1
+
+    def test_country_only_database(self):
+        resolver = GeoIPResolver(reader=_reader({"registered_country": {"iso_code": "JP"}}))
+        assert resolver.lookup("1.0.16.1") == GeoLocation("JP", None)
+
+    @pytest.mark.parametrize("ip", [None, "", "not-an-ip"])
+    def test_invalid_ip(self, ip):
+        reader = _reader()
+        assert GeoIPResolver(reader=reader).lookup(ip) == UNKNOWN_LOCATION
+        reader.get.assert_not_called()
+
+    def test_disabled_without_database_path(self):
+        assert GeoIPResolver("").lookup("8.8.8.8") == UNKNOWN_LOCATION
+
+    def test_unreadable_database_disables_enrichment(self, mocker):
+        """DB 파일을 열 수 없으면 한 번만 시도하고 이후 UNKNOWN 반환"""
+        fake = MagicMock()
+        fake.open_database.side_effect = FileNotFoundError("missing.mmdb")
+        mocker.patch.object(geoip, "maxminddb", fake)
+        resolver = GeoIPResolver("missing.mmdb")
+
+        assert resolver.lookup("8.8.8.8") == UNKNOWN_LOCATION
+        assert resolver.lookup("9.9.9.9") == UNKNOWN_LOCATION
+        assert fake.open_database.call_count == 1
+
+
+class TestStoredIp:
+    @pytest.mark.parametrize(
+        ("ip", "mode", "expected"),
+        [
+            ("211.45.1.10", "full", "211.45.1.10"),
+            ("211.45.1.10", "truncated", "211.45.1.0"),
+            ("2001:db8:1:aaaa::1", "truncated", "2001:db8:1::"),
+            ("::ffff:211.45.1.10", "truncated", "211.45.1.0"),
+            ("211.45.1.10", "none", None),
+            (None, "full", None),
+        ],
+    )
+    def test_modes(self, ip, mode, expected):
+        assert stored_ip(ip, mode) == expected
+
+
+class TestRecordDailyGeo:
+    async def test_unknown_country_stored_as_empty(self):
+        db = MagicMock()
+        db.execute = AsyncMock()
+
+        await record_daily_geo(db, USER_ID, None, "view")
+
+        compiled = db.execute.await_args.args[0].compile(dialect=postgresql.dialect())
+        assert "ON CONFLICT (user_id, day, country, shard) DO UPDATE SET view_count" in str(compiled)
+        assert compiled.params["country"] == ""
+        assert compiled.params["view_count"] == 1
+
+    async def test_shard_range_from_settings(self, mocker):
+        randrange = mocker.patch("app.services.geoip.random.randrange", return_value=7)
+        mocker.patch("app.services.geoip.settings.daily_stats_shards", 16)
+        db = MagicMock()
+        db.execute = AsyncMock()
+
+        await record_daily_geo(db, USER_ID, "KR", "click")
+
+        randrange.assert_called_once_with(16)
+        compiled = db.execute.await_args.args[0].compile(dialect=postgresql.dialect())
+        assert compiled.params["shard"] == 7
@@ -8,6 +8,7 @@ from unittest.mock import AsyncMock
 
 import pytest
 
+from app.core.pagination import encode_cursor
 from app.schemas.analytics import (
     AnalyticsSummary,
     LinkAnalytics,
@@ -15,6 +16,8 @@ from app.schemas.analytics import (
     DailyViewStats,
     TopLink,
     RecentClick,
+    BreakdownItem,
+    TopSource,
 )
 
 
@@ -225,3 +228,162 @@ class TestGraphQLRecentClicks:
 
         assert response.status_code == 200
         assert "errors" in data
+
+
+GQL_ANALYTICS_EVENTS = """
+subscription {
+  analyticsEvents { kind linkId clickCount occurredAt }
+}
+"""
+
+
+class TestGraphQLAnalyticsEventsSubscription:
+    async def test_pushes_published_click(self, mock_db, test_user_id):
+        """발행된 클릭 이벤트가 구독자에게 푸시됨"""
+        import asyncio
+        from app.core.events import AnalyticsEvent, event_hub
+        from app.graphql.context import GraphQLContext
+        from app.graphql.schema import schema
+
+        context = GraphQLContext(db=mock_db, user_id=test_user_id)
+        stream = await schema.subscribe(GQL_ANALYTICS_EVENTS, context_value=context)
+        next_result = asyncio.ensure_future(stream.__anext__())
+        while event_hub.subscriber_count(test_user_id) == 0:
+            await asyncio.sleep(0)
+
+        link_id = uuid.UUID("00000000-0000-0000-0000-000000000002")
+        await event_hub.publish(
+            AnalyticsEvent(
+                kind="click",
+                user_id=test_user_id,
+                occurred_at=datetime.now(timezone.utc),
+                link_id=link_id,
+                click_count=11,
+            )
+        )
+        result = await asyncio.wait_for(next_result, timeout=1)
+        await stream.aclose()
+
+        assert result.errors is None
+        assert result.data["analyticsEvents"]["kind"] == "click"
+        assert result.data["analyticsEvents"]["linkId"] == str(link_id)
+        assert result.data["analyticsEvents"]["clickCount"] == 11
+
+    async def test_connection_params_authorization(self, mock_db, test_user_id, auth_headers):
+        """WebSocket connection_init payload의 Authorization으로 인증"""
+        from app.graphql.context import GraphQLContext
+
+        context = GraphQLContext(db=mock_db)
+        context.connection_params = {"Authorization": auth_headers["Authorization"]}
+
+        assert context.subscriber_id == test_user_id
+
+    async def test_unauthenticated_subscription_error(self, mock_db):
+        """미인증 구독 → 에러"""
+        from app.graphql.context import GraphQLContext
+        from app.graphql.schema import schema
+
+        context = GraphQLContext(db=mock_db)
+        stream = await schema.subscribe(GQL_ANALYTICS_EVENTS, context_value=context)
+        result = await stream.__anext__()
+
+        assert result.errors
+
+
+class TestGraphQLPagination:
+    async def test_link_stats_cursor_and_args(self, auth_gql_client, mocker):
+        """linkStats(limit, after) 인자 전달 및 항목별 cursor 노출"""
+        link_id = uuid.UUID("00000000-0000-0000-0000-000000000002")
+        mock_get = mocker.patch(
+            "app.graphql.resolvers.analytics.analytics_service.get_link_stats",
+            new_callable=AsyncMock,
+            return_value=[
+                LinkAnalytics(id=link_id, title="T", url="https://e.com", click_count=3, is_active=True)
+            ],
+        )
+
+        response = await auth_gql_client.post(
+            "/graphql",
+            json={"query": 'query { linkStats(limit: 1, after: "abc") { id cursor } }'},
+        )
+        data = response.json()
+
+        assert "errors" not in data
+        assert data["data"]["linkStats"][0]["cursor"] == encode_cursor(3, link_id)
+        assert mock_get.await_args.args[2:] == (1, "abc")
+
+    async def test_invalid_cursor_returns_error(self, auth_gql_client, mock_db):
+        """잘못된 after 커서 → GraphQL 에러"""
+        response = await auth_gql_client.post(
+            "/graphql",
+            json={"query": 'query { recentClicks(after: "%%%") { linkId } }'},
+        )
+        data = response.json()
+
+        assert data["errors"][0]["message"] == "잘못된 페이지 커서입니다."
+
+
+class TestGraphQLBreakdown:
+    async def test_breakdown_success(self, auth_gql_client, mocker):
+        """breakdown(dimension, kind, days) 인자 전달 및 결과 반환"""
+        mock_get = mocker.patch(
+            "app.graphql.resolvers.analytics.analytics_service.get_breakdown",
+            new_callable=AsyncMock,
+            return_value=[BreakdownItem(label="iOS", count=4, percentage=100.0)],
+        )
+
+        response = await auth_gql_client.post(
+            "/graphql",
+            json={"query": 'query { breakdown(dimension: "os", kind: "views", days: 7) { label count percentage } }'},
+        )
+        data = response.json()
+
+        assert "errors" not in data
+        assert data["data"]["breakdown"] == [{"label": "iOS", "count": 4, "percentage": 100.0}]
+        assert mock_get.await_args.args[2:] == ("os", "views", 7)
+
+    async def test_breakdown_invalid_dimension(self, auth_gql_client, mock_db):
+        response = await auth_gql_client.post(
+            "/graphql", json={"query": 'query { breakdown(dimension: "country") { label } }'}
+        )
+        assert response.json()["errors"][0]["message"] == "지원하지 않는 분포 기준입니다."
+
+    async def test_geo_breakdown_success(self, auth_gql_client, mocker):
+        """geoBreakdown(kind, days) 인자 전달 및 결과 반환"""
+        mock_get = mocker.patch(
+            "app.graphql.resolvers.analytics.analytics_service.get_geo_breakdown",
+            new_callable=AsyncMock,
+            return_value=[BreakdownItem(label="KR", count=2, percentage=100.0)],
+        )
+
+        response = await auth_gql_client.post(
+            "/graphql", json={"query": 'query { geoBreakdown(kind: "clicks", days: 14) { label count } }'}
+        )
+        data = response.json()
+
+        assert "errors" not in data
+        assert data["data"]["geoBreakdown"] == [{"label": "KR", "count": 2}]
+        assert mock_get.await_args.args[2:] == ("clicks", 14)
+
+    async def test_top_sources_success(self, auth_gql_client, mocker):
+        """topSources(days, limit) 인자 전달 및 결과 반환"""
+        mock_get = mocker.patch(
+            "app.graphql.resolvers.analytics.analytics_service.get_top_sources",
+            new_callable=AsyncMock,
+            return_value=[
+                TopSource(referrer_domain="t.co", utm_source="x", utm_medium=None, utm_campaign=None,
+                          view_count=3, click_count=1)
+            ],
+        )
+
+        response = await auth_gql_client.post(
+            "/graphql",
+            json={"query": "query { topSources(days: 14, limit: 3) { referrerDomain utmSource utmCampaign viewCount clickCount } }"},
+        )
+        data = response.json()
+
+        assert "errors" not in data
+        assert data["data"]["topSources"] == [
+            {"referrerDomain": "t.co", "utmSource": "x", "utmCampaign": None, "viewCount": 3, "clickCount": 1}
+        ]
+        assert mock_get.await_args.args[2:] == (14, 3)
@@ -82,6 +82,40 @@ class TestGraphQLLinks:
         assert len(data["data"]["links"]) == 1
         assert data["data"]["links"][0]["title"] == "Test Link"
 
+    async def test_links_resolves_orm_instance_directly(self, auth_gql_client, mocker):
+        """실제 Link ORM 인스턴스를 복사 없이 반환해도 필드가 해석됨"""
+        now = datetime.now(timezone.utc)
+        link = Link(
+            id=uuid.uuid4(),
+            user_id=uuid.UUID("00000000-0000-0000-0000-000000000001"),
+            title="ORM Link",
+            url="https://orm.example.com",
+            position=3,
+            is_active=False,
+            click_count=7,
+            is_sensitive=False,
+            link_type="link",
+            created_at=now,
+            updated_at=now,
+        )
+        mocker.patch(
+            "app.graphql.resolvers.links.link_service.list_links",
+            new_callable=AsyncMock,
+            return_value=[link],
+        )
+
+        response = await auth_gql_client.post("/graphql", json={"query": GQL_LINKS})
+        data = response.json()
+
+        assert "errors" not in data
+        assert data["data"]["links"][0] == {
+            "id": str(link.id),
+            "title": "ORM Link",
+            "url": "https://orm.example.com",
+            "isActive": False,
+            "position": 3,
+        }
+
     async def test_links_unauthenticated(self, gql_client):
         """미인증 → 에러"""
         response = await gql_client.post("/graphql", json={"query": GQL_LINKS})
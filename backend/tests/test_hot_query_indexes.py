@@ -0,0 +1,224 @@
+# 파일 목적: 핫 쿼리 부분/커버링 인덱스 테스트
+# 주요 기능: 021/023 마이그레이션과 모델 Index 선언의 DDL 일치, 023이 대체한 인덱스가 모델에 남지 않았는지,
+#           시드한 실제 PostgreSQL에서 각 핫 쿼리(집계, 방문 중복 확인, raw export, 계정 삭제 CASCADE)의 EXPLAIN에 해당 인덱스 스캔이 쓰이는지
+#           (요청 경로의 SQL·파라미터를 그대로 캡처해 EXPLAIN — TEST_DATABASE_URL이 없으면 건너뜀, CI는 postgres 서비스로 실행)
+# 사용 방법: pytest tests/test_hot_query_indexes.py
+#           TEST_DATABASE_URL=postgresql+asyncpg://.../linktree_test pytest tests/test_hot_query_indexes.py
+#           (테이블을 만들고 지우므로 비어 있는 테스트 전용 DB를 지정)
+
+import json
+import os
+
+import pytest
+from alembic.script import ScriptDirectory
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event, select, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, create_async_engine
+from sqlalchemy.schema import CreateIndex
+
+from app.core.database import Base
+from app.core.migrations import alembic_config
+from app.models.analytics import LinkClick, ProfileView
+from app.models.link import Link
+from app.services.analytics import (
+    get_breakdown,
+    get_recent_clicks,
+    get_summary,
+    get_view_stats,
+    stream_link_clicks,
+    stream_profile_views,
+)
+from app.services.hot_queries import recent_view
+from app.services.prerender import ProfileRenderer
+from app.services.profile import load_public_timeline
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+# 사용자 1,000명 × 링크 10개(20% 비활성, 1% 예약) / 방문·클릭 각 10만 건(5% 봇, 최근 30일)
+SEED_SQL = (
+    """
+    INSERT INTO users (id, username, email, password_hash, theme, bg_color, is_active, created_at, updated_at)
+    SELECT gen_random_uuid(), 'user' || g, 'user' || g || '@example.com', 'x', 'default', '#ffffff', true, now(), now()
+    FROM generate_series(1, 1000) g
+    """,
+    """
+    INSERT INTO links (id, user_id, title, url, position, is_active, click_count, is_sensitive, link_type,
+                       scheduled_start, created_at, updated_at)
+    SELECT gen_random_uuid(), u.id, 'link ' || p, 'https://example.com/' || p, p, p % 5 <> 0, 0, false, 'link',
+           CASE WHEN p = 9 AND right(u.username, 1) = '0' THEN now() + interval '1 day' END, now(), now()
+    FROM users u CROSS JOIN generate_series(0, 9) p
+    """,
+    """
+    INSERT INTO profile_views (user_id, viewer_ip, is_bot, viewed_at)
+    SELECT u.id, ('10.0.' || g % 250 || '.' || g % 200)::inet, g % 20 = 0, now() - (g * 293 % 43200) * interval '1 minute'
+    FROM users u CROSS JOIN generate_series(1, 100) g
+    """,
+    """
+    INSERT INTO link_clicks (link_id, user_id, visitor_ip, is_bot, clicked_at)
+    SELECT l.id, l.user_id, ('10.1.' || g % 250 || '.' || g % 200)::inet, g % 20 = 0,
+           now() - (g * 293 % 43200) * interval '1 minute'
+    FROM links l CROSS JOIN generate_series(1, 10) g
+    """,
+)
+
+
+def _migration(revision: str):
+    return ScriptDirectory.from_config(alembic_config()).get_revision(revision).module
+
+
+def _migration_indexes() -> tuple:
+    """021 부분 인덱스 중 023이 대체하지 않은 것 (links)"""
+    superseded = {name for name, _ in _migration("023").SUPERSEDED}
+    return tuple(index for index in _migration("021").INDEXES if index[0] not in superseded)
+
+
+def _model_ddl() -> dict[str, str]:
+    return {
+        index.name: str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+        for table in (Link.__table__, ProfileView.__table__, LinkClick.__table__)
+        for index in table.indexes
+    }
+
+
+class TestIndexDefinitions:
+    def test_models_match_migration(self):
+        ddl = _model_ddl()
+        for name, table, columns, include, where in _migration_indexes():
+            include_sql = f" INCLUDE ({include})" if include else ""
+            assert ddl[name] == f"CREATE INDEX {name} ON {table} ({columns}){include_sql} WHERE {where}"
+
+    def test_all_partial(self):
+        # 부분 인덱스 — 비활성 링크/봇 이벤트는 인덱스에 들어가지 않음
+        for name, _, _, _, where in _migration_indexes():
+            assert where, name
+
+    def test_event_indexes_match_migration(self):
+        ddl = _model_ddl()
+        for name, table, columns, include in _migration("023").INDEXES:
+            assert ddl[name] == f"CREATE INDEX {name} ON {table} ({columns}) INCLUDE ({include})"
+
+    def test_superseded_indexes_removed_from_models(self):
+        # 모델에 남으면 새 DB(create_all)와 마이그레이션한 DB의 인덱스가 달라짐
+        ddl = _model_ddl()
+        for name, _ in _migration("023").SUPERSEDED:
+            assert name not in ddl
+
+
+async def _first_page(stream) -> None:
+    async for _ in stream:
+        break
+
+
+def _index_names(node: dict) -> set[str]:
+    names = {node["Index Name"]} if "Index Name" in node else set()
+    for child in node.get("Plans", ()):
+        names |= _index_names(child)
+    return names
+
+
+async def _indexes_used(conn: AsyncConnection, call) -> set[str]:
+    """call이 실행한 SQL을 같은 파라미터로 EXPLAIN 해 계획에 쓰인 인덱스 이름을 모음"""
+    statements: list[tuple[str, object]] = []
+
+    def capture(_conn, _cursor, statement, parameters, _context, _executemany):
+        statements.append((statement, parameters))
+
+    event.listen(conn.sync_connection, "before_cursor_execute", capture)
+    try:
+        async with AsyncSession(bind=conn) as db:
+            await call(db)
+            await db.rollback()
+    finally:
+        event.remove(conn.sync_connection, "before_cursor_execute", capture)
+
+    used: set[str] = set()
+    for statement, parameters in statements:
+        value = (await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)).scalar_one()
+        plan = json.loads(value) if isinstance(value, str) else value
+        used |= _index_names(plan[0]["Plan"])
+    return used
+
+
+@pytest.fixture
+async def seeded_conn():
+    engine = create_async_engine(TEST_DATABASE_URL)
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            for sql in SEED_SQL:
+                await conn.exec_driver_sql(sql)
+        # index-only scan 비용이 운영과 같게 잡히도록 visibility map까지 갱신 (트랜잭션 밖에서 실행)
+        async with engine.connect() as conn:
+            conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await conn.exec_driver_sql("VACUUM ANALYZE users, links, profile_views, link_clicks")
+        async with engine.connect() as conn:
+            yield conn
+    finally:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+        await engine.dispose()
+
+
+@pytest.mark.skipif(TEST_DATABASE_URL is None, reason="TEST_DATABASE_URL이 없으면 실제 DB 계획을 확인할 수 없음")
+class TestIndexScans:
+    async def test_hot_queries_use_indexes(self, seeded_conn, tmp_path):
+        user_id = await seeded_conn.scalar(select(Link.user_id).limit(1))
+        cases = {
+            "public_timeline": (
+                lambda db: load_public_timeline(db, "user7"),
+                {"ix_users_username", "ix_links_user_position_active"},
+            ),
+            "prerender_bootstrap": (
+                lambda db: ProfileRenderer(str(tmp_path)).bootstrap(db),
+                {"ix_links_user_scheduled_active"},
+            ),
+            "summary": (
+                lambda db: get_summary(db, user_id),
+                {"ix_link_clicks_user_clicked_at_covering", "ix_profile_views_user_viewed_at_covering"},
+            ),
+            "view_stats": (lambda db: get_view_stats(db, user_id, 7), {"ix_profile_views_user_viewed_at_covering"}),
+            "breakdown_views": (
+                lambda db: get_breakdown(db, user_id, "device", "views"),
+                {"ix_profile_views_user_viewed_at_covering"},
+            ),
+            "breakdown_clicks": (
+                lambda db: get_breakdown(db, user_id, "device", "clicks"),
+                {"ix_link_clicks_user_clicked_at_covering"},
+            ),
+            "recent_clicks": (
+                lambda db: get_recent_clicks(db, user_id, 10),
+                {"ix_link_clicks_user_clicked_at_covering"},
+            ),
+            # 아래는 봇 행까지 읽는 조회 — 021 부분 인덱스로는 처리할 수 없던 경로
+            "view_dedup": (
+                lambda db: db.execute(recent_view(user_id, "10.0.1.1", datetime.now(timezone.utc) - timedelta(hours=1))),
+                {"ix_profile_views_user_viewed_at_covering"},
+            ),
+            "export_clicks": (
+                lambda db: _first_page(stream_link_clicks(db, user_id)),
+                {"ix_link_clicks_user_clicked_at_covering"},
+            ),
+            "export_views": (
+                lambda db: _first_page(stream_profile_views(db, user_id)),
+                {"ix_profile_views_user_viewed_at_covering"},
+            ),
+            # 계정 삭제 시 FK ON DELETE CASCADE가 실행하는 삭제 (EXPLAIN만 하므로 실제로 지우지 않음)
+            "cascade_views": (
+                lambda db: db.execute(text("DELETE FROM profile_views WHERE user_id = :u"), {"u": user_id}),
+                {"ix_profile_views_user_viewed_at_covering"},
+            ),
+            "cascade_clicks": (
+                lambda db: db.execute(text("DELETE FROM link_clicks WHERE user_id = :u"), {"u": user_id}),
+                {"ix_link_clicks_user_clicked_at_covering"},
+            ),
+        }
+
+        missing = {}
+        for name, (call, expected) in cases.items():
+            used = await _indexes_used(seeded_conn, call)
+            if not expected <= used:
+                missing[name] = (sorted(expected - used), sorted(used))
+
+        assert missing == {}, f"인덱스를 쓰지 않는 핫 쿼리: {missing}"
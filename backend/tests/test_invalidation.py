@@ -0,0 +1,175 @@
+# 파일 목적: 워커 간 캐시 무효화 버스 테스트
+# 주요 기능: 발행 메시지 형식과 origin별 seq, 다른 워커 메시지 적용/자기 메시지 무시, seq 건너뜀·재연결 시 전체 flush, 발행 큐 넘침,
+#           NOTIFY 전송 task(PgListener 연결 사용), 공개 프로필 캐시 연동(로컬 변경 → 발행, 원격 변경 → 리스너 없이 항목만 제거)
+# 사용 방법: pytest tests/test_invalidation.py
+
+import asyncio
+import json
+import uuid
+from contextlib import suppress
+from unittest.mock import AsyncMock, MagicMock
+
+from app.core.invalidation import InMemoryInvalidationBus, PostgresInvalidationBus, invalidation_bus
+from app.services.profile_timeline import ProfileTimeline, PublicProfileCache, public_profile_cache
+
+USER_ID = uuid.UUID("00000000-0000-0000-0000-000000000001")
+
+
+def _remote(seq: int, origin: str = "worker-b", username: str | None = "alice") -> str:
+    message = {"o": origin, "s": seq, "u": USER_ID.hex}
+    if username is not None:
+        message["n"] = username
+    return json.dumps(message)
+
+
+def _bus() -> tuple[PostgresInvalidationBus, list, MagicMock]:
+    bus = PostgresInvalidationBus("postgresql://x")
+    applied = []
+    flush = MagicMock()
+    bus.add_handler(lambda user_id, username: applied.append((user_id, username)))
+    bus.add_flush_handler(flush)
+    return bus, applied, flush
+
+
+class TestPublish:
+    def test_messages_carry_origin_and_sequence(self):
+        bus = PostgresInvalidationBus("postgresql://x")
+
+        bus.publish(USER_ID, "alice")
+        bus.publish(USER_ID)
+
+        first = json.loads(bus._outbox.get_nowait())
+        second = json.loads(bus._outbox.get_nowait())
+        assert first == {"o": bus.origin, "s": 1, "u": USER_ID.hex, "n": "alice"}
+        assert second == {"o": bus.origin, "s": 2, "u": USER_ID.hex}
+
+    def test_full_queue_drops_but_consumes_sequence(self):
+        """유실된 seq는 다른 워커가 건너뜀으로 감지"""
+        bus = PostgresInvalidationBus("postgresql://x", queue_size=1)
+
+        bus.publish(USER_ID)
+        bus.publish(USER_ID)
+        bus.publish(USER_ID)
+
+        assert bus._outbox.qsize() == 1
+        assert bus._seq == 3
+
+    def test_memory_bus_publish_is_noop(self):
+        bus = InMemoryInvalidationBus()
+        handler = MagicMock()
+        bus.add_handler(handler)
+
+        bus.publish(USER_ID, "alice")
+
+        handler.assert_not_called()
+
+    async def test_sender_notifies_on_listen_connection(self):
+        bus = PostgresInvalidationBus("postgresql://x")
+        conn = bus._listener._conn = MagicMock()
+        conn.is_closed.return_value = False
+        conn.execute = AsyncMock()
+        bus.publish(USER_ID, "alice")
+
+        task = asyncio.create_task(bus._send_forever())
+        await asyncio.sleep(0)
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+
+        sql, channel, payload = conn.execute.await_args.args
+        assert sql == "SELECT pg_notify($1, $2)"
+        assert channel == "cache_invalidation"
+        assert json.loads(payload)["s"] == 1
+
+
+class TestReceive:
+    def test_applies_remote_messages_in_sequence(self):
+        bus, applied, flush = _bus()
+
+        bus._on_notify(None, 1, "cache_invalidation", _remote(5))
+        bus._on_notify(None, 1, "cache_invalidation", _remote(6, username=None))
+
+        assert applied == [(USER_ID, "alice"), (USER_ID, None)]
+        flush.assert_not_called()
+
+    def test_ignores_own_messages(self):
+        bus, applied, flush = _bus()
+
+        bus._on_notify(None, 1, "cache_invalidation", _remote(1, origin=bus.origin))
+
+        assert applied == []
+
+    def test_sequence_gap_flushes_everything(self):
+        bus, applied, flush = _bus()
+
+        bus._on_notify(None, 1, "cache_invalidation", _remote(1))
+        bus._on_notify(None, 1, "cache_invalidation", _remote(3))
+        # flush 후에는 새 기준으로 이어서 적용
+        bus._on_notify(None, 1, "cache_invalidation", _remote(4))
+
+        assert applied == [(USER_ID, "alice"), (USER_ID, "alice")]
+        flush.assert_called_once()
+
+    def test_origins_tracked_independently(self):
+        bus, applied, flush = _bus()
+
+        bus._on_notify(None, 1, "cache_invalidation", _remote(1, origin="a"))
+        bus._on_notify(None, 1, "cache_invalidation", _remote(7, origin="b"))
+        bus._on_notify(None, 1, "cache_invalidation", _remote(2, origin="a"))
+
+        assert len(applied) == 3
+        flush.assert_not_called()
+
+    def test_invalid_payload_ignored(self):
+        bus, applied, flush = _bus()
+
+        bus._on_notify(None, 1, "cache_invalidation", "not json")
+        bus._on_notify(None, 1, "cache_invalidation", json.dumps({"o": "b", "s": 1, "u": "bad"}))
+
+        assert applied == []
+        flush.assert_not_called()
+
+    def test_failing_handler_isolated(self):
+        bus, applied, flush = _bus()
+        bus._handlers.insert(0, MagicMock(side_effect=RuntimeError("boom")))
+
+        bus._on_notify(None, 1, "cache_invalidation", _remote(1))
+
+        assert applied == [(USER_ID, "alice")]
+
+
+class TestReconnect:
+    def test_reconnect_flushes_and_resets_sequences(self):
+        """재연결 루프 자체는 PgListener 테스트 — 여기서는 유실 복구만"""
+        bus, applied, flush = _bus()
+        bus._on_notify(None, 1, "cache_invalidation", _remote(9))
+
+        bus._on_reconnect()
+        # 새 기준으로 시작 — 끊긴 동안 발행된 seq로 이어져도 건너뜀으로 보지 않음
+        bus._on_notify(None, 1, "cache_invalidation", _remote(15))
+
+        flush.assert_called_once()
+        assert len(applied) == 2
+
+
+class TestPublicProfileCacheWiring:
+    def test_module_cache_wired_to_bus(self):
+        assert invalidation_bus.publish in public_profile_cache._listeners
+        assert public_profile_cache.discard_user in invalidation_bus._handlers
+        assert public_profile_cache.clear in invalidation_bus._flush_handlers
+
+    def test_local_change_publishes_remote_change_only_discards(self):
+        bus = PostgresInvalidationBus("postgresql://x")
+        cache = PublicProfileCache()
+        cache.add_listener(bus.publish)
+        bus.add_handler(cache.discard_user)
+        cache.put("alice", ProfileTimeline.build(USER_ID, {"username": "alice"}, []))
+
+        bus._on_notify(None, 1, "cache_invalidation", _remote(1))
+
+        # 원격 변경: 로컬 항목만 버리고 재발행하지 않음
+        assert cache.get("alice") is None
+        assert bus._outbox.empty()
+
+        cache.invalidate_user(USER_ID, "alice")
+        assert json.loads(bus._outbox.get_nowait())["u"] == USER_ID.hex
@@ -1,5 +1,5 @@
 # 파일 목적: 링크 예약 공개(scheduled_start/end) 및 민감 콘텐츠(is_sensitive) 기능 단위 테스트
-# 주요 기능: 스키마 validator, is_sensitive 기본값, 공개 프로필 예약 필터링 검증
+# 주요 기능: 스키마 validator, is_sensitive 기본값, 공개 프로필 예약 필터링 검증 (DB가 반환한 예약 전/만료 링크를 ProfileTimeline이 제외)
 # 사용 방법: pytest tests/test_link_features.py -v --tb=short
 
 import uuid
@@ -164,42 +164,48 @@ class TestIsSensitive:
 
 
 class TestPublicProfileSchedulingFilter:
-    async def test_future_scheduled_start_excluded(self):
-        """scheduled_start가 미래 → DB 쿼리 필터로 제외됨 (mock에서 빈 결과 반환)"""
+    async def _public_links(self, *links) -> list:
         db = _make_db()
-        user = _make_user()
-
         user_result = MagicMock()
-        user_result.scalar_one_or_none.return_value = user
-
-        # DB가 필터링된 결과(빈 목록)를 반환하는 시나리오
+        user_result.one_or_none.return_value = _make_user()
+        # 링크 조회는 예약 조건 없이 활성 링크를 모두 반환 — 예약 평가는 ProfileTimeline 몫
         links_result = MagicMock()
-        links_result.scalars.return_value.all.return_value = []
-
+        links_result.all.return_value = list(links)
         db.execute = AsyncMock(side_effect=[user_result, links_result])
 
         result = await profile_service.get_public_profile(db, "scheduser")
 
-        assert result["links"] == []
         # DB execute가 두 번 호출됨 (user 조회 + 링크 조회)
         assert db.execute.call_count == 2
+        return result["links"]
+
+    async def test_future_scheduled_start_excluded(self):
+        """scheduled_start가 미래 → DB가 반환해도 ProfileTimeline이 공개 목록에서 제외"""
+        visible = _make_link()
+        pending = _make_link(scheduled_start=FUTURE, scheduled_end=FAR_FUTURE)
+
+        links = await self._public_links(visible, pending)
+
+        assert [link.id for link in links] == [visible.id]
 
     async def test_past_scheduled_end_excluded(self):
-        """scheduled_end가 과거 → DB 쿼리 필터로 제외됨 (mock에서 빈 결과 반환)"""
-        db = _make_db()
-        user = _make_user()
+        """scheduled_end가 과거 → DB가 반환해도 ProfileTimeline이 공개 목록에서 제외"""
+        visible = _make_link()
+        expired = _make_link(scheduled_start=PAST - timedelta(hours=1), scheduled_end=PAST)
 
-        user_result = MagicMock()
-        user_result.scalar_one_or_none.return_value = user
+        links = await self._public_links(expired, visible)
 
-        links_result = MagicMock()
-        links_result.scalars.return_value.all.return_value = []
+        assert [link.id for link in links] == [visible.id]
 
-        db.execute = AsyncMock(side_effect=[user_result, links_result])
+    async def test_future_and_expired_excluded_together(self):
+        """예약 전 링크와 만료 링크가 함께 와도 둘 다 제외, 공개 기간 중인 링크만 남음"""
+        pending = _make_link(scheduled_start=FUTURE)
+        expired = _make_link(scheduled_end=PAST)
+        live = _make_link(scheduled_start=PAST, scheduled_end=FUTURE)
 
-        result = await profile_service.get_public_profile(db, "scheduser")
+        links = await self._public_links(pending, expired, live)
 
-        assert result["links"] == []
+        assert [link.id for link in links] == [live.id]
 
     async def test_no_schedule_included(self):
         """예약 미설정 링크 → 정상 공개"""
@@ -208,10 +214,10 @@ class TestPublicProfileSchedulingFilter:
         link = _make_link(scheduled_start=None, scheduled_end=None)
 
         user_result = MagicMock()
-        user_result.scalar_one_or_none.return_value = user
+        user_result.one_or_none.return_value = user
 
         links_result = MagicMock()
-        links_result.scalars.return_value.all.return_value = [link]
+        links_result.all.return_value = [link]
 
         db.execute = AsyncMock(side_effect=[user_result, links_result])
 
@@ -228,10 +234,10 @@ class TestPublicProfileSchedulingFilter:
         link = _make_link(scheduled_start=PAST, scheduled_end=FUTURE)
 
         user_result = MagicMock()
-        user_result.scalar_one_or_none.return_value = user
+        user_result.one_or_none.return_value = user
 
         links_result = MagicMock()
-        links_result.scalars.return_value.all.return_value = [link]
+        links_result.all.return_value = [link]
 
         db.execute = AsyncMock(side_effect=[user_result, links_result])
 
@@ -246,10 +252,10 @@ class TestPublicProfileSchedulingFilter:
         link = _make_link(is_sensitive=True)
 
         user_result = MagicMock()
-        user_result.scalar_one_or_none.return_value = user
+        user_result.one_or_none.return_value = user
 
         links_result = MagicMock()
-        links_result.scalars.return_value.all.return_value = [link]
+        links_result.all.return_value = [link]
 
         db.execute = AsyncMock(side_effect=[user_result, links_result])
 
@@ -0,0 +1,147 @@
+# 파일 목적: SSE 실시간 카운터 집계기 및 /api/public/{username}/stream 테스트
+# 주요 기능: interval 단위 delta 병합, 리스너 없는 사용자 무시, SSE 포맷/keepalive, 404 처리
+# 사용 방법: pytest tests/test_live_counters.py
+
+import asyncio
+import json
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.core.events import AnalyticsEvent
+from app.core.exceptions import NotFoundException
+from app.core.live_counters import LiveCounterAggregator
+from app.routers import public
+
+USER_ID = uuid.UUID("00000000-0000-0000-0000-000000000001")
+LINK_ID = uuid.UUID("00000000-0000-0000-0000-000000000002")
+
+
+def _click(count: int, user_id: uuid.UUID = USER_ID) -> AnalyticsEvent:
+    return AnalyticsEvent(
+        kind="click",
+        user_id=user_id,
+        occurred_at=datetime.now(timezone.utc),
+        link_id=LINK_ID,
+        click_count=count,
+    )
+
+
+def _view(user_id: uuid.UUID = USER_ID) -> AnalyticsEvent:
+    return AnalyticsEvent(kind="view", user_id=user_id, occurred_at=datetime.now(timezone.utc))
+
+
+class TestLiveCounterAggregator:
+    async def test_events_coalesced_into_single_delta(self):
+        """interval 내 이벤트들은 한 번의 delta로 병합"""
+        agg = LiveCounterAggregator(interval=3600, keepalive=3600)
+        mailbox = agg.listen(USER_ID)
+
+        agg.on_event(_click(10))
+        agg.on_event(_click(11))
+        agg.on_event(_view())
+        assert not mailbox.ready.is_set()
+
+        agg.flush()
+
+        assert mailbox.ready.is_set()
+        delta = mailbox.take().to_dict()
+        assert delta["views"] == 1
+        assert delta["clicks"] == 2
+        assert delta["links"][str(LINK_ID)] == {"delta": 2, "click_count": 11}
+        agg.unlisten(USER_ID, mailbox)
+
+    async def test_unconsumed_deltas_merge_in_mailbox(self):
+        """소비 전 여러 번 flush 되어도 mailbox 하나에 합산"""
+        agg = LiveCounterAggregator(interval=3600, keepalive=3600)
+        mailbox = agg.listen(USER_ID)
+
+        agg.on_event(_click(1))
+        agg.flush()
+        agg.on_event(_click(2))
+        agg.flush()
+
+        delta = mailbox.take()
+        assert delta.clicks == 2
+        assert not mailbox.ready.is_set()
+        agg.unlisten(USER_ID, mailbox)
+
+    async def test_events_without_listeners_ignored(self):
+        """리스너 없는 사용자의 이벤트는 집계하지 않음"""
+        agg = LiveCounterAggregator(interval=3600, keepalive=3600)
+        agg.on_event(_click(1, user_id=uuid.uuid4()))
+        assert agg._pending == {}
+
+    async def test_flusher_stops_when_no_listeners(self):
+        """리스너가 모두 떠나면 flusher task 종료"""
+        agg = LiveCounterAggregator(interval=0, keepalive=3600)
+        mailbox = agg.listen(USER_ID)
+        flusher = agg._flusher
+        agg.unlisten(USER_ID, mailbox)
+
+        await asyncio.wait_for(flusher, timeout=1)
+
+        assert agg._flusher is None
+        assert agg.listener_count() == 0
+
+    async def test_stream_emits_sse_frames(self):
+        """stream → retry, counters 이벤트 프레임 순서로 출력"""
+        agg = LiveCounterAggregator(interval=0, keepalive=3600)
+        stream = agg.stream(USER_ID)
+
+        assert (await stream.__anext__()).startswith("retry:")
+        frame = asyncio.ensure_future(stream.__anext__())
+        while agg.listener_count(USER_ID) == 0:
+            await asyncio.sleep(0)
+        agg.on_event(_click(5))
+
+        text = await asyncio.wait_for(frame, timeout=1)
+        assert text.startswith("event: counters\ndata: ")
+        assert json.loads(text.split("data: ", 1)[1])["clicks"] == 1
+
+        await stream.aclose()
+        assert agg.listener_count() == 0
+
+    async def test_stream_keepalive(self):
+        """유휴 상태에서는 keepalive 주석 라인 전송"""
+        agg = LiveCounterAggregator(interval=3600, keepalive=0.01)
+        stream = agg.stream(USER_ID)
+        await stream.__anext__()
+
+        assert await asyncio.wait_for(stream.__anext__(), timeout=1) == ": keepalive\n\n"
+        await stream.aclose()
+
+
+class TestStreamEndpoint:
+    async def test_unknown_user_404(self, client, mock_db):
+        """존재하지 않는 username → 404"""
+        result = MagicMock()
+        result.scalar_one_or_none.return_value = None
+        mock_db.execute.return_value = result
+
+        response = await client.get("/api/public/nobody/stream")
+
+        assert response.status_code == 404
+
+    async def test_returns_event_stream_and_releases_db(self, mock_db):
+        """SSE 응답 생성 전에 DB 세션을 반환"""
+        result = MagicMock()
+        result.scalar_one_or_none.return_value = USER_ID
+        mock_db.execute = AsyncMock(return_value=result)
+
+        response = await public.stream_counters("testuser", db=mock_db)
+
+        assert response.media_type == "text/event-stream"
+        assert response.headers["x-accel-buffering"] == "no"
+        mock_db.close.assert_awaited_once()
+        await response.body_iterator.aclose()
+
+    async def test_not_found_raises(self, mock_db):
+        result = MagicMock()
+        result.scalar_one_or_none.return_value = None
+        mock_db.execute = AsyncMock(return_value=result)
+
+        with pytest.raises(NotFoundException):
+            await public.stream_counters("nobody", db=mock_db)
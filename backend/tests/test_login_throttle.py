@@ -0,0 +1,173 @@
+# 파일 목적: 로그인 실패 throttle 테스트
+# 주요 기능: 허용 횟수 이후 지수 backoff, 최대 대기 시간, window 경과 후 만료, 잠금 중 동시 시도는 1회만 통과, 선점 환불,
+#           email/IP 분리 추적, check 시 시도 선점, 워커 두 개가 같은 shared_state를 쓰면 허용 횟수를 나눠 씀, 공유 키에 원본 email 없음, 카운터 노출
+# 사용 방법: pytest tests/test_login_throttle.py
+
+import pytest
+
+from app.core.login_throttle import BackoffTable, LoginThrottle, login_throttle
+from app.core.shared_state import InMemorySharedState, SqliteSharedState
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _table(clock: FakeClock, **kwargs) -> BackoffTable:
+    return BackoffTable(InMemorySharedState(clock), "t:", clock=clock, **kwargs)
+
+
+class TestBackoffTable:
+    async def test_exponential_backoff_after_free_attempts(self):
+        clock = FakeClock()
+        table = _table(clock, free_attempts=2, base_delay=1.0, max_delay=10.0, window=60.0)
+
+        delays = []
+        for _ in range(7):
+            assert await table.reserve("k") == 0
+            delays.append(await table.retry_after("k"))
+            # 잠금이 풀린 뒤 다음 시도
+            clock.now += delays[-1]
+
+        assert delays == [0.0, 0.0, 1.0, 2.0, 4.0, 8.0, 10.0]
+
+    async def test_lock_expires_with_time(self):
+        clock = FakeClock()
+        table = _table(clock, free_attempts=0)
+        await table.reserve("k")
+        assert await table.retry_after("k") == 1.0
+
+        clock.now += 1.5
+        assert await table.retry_after("k") == 0.0
+
+    async def test_entries_expire_after_window(self):
+        """window 동안 실패가 없으면 실패 횟수가 초기화됨"""
+        clock = FakeClock()
+        table = _table(clock, free_attempts=1, window=60.0)
+        await table.reserve("k")
+
+        clock.now += 61
+        assert await table.failures("k") == 0
+        assert await table.reserve("k") == 0
+        assert await table.retry_after("k") == 0.0
+
+    async def test_only_one_attempt_passes_each_lock(self):
+        """허용 횟수를 넘긴 뒤 동시에 들어온 시도는 잠금 구간을 먼저 차지한 하나만 통과, 나머지는 선점을 되돌림"""
+        clock = FakeClock()
+        table = _table(clock, free_attempts=1, base_delay=4.0)
+        assert await table.reserve("k") == 0
+
+        assert await table.reserve("k") == 0
+        assert await table.reserve("k") == 4.0
+        assert await table.failures("k") == 2
+
+    async def test_release_refunds_reserved_attempt(self):
+        clock = FakeClock()
+        table = _table(clock, free_attempts=1)
+        await table.reserve("k")
+        await table.reserve("k")
+        assert await table.retry_after("k") > 0
+
+        await table.release("k")
+        assert await table.retry_after("k") == 0.0
+        await table.release("k")
+        assert await table.failures("k") == 0
+
+    async def test_keys_do_not_contain_raw_identifier(self):
+        clock = FakeClock()
+        state = InMemorySharedState(clock)
+        table = BackoffTable(state, "login:email:", free_attempts=0, clock=clock)
+
+        await table.reserve("a@example.com")
+
+        assert not any("example.com" in key for key in state._values)
+
+
+class TestLoginThrottle:
+    async def test_check_reserves_attempt(self):
+        """check가 허용하면서 시도를 선점 — 결과 기록 전에 들어온 요청도 허용 횟수에 포함"""
+        clock = FakeClock()
+        throttle = LoginThrottle(email_free_attempts=2, state=InMemorySharedState(clock), clock=clock)
+        allowed = [await throttle.check("a@example.com", None) == 0 for _ in range(5)]
+
+        assert allowed == [True, True, True, False, False]
+
+    async def test_success_refunds_ip_reservation(self):
+        clock = FakeClock()
+        throttle = LoginThrottle(ip_free_attempts=1, state=InMemorySharedState(clock), clock=clock)
+        for _ in range(3):
+            assert await throttle.check("a@example.com", "198.51.100.1") == 0
+            await throttle.record_success("a@example.com", "198.51.100.1")
+
+        assert await throttle.ips.failures("198.51.100.1") == 0
+
+    async def test_ip_spraying_many_accounts_locked(self):
+        """한 IP에서 여러 계정을 돌아가며 시도해도 IP 테이블에서 잠김"""
+        clock = FakeClock()
+        throttle = LoginThrottle(
+            email_free_attempts=5, ip_free_attempts=3, state=InMemorySharedState(clock), clock=clock
+        )
+        for i in range(4):
+            assert await throttle.check(f"user{i}@example.com", "198.51.100.1") == 0
+            await throttle.record_failure(f"user{i}@example.com", "198.51.100.1")
+
+        assert await throttle.check("new@example.com", "198.51.100.1") > 0
+        # IP에서 막힌 시도는 email 실패 수에 남지 않음
+        assert await throttle.emails.failures("new@example.com") == 0
+        assert await throttle.check("new@example.com", "198.51.100.2") == 0
+
+    async def test_counters(self):
+        clock = FakeClock()
+        throttle = LoginThrottle(email_free_attempts=0, state=InMemorySharedState(clock), clock=clock)
+        await throttle.check("A@example.com", None)
+        await throttle.record_failure("A@example.com", None)
+        await throttle.check("a@example.com", None)
+        await throttle.record_success("b@example.com", "198.51.100.1")
+
+        assert await throttle.stats() == {"checked": 2, "rejected": 1, "failures": 1, "successes": 1}
+
+
+class TestSharedAcrossWorkers:
+    @pytest.fixture
+    async def workers(self, tmp_path):
+        """같은 SQLite 파일을 여는 워커 두 개 (gunicorn 워커 프로세스와 같은 구성)"""
+        states = [SqliteSharedState(str(tmp_path / "shared.db")) for _ in range(2)]
+        for state in states:
+            await state.start()
+        yield [LoginThrottle(email_free_attempts=3, ip_free_attempts=100, state=state) for state in states]
+        for state in states:
+            await state.stop()
+
+    async def test_workers_share_attempt_budget(self, workers):
+        """요청이 워커 사이에 번갈아 분산돼도 email 허용 횟수는 전체 합계 기준"""
+        allowed = [await workers[i % 2].check("a@example.com", "198.51.100.1") == 0 for i in range(8)]
+
+        assert allowed == [True, True, True, True, False, False, False, False]
+
+    async def test_lockout_visible_to_other_worker(self, workers):
+        for _ in range(4):
+            await workers[0].check("a@example.com", None)
+
+        assert await workers[1].check("a@example.com", None) > 0
+        assert (await workers[1].stats())["rejected"] == 1
+
+    async def test_success_on_other_worker_resets_email(self, workers):
+        for _ in range(4):
+            await workers[0].check("a@example.com", None)
+
+        await workers[1].record_success("a@example.com", None)
+
+        assert await workers[0].check("a@example.com", None) == 0
+
+
+class TestLoginThrottleEndpoint:
+    async def test_stats_endpoint(self, client):
+        login_throttle.clear()
+        response = await client.get("/api/health/login-throttle")
+
+        assert response.status_code == 200
+        assert response.json()["rejected"] == 0
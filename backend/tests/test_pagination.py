@@ -0,0 +1,37 @@
+# 파일 목적: keyset 페이지네이션 커서 인코딩/디코딩 테스트
+# 주요 기능: 타입 보존 round trip, URL-safe 문자열, 손상/개수 불일치 커서 거부
+# 사용 방법: pytest tests/test_pagination.py
+
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+from app.core.exceptions import BadRequestException
+from app.core.pagination import decode_cursor, encode_cursor
+
+
+class TestCursor:
+    def test_round_trip_preserves_types(self):
+        clicked_at = datetime(2026, 3, 1, 9, 30, 15, 123456, tzinfo=timezone.utc)
+        cursor = encode_cursor(clicked_at, 12345)
+
+        assert decode_cursor(cursor, datetime, int) == (clicked_at, 12345)
+
+    def test_uuid_round_trip(self):
+        link_id = uuid.uuid4()
+        assert decode_cursor(encode_cursor(0, link_id), int, uuid.UUID) == (0, link_id)
+
+    def test_url_safe(self):
+        cursor = encode_cursor(datetime.now(timezone.utc), 2**40)
+        assert "=" not in cursor and "+" not in cursor and "/" not in cursor
+
+    @pytest.mark.parametrize("cursor", ["", "%%%", "bm90LWpzb24", encode_cursor(1)])
+    def test_invalid_cursor_rejected(self, cursor):
+        """손상되었거나 키 개수가 다른 커서 → 400"""
+        with pytest.raises(BadRequestException):
+            decode_cursor(cursor, datetime, int)
+
+    def test_wrong_value_type_rejected(self):
+        with pytest.raises(BadRequestException):
+            decode_cursor(encode_cursor("x", 1), datetime, int)
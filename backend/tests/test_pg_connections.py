@@ -0,0 +1,163 @@
+# 파일 목적: 워커당 PostgreSQL 연결 예산 테스트
+# 주요 기능: 워커 수로 나눈 풀 크기(워커 수 × 워커당 최대 연결 ≤ DB_MAX_CONNECTIONS, 설정 풀 크기는 상한), 워커 수 제한,
+#           PgConnections 공유(첫 start에 풀·LISTEN 연결을 열고 마지막 stop에 닫음, 풀 생성 실패 시 사용 수 복구),
+#           postgres 백엔드 팩토리 4종이 같은 pg_connections와 LISTEN 연결을 쓰는지, 실제 PostgreSQL에서 백엔드 4개가 연결 2개만 쓰는지
+#           (실제 DB 테스트는 TEST_DATABASE_URL이 없으면 건너뜀)
+# 사용 방법: pytest tests/test_pg_connections.py
+
+import os
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.core import events, invalidation, rate_limit, shared_state
+from app.core.config import MIN_CONNECTIONS_PER_WORKER, Settings
+from app.core.pg_connections import PgConnections, pg_connections
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+
+class TestConnectionBudget:
+    @pytest.mark.parametrize("workers", [1, 2, 4, 8, 16, 30])
+    def test_workers_fit_budget(self, workers):
+        config = Settings(web_concurrency=str(workers), db_max_connections=90)
+        pool_size, max_overflow, aux = config.worker_connection_limits
+
+        assert config.worker_count == workers
+        assert pool_size >= 1 and aux >= 1
+        assert workers * (pool_size + max_overflow + aux + 1) <= 90
+
+    def test_single_worker_keeps_configured_sizes(self):
+        config = Settings(web_concurrency="1", db_pool_size=10, db_max_overflow=20, pg_aux_pool_size=4)
+
+        assert config.worker_connection_limits == (10, 20, 4)
+
+    def test_worker_count_capped(self):
+        config = Settings(web_concurrency="64", db_max_connections=90)
+
+        assert config.worker_count == 90 // MIN_CONNECTIONS_PER_WORKER
+        pool_size, max_overflow, aux = config.worker_connection_limits
+        assert config.worker_count * (pool_size + max_overflow + aux + 1) <= 90
+
+    def test_defaults_to_cpu_count(self, mocker):
+        mocker.patch("app.core.config.os.cpu_count", return_value=6)
+
+        assert Settings(web_concurrency="").worker_count == 6
+
+
+def _fake_pool() -> MagicMock:
+    pool = MagicMock()
+    pool.close = AsyncMock()
+    return pool
+
+
+class TestPgConnections:
+    async def test_opened_once_and_closed_by_last_user(self, mocker):
+        pool = _fake_pool()
+        create_pool = mocker.patch("asyncpg.create_pool", AsyncMock(return_value=pool))
+        connections = PgConnections("postgresql://x", pool_size=3)
+        connections.listener.start = AsyncMock()
+        connections.listener.stop = AsyncMock()
+
+        await connections.start()
+        await connections.start()
+        create_pool.assert_awaited_once_with("postgresql://x", min_size=1, max_size=3)
+        connections.listener.start.assert_awaited_once()
+
+        await connections.stop()
+        pool.close.assert_not_awaited()
+        assert connections.pool is pool
+
+        await connections.stop()
+        pool.close.assert_awaited_once()
+        connections.listener.stop.assert_awaited_once()
+        assert connections.pool is None
+
+    async def test_failed_open_not_counted(self, mocker):
+        mocker.patch("asyncpg.create_pool", AsyncMock(side_effect=[OSError("refused"), _fake_pool()]))
+        connections = PgConnections("postgresql://x")
+        connections.listener.start = AsyncMock()
+
+        with pytest.raises(OSError):
+            await connections.start()
+        await connections.start()
+
+        assert connections.pool is not None
+
+    async def test_backends_share_pool(self, mocker):
+        pool = _fake_pool()
+        mocker.patch("asyncpg.create_pool", AsyncMock(return_value=pool))
+        connections = PgConnections("postgresql://x")
+        connections.listener.start = AsyncMock()
+        connections.listener.stop = AsyncMock()
+        backends = [
+            events.PostgresEventHub("postgresql://x", connections=connections),
+            rate_limit.PostgresRateLimiter("postgresql://x", connections=connections),
+            shared_state.PostgresSharedState("postgresql://x", connections=connections),
+        ]
+
+        for backend in backends:
+            await backend.start()
+        assert all(backend._pool is pool for backend in backends)
+
+        for backend in backends:
+            await backend.stop()
+        pool.close.assert_awaited_once()
+        assert all(backend._pool is None for backend in backends)
+
+
+class TestFactories:
+    def test_postgres_backends_use_worker_connections(self, mocker):
+        mocker.patch.object(events.settings, "analytics_event_backend", "postgres")
+        mocker.patch.object(rate_limit.settings, "rate_limit_backend", "postgres")
+        mocker.patch.object(shared_state.settings, "shared_state_backend", "postgres")
+        mocker.patch.object(invalidation.settings, "invalidation_backend", "postgres")
+        mocker.patch.object(pg_connections.listener, "_channels", {})
+        mocker.patch.object(pg_connections.listener, "_reconnect_handlers", [])
+
+        backends = [
+            events.create_event_hub(),
+            rate_limit.create_rate_limiter(),
+            shared_state.create_shared_state(),
+            invalidation.create_invalidation_bus(),
+        ]
+
+        assert all(backend._pg is pg_connections for backend in backends)
+        # LISTEN 연결 하나가 세 채널을 모두 수신
+        assert set(pg_connections.listener._channels) == {"analytics_events", "shared_state", "cache_invalidation"}
+
+
+@pytest.mark.skipif(TEST_DATABASE_URL is None, reason="TEST_DATABASE_URL이 없으면 실제 연결 수를 셀 수 없음")
+class TestRealConnectionCount:
+    async def test_four_backends_use_two_connections(self):
+        import asyncio
+
+        import asyncpg
+
+        dsn = TEST_DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://")
+        connections = PgConnections(dsn, pool_size=4, name="linktree_budget_test")
+        backends = [
+            events.PostgresEventHub(dsn, connections=connections),
+            rate_limit.PostgresRateLimiter(dsn, connections=connections),
+            shared_state.PostgresSharedState(dsn, connections=connections),
+            invalidation.PostgresInvalidationBus(dsn, connections=connections),
+        ]
+        admin = await asyncpg.connect(dsn)
+        before = await admin.fetchval("SELECT count(*) FROM pg_stat_activity WHERE backend_type = 'client backend'")
+        try:
+            for backend in backends:
+                await backend.start()
+            for _ in range(100):
+                if connections.listener.connection is not None:
+                    break
+                await asyncio.sleep(0.05)
+
+            after = await admin.fetchval(
+                "SELECT count(*) FROM pg_stat_activity WHERE backend_type = 'client backend'"
+            )
+            # 풀 min_size 1 + LISTEN 1 (백엔드마다 풀 + LISTEN을 열던 때는 7개)
+            assert after - before == 2
+        finally:
+            for backend in backends:
+                await backend.stop()
+            await admin.close()
@@ -0,0 +1,152 @@
+# 파일 목적: 재연결되는 LISTEN 연결(PgListener) 테스트
+# 주요 기능: 끊김 감지 후 재연결·재연결 핸들러 호출(첫 연결은 제외), 연결 실패 시 백오프 재시도, 채널 재등록, 연결 없을 때 notify,
+#           이벤트 허브/공유 상태/캐시 무효화 버스의 PgListener 채널 등록, 실제 PostgreSQL에서 LISTEN 백엔드 강제 종료 후 수신 복구
+#           (실제 DB 테스트는 TEST_DATABASE_URL이 없으면 건너뜀)
+# 사용 방법: pytest tests/test_pg_listener.py
+
+import asyncio
+import os
+from contextlib import suppress
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.core import pg_listener
+from app.core.events import PostgresEventHub
+from app.core.invalidation import PostgresInvalidationBus
+from app.core.pg_listener import PgListener
+from app.core.shared_state import PostgresSharedState
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+
+def _fake_conn() -> MagicMock:
+    conn = MagicMock()
+    conn.is_closed.return_value = False
+    conn.add_listener = AsyncMock()
+    conn.close = AsyncMock()
+    conn.execute = AsyncMock()
+    return conn
+
+
+async def _stop(task: asyncio.Task) -> None:
+    task.cancel()
+    with suppress(asyncio.CancelledError):
+        await task
+
+
+class TestReconnect:
+    async def test_reconnects_and_relistens_after_termination(self, mocker):
+        conns = [_fake_conn(), _fake_conn()]
+        connect = mocker.patch("asyncpg.connect", AsyncMock(side_effect=conns))
+        listener = PgListener("postgresql://x")
+        callback = MagicMock()
+        reconnected = asyncio.Event()
+        listener.add_channel("ch", callback)
+        listener.add_reconnect_handler(reconnected.set)
+
+        task = asyncio.create_task(listener._listen_forever())
+        await asyncio.sleep(0)
+        # 첫 연결에서는 재연결 핸들러를 부르지 않음
+        assert not reconnected.is_set()
+        assert listener.connection is conns[0]
+
+        # DB 재시작/유휴 종료 — asyncpg termination listener 호출
+        conns[0].add_termination_listener.call_args.args[0](conns[0])
+        await asyncio.wait_for(reconnected.wait(), timeout=1)
+        await _stop(task)
+
+        assert connect.await_count == 2
+        conns[1].add_listener.assert_awaited_once_with("ch", callback)
+
+    async def test_connect_failure_retries_with_backoff(self, mocker):
+        mocker.patch.object(pg_listener, "_RECONNECT_MIN_SECONDS", 0)
+        conn = _fake_conn()
+        mocker.patch("asyncpg.connect", AsyncMock(side_effect=[OSError("refused"), conn]))
+        listener = PgListener("postgresql://x")
+        handler = MagicMock()
+        listener.add_reconnect_handler(handler)
+
+        task = asyncio.create_task(listener._listen_forever())
+        for _ in range(10):
+            await asyncio.sleep(0)
+            if listener.connection is conn:
+                break
+        connected = listener.connection
+        await _stop(task)
+
+        assert connected is conn
+        # 처음 연결될 때까지는 유실된 알림이 없으므로 핸들러 없음
+        handler.assert_not_called()
+
+    async def test_failing_reconnect_handler_isolated(self):
+        listener = PgListener("postgresql://x")
+        calls = []
+        listener.add_reconnect_handler(MagicMock(side_effect=RuntimeError("boom")))
+        listener.add_reconnect_handler(lambda: calls.append(1))
+
+        listener._reconnected()
+
+        assert calls == [1]
+
+
+class TestNotify:
+    async def test_without_connection_returns_false(self):
+        assert await PgListener("postgresql://x").notify("ch", "{}") is False
+
+    async def test_sends_on_listen_connection(self):
+        listener = PgListener("postgresql://x")
+        listener._conn = _fake_conn()
+
+        assert await listener.notify("ch", "{}") is True
+        listener._conn.execute.assert_awaited_once_with("SELECT pg_notify($1, $2)", "ch", "{}")
+
+
+class TestBackendsUseListener:
+    def test_event_hub(self):
+        hub = PostgresEventHub("postgresql://x")
+
+        assert hub._listener._channels == {"analytics_events": [hub._on_notify]}
+
+    def test_shared_state(self):
+        state = PostgresSharedState("postgresql://x")
+
+        assert state._listener._channels == {"shared_state": [state._on_notify]}
+
+    def test_invalidation_bus_flushes_on_reconnect(self):
+        bus = PostgresInvalidationBus("postgresql://x")
+
+        assert bus._listener._channels == {"cache_invalidation": [bus._on_notify]}
+        assert bus._listener._reconnect_handlers == [bus._on_reconnect]
+
+
+@pytest.mark.skipif(TEST_DATABASE_URL is None, reason="TEST_DATABASE_URL이 없으면 실제 LISTEN 연결을 끊어 볼 수 없음")
+class TestRealConnection:
+    async def test_receives_again_after_backend_terminated(self, mocker):
+        import asyncpg
+
+        mocker.patch.object(pg_listener, "_RECONNECT_MIN_SECONDS", 0.05)
+        dsn = TEST_DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://")
+        received: asyncio.Queue[str] = asyncio.Queue()
+        reconnected = asyncio.Event()
+        listener = PgListener(dsn)
+        listener.add_channel("pg_listener_test", lambda conn, pid, channel, payload: received.put_nowait(payload))
+        listener.add_reconnect_handler(reconnected.set)
+        await listener.start()
+        admin = await asyncpg.connect(dsn)
+        try:
+            for _ in range(100):
+                if listener.connection is not None:
+                    break
+                await asyncio.sleep(0.05)
+            await admin.execute("SELECT pg_notify('pg_listener_test', 'before')")
+            assert await asyncio.wait_for(received.get(), timeout=5) == "before"
+
+            await admin.execute("SELECT pg_terminate_backend($1)", listener.connection.get_server_pid())
+            await asyncio.wait_for(reconnected.wait(), timeout=5)
+
+            await admin.execute("SELECT pg_notify('pg_listener_test', 'after')")
+            assert await asyncio.wait_for(received.get(), timeout=5) == "after"
+        finally:
+            await admin.close()
+            await listener.stop()
@@ -0,0 +1,231 @@
+# 파일 목적: 공개 프로필 정적 사전 렌더링 테스트
+# 주요 기능: JSON/.gz 원자적 쓰기·삭제, 안전하지 않은 username 거부, 변경 알림 → 재렌더링, 계정 삭제 시 파일 제거,
+#           예약 경계 재렌더링 예약, 조회 미스 대기열, 기동 시 경계 등록, 전체 렌더링 후 오래된 파일 정리, 공개 라우터 연동
+# 사용 방법: pytest tests/test_prerender.py
+
+import gzip
+import json
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.core.exceptions import NotFoundException
+from app.services import prerender
+from app.services.prerender import (
+    ProfileRenderer,
+    remove_profile_files,
+    render_all,
+    render_profile_json,
+    write_profile_files,
+)
+from app.services.profile_timeline import ProfileTimeline, public_profile_cache
+
+USER_ID = uuid.UUID("00000000-0000-0000-0000-000000000001")
+NOW = datetime.now(timezone.utc)
+
+
+def _link(**overrides) -> SimpleNamespace:
+    values = dict(
+        id=uuid.uuid4(),
+        user_id=USER_ID,
+        title="링크",
+        url="https://example.com",
+        description=None,
+        thumbnail_url=None,
+        position=0,
+        is_active=True,
+        click_count=3,
+        scheduled_start=None,
+        scheduled_end=None,
+        is_sensitive=False,
+        link_type="link",
+        favicon_url=None,
+        created_at=NOW,
+        updated_at=NOW,
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def _timeline(links=()) -> ProfileTimeline:
+    profile = {
+        "username": "alice",
+        "display_name": "Alice",
+        "bio": None,
+        "avatar_url": None,
+        "social_links": None,
+        "seo_settings": None,
+        "theme": "default",
+        "bg_color": "#ffffff",
+    }
+    return ProfileTimeline.build(USER_ID, profile, list(links))
+
+
+def _scalar_result(value) -> MagicMock:
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = value
+    return result
+
+
+def _read(path) -> dict:
+    return json.loads(path.read_bytes())
+
+
+def _read_links(renderer: ProfileRenderer) -> list:
+    with open(f"{renderer.directory}/alice.json", "rb") as f:
+        return json.loads(f.read())["links"]
+
+
+class TestProfileFiles:
+    def test_write_json_and_gzip(self, tmp_path):
+        body = render_profile_json(_timeline([_link()]).response)
+        write_profile_files(str(tmp_path), "alice", body)
+
+        assert _read(tmp_path / "alice.json")["links"][0]["click_count"] == 3
+        assert gzip.decompress((tmp_path / "alice.json.gz").read_bytes()) == body
+        # 임시 파일이 남지 않음
+        assert not list(tmp_path.glob("*.tmp"))
+
+    def test_rejects_unsafe_username(self, tmp_path):
+        with pytest.raises(ValueError):
+            write_profile_files(str(tmp_path), "../etc/passwd", b"{}")
+        remove_profile_files(str(tmp_path), "../x")  # 예외 없이 무시
+
+    def test_remove(self, tmp_path):
+        write_profile_files(str(tmp_path), "alice", b"{}")
+        remove_profile_files(str(tmp_path), "alice")
+        remove_profile_files(str(tmp_path), "alice")
+        assert list(tmp_path.iterdir()) == []
+
+    async def test_json_matches_api_response(self, client, mocker):
+        """사전 렌더링 파일과 GET /api/public/{username} 응답 본문이 같은 JSON"""
+        response_dict = _timeline([_link()]).response
+        mocker.patch("app.routers.public.profile_service.get_public_profile", return_value=response_dict)
+
+        api = await client.get("/api/public/alice")
+
+        assert json.loads(render_profile_json(response_dict)) == api.json()
+
+
+class TestProfileRenderer:
+    @pytest.fixture
+    def renderer(self, tmp_path):
+        renderer = ProfileRenderer(str(tmp_path), max_age_seconds=0)
+        renderer.start()
+        yield renderer
+        renderer.stop()
+
+    async def test_mutation_triggers_render(self, renderer, tmp_path, mocker):
+        """서비스 계층의 무효화 알림 → 대기열 → flush 시 파일 작성"""
+        mocker.patch.object(prerender.profile_service, "load_public_timeline", AsyncMock(return_value=_timeline([_link()])))
+        public_profile_cache.invalidate_user(USER_ID)
+        assert renderer.pending == 1
+
+        db = MagicMock()
+        db.execute = AsyncMock(return_value=_scalar_result("alice"))
+        assert await renderer.flush(db) == 1
+
+        assert _read(tmp_path / "alice.json")["username"] == "alice"
+        assert renderer.pending == 0
+
+    async def test_deleted_account_removes_files(self, renderer, tmp_path):
+        write_profile_files(str(tmp_path), "alice", b"{}")
+        public_profile_cache.invalidate_user(USER_ID, "alice")
+
+        db = MagicMock()
+        db.execute = AsyncMock(return_value=_scalar_result(None))
+        assert await renderer.flush(db) == 0
+
+        assert list(tmp_path.iterdir()) == []
+
+    async def test_schedules_rerender_at_next_boundary(self, renderer, mocker):
+        launch = NOW + timedelta(hours=1)
+        timeline = _timeline([_link(scheduled_start=launch)])
+        mocker.patch.object(prerender.profile_service, "load_public_timeline", AsyncMock(return_value=timeline))
+
+        await renderer.render_username(MagicMock(), "alice")
+
+        assert _read_links(renderer) == []
+        assert renderer.schedule.next_at() == launch.timestamp()
+        user_ids, _ = renderer.take_pending(now=launch)
+        assert user_ids == {USER_ID}
+
+    async def test_max_age_refresh(self, tmp_path, mocker):
+        """예약 경계가 없어도 max_age 뒤에 다시 렌더링 (click_count 등 갱신)"""
+        renderer = ProfileRenderer(str(tmp_path), max_age_seconds=300)
+        mocker.patch.object(prerender.profile_service, "load_public_timeline", AsyncMock(return_value=_timeline()))
+
+        await renderer.render_username(MagicMock(), "alice")
+
+        assert renderer.schedule.next_at() == pytest.approx(NOW.timestamp() + 300, abs=60)
+
+    async def test_missing_profile_removes_files(self, renderer, tmp_path, mocker):
+        write_profile_files(str(tmp_path), "alice", b"{}")
+        mocker.patch.object(
+            prerender.profile_service, "load_public_timeline", AsyncMock(side_effect=NotFoundException())
+        )
+
+        assert await renderer.render_username(MagicMock(), "alice") is False
+        assert list(tmp_path.iterdir()) == []
+
+    async def test_ensure_rendered_queues_once(self, renderer, mocker):
+        renderer.ensure_rendered("alice")
+        renderer.ensure_rendered("../bad")
+        _, usernames = renderer.take_pending()
+        assert usernames == {"alice"}
+
+        mocker.patch.object(prerender.profile_service, "load_public_timeline", AsyncMock(return_value=_timeline()))
+        await renderer.render_username(MagicMock(), "alice")
+        renderer.ensure_rendered("alice")
+        assert renderer.pending == 0
+
+    async def test_flush_continues_after_error(self, renderer, mocker):
+        mocker.patch.object(
+            prerender.profile_service, "load_public_timeline", AsyncMock(side_effect=RuntimeError("db down"))
+        )
+        renderer.ensure_rendered("alice")
+        renderer.ensure_rendered("bob")
+
+        assert await renderer.flush(MagicMock()) == 0
+
+    async def test_bootstrap_schedules_next_boundary(self, renderer, mock_db):
+        other = uuid.uuid4()
+        result = MagicMock()
+        result.all.return_value = [
+            (USER_ID, NOW + timedelta(hours=2), NOW + timedelta(hours=1)),
+            (other, None, NOW + timedelta(hours=3)),
+        ]
+        mock_db.execute.return_value = result
+
+        assert await renderer.bootstrap(mock_db) == 2
+        user_ids, _ = renderer.take_pending(now=NOW + timedelta(hours=1))
+        assert user_ids == {USER_ID}
+
+
+class TestRenderAll:
+    async def test_renders_active_users_and_prunes_stale(self, tmp_path, mock_db, mocker):
+        write_profile_files(str(tmp_path), "deleted_user", b"{}")
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = ["alice"]
+        mock_db.execute.return_value = result
+        mocker.patch.object(prerender.profile_service, "load_public_timeline", AsyncMock(return_value=_timeline()))
+
+        rendered, removed = await render_all(mock_db, ProfileRenderer(str(tmp_path)))
+
+        assert (rendered, removed) == (1, 1)
+        assert {p.name for p in tmp_path.iterdir()} - {"alice.json.br"} == {"alice.json", "alice.json.gz"}
+
+
+class TestPublicRouterHook:
+    async def test_backend_hit_queues_render(self, client, mocker, tmp_path):
+        renderer = ProfileRenderer(str(tmp_path))
+        mocker.patch("app.routers.public.profile_renderer", renderer)
+        mocker.patch("app.routers.public.profile_service.get_public_profile", return_value=_timeline().response)
+
+        response = await client.get("/api/public/alice")
+
+        assert response.status_code == 200
+        assert renderer.take_pending()[1] == {"alice"}
@@ -0,0 +1,255 @@
+# 파일 목적: 공개 프로필 예약 타임라인 캐시 테스트
+# 주요 기능: 경계 목록/활성 집합 계산, 경계 통과 시 DB 없이 재계산, TTL 만료, 사용자 단위 무효화, LRU 상한, 스케줄러 advance,
+#           스케줄러 대기 중 취소 전파, get_public_profile 캐시 히트(DB 미조회)와 링크 변경 시 무효화
+# 사용 방법: pytest tests/test_profile_timeline.py
+
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from app.services import link as link_service
+from app.services import profile as profile_service
+from app.services.profile_timeline import (
+    BoundaryScheduler,
+    ProfileTimeline,
+    PublicProfileCache,
+    active_links,
+    public_profile_cache,
+    schedule_boundaries,
+)
+
+USER_ID = uuid.UUID("00000000-0000-0000-0000-000000000001")
+NOW = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+PROFILE = {"username": "alice", "display_name": "Alice"}
+
+
+def _link(title: str, start: datetime | None = None, end: datetime | None = None) -> SimpleNamespace:
+    return SimpleNamespace(title=title, scheduled_start=start, scheduled_end=end)
+
+
+def _put(cache: PublicProfileCache, username: str, links: list, user_id: uuid.UUID = USER_ID) -> dict:
+    return cache.put(username, ProfileTimeline.build(user_id, PROFILE, links, now=NOW))
+
+
+def _titles(profile: dict) -> list[str]:
+    return [link.title for link in profile["links"]]
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestTimelineHelpers:
+    def test_boundaries_sorted_and_unique(self):
+        links = [
+            _link("a", NOW + timedelta(hours=2), NOW + timedelta(hours=3)),
+            _link("b", None, NOW + timedelta(hours=2)),
+            _link("c"),
+        ]
+        assert schedule_boundaries(links) == (NOW + timedelta(hours=2), NOW + timedelta(hours=3))
+
+    def test_active_links_matches_query_semantics(self):
+        """start <= now < end — 시작 시각은 포함, 종료 시각은 제외"""
+        links = [
+            _link("starts-now", start=NOW),
+            _link("ends-now", end=NOW),
+            _link("future", start=NOW + timedelta(seconds=1)),
+            _link("always"),
+        ]
+        assert [link.title for link in active_links(links, NOW)] == ["starts-now", "always"]
+
+
+class TestPublicProfileCache:
+    def test_hit_returns_cached_response(self):
+        cache = PublicProfileCache()
+        _put(cache, "alice", [_link("a")])
+
+        cached = cache.get("alice", now=NOW)
+        assert cached["display_name"] == "Alice"
+        assert _titles(cached) == ["a"]
+        assert cache.get("bob", now=NOW) is None
+
+    def test_recomputes_active_set_when_boundary_passes(self):
+        """다음 경계 전까지는 같은 응답, 경계 이후에는 DB 없이 활성 집합만 다시 계산"""
+        cache = PublicProfileCache()
+        links = [
+            _link("launch", start=NOW + timedelta(hours=1)),
+            _link("sale", end=NOW + timedelta(hours=2)),
+        ]
+        first = _put(cache, "alice", links)
+        assert _titles(first) == ["sale"]
+
+        assert cache.get("alice", now=NOW + timedelta(minutes=59)) is first
+        assert _titles(cache.get("alice", now=NOW + timedelta(hours=1))) == ["launch", "sale"]
+        assert _titles(cache.get("alice", now=NOW + timedelta(hours=2))) == ["launch"]
+
+    def test_ttl_expiry(self):
+        clock = FakeClock()
+        cache = PublicProfileCache(ttl_seconds=30, clock=clock)
+        _put(cache, "alice", [])
+
+        clock.now += 31
+        assert cache.get("alice", now=NOW) is None
+        assert len(cache) == 0
+
+    def test_invalidate_user(self):
+        cache = PublicProfileCache()
+        _put(cache, "alice", [])
+        cache.invalidate_user(uuid.uuid4())
+        assert cache.get("alice", now=NOW) is not None
+
+        cache.invalidate_user(USER_ID)
+        assert cache.get("alice", now=NOW) is None
+
+    def test_lru_eviction(self):
+        cache = PublicProfileCache(maxsize=2)
+        for name in ("a", "b"):
+            _put(cache, name, [], uuid.uuid4())
+        cache.get("a", now=NOW)
+        _put(cache, "c", [], uuid.uuid4())
+
+        assert cache.get("b", now=NOW) is None
+        assert cache.get("a", now=NOW) is not None
+        assert len(cache) == 2
+
+    def test_disabled_when_maxsize_zero(self):
+        cache = PublicProfileCache(maxsize=0)
+        response = _put(cache, "alice", [_link("a")])
+        assert _titles(response) == ["a"]
+        assert cache.get("alice", now=NOW) is None
+
+    def test_advance_rebuilds_due_entries(self):
+        """스케줄러는 가장 이른 경계부터 처리하고, 지나지 않은 경계는 건드리지 않음"""
+        cache = PublicProfileCache()
+        soon, later = NOW + timedelta(minutes=5), NOW + timedelta(hours=1)
+        _put(cache, "alice", [_link("a", start=soon)])
+        _put(cache, "bob", [_link("b", start=later)], uuid.uuid4())
+        assert cache.boundaries.next_at() == soon.timestamp()
+
+        assert cache.advance(now=NOW) == []
+        assert cache.advance(now=soon) == ["alice"]
+        assert _titles(cache._entries["alice"].response) == ["a"]
+        assert cache.boundaries.next_at() == later.timestamp()
+
+    def test_advance_skips_invalidated_entries(self):
+        cache = PublicProfileCache()
+        _put(cache, "alice", [_link("a", start=NOW + timedelta(minutes=5))])
+        _put(cache, "bob", [_link("b", start=NOW + timedelta(hours=1))], uuid.uuid4())
+        cache.invalidate_user(USER_ID)
+
+        assert cache.advance(now=NOW + timedelta(minutes=5)) == []
+
+    def test_invalidate_notifies_listeners(self):
+        cache = PublicProfileCache()
+        _put(cache, "alice", [])
+        calls = []
+        cache.add_listener(lambda user_id, username: calls.append((user_id, username)))
+
+        cache.invalidate_user(USER_ID)
+        cache.invalidate_user(USER_ID, "alice")
+        other = uuid.uuid4()
+        cache.invalidate_user(other)
+
+        assert calls == [(USER_ID, "alice"), (USER_ID, "alice"), (other, None)]
+
+
+class TestBoundaryScheduler:
+    def test_pop_due_in_order_and_reschedule(self):
+        scheduler = BoundaryScheduler()
+        scheduler.schedule("a", NOW + timedelta(minutes=2))
+        scheduler.schedule("b", NOW + timedelta(minutes=1))
+        scheduler.schedule("a", NOW + timedelta(minutes=3))  # 재예약 — 이전 시각은 무시됨
+
+        assert scheduler.pop_due(NOW + timedelta(minutes=2)) == ["b"]
+        assert scheduler.pop_due(NOW + timedelta(minutes=3)) == ["a"]
+        assert len(scheduler) == 0
+
+    def test_cancel_and_none(self):
+        scheduler = BoundaryScheduler()
+        scheduler.schedule("a", NOW)
+        scheduler.schedule("b", NOW)
+        scheduler.cancel("a")
+        scheduler.schedule("b", None)
+
+        assert scheduler.next_at() is None
+        assert scheduler.pop_due(NOW) == []
+
+    def test_heap_stays_bounded_under_churn(self):
+        """같은 키를 반복 재예약해도 죽은 힙 항목이 무한히 쌓이지 않음"""
+        scheduler = BoundaryScheduler()
+        for i in range(500):
+            scheduler.schedule("a", NOW + timedelta(seconds=i))
+        assert len(scheduler._heap) <= 2 * len(scheduler) + 64
+
+    async def test_wait_returns_when_woken(self):
+        """대기 전에 들어온 wake()도 유실되지 않음"""
+        scheduler = BoundaryScheduler()
+        scheduler.wake()
+        start = time.monotonic()
+        await scheduler.wait(max_sleep=5.0)
+        assert time.monotonic() - start < 1.0
+
+    async def test_cancel_while_waiting_exits(self):
+        """lifespan 종료 시 대기 중인 스케줄러 task가 취소를 삼키지 않고 종료"""
+        scheduler = BoundaryScheduler()
+
+        async def loop():
+            while True:
+                await scheduler.wait(max_sleep=60.0)
+
+        task = asyncio.create_task(loop())
+        await asyncio.sleep(0)
+        task.cancel()
+        done, _ = await asyncio.wait({task}, timeout=1.0)
+
+        assert task in done
+        assert task.cancelled()
+
+    def test_clear_resets_wakeup(self):
+        scheduler = BoundaryScheduler()
+        scheduler.wake()
+        scheduler.clear()
+        assert not scheduler._wakeup.is_set()
+
+
+class TestGetPublicProfileCache:
+    def _db(self):
+        user = MagicMock()
+        user.id = USER_ID
+        user.username = "alice"
+        user_result = MagicMock()
+        user_result.one_or_none.return_value = user
+        links_result = MagicMock()
+        links_result.all.return_value = [_link("a")]
+        db = MagicMock()
+        db.execute = AsyncMock(side_effect=[user_result, links_result])
+        return db
+
+    async def test_second_request_skips_db(self):
+        db = self._db()
+        first = await profile_service.get_public_profile(db, "alice")
+        second = await profile_service.get_public_profile(db, "alice")
+
+        assert second is first
+        assert db.execute.await_count == 2
+
+    async def test_link_change_invalidates(self, mock_db):
+        """링크 변경 커밋 후 해당 사용자의 캐시가 비워짐"""
+        await profile_service.get_public_profile(self._db(), "alice")
+        assert public_profile_cache.get("alice") is not None
+
+        link = MagicMock()
+        link.user_id = USER_ID
+        result = MagicMock()
+        result.scalar_one_or_none.return_value = link
+        mock_db.execute.return_value = result
+        await link_service.toggle_link(mock_db, uuid.uuid4(), USER_ID)
+
+        assert public_profile_cache.get("alice") is None
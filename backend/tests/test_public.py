@@ -9,9 +9,12 @@ from unittest.mock import AsyncMock, MagicMock
 import pytest
 
 from app.core.exceptions import NotFoundException
+from app.core.rate_limit import RateLimit, rate_limiter
 from app.models.link import Link
 from app.models.user import User
 from app.schemas.profile import PublicProfileResponse
+from app.services.geoip import GeoLocation
+from app.services.user_agents import UserAgentRef
 
 
 def _make_public_user(username: str = "testuser") -> MagicMock:
@@ -41,6 +44,42 @@ def _make_active_link(link_id: uuid.UUID | None = None, url: str = "https://exam
 LINK_ID = uuid.UUID("00000000-0000-0000-0000-000000000002")
 
 
+@pytest.fixture(autouse=True)
+def resolve_user_agent(mocker):
+    """UA 사전 조회는 test_user_agents.py에서 검증 — 여기서는 고정 id로 대체"""
+    return mocker.patch(
+        "app.routers.public.user_agent_cache.resolve",
+        new_callable=AsyncMock,
+        return_value=UserAgentRef(1, False),
+    )
+
+
+@pytest.fixture(autouse=True)
+def reset_rate_limiter():
+    """테스트 간 토큰 버킷 공유 방지 (모든 요청이 같은 테스트 클라이언트 IP)"""
+    rate_limiter.clear()
+    yield
+    rate_limiter.clear()
+
+
+@pytest.fixture(autouse=True)
+def record_source(mocker):
+    """유입 경로 사전/집계는 test_traffic_sources.py에서 검증 — 여기서는 호출만 기록"""
+    mocker.patch(
+        "app.routers.public.traffic_source_cache.resolve", new_callable=AsyncMock, return_value=3
+    )
+    return mocker.patch("app.routers.public.record_daily_source", new_callable=AsyncMock)
+
+
+@pytest.fixture(autouse=True)
+def record_geo(mocker):
+    """GeoIP 조회/국가 집계는 test_geoip.py에서 검증 — 여기서는 고정 위치로 대체"""
+    mocker.patch(
+        "app.routers.public.geoip_resolver.lookup", return_value=GeoLocation("KR", "Seoul")
+    )
+    return mocker.patch("app.routers.public.record_daily_geo", new_callable=AsyncMock)
+
+
 class TestPublicProfile:
     async def test_get_public_profile_success(self, client, mocker):
         """공개 프로필 조회 → 200 + PublicProfileResponse"""
@@ -185,10 +224,11 @@ class TestRecordClick:
 
         assert response.status_code == 404
 
-    async def test_record_click_increments_count(self, client, mock_db):
-        """클릭 시 click_count 증가 및 DB 저장"""
+    async def test_record_click_increments_shard(self, client, mock_db, mocker):
+        """클릭 시 links 행 대신 클릭 카운터 샤드에 가산 후 DB 저장"""
         mock_link = _make_active_link(link_id=LINK_ID)
         mock_link.click_count = 5
+        increment = mocker.patch("app.routers.public.increment_click", new_callable=AsyncMock, return_value=6)
 
         link_result = MagicMock()
         link_result.scalar_one_or_none.return_value = mock_link
@@ -199,7 +239,167 @@ class TestRecordClick:
             follow_redirects=False,
         )
 
-        # click_count가 증가되고 commit이 호출됐는지 확인
-        assert mock_link.click_count == 6
+        # links 행은 수정하지 않고(행 락 없음) 샤드 가산 + commit만 호출됐는지 확인
+        assert mock_link.click_count == 5
+        increment.assert_awaited_once_with(mock_db, LINK_ID)
         mock_db.add.assert_called_once()
         mock_db.commit.assert_called_once()
+
+    async def test_record_click_publishes_event(self, client, mock_db, mocker):
+        """클릭 기록 후 실시간 이벤트 발행 (누적 click_count 포함)"""
+        mock_link = _make_active_link(link_id=LINK_ID)
+        mock_link.click_count = 5
+
+        link_result = MagicMock()
+        link_result.scalar_one_or_none.return_value = mock_link
+        mock_db.execute.return_value = link_result
+        mocker.patch("app.routers.public.increment_click", new_callable=AsyncMock, return_value=6)
+        publish = mocker.patch("app.routers.public.event_hub.publish", new_callable=AsyncMock)
+
+        await client.get(
+            f"/api/public/links/{LINK_ID}/click",
+            follow_redirects=False,
+        )
+
+        event = publish.await_args.args[0]
+        assert event.kind == "click"
+        assert event.link_id == LINK_ID
+        assert event.user_id == mock_link.user_id
+        assert event.click_count == 6
+
+
+class TestUserAgentEncoding:
+    async def test_click_stores_user_agent_id(self, client, mock_db, resolve_user_agent):
+        """클릭 기록 시 UA 문자열 대신 user_agents.id만 저장"""
+        link = _make_active_link(link_id=LINK_ID)
+        link_result = MagicMock()
+        link_result.scalar_one_or_none.return_value = link
+        mock_db.execute.return_value = link_result
+
+        await client.get(f"/api/public/links/{LINK_ID}/click", headers={"user-agent": "TestAgent/1.0"})
+
+        assert resolve_user_agent.await_args.args[1] == "TestAgent/1.0"
+        click = mock_db.add.call_args.args[0]
+        assert click.user_agent_id == 1
+        assert click.is_bot is False
+
+    async def test_bot_click_not_counted(self, client, mock_db, mocker, resolve_user_agent):
+        """봇 클릭은 is_bot으로 기록, 누적 클릭 수/실시간 이벤트에는 반영하지 않음"""
+        resolve_user_agent.return_value = UserAgentRef(2, True)
+        increment = mocker.patch("app.routers.public.increment_click", new_callable=AsyncMock)
+        publish = mocker.patch("app.routers.public.event_hub.publish", new_callable=AsyncMock)
+        link = _make_active_link(link_id=LINK_ID)
+        link_result = MagicMock()
+        link_result.scalar_one_or_none.return_value = link
+        mock_db.execute.return_value = link_result
+
+        response = await client.get(f"/api/public/links/{LINK_ID}/click")
+
+        assert response.status_code == 302
+        assert mock_db.add.call_args.args[0].is_bot is True
+        assert link.click_count == 5
+        increment.assert_not_awaited()
+        publish.assert_not_awaited()
+
+
+class TestTrafficSourceCapture:
+    async def test_click_rolls_up_source(self, client, mock_db, record_source):
+        """클릭 기록 시 유입 경로 id 저장 + 일별 집계 가산"""
+        link = _make_active_link(link_id=LINK_ID)
+        link_result = MagicMock()
+        link_result.scalar_one_or_none.return_value = link
+        mock_db.execute.return_value = link_result
+
+        await client.get(f"/api/public/links/{LINK_ID}/click?utm_source=ig")
+
+        assert mock_db.add.call_args.args[0].traffic_source_id == 3
+        record_source.assert_awaited_once_with(mock_db, link.user_id, 3, "click")
+
+    async def test_bot_view_not_rolled_up(self, client, mock_db, record_source, resolve_user_agent):
+        resolve_user_agent.return_value = UserAgentRef(2, True)
+        user_result = MagicMock()
+        user_result.scalar_one_or_none.return_value = _make_public_user()
+        view_result = MagicMock()
+        view_result.scalar_one_or_none.return_value = None
+        mock_db.execute.side_effect = [user_result, view_result]
+
+        response = await client.post("/api/public/testuser/view")
+
+        assert response.json() == {"status": "recorded"}
+        record_source.assert_not_awaited()
+
+
+class TestGeoEnrichment:
+    async def test_click_enriched_and_ip_truncated(self, client, mock_db, record_geo, mocker):
+        """GeoIP 보강 후 truncated 설정이면 /24 대역만 저장, 국가별 집계 가산"""
+        mocker.patch("app.services.geoip.settings.analytics_ip_storage", "truncated")
+        link = _make_active_link(link_id=LINK_ID)
+        link_result = MagicMock()
+        link_result.scalar_one_or_none.return_value = link
+        mock_db.execute.return_value = link_result
+
+        await client.get(f"/api/public/links/{LINK_ID}/click")
+
+        click = mock_db.add.call_args.args[0]
+        assert (click.country, click.region) == ("KR", "Seoul")
+        assert click.visitor_ip == "127.0.0.0"
+        record_geo.assert_awaited_once_with(mock_db, link.user_id, "KR", "click")
+
+    async def test_view_without_stored_ip_skips_dedup(self, client, mock_db, mocker):
+        """IP를 저장하지 않는 설정에서는 중복 방문 조회 없이 바로 기록"""
+        mocker.patch("app.services.geoip.settings.analytics_ip_storage", "none")
+        user_result = MagicMock()
+        user_result.scalar_one_or_none.return_value = _make_public_user()
+        mock_db.execute.side_effect = [user_result]
+
+        response = await client.post("/api/public/testuser/view")
+
+        assert response.json() == {"status": "recorded"}
+        assert mock_db.add.call_args.args[0].viewer_ip is None
+
+
+class TestIngestRateLimit:
+    async def test_view_over_limit_skipped_without_db(self, client, mock_db, mocker):
+        """한도 초과 방문은 DB 조회/쓰기 없이 skipped 응답"""
+        mocker.patch("app.dependencies.rate_limit.PER_TARGET_LIMIT", RateLimit(rate=0.001, burst=1))
+        user_result = MagicMock()
+        user_result.scalar_one_or_none.return_value = _make_public_user()
+        view_result = MagicMock()
+        view_result.scalar_one_or_none.return_value = None
+        mock_db.execute.side_effect = [user_result, view_result]
+
+        first = await client.post("/api/public/testuser/view")
+        second = await client.post("/api/public/testuser/view")
+
+        assert first.json() == {"status": "recorded"}
+        assert second.json() == {"status": "skipped"}
+        assert mock_db.execute.await_count == 2
+        assert mock_db.commit.await_count == 1
+
+    async def test_click_over_limit_redirects_without_recording(self, client, mock_db, mocker):
+        mocker.patch("app.dependencies.rate_limit.PER_IP_LIMIT", RateLimit(rate=0.001, burst=1))
+        link = _make_active_link(link_id=LINK_ID)
+        link_result = MagicMock()
+        link_result.scalar_one_or_none.return_value = link
+        mock_db.execute.return_value = link_result
+
+        await client.get(f"/api/public/links/{LINK_ID}/click")
+        response = await client.get(f"/api/public/links/{LINK_ID}/click")
+
+        assert response.status_code == 302
+        assert mock_db.add.call_count == 1
+        assert mock_db.commit.await_count == 1
+
+    async def test_reject_mode_returns_429(self, client, mock_db, mocker):
+        mocker.patch("app.dependencies.rate_limit.PER_IP_LIMIT", RateLimit(rate=0.5, burst=1))
+        mocker.patch("app.dependencies.rate_limit.settings.public_rate_limit_action", "reject")
+        link_result = MagicMock()
+        link_result.scalar_one_or_none.return_value = _make_active_link(link_id=LINK_ID)
+        mock_db.execute.return_value = link_result
+
+        await client.get(f"/api/public/links/{LINK_ID}/click")
+        response = await client.get(f"/api/public/links/{LINK_ID}/click")
+
+        assert response.status_code == 429
+        assert response.headers["retry-after"] == "2"
+        assert mock_db.execute.await_count == 1
@@ -0,0 +1,96 @@
+# 파일 목적: 토큰 버킷 rate limiter 테스트
+# 주요 기능: 한도 문자열 파싱, burst 후 차단 및 시간 경과에 따른 보충, shard별 LRU 상한, 공유(Postgres) 모드 SQL 호출 및 장애 시 로컬 대체
+# 사용 방법: pytest tests/test_rate_limit.py
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.core.rate_limit import InMemoryRateLimiter, PostgresRateLimiter, RateLimit
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestRateLimitParse:
+    def test_parse(self):
+        assert RateLimit.parse("60/minute") == RateLimit(rate=1.0, burst=60)
+        assert RateLimit.parse("10/seconds") == RateLimit(rate=10.0, burst=10)
+
+    @pytest.mark.parametrize("value", ["", "abc", "10/day", "0/minute", "-1/second"])
+    def test_invalid(self, value):
+        with pytest.raises(ValueError):
+            RateLimit.parse(value)
+
+
+class TestInMemoryRateLimiter:
+    async def test_burst_then_refill(self):
+        clock = FakeClock()
+        limiter = InMemoryRateLimiter(clock=clock)
+        limit = RateLimit(rate=1.0, burst=3)
+
+        assert [await limiter.allow("ip:1", limit) for _ in range(4)] == [True, True, True, False]
+
+        clock.now += 1.0
+        assert await limiter.allow("ip:1", limit) is True
+        assert await limiter.allow("ip:1", limit) is False
+
+    async def test_refill_capped_at_burst(self):
+        clock = FakeClock()
+        limiter = InMemoryRateLimiter(clock=clock)
+        limit = RateLimit(rate=1.0, burst=2)
+        await limiter.allow("k", limit)
+
+        clock.now += 3600
+        assert [await limiter.allow("k", limit) for _ in range(3)] == [True, True, False]
+
+    async def test_keys_independent(self):
+        limiter = InMemoryRateLimiter(clock=FakeClock())
+        limit = RateLimit(rate=1.0, burst=1)
+
+        assert await limiter.allow("a", limit)
+        assert await limiter.allow("b", limit)
+        assert not await limiter.allow("a", limit)
+
+    async def test_shard_capacity_bounded(self):
+        """키가 아무리 많아도 shard 수 × shard 상한을 넘지 않음"""
+        limiter = InMemoryRateLimiter(shards=4, max_keys_per_shard=8)
+        limit = RateLimit(rate=1.0, burst=1)
+        for i in range(1000):
+            await limiter.allow(f"ip:{i}", limit)
+
+        assert len(limiter) <= 32
+        limiter.clear()
+        assert len(limiter) == 0
+
+
+class TestPostgresRateLimiter:
+    async def test_uses_shared_table(self):
+        limiter = PostgresRateLimiter("postgresql://x")
+        limiter._pool = MagicMock()
+        limiter._pool.fetchval = AsyncMock(return_value=False)
+
+        assert await limiter.allow("ip:1", RateLimit(rate=2.0, burst=5)) is False
+        sql, *args = limiter._pool.fetchval.await_args.args
+        assert "INSERT INTO rate_limit_buckets" in sql
+        assert "ON CONFLICT (key) DO UPDATE" in sql
+        assert args == ["ip:1", 2.0, 5.0]
+
+    async def test_falls_back_to_local_buckets(self):
+        """공유 저장소 장애 시 요청을 막지 않고 로컬 버킷으로 판단"""
+        limiter = PostgresRateLimiter("postgresql://x", clock=FakeClock())
+        limiter._pool = MagicMock()
+        limiter._pool.fetchval = AsyncMock(side_effect=OSError("connection refused"))
+        limit = RateLimit(rate=1.0, burst=1)
+
+        assert await limiter.allow("ip:1", limit) is True
+        assert await limiter.allow("ip:1", limit) is False
+
+    async def test_without_pool_uses_local_buckets(self):
+        limiter = PostgresRateLimiter("postgresql://x")
+        assert await limiter.allow("ip:1", RateLimit(rate=1.0, burst=1)) is True
@@ -0,0 +1,136 @@
+# 파일 목적: raw 분석 이벤트 retention job 테스트
+# 주요 기능: cutoff 계산(최소 90일, 날짜 경계), 배치 삭제 → 일별 집계 upsert, NDJSON.gz 아카이브, advisory lock 실패 시 중단, CLI 인자 검증
+# 사용 방법: pytest tests/test_retention.py
+
+import gzip
+import json
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.services import retention
+
+USER_ID = uuid.UUID("00000000-0000-0000-0000-000000000001")
+LINK_ID = uuid.UUID("00000000-0000-0000-0000-000000000002")
+NOW = datetime(2026, 10, 19, 15, 30, tzinfo=timezone.utc)
+OLD = datetime(2026, 1, 2, 8, 0, tzinfo=timezone.utc)
+
+
+def _view(i: int) -> SimpleNamespace:
+    return SimpleNamespace(id=i, user_id=USER_ID, viewed_at=OLD, viewer_ip="10.0.0.1", country="KR", region="Seoul", user_agent_id=7, is_bot=False)
+
+
+def _click(i: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        id=i, link_id=LINK_ID, user_id=USER_ID, clicked_at=OLD, visitor_ip=None, country=None, region=None, user_agent_id=None, is_bot=False
+    )
+
+
+def _session_factory(batches: list[list], locked: bool = True):
+    """배치마다 새 세션 — 각 세션은 SET LOCAL, advisory lock, DELETE ... RETURNING, (upsert, UA 역조회) 순으로 실행"""
+    sessions = []
+
+    def factory():
+        db = MagicMock()
+        db.scalar = AsyncMock(return_value=locked)
+        rows = batches.pop(0) if batches else []
+        delete_result = MagicMock()
+        delete_result.all.return_value = rows
+        ua_result = MagicMock()
+        ua_result.all.return_value = [SimpleNamespace(id=7, value="Mozilla/5.0")]
+        db.execute = AsyncMock(side_effect=[MagicMock(), delete_result, MagicMock(), ua_result])
+        db.commit = AsyncMock()
+        cm = MagicMock()
+        cm.__aenter__ = AsyncMock(return_value=db)
+        cm.__aexit__ = AsyncMock(return_value=False)
+        sessions.append(db)
+        return cm
+
+    factory.sessions = sessions
+    return factory
+
+
+class TestRetentionCutoff:
+    def test_rounded_to_day_boundary(self):
+        assert retention.retention_cutoff(120, NOW) == datetime(2026, 6, 21, tzinfo=timezone.utc)
+
+    def test_minimum_days_enforced(self):
+        """viewStats 조회 범위(90일)보다 짧은 보존 기간은 90일로 올림"""
+        assert retention.retention_cutoff(7, NOW) == retention.retention_cutoff(90, NOW)
+
+
+class TestRunRetention:
+    async def test_batches_until_short_page(self):
+        """배치가 batch_size보다 작아질 때까지 반복, 테이블별 건수 집계"""
+        factory = _session_factory([[_view(1), _view(2)], [_view(3)], [_click(1)]])
+
+        result = await retention.run_retention(
+            days=120, batch_size=2, pause=0, session_factory=factory, now=NOW
+        )
+
+        assert (result.views, result.clicks) == (3, 1)
+        assert len(factory.sessions) == 3
+        for db in factory.sessions:
+            db.commit.assert_awaited_once()
+
+    async def test_folds_into_daily_aggregate_before_commit(self):
+        """삭제된 행은 같은 트랜잭션에서 (링크, 날짜)별 가산 upsert"""
+        factory = _session_factory([[], [_click(1), _click(2)]])
+
+        await retention.run_retention(days=120, batch_size=10, pause=0, session_factory=factory, now=NOW)
+
+        click_db = factory.sessions[1]
+        delete_sql = str(click_db.execute.await_args_list[1].args[0].compile(dialect=postgresql.dialect()))
+        upsert = click_db.execute.await_args_list[2].args[0]
+        assert "FOR UPDATE SKIP LOCKED" in delete_sql
+        assert "RETURNING" in delete_sql
+        assert "ON CONFLICT (link_id, day) DO UPDATE" in str(upsert.compile(dialect=postgresql.dialect()))
+        params = upsert.compile().params
+        assert 2 in params.values()
+
+    async def test_bot_rows_deleted_but_not_folded(self):
+        """봇 행은 삭제되지만 일별 집계에는 더하지 않음"""
+        bot = _click(9)
+        bot.is_bot = True
+        factory = _session_factory([[], [bot]])
+
+        result = await retention.run_retention(days=120, batch_size=10, session_factory=factory, now=NOW)
+
+        assert result.clicks == 1
+        assert factory.sessions[1].execute.await_count == 2  # SET LOCAL + DELETE, upsert 없음
+
+    async def test_lock_not_acquired_stops(self):
+        """다른 워커가 실행 중이면 아무것도 지우지 않고 종료"""
+        factory = _session_factory([[_view(1)]], locked=False)
+
+        result = await retention.run_retention(days=120, session_factory=factory, now=NOW)
+
+        assert result.views == 0
+        assert factory.sessions[0].execute.await_count == 1
+        factory.sessions[0].commit.assert_not_awaited()
+
+    async def test_archives_rows_per_day(self, tmp_path):
+        """삭제 전 raw 행을 날짜별 NDJSON.gz에 append"""
+        factory = _session_factory([[_view(1)], [_view(2)]])
+
+        await retention.run_retention(
+            days=120, batch_size=1, pause=0, archive_dir=str(tmp_path), session_factory=factory, now=NOW
+        )
+
+        path = tmp_path / "profile_views" / "2026-01-02.ndjson.gz"
+        records = [json.loads(line) for line in gzip.decompress(path.read_bytes()).splitlines()]
+        assert [r["id"] for r in records] == [1, 2]
+        assert records[0]["viewer_ip"] == "10.0.0.1"
+        assert records[0]["user_agent"] == "Mozilla/5.0"
+        assert records[0]["country"] == "KR"
+
+
+class TestCli:
+    def test_requires_positive_days(self, monkeypatch):
+        monkeypatch.setattr(retention.settings, "analytics_retention_days", 0)
+        with pytest.raises(SystemExit):
+            retention.main([])
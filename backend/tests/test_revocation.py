@@ -0,0 +1,79 @@
+# 파일 목적: 토큰 family 폐기 deny-set 테스트
+# 주요 기능: 즉시 폐기/조회, TTL 경과 항목 prune, DB 증분 동기화(워터마크 + 겹침 구간, 삭제 계정 폐기 기록 포함), 만료 refresh token 정리 SQL
+# 사용 방법: pytest tests/test_revocation.py
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from app.core.revocation import SYNC_OVERLAP, RevocationSet, purge_expired_refresh_tokens
+
+FAMILY_A = uuid.UUID("00000000-0000-0000-0000-0000000000a1")
+FAMILY_B = uuid.UUID("00000000-0000-0000-0000-0000000000b2")
+
+
+def _db(rows: list) -> MagicMock:
+    db = MagicMock()
+    result = MagicMock()
+    result.all.return_value = rows
+    db.execute = AsyncMock(return_value=result)
+    return db
+
+
+class TestRevocationSet:
+    def test_revoke_and_lookup(self):
+        revoked = RevocationSet(ttl_seconds=60)
+        revoked.revoke([FAMILY_A])
+
+        assert str(FAMILY_A) in revoked
+        assert str(FAMILY_B) not in revoked
+        assert None not in revoked
+
+    def test_prune_after_ttl(self):
+        """access token 수명이 지난 폐기 항목은 더 이상 필요 없으므로 제거"""
+        now = [1000.0]
+        revoked = RevocationSet(ttl_seconds=60, clock=lambda: now[0])
+        revoked.revoke([FAMILY_A])
+
+        now[0] += 61
+        revoked.prune()
+        assert len(revoked) == 0
+
+    async def test_incremental_sync(self):
+        revoked = RevocationSet(ttl_seconds=1800)
+        revoked_at = datetime.now(timezone.utc) - timedelta(seconds=5)
+
+        assert await revoked.sync(_db([SimpleNamespace(family_id=FAMILY_A, revoked_at=revoked_at)])) == 1
+        assert str(FAMILY_A) in revoked
+
+        db = _db([])
+        await revoked.sync(db)
+        # 두 번째 동기화는 마지막으로 본 폐기 시각에서 겹침 구간만큼 앞부터 조회
+        params = db.execute.await_args.args[0].compile().params
+        assert min(v for v in params.values() if isinstance(v, datetime)) == revoked_at - SYNC_OVERLAP
+
+    async def test_sync_includes_deleted_account_families(self):
+        """계정 삭제로 refresh_tokens 행이 CASCADE 삭제돼도 revoked_token_families에서 동기화"""
+        revoked = RevocationSet(ttl_seconds=1800)
+        db = _db([])
+
+        await revoked.sync(db)
+
+        sql = str(db.execute.await_args.args[0])
+        assert "FROM refresh_tokens" in sql
+        assert "UNION" in sql
+        assert "FROM revoked_token_families" in sql
+
+
+class TestPurgeExpired:
+    async def test_deletes_expired_rows(self):
+        db = MagicMock()
+        db.execute = AsyncMock(return_value=MagicMock(rowcount=3))
+        db.commit = AsyncMock()
+
+        assert await purge_expired_refresh_tokens(db) == 3
+        statements = [str(call.args[0]) for call in db.execute.await_args_list]
+        assert "DELETE FROM refresh_tokens WHERE refresh_tokens.expires_at <" in statements[0]
+        assert "DELETE FROM revoked_token_families WHERE revoked_token_families.revoked_at <" in statements[1]
+        db.commit.assert_awaited_once()
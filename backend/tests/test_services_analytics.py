@@ -1,11 +1,15 @@
 # 파일 목적: analytics 서비스 단위 테스트
-# 주요 기능: get_summary, get_link_stats, get_view_stats, get_top_links, get_recent_clicks
+# 주요 기능: get_summary, get_link_stats, get_view_stats, get_top_links, get_recent_clicks (keyset 커서 포함), get_breakdown, get_geo_breakdown, get_top_sources
 # 사용 방법: pytest tests/test_services_analytics.py
 
 import uuid
 from datetime import datetime, timezone
 from unittest.mock import AsyncMock, MagicMock
 
+import pytest
+
+from app.core.exceptions import BadRequestException
+from app.core.pagination import encode_cursor
 from app.services import analytics as analytics_service
 
 USER_ID = uuid.UUID("00000000-0000-0000-0000-000000000001")
@@ -28,7 +32,7 @@ class TestGetSummary:
         today_mock.scalar.return_value = None
 
         view_mock = MagicMock()
-        view_mock.one.return_value = MagicMock(total_views=None, today_views=None)
+        view_mock.one.return_value = MagicMock(total_views=None, today_views=None, archived_views=None)
 
         db.execute = AsyncMock(side_effect=[click_mock, today_mock, view_mock])
 
@@ -52,7 +56,7 @@ class TestGetSummary:
         today_mock.scalar.return_value = 5
 
         view_mock = MagicMock()
-        view_mock.one.return_value = MagicMock(total_views=100, today_views=10)
+        view_mock.one.return_value = MagicMock(total_views=100, today_views=10, archived_views=0)
 
         db.execute = AsyncMock(side_effect=[click_mock, today_mock, view_mock])
 
@@ -76,7 +80,7 @@ class TestGetSummary:
         today_mock.scalar.return_value = 0
 
         view_mock = MagicMock()
-        view_mock.one.return_value = MagicMock(total_views=0, today_views=0)
+        view_mock.one.return_value = MagicMock(total_views=0, today_views=0, archived_views=0)
 
         db.execute = AsyncMock(side_effect=[click_mock, today_mock, view_mock])
 
@@ -84,12 +88,33 @@ class TestGetSummary:
 
         assert result.click_through_rate == 0.0
 
+    async def test_includes_archived_views(self):
+        """retention으로 일별 집계에 접힌 방문 수도 총 방문 수에 포함"""
+        db = _make_db()
+
+        click_mock = MagicMock()
+        click_mock.one.return_value = MagicMock(total_clicks=30, total_links=1)
+
+        today_mock = MagicMock()
+        today_mock.scalar.return_value = 0
+
+        view_mock = MagicMock()
+        view_mock.one.return_value = MagicMock(total_views=40, today_views=0, archived_views=60)
+
+        db.execute = AsyncMock(side_effect=[click_mock, today_mock, view_mock])
+
+        result = await analytics_service.get_summary(db, USER_ID)
+
+        assert result.total_views == 100
+        assert result.click_through_rate == 30.0
+        assert "daily_profile_views" in str(db.execute.call_args.args[0])
+
 
 class TestGetLinkStats:
     async def test_empty_list(self):
         db = _make_db()
         mock_result = MagicMock()
-        mock_result.scalars.return_value.all.return_value = []
+        mock_result.all.return_value = []
         db.execute = AsyncMock(return_value=mock_result)
 
         result = await analytics_service.get_link_stats(db, USER_ID)
@@ -106,7 +131,7 @@ class TestGetLinkStats:
         link.is_active = True
 
         mock_result = MagicMock()
-        mock_result.scalars.return_value.all.return_value = [link]
+        mock_result.all.return_value = [link]
         db.execute = AsyncMock(return_value=mock_result)
 
         result = await analytics_service.get_link_stats(db, USER_ID)
@@ -115,6 +140,20 @@ class TestGetLinkStats:
         assert result[0].click_count == 10
         assert result[0].title == "링크1"
 
+    async def test_selects_only_required_columns(self):
+        """ORM 엔티티 대신 LinkAnalytics에 필요한 5개 컬럼만 조회"""
+        db = _make_db()
+        mock_result = MagicMock()
+        mock_result.all.return_value = []
+        db.execute = AsyncMock(return_value=mock_result)
+
+        await analytics_service.get_link_stats(db, USER_ID)
+
+        stmt = db.execute.call_args.args[0]
+        assert [c.key for c in stmt.selected_columns] == [
+            "id", "title", "url", "click_count", "is_active",
+        ]
+
 
 class TestGetViewStats:
     async def test_default_7_days(self):
@@ -190,7 +229,7 @@ class TestGetTopLinks:
         link.click_count = 5
 
         links_mock = MagicMock()
-        links_mock.scalars.return_value.all.return_value = [link]
+        links_mock.all.return_value = [link]
 
         db.execute = AsyncMock(side_effect=[view_mock, links_mock])
 
@@ -213,7 +252,7 @@ class TestGetTopLinks:
         link.click_count = 25
 
         links_mock = MagicMock()
-        links_mock.scalars.return_value.all.return_value = [link]
+        links_mock.all.return_value = [link]
 
         db.execute = AsyncMock(side_effect=[view_mock, links_mock])
 
@@ -228,7 +267,7 @@ class TestGetTopLinks:
         view_mock.scalar.return_value = 0
 
         links_mock = MagicMock()
-        links_mock.scalars.return_value.all.return_value = []
+        links_mock.all.return_value = []
 
         db.execute = AsyncMock(side_effect=[view_mock, links_mock])
 
@@ -237,6 +276,70 @@ class TestGetTopLinks:
         assert result == []
 
 
+class TestLinkStatsKeyset:
+    async def test_orders_by_click_count_then_id(self):
+        """동률 click_count에서도 순서가 고정되도록 id를 보조 정렬 키로 사용"""
+        db = _make_db()
+        mock_result = MagicMock()
+        mock_result.all.return_value = []
+        db.execute = AsyncMock(return_value=mock_result)
+
+        await analytics_service.get_link_stats(db, USER_ID, limit=20)
+
+        sql = str(db.execute.call_args.args[0])
+        assert "ORDER BY links.click_count DESC, links.id DESC" in sql
+        assert "LIMIT" in sql
+
+    async def test_after_cursor_seeks_past_last_row(self):
+        """after 커서 → OFFSET 없이 (click_count, id) < 튜플 비교로 seek"""
+        db = _make_db()
+        mock_result = MagicMock()
+        mock_result.all.return_value = []
+        db.execute = AsyncMock(return_value=mock_result)
+
+        cursor = encode_cursor(7, uuid.UUID("00000000-0000-0000-0000-000000000009"))
+        await analytics_service.get_link_stats(db, USER_ID, limit=20, after=cursor)
+
+        stmt = db.execute.call_args.args[0]
+        sql = str(stmt)
+        assert "(links.click_count, links.id) <" in sql
+        assert "OFFSET" not in sql
+        params = stmt.compile().params
+        assert 7 in params.values()
+
+    async def test_invalid_cursor_raises(self):
+        db = _make_db()
+        with pytest.raises(BadRequestException):
+            await analytics_service.get_link_stats(db, USER_ID, after="not-a-cursor")
+
+
+class TestRecentClicksKeyset:
+    async def test_cursor_round_trip(self):
+        """응답 항목의 cursor를 after로 넘기면 (clicked_at, id) 이후부터 조회"""
+        db = _make_db()
+        clicked_at = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+        click = MagicMock()
+        click.id = 42
+        click.link_id = uuid.uuid4()
+        click.clicked_at = clicked_at
+        click.visitor_ip = None
+        click.title = "링크"
+
+        mock_result = MagicMock()
+        mock_result.all.return_value = [click]
+        db.execute = AsyncMock(return_value=mock_result)
+
+        first = await analytics_service.get_recent_clicks(db, USER_ID, limit=1)
+        await analytics_service.get_recent_clicks(db, USER_ID, limit=1, after=first[0].cursor)
+
+        stmt = db.execute.call_args.args[0]
+        assert "(link_clicks.clicked_at, link_clicks.id) <" in str(stmt)
+        assert "ORDER BY link_clicks.clicked_at DESC, link_clicks.id DESC" in str(stmt)
+        params = stmt.compile().params.values()
+        assert clicked_at in params
+        assert 42 in params
+
+
 class TestGetRecentClicks:
     async def test_ipv4_masking(self):
         """IPv4 마지막 옥텟을 * 로 마스킹"""
@@ -245,9 +348,10 @@ class TestGetRecentClicks:
         click.link_id = uuid.uuid4()
         click.clicked_at = datetime.now(timezone.utc)
         click.visitor_ip = "192.168.1.100"
+        click.title = "링크 제목"
 
         mock_result = MagicMock()
-        mock_result.all.return_value = [(click, "링크 제목")]
+        mock_result.all.return_value = [click]
         db.execute = AsyncMock(return_value=mock_result)
 
         result = await analytics_service.get_recent_clicks(db, USER_ID)
@@ -263,9 +367,10 @@ class TestGetRecentClicks:
         click.link_id = uuid.uuid4()
         click.clicked_at = datetime.now(timezone.utc)
         click.visitor_ip = "2001:db8::1"
+        click.title = "링크"
 
         mock_result = MagicMock()
-        mock_result.all.return_value = [(click, "링크")]
+        mock_result.all.return_value = [click]
         db.execute = AsyncMock(return_value=mock_result)
 
         result = await analytics_service.get_recent_clicks(db, USER_ID)
@@ -280,9 +385,10 @@ class TestGetRecentClicks:
         click.link_id = uuid.uuid4()
         click.clicked_at = datetime.now(timezone.utc)
         click.visitor_ip = None
+        click.title = "링크"
 
         mock_result = MagicMock()
-        mock_result.all.return_value = [(click, "링크")]
+        mock_result.all.return_value = [click]
         db.execute = AsyncMock(return_value=mock_result)
 
         result = await analytics_service.get_recent_clicks(db, USER_ID)
@@ -298,3 +404,89 @@ class TestGetRecentClicks:
         result = await analytics_service.get_recent_clicks(db, USER_ID)
 
         assert result == []
+
+
+class TestGetBreakdown:
+    async def test_groups_on_precomputed_column_without_bots(self):
+        """UA 문자열 파싱 없이 user_agents 분류 컬럼으로 GROUP BY, 봇 제외, 비율 계산"""
+        db = _make_db()
+        mock_result = MagicMock()
+        mock_result.all.return_value = [
+            MagicMock(label="mobile", count=3),
+            MagicMock(label="desktop", count=1),
+        ]
+        db.execute = AsyncMock(return_value=mock_result)
+
+        result = await analytics_service.get_breakdown(db, USER_ID, "device", "clicks", 30)
+
+        assert [(item.label, item.count, item.percentage) for item in result] == [
+            ("mobile", 3, 75.0),
+            ("desktop", 1, 25.0),
+        ]
+        sql = str(db.execute.call_args.args[0])
+        assert "user_agents.device_type" in sql
+        assert "link_clicks.is_bot = false" in sql
+        assert "GROUP BY" in sql
+
+    async def test_views_by_browser(self):
+        db = _make_db()
+        mock_result = MagicMock()
+        mock_result.all.return_value = []
+        db.execute = AsyncMock(return_value=mock_result)
+
+        assert await analytics_service.get_breakdown(db, USER_ID, "browser", "views") == []
+        sql = str(db.execute.call_args.args[0])
+        assert "FROM profile_views LEFT OUTER JOIN user_agents" in sql
+
+    async def test_unknown_dimension_rejected(self):
+        with pytest.raises(BadRequestException):
+            await analytics_service.get_breakdown(_make_db(), USER_ID, "country")
+
+
+class TestGetTopSources:
+    async def test_reads_daily_aggregates_only(self):
+        """유입 경로 조회는 raw 이벤트가 아닌 daily_source_stats만 읽고, 빈 문자열 키는 None으로 반환"""
+        db = _make_db()
+        mock_result = MagicMock()
+        mock_result.all.return_value = [
+            MagicMock(referrer_domain="instagram.com", utm_source="", utm_medium="", utm_campaign="",
+                      view_count=10, click_count=4),
+            MagicMock(referrer_domain="", utm_source="", utm_medium="", utm_campaign="",
+                      view_count=2, click_count=None),
+        ]
+        db.execute = AsyncMock(return_value=mock_result)
+
+        result = await analytics_service.get_top_sources(db, USER_ID, days=7, limit=5)
+
+        assert result[0].referrer_domain == "instagram.com"
+        assert result[0].utm_source is None
+        assert (result[0].view_count, result[0].click_count) == (10, 4)
+        assert result[1].referrer_domain is None
+        assert result[1].click_count == 0
+        sql = str(db.execute.call_args.args[0])
+        assert "FROM daily_source_stats JOIN traffic_sources" in sql
+        assert "profile_views" not in sql
+        assert "link_clicks" not in sql
+
+
+class TestGetGeoBreakdown:
+    async def test_reads_daily_geo_stats_only(self):
+        """국가 분포는 daily_geo_stats 집계만 읽고, 빈 국가 코드는 Unknown으로 표시"""
+        db = _make_db()
+        mock_result = MagicMock()
+        mock_result.all.return_value = [MagicMock(label="KR", count=3), MagicMock(label="", count=1)]
+        db.execute = AsyncMock(return_value=mock_result)
+
+        result = await analytics_service.get_geo_breakdown(db, USER_ID, "clicks", 7)
+
+        assert [(item.label, item.count, item.percentage) for item in result] == [
+            ("KR", 3, 75.0),
+            ("Unknown", 1, 25.0),
+        ]
+        sql = str(db.execute.call_args.args[0])
+        assert "sum(daily_geo_stats.click_count)" in sql
+        assert "link_clicks" not in sql
+
+    async def test_unknown_kind_rejected(self):
+        with pytest.raises(BadRequestException):
+            await analytics_service.get_geo_breakdown(_make_db(), USER_ID, "sessions")
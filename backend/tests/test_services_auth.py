@@ -1,14 +1,20 @@
 # 파일 목적: services/auth.py 단위 테스트
-# 주요 기능: register, login, refresh_token, change_password, delete_account 비즈니스 로직 검증
+# 주요 기능: register, login(실패 throttle 포함), refresh_token(rotation, 재사용 탐지), change_password(세션 폐기), delete_account 비즈니스 로직 검증
 # 사용 방법: pytest tests/test_services_auth.py
 
+import asyncio
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from sqlalchemy.dialects import postgresql
 
-from app.core.exceptions import ConflictException, UnauthorizedException
+from app.core.exceptions import ConflictException, TooManyRequestsException, UnauthorizedException
+from app.core.login_throttle import login_throttle
+from app.core.revocation import revoked_families
+from app.core.security import create_access_token, create_refresh_token, verify_refresh_token, verify_token
+from app.models.refresh_token import RefreshToken, RevokedTokenFamily
 from app.models.user import User
 from app.schemas.user import ChangePasswordRequest, LoginRequest, RegisterRequest
 from app.services import auth as auth_service
@@ -28,6 +34,15 @@ def _make_user(is_active: bool = True) -> MagicMock:
     return user
 
 
+@pytest.fixture(autouse=True)
+def reset_auth_state():
+    login_throttle.clear()
+    revoked_families.clear()
+    yield
+    login_throttle.clear()
+    revoked_families.clear()
+
+
 def _make_execute_result(scalar_value):
     """db.execute() 반환값 mock"""
     result = MagicMock()
@@ -155,46 +170,156 @@ class TestLogin:
         assert result.access_token
         assert result.refresh_token
         assert result.token_type == "bearer"
+        # 로그인마다 새 token family를 저장소에 기록
+        stored = mock_db.add.call_args.args[0]
+        assert isinstance(stored, RefreshToken)
+        assert verify_refresh_token(result.refresh_token).jti == str(stored.jti)
+
+
+class TestLoginThrottle:
+    async def test_locked_email_rejected_before_db_and_bcrypt(self, mock_db):
+        """허용 실패 횟수를 넘긴 email은 DB 조회·bcrypt 검증 없이 429"""
+        mock_db.execute.return_value = _make_execute_result(_make_user())
+        data = LoginRequest(email="test@example.com", password="wrongpassword")
+
+        with patch("app.services.auth.verify_password", return_value=False) as verify:
+            for _ in range(login_throttle.emails.free_attempts + 1):
+                with pytest.raises(UnauthorizedException):
+                    await auth_service.login(mock_db, data, "198.51.100.1")
+            calls = mock_db.execute.await_count
+
+            with pytest.raises(TooManyRequestsException) as exc_info:
+                await auth_service.login(mock_db, LoginRequest(email="TEST@example.com", password="x"), "203.0.113.5")
+
+        assert exc_info.value.headers == {"Retry-After": "1"}
+        assert mock_db.execute.await_count == calls
+        assert verify.call_count == login_throttle.emails.free_attempts + 1
+
+    async def test_concurrent_attempts_cannot_bypass_backoff(self, mock_db):
+        """동시 요청도 DB 조회·bcrypt 전에 시도를 선점하므로 허용 횟수 + 1회만 검증까지 진행"""
+
+        async def slow_execute(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            return _make_execute_result(_make_user())
+
+        mock_db.execute.side_effect = slow_execute
+        data = LoginRequest(email="test@example.com", password="wrongpassword")
+
+        with patch("app.services.auth.verify_password", return_value=False) as verify:
+            results = await asyncio.gather(
+                *(auth_service.login(mock_db, data, "198.51.100.1") for _ in range(20)),
+                return_exceptions=True,
+            )
+
+        free = login_throttle.emails.free_attempts
+        assert verify.call_count == free + 1
+        assert sum(isinstance(r, UnauthorizedException) for r in results) == free + 1
+        assert sum(isinstance(r, TooManyRequestsException) for r in results) == 20 - free - 1
+
+    async def test_success_resets_email_failures(self, mock_db):
+        mock_db.execute.return_value = _make_execute_result(_make_user())
+        data = LoginRequest(email="test@example.com", password="password123")
+
+        with patch("app.services.auth.verify_password", side_effect=[False, True]):
+            with pytest.raises(UnauthorizedException):
+                await auth_service.login(mock_db, data, "198.51.100.1")
+            await auth_service.login(mock_db, data, "198.51.100.1")
+
+        assert await login_throttle.emails.failures("test@example.com") == 0
+        assert await login_throttle.ips.failures("198.51.100.1") == 1
 
 
 class TestRefreshToken:
+    USER_ID = uuid.UUID("00000000-0000-0000-0000-000000000001")
+    FAMILY_ID = uuid.UUID("00000000-0000-0000-0000-0000000000f1")
+    JTI = uuid.UUID("00000000-0000-0000-0000-0000000000a1")
+
+    def _token(self) -> str:
+        return create_refresh_token(str(self.USER_ID), str(self.FAMILY_ID), str(self.JTI))
+
+    def _stored(self, used: bool = False, revoked: bool = False) -> RefreshToken:
+        now = datetime.now(timezone.utc)
+        return RefreshToken(
+            jti=self.JTI,
+            family_id=self.FAMILY_ID,
+            user_id=self.USER_ID,
+            expires_at=now + timedelta(days=1),
+            used_at=now if used else None,
+            revoked_at=now if revoked else None,
+        )
+
+    @staticmethod
+    def _row_result(row):
+        result = MagicMock()
+        result.one_or_none.return_value = row
+        return result
+
     async def test_invalid_token_raises_unauthorized(self, mock_db):
-        """유효하지 않은 토큰 → UnauthorizedException"""
-        with patch("app.services.auth.verify_token", return_value=None):
-            with pytest.raises(UnauthorizedException) as exc_info:
-                await auth_service.refresh_token(mock_db, "invalid_token")
+        """유효하지 않은 토큰 → UnauthorizedException (DB 조회 없음)"""
+        with pytest.raises(UnauthorizedException) as exc_info:
+            await auth_service.refresh_token(mock_db, "invalid_token")
         assert "refresh token" in exc_info.value.detail
+        mock_db.execute.assert_not_awaited()
 
-    async def test_user_not_found_raises_unauthorized(self, mock_db):
-        """유효한 토큰이지만 사용자 없음 → UnauthorizedException"""
-        user_id = str(uuid.UUID("00000000-0000-0000-0000-000000000001"))
-        mock_db.execute.return_value = _make_execute_result(None)
+    async def test_legacy_token_without_family_rejected(self, mock_db):
+        """family/jti 없는 이전 형식 refresh token은 재로그인 필요"""
+        with pytest.raises(UnauthorizedException):
+            await auth_service.refresh_token(mock_db, create_refresh_token(str(self.USER_ID)))
 
-        with patch("app.services.auth.verify_token", return_value=user_id):
-            with pytest.raises(UnauthorizedException) as exc_info:
-                await auth_service.refresh_token(mock_db, "some_token")
-        assert "사용자" in exc_info.value.detail
+    async def test_unknown_jti_raises_unauthorized(self, mock_db):
+        mock_db.execute.return_value = self._row_result(None)
 
-    async def test_inactive_user_raises_unauthorized(self, mock_db):
-        """비활성 사용자 토큰 갱신 → UnauthorizedException"""
-        user_id = str(uuid.UUID("00000000-0000-0000-0000-000000000001"))
-        inactive_user = _make_user(is_active=False)
-        mock_db.execute.return_value = _make_execute_result(inactive_user)
+        with pytest.raises(UnauthorizedException):
+            await auth_service.refresh_token(mock_db, self._token())
 
-        with patch("app.services.auth.verify_token", return_value=user_id):
-            with pytest.raises(UnauthorizedException):
-                await auth_service.refresh_token(mock_db, "some_token")
+    async def test_inactive_user_raises_unauthorized(self, mock_db):
+        """비활성 사용자 토큰 갱신 → UnauthorizedException (사용자 별도 조회 없이 한 쿼리)"""
+        mock_db.execute.return_value = self._row_result((self._stored(), False))
 
-    async def test_refresh_success_returns_new_tokens(self, mock_db):
-        """정상 토큰 갱신 → 새 TokenResponse 반환"""
-        user_id = str(uuid.UUID("00000000-0000-0000-0000-000000000001"))
-        mock_db.execute.return_value = _make_execute_result(_make_user())
+        with pytest.raises(UnauthorizedException) as exc_info:
+            await auth_service.refresh_token(mock_db, self._token())
+        assert "사용자" in exc_info.value.detail
+        assert mock_db.execute.await_count == 1
+
+    async def test_refresh_rotates_within_family(self, mock_db):
+        """정상 갱신 → 기존 jti 사용 처리, 같은 family의 새 jti 발급"""
+        stored = self._stored()
+        mock_db.execute.return_value = self._row_result((stored, True))
+
+        result = await auth_service.refresh_token(mock_db, self._token())
+
+        assert stored.used_at is not None
+        issued = mock_db.add.call_args.args[0]
+        assert issued.family_id == self.FAMILY_ID
+        assert issued.jti != self.JTI
+        claims = verify_refresh_token(result.refresh_token)
+        assert claims.family_id == str(self.FAMILY_ID)
+        assert claims.jti == str(issued.jti)
+        assert verify_token(result.access_token) == str(self.USER_ID)
+        sql = str(mock_db.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "FOR UPDATE OF refresh_tokens" in sql
+
+    async def test_reused_token_revokes_family(self, mock_db):
+        """이미 교체된 토큰 재제출 → family 전체 폐기, 같은 family의 access token도 즉시 거부"""
+        access = create_access_token(str(self.USER_ID), str(self.FAMILY_ID))
+        revoke_result = MagicMock()
+        revoke_result.scalars.return_value.all.return_value = [self.FAMILY_ID]
+        mock_db.execute.side_effect = [self._row_result((self._stored(used=True), True)), revoke_result]
+
+        with pytest.raises(UnauthorizedException) as exc_info:
+            await auth_service.refresh_token(mock_db, self._token())
+
+        assert "이미 사용된" in exc_info.value.detail
+        mock_db.commit.assert_awaited_once()
+        mock_db.add.assert_not_called()
+        assert verify_token(access) is None
 
-        with patch("app.services.auth.verify_token", return_value=user_id):
-            result = await auth_service.refresh_token(mock_db, "some_token")
+    async def test_revoked_token_rejected(self, mock_db):
+        mock_db.execute.return_value = self._row_result((self._stored(revoked=True), True))
 
-        assert result.access_token
-        assert result.refresh_token
+        with pytest.raises(UnauthorizedException):
+            await auth_service.refresh_token(mock_db, self._token())
+        mock_db.add.assert_not_called()
 
 
 class TestChangePassword:
@@ -209,8 +334,13 @@ class TestChangePassword:
         assert "비밀번호" in exc_info.value.detail
 
     async def test_change_password_success(self, mock_db):
-        """정상 비밀번호 변경 → 해시 갱신 및 commit 호출"""
+        """정상 비밀번호 변경 → 해시 갱신, 모든 세션 폐기 후 commit"""
         user = _make_user()
+        family_id = uuid.uuid4()
+        access = create_access_token(str(user.id), str(family_id))
+        revoke_result = MagicMock()
+        revoke_result.scalars.return_value.all.return_value = [family_id]
+        mock_db.execute.return_value = revoke_result
         data = ChangePasswordRequest(current_password="correctpass", new_password="newpassword123")
 
         with patch("app.services.auth.verify_password", return_value=True):
@@ -219,14 +349,45 @@ class TestChangePassword:
 
         assert user.password_hash == "new_hashed_pw"
         mock_db.commit.assert_awaited_once()
+        sql = str(mock_db.execute.await_args.args[0])
+        assert "UPDATE refresh_tokens SET revoked_at" in sql
+        assert verify_token(access) is None
 
 
 class TestDeleteAccount:
     async def test_delete_account_calls_delete_and_commit(self, mock_db):
         """계정 삭제 → db.delete(user) + db.commit() 호출"""
         user = _make_user()
+        revoke_result = MagicMock()
+        revoke_result.scalars.return_value.all.return_value = []
+        mock_db.execute.return_value = revoke_result
 
         await auth_service.delete_account(mock_db, user)
 
         mock_db.delete.assert_called_once_with(user)
         mock_db.commit.assert_awaited_once()
+
+    async def test_delete_account_revokes_families(self, mock_db):
+        """계정 삭제 → 모든 family 폐기 + CASCADE와 무관한 폐기 기록 저장, 이 워커는 access token 즉시 거부"""
+        user = _make_user()
+        family_id = uuid.uuid4()
+        access = create_access_token(str(user.id), str(family_id))
+        revoke_result = MagicMock()
+        revoke_result.scalars.return_value.all.return_value = [family_id]
+        mock_db.execute.return_value = revoke_result
+
+        try:
+            await auth_service.delete_account(mock_db, user)
+
+            sql = str(mock_db.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+            assert "UPDATE refresh_tokens SET revoked_at" in sql
+            record = mock_db.add.call_args.args[0]
+            assert isinstance(record, RevokedTokenFamily)
+            assert record.family_id == family_id
+            # 폐기 기록이 사용자 삭제와 같은 트랜잭션에 포함
+            assert mock_db.add.call_count == 1
+            mock_db.commit.assert_awaited_once()
+            assert str(family_id) in revoked_families
+            assert verify_token(access) is None
+        finally:
+            revoked_families.clear()
@@ -45,7 +45,7 @@ class TestListLinks:
     async def test_empty_list(self):
         db = _make_db()
         mock_result = MagicMock()
-        mock_result.scalars.return_value.all.return_value = []
+        mock_result.all.return_value = []
         db.execute = AsyncMock(return_value=mock_result)
 
         result = await link_service.list_links(db, USER_ID)
@@ -56,13 +56,26 @@ class TestListLinks:
         db = _make_db()
         links = [_make_link(), _make_link(link_id=uuid.uuid4())]
         mock_result = MagicMock()
-        mock_result.scalars.return_value.all.return_value = links
+        mock_result.all.return_value = links
         db.execute = AsyncMock(return_value=mock_result)
 
         result = await link_service.list_links(db, USER_ID)
 
         assert len(result) == 2
 
+    async def test_selects_columns_not_orm_entity(self):
+        """list_links는 Link 엔티티가 아닌 컬럼 projection으로 조회 (identity map 미사용)"""
+        db = _make_db()
+        mock_result = MagicMock()
+        mock_result.all.return_value = []
+        db.execute = AsyncMock(return_value=mock_result)
+
+        await link_service.list_links(db, USER_ID)
+
+        stmt = db.execute.call_args.args[0]
+        assert all(d["type"] is not Link for d in stmt.column_descriptions)
+        assert {c.key for c in stmt.selected_columns} >= {"id", "title", "url", "position"}
+
 
 class TestCreateLink:
     async def test_create_success(self):
@@ -175,7 +188,7 @@ class TestReorderLinks:
         r2 = MagicMock()
         r2.scalar_one_or_none.return_value = link2
         list_result = MagicMock()
-        list_result.scalars.return_value.all.return_value = [link2, link1]
+        list_result.all.return_value = [link2, link1]
 
         db.execute = AsyncMock(side_effect=[r1, r2, list_result])
 
@@ -125,12 +125,14 @@ class TestGetPublicProfile:
         link.title = "링크1"
         link.url = "https://example.com"
         link.is_active = True
+        link.scheduled_start = None
+        link.scheduled_end = None
 
         user_result = MagicMock()
-        user_result.scalar_one_or_none.return_value = user
+        user_result.one_or_none.return_value = user
 
         links_result = MagicMock()
-        links_result.scalars.return_value.all.return_value = [link]
+        links_result.all.return_value = [link]
 
         db.execute = AsyncMock(side_effect=[user_result, links_result])
 
@@ -145,10 +147,10 @@ class TestGetPublicProfile:
         user = _make_user()
 
         user_result = MagicMock()
-        user_result.scalar_one_or_none.return_value = user
+        user_result.one_or_none.return_value = user
 
         links_result = MagicMock()
-        links_result.scalars.return_value.all.return_value = []
+        links_result.all.return_value = []
 
         db.execute = AsyncMock(side_effect=[user_result, links_result])
 
@@ -159,7 +161,7 @@ class TestGetPublicProfile:
     async def test_not_found(self):
         db = _make_db()
         mock_result = MagicMock()
-        mock_result.scalar_one_or_none.return_value = None
+        mock_result.one_or_none.return_value = None
         db.execute = AsyncMock(return_value=mock_result)
 
         with pytest.raises(NotFoundException):
@@ -0,0 +1,238 @@
+# 파일 목적: 멀티 워커 공유 상태 테스트
+# 주요 기능: 메모리 백엔드 get/set/incr/expire/delete + TTL 만료 + pub/sub, SQLite 백엔드 두 인스턴스(= 두 워커) 간 값·카운터·메시지 공유,
+#           Postgres 백엔드 SQL 호출·NOTIFY payload·자기 메시지 무시·장애 시 로컬 대체, 프로세스 로컬 설정 목록
+# 사용 방법: pytest tests/test_shared_state.py
+
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+from app.core.config import Settings
+from app.core.shared_state import (
+    InMemorySharedState,
+    PostgresSharedState,
+    SqliteSharedState,
+    process_local_settings,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestInMemorySharedState:
+    async def test_get_set_delete(self):
+        state = InMemorySharedState()
+
+        assert await state.get("k") is None
+        await state.set("k", "v")
+        assert await state.get("k") == "v"
+        assert await state.delete("k") is True
+        assert await state.delete("k") is False
+        assert await state.get("k") is None
+
+    async def test_ttl_expiry(self):
+        clock = FakeClock()
+        state = InMemorySharedState(clock=clock)
+        await state.set("k", "v", ttl=10)
+
+        clock.now += 9.9
+        assert await state.get("k") == "v"
+        clock.now += 0.2
+        assert await state.get("k") is None
+        assert len(state) == 0
+
+    async def test_incr_ttl_only_on_create(self):
+        """고정 윈도 카운터: 가산해도 만료 시각이 늘어나지 않음"""
+        clock = FakeClock()
+        state = InMemorySharedState(clock=clock)
+
+        assert await state.incr("hits", ttl=60) == 1
+        clock.now += 30
+        assert await state.incr("hits", 2, ttl=60) == 3
+        clock.now += 31
+        assert await state.incr("hits", ttl=60) == 1
+
+    async def test_expire(self):
+        clock = FakeClock()
+        state = InMemorySharedState(clock=clock)
+        await state.set("k", "v")
+
+        assert await state.expire("k", 5) is True
+        assert await state.expire("missing", 5) is False
+        clock.now += 6
+        assert await state.get("k") is None
+
+    async def test_publish_subscribe(self):
+        state = InMemorySharedState()
+        received = []
+        state.subscribe("invalidate", received.append)
+
+        await state.publish("invalidate", "user:1")
+        await state.publish("other", "ignored")
+        state.unsubscribe("invalidate", received.append)
+        await state.publish("invalidate", "user:2")
+
+        assert received == ["user:1"]
+
+    async def test_failing_subscriber_isolated(self):
+        state = InMemorySharedState()
+        received = []
+        state.subscribe("ch", MagicMock(side_effect=RuntimeError("boom")))
+        state.subscribe("ch", received.append)
+
+        await state.publish("ch", "m")
+
+        assert received == ["m"]
+
+
+class TestSqliteSharedState:
+    async def test_two_workers_share_values_and_counters(self, tmp_path):
+        path = str(tmp_path / "shared.db")
+        a, b = SqliteSharedState(path), SqliteSharedState(path)
+        await a.start()
+        await b.start()
+        try:
+            await a.set("k", "v", ttl=60)
+            assert await b.get("k") == "v"
+
+            assert await a.incr("hits") == 1
+            assert await b.incr("hits", 5) == 6
+            assert await a.get("hits") == "6"
+
+            assert await b.expire("k", 60) is True
+            assert await b.delete("k") is True
+            assert await a.get("k") is None
+        finally:
+            await a.stop()
+            await b.stop()
+
+    async def test_incr_resets_after_expiry(self, tmp_path):
+        clock = FakeClock()
+        state = SqliteSharedState(str(tmp_path / "shared.db"), clock=clock)
+        await state.start()
+        try:
+            assert await state.incr("hits", ttl=10) == 1
+            assert await state.incr("hits", ttl=10) == 2
+            clock.now += 11
+            assert await state.get("hits") is None
+            assert await state.incr("hits", ttl=10) == 1
+        finally:
+            await state.stop()
+
+    async def test_messages_delivered_to_other_workers_once(self, tmp_path):
+        path = str(tmp_path / "shared.db")
+        a, b = SqliteSharedState(path), SqliteSharedState(path)
+        await a.start()
+        await b.start()
+        try:
+            from_a, from_b = [], []
+            a.subscribe("invalidate", from_a.append)
+            b.subscribe("invalidate", from_b.append)
+
+            await a.publish("invalidate", "user:1")
+            # 발행 워커는 즉시, 다른 워커는 폴링으로 수신
+            assert from_a == ["user:1"]
+            assert await b.poll() == 1
+            assert await a.poll() == 0
+            assert await b.poll() == 0
+
+            assert from_a == ["user:1"]
+            assert from_b == ["user:1"]
+        finally:
+            await a.stop()
+            await b.stop()
+
+    async def test_not_started_uses_local_values(self, tmp_path):
+        state = SqliteSharedState(str(tmp_path / "shared.db"))
+
+        assert await state.incr("hits") == 1
+        assert await state.get("hits") == "1"
+        assert await state.poll() == 0
+
+
+class TestPostgresSharedState:
+    async def test_incr_uses_shared_table(self):
+        state = PostgresSharedState("postgresql://x")
+        state._pool = MagicMock()
+        state._pool.fetchval = AsyncMock(return_value=7)
+
+        assert await state.incr("hits", 2, ttl=60) == 7
+        sql, *args = state._pool.fetchval.await_args.args
+        assert "INSERT INTO shared_state" in sql
+        assert "ON CONFLICT (key) DO UPDATE" in sql
+        assert args == ["hits", 2, 60]
+
+    async def test_publish_notifies_other_workers(self):
+        state = PostgresSharedState("postgresql://x")
+        state._pool = MagicMock()
+        state._pool.execute = AsyncMock()
+        received = []
+        state.subscribe("invalidate", received.append)
+
+        await state.publish("invalidate", "user:1")
+
+        assert received == ["user:1"]
+        sql, channel, payload = state._pool.execute.await_args.args
+        assert sql == "SELECT pg_notify($1, $2)"
+        assert channel == "shared_state"
+        assert json.loads(payload) == {"c": "invalidate", "m": "user:1", "o": state._origin}
+
+    async def test_notify_skips_own_origin(self):
+        state = PostgresSharedState("postgresql://x")
+        received = []
+        state.subscribe("invalidate", received.append)
+
+        own = json.dumps({"c": "invalidate", "m": "mine", "o": state._origin})
+        other = json.dumps({"c": "invalidate", "m": "theirs", "o": "other"})
+        state._on_notify(None, 1, "shared_state", own)
+        state._on_notify(None, 1, "shared_state", other)
+        state._on_notify(None, 1, "shared_state", "not json")
+
+        assert received == ["theirs"]
+
+    async def test_falls_back_to_local_on_error(self):
+        """공유 저장소 장애 시 요청을 막지 않고 워커 로컬 값 사용"""
+        state = PostgresSharedState("postgresql://x")
+        state._pool = MagicMock()
+        state._pool.fetchval = AsyncMock(side_effect=OSError("connection refused"))
+        state._pool.execute = AsyncMock(side_effect=OSError("connection refused"))
+
+        assert await state.incr("hits") == 1
+        assert await state.incr("hits") == 2
+        await state.set("k", "v")
+        assert await state.get("k") == "v"
+
+    async def test_without_pool_uses_local_values(self):
+        state = PostgresSharedState("postgresql://x")
+
+        await state.set("k", "v")
+        assert await state.get("k") == "v"
+
+
+class TestProcessLocalSettings:
+    def test_lists_memory_backends(self):
+        config = Settings(
+            shared_state_backend="memory",
+            invalidation_backend="postgres",
+            rate_limit_backend="postgres",
+            analytics_event_backend="memory",
+        )
+
+        assert process_local_settings(config) == [
+            "SHARED_STATE_BACKEND=memory (로그인 throttle)",
+            "ANALYTICS_EVENT_BACKEND=memory",
+        ]
+
+    def test_all_shared(self):
+        config = Settings(
+            shared_state_backend="sqlite",
+            invalidation_backend="postgres",
+            rate_limit_backend="postgres",
+            analytics_event_backend="postgres",
+        )
+
+        assert process_local_settings(config) == []
@@ -0,0 +1,257 @@
+# 파일 목적: 기동 시간 최적화 테스트
+# 주요 기능: GraphQL 지연 생성(1회만 생성), DB 풀 사전 연결(동시 N개, pool_size 상한, 실패 시 대기 해제, 연결별 핫 쿼리 prepare 후 롤백),
+#           prepared statement 캐시 크기 설정 전달, 핫 쿼리 prepare 대상(공개 프로필·클릭 링크 조회·방문 INSERT), 인기 공개 프로필 캐시 적재,
+#           lifespan 사전 준비 실패 격리, 마이그레이션 head 빠른 확인(alembic_version 조회 vs 마이그레이션 파일 head)
+# 사용 방법: pytest tests/test_startup.py
+
+import asyncio
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.core import migrations
+from app.core import database
+from app.core.database import warm_pool
+from app.graphql.lazy import LazyGraphQLApp
+from app.models.analytics import ProfileView
+from app.services.hot_queries import prepare_hot_statements
+from app.services.profile import warm_public_profiles
+from app.services.profile_timeline import ProfileTimeline, public_profile_cache
+
+
+class TestLazyGraphQLApp:
+    def test_builds_once(self):
+        graphql = LazyGraphQLApp("/graphql")
+        assert not graphql.ready
+
+        router = graphql.build()
+
+        assert graphql.ready
+        assert graphql.build() is router
+        assert [route.path for route in router.routes] == ["/graphql", "/graphql", "/graphql"]
+
+    async def test_main_app_serves_graphql_lazily(self, gql_client):
+        response = await gql_client.post("/graphql", json={"query": "{ __typename }"})
+
+        assert response.status_code == 200
+        assert response.json() == {"data": {"__typename": "Query"}}
+
+
+class TestWarmPool:
+    def _engine(self, mocker, active: list[int], fail: bool = False):
+        engine = mocker.patch("app.core.database.engine")
+
+        class _Conn:
+            async def __aenter__(self):
+                if fail:
+                    raise OSError("connection refused")
+                active.append(1)
+                conn = MagicMock()
+                conn.execute = AsyncMock()
+                return conn
+
+            async def __aexit__(self, *exc):
+                return False
+
+        engine.connect.side_effect = lambda: _Conn()
+        return engine
+
+    async def test_opens_connections_concurrently(self, mocker):
+        active = []
+        engine = self._engine(mocker, active)
+
+        assert await warm_pool(3) == 3
+        # 반납 전에 모두 열려 있었으므로 풀이 같은 연결을 재사용하지 않음
+        assert len(active) == 3
+        assert engine.connect.call_count == 3
+
+    async def test_failure_propagates_without_hanging(self, mocker):
+        self._engine(mocker, [], fail=True)
+
+        with pytest.raises(OSError):
+            await asyncio.wait_for(warm_pool(3), timeout=1)
+
+    async def test_capped_at_pool_size(self, mocker):
+        engine = self._engine(mocker, [])
+        mocker.patch.object(database.settings, "db_pool_size", 2)
+        mocker.patch.object(database.settings, "web_concurrency", "1")
+
+        assert await warm_pool(8) == 2
+        assert engine.connect.call_count == 2
+
+    async def test_disabled(self, mocker):
+        engine = self._engine(mocker, [])
+
+        assert await warm_pool(0) == 0
+        engine.connect.assert_not_called()
+
+    async def test_prepares_on_each_connection_and_rolls_back(self, mocker):
+        self._engine(mocker, [])
+        sessions = []
+
+        class _Session:
+            def __init__(self, bind):
+                self.bind = bind
+                self.rollback = AsyncMock()
+                sessions.append(self)
+
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+        mocker.patch("app.core.database.AsyncSession", _Session)
+        prepare = AsyncMock()
+
+        assert await warm_pool(2, prepare=prepare) == 2
+
+        assert [call.args[0] for call in prepare.await_args_list] == sessions
+        assert all(session.rollback.await_count == 1 for session in sessions)
+
+
+class TestEngineSettings:
+    def test_statement_cache_size_passed_to_driver(self, mocker):
+        create = mocker.patch("app.core.database.create_async_engine")
+        mocker.patch.object(database.settings, "db_statement_cache_size", 0)
+        mocker.patch.object(database.settings, "db_pool_size", 5)
+        mocker.patch.object(database.settings, "web_concurrency", "1")
+
+        database.create_engine()
+
+        kwargs = create.call_args.kwargs
+        assert kwargs["pool_size"] == 5
+        assert kwargs["max_overflow"] == database.settings.db_max_overflow
+        assert kwargs["connect_args"] == {"prepared_statement_cache_size": 0, "statement_cache_size": 0}
+
+    def test_pool_sized_from_worker_count(self, mocker):
+        """워커 8개면 워커당 연결을 DB_MAX_CONNECTIONS / 8 안으로 줄임"""
+        create = mocker.patch("app.core.database.create_async_engine")
+        mocker.patch.object(database.settings, "web_concurrency", "8")
+        mocker.patch.object(database.settings, "db_max_connections", 90)
+
+        database.create_engine()
+
+        kwargs = create.call_args.kwargs
+        aux = database.settings.worker_connection_limits[2]
+        assert 8 * (kwargs["pool_size"] + kwargs["max_overflow"] + aux + 1) <= 90
+
+
+class TestPrepareHotStatements:
+    async def test_empty_database_prepares_lookups_only(self, mock_db):
+        mock_db.scalar = AsyncMock(return_value=None)
+
+        await prepare_hot_statements(mock_db)
+
+        sql = [str(call.args[0].compile(dialect=postgresql.dialect())) for call in mock_db.execute.await_args_list]
+        assert len(sql) == 3
+        assert "users.username = " in sql[0]
+        assert "links.id = " in sql[1]
+        assert "profile_views.viewer_ip = " in sql[2]
+        mock_db.add.assert_not_called()
+        mock_db.commit.assert_not_awaited()
+
+    async def test_prepares_public_profile_and_view_insert(self, mock_db, mocker):
+        user_id = uuid.uuid4()
+        mock_db.scalar = AsyncMock(return_value="alice")
+        load = mocker.patch(
+            "app.services.hot_queries.load_public_timeline",
+            AsyncMock(return_value=ProfileTimeline.build(user_id, {"username": "alice"}, [])),
+        )
+
+        await prepare_hot_statements(mock_db)
+
+        load.assert_awaited_once_with(mock_db, "alice")
+        view = mock_db.add.call_args.args[0]
+        assert isinstance(view, ProfileView)
+        assert view.user_id == user_id
+        mock_db.flush.assert_awaited_once()
+        # 롤백은 호출자(warm_pool) 몫 — 커밋하지 않음
+        mock_db.commit.assert_not_awaited()
+
+
+class TestWarmPublicProfiles:
+    async def test_loads_most_viewed_profiles(self, mock_db, mocker):
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = ["alice", "bob"]
+        mock_db.execute.return_value = result
+        load = mocker.patch(
+            "app.services.profile.load_public_timeline",
+            side_effect=lambda db, username: ProfileTimeline.build(uuid.uuid4(), {"username": username}, []),
+        )
+
+        assert await warm_public_profiles(mock_db, 10) == 2
+
+        assert [call.args[1] for call in load.await_args_list] == ["alice", "bob"]
+        assert public_profile_cache.get("alice") == {"username": "alice", "links": []}
+        sql = str(mock_db.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "profile_views.viewed_at >=" in sql
+        assert "profile_views.is_bot = false" in sql
+        assert "ORDER BY count(*) DESC" in sql
+
+    async def test_skips_already_cached(self, mock_db, mocker):
+        public_profile_cache.put("alice", ProfileTimeline.build(uuid.uuid4(), {"username": "alice"}, []))
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = ["alice"]
+        mock_db.execute.return_value = result
+        load = mocker.patch("app.services.profile.load_public_timeline")
+
+        assert await warm_public_profiles(mock_db, 10) == 0
+        load.assert_not_awaited()
+
+    async def test_disabled(self, mock_db):
+        assert await warm_public_profiles(mock_db, 0) == 0
+        mock_db.execute.assert_not_awaited()
+
+
+class TestWarmUp:
+    async def test_failures_do_not_block_startup(self, mocker):
+        from app import main
+
+        mocker.patch.object(main, "warm_pool", AsyncMock(side_effect=OSError("connection refused")))
+        mocker.patch.object(main, "warm_public_profiles", AsyncMock(side_effect=OSError("connection refused")))
+        session = MagicMock()
+        session.__aenter__ = AsyncMock(return_value=MagicMock())
+        session.__aexit__ = AsyncMock(return_value=False)
+        mocker.patch.object(main, "AsyncSessionLocal", return_value=session)
+
+        await main.warm_up()
+
+        assert main.graphql_app.ready
+
+
+class TestMigrations:
+    def test_single_head(self):
+        assert len(migrations.script_heads()) == 1
+
+    async def test_at_head(self, mocker):
+        mocker.patch.object(migrations, "current_revisions", AsyncMock(return_value=migrations.script_heads()))
+
+        assert await migrations.is_at_head() is True
+
+    async def test_behind_head(self, mocker):
+        mocker.patch.object(migrations, "current_revisions", AsyncMock(return_value={"001"}))
+
+        assert await migrations.is_at_head() is False
+
+    async def test_current_revisions_on_empty_database(self, mocker):
+        conn = MagicMock()
+        conn.fetchval = AsyncMock(return_value=None)
+        conn.fetch = AsyncMock()
+        conn.close = AsyncMock()
+        mocker.patch("asyncpg.connect", AsyncMock(return_value=conn))
+
+        assert await migrations.current_revisions("postgresql://x") == set()
+        conn.fetch.assert_not_awaited()
+        conn.close.assert_awaited_once()
+
+    async def test_current_revisions(self, mocker):
+        conn = MagicMock()
+        conn.fetchval = AsyncMock(return_value="alembic_version")
+        conn.fetch = AsyncMock(return_value=[{"version_num": "020"}])
+        conn.close = AsyncMock()
+        mocker.patch("asyncpg.connect", AsyncMock(return_value=conn))
+
+        assert await migrations.current_revisions("postgresql://x") == {"020"}
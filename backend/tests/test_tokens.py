@@ -0,0 +1,162 @@
+# 파일 목적: JWT 코덱 테스트
+# 주요 기능: HMACCodec ↔ python-jose 상호 호환, 만료/변조/alg 혼동 거부, EdDSA·ES256 서명과 공개키 전용 검증, PEM 파일 로드, JWKS 노출, 미구현 코덱 생성 거부
+# 사용 방법: pytest tests/test_tokens.py
+
+import time
+
+import pytest
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+from cryptography.hazmat.primitives.serialization import (
+    Encoding,
+    NoEncryption,
+    PrivateFormat,
+    PublicFormat,
+)
+from jose import jwt
+
+from app.core.tokens import AsymmetricCodec, HMACCodec, JoseCodec, _b64encode, _CompactJWS, jwks
+
+SECRET = "test-secret-key-minimum-32-characters!!"
+
+
+def _claims(**extra) -> dict:
+    return {"sub": "user-1", "type": "access", "exp": int(time.time()) + 60, **extra}
+
+
+def _ed25519_codec() -> AsymmetricCodec:
+    return AsymmetricCodec("EdDSA", private_key=ed25519.Ed25519PrivateKey.generate())
+
+
+class TestCompactJWS:
+    def test_incomplete_codec_fails_at_construction(self):
+        """서명/검증을 구현하지 않은 코덱은 첫 토큰이 아니라 생성 시점에 실패"""
+
+        class SignOnly(_CompactJWS):
+            def _sign(self, signing_input: bytes) -> bytes:
+                return b""
+
+        with pytest.raises(TypeError):
+            SignOnly("HS256")
+
+
+class TestHMACCodec:
+    def test_roundtrip(self):
+        codec = HMACCodec(SECRET)
+        claims = _claims(fam="f1")
+        assert codec.decode(codec.encode(claims)) == claims
+
+    @pytest.mark.parametrize("algorithm", ["HS256", "HS384", "HS512"])
+    def test_interoperates_with_jose(self, algorithm):
+        """fast 코덱과 python-jose는 서로의 토큰을 검증할 수 있음 (백엔드 전환 시 기존 세션 유지)"""
+        codec = HMACCodec(SECRET, algorithm)
+        claims = _claims()
+
+        assert jwt.decode(codec.encode(claims), SECRET, algorithms=[algorithm]) == claims
+        assert codec.decode(jwt.encode(claims, SECRET, algorithm=algorithm)) == claims
+
+    def test_rejects_expired(self):
+        codec = HMACCodec(SECRET)
+        assert codec.decode(codec.encode(_claims(exp=int(time.time()) - 1))) is None
+
+    def test_rejects_non_numeric_exp(self):
+        codec = HMACCodec(SECRET)
+        assert codec.decode(codec.encode(_claims(exp="tomorrow"))) is None
+
+    def test_rejects_wrong_secret(self):
+        token = HMACCodec("another-secret-key-minimum-32-characters").encode(_claims())
+        assert HMACCodec(SECRET).decode(token) is None
+
+    def test_rejects_tampered_payload(self):
+        codec = HMACCodec(SECRET)
+        header, _, signature = codec.encode(_claims()).split(".")
+        forged_payload = _b64encode(b'{"sub":"admin","type":"access"}').decode()
+        assert codec.decode(f"{header}.{forged_payload}.{signature}") is None
+
+    def test_rejects_other_algorithm_header(self):
+        """헤더 alg가 설정과 다르면(none, HS512 등) 서명 검증 없이 거부"""
+        codec = HMACCodec(SECRET)
+        assert codec.decode(jwt.encode(_claims(), SECRET, algorithm="HS512")) is None
+
+        unsigned = _b64encode(b'{"alg":"none","typ":"JWT"}') + b"." + _b64encode(b'{"sub":"x"}') + b"."
+        assert codec.decode(unsigned.decode()) is None
+
+    @pytest.mark.parametrize("token", ["", "abc", "a.b", "a.b.c.d", "!!.??.**", "한글.토큰.값"])
+    def test_malformed_tokens_return_none(self, token):
+        assert HMACCodec(SECRET).decode(token) is None
+
+
+class TestAsymmetricCodec:
+    def test_eddsa_roundtrip(self):
+        codec = _ed25519_codec()
+        claims = _claims()
+        assert codec.decode(codec.encode(claims)) == claims
+
+    def test_es256_roundtrip_with_raw_signature(self):
+        """ES256 서명은 JWS 규격대로 DER이 아닌 64바이트 r||s"""
+        codec = AsymmetricCodec("ES256", private_key=ec.generate_private_key(ec.SECP256R1()))
+        token = codec.encode(_claims())
+
+        assert len(token.rsplit(".", 1)[1]) == 86  # 64바이트 base64url
+        assert codec.decode(token) == jwt.get_unverified_claims(token)
+
+    def test_public_key_only_verifies(self):
+        """공개키만 가진 엣지 컴포넌트는 검증만 가능하고 발급은 불가"""
+        signer = _ed25519_codec()
+        verifier = AsymmetricCodec("EdDSA", public_key=signer._public_key)
+
+        assert verifier.decode(signer.encode(_claims())) is not None
+        with pytest.raises(RuntimeError):
+            verifier.encode(_claims())
+
+    def test_rejects_token_from_other_key(self):
+        assert _ed25519_codec().decode(_ed25519_codec().encode(_claims())) is None
+
+    def test_rejects_hmac_token_signed_with_public_key(self):
+        """공개키를 HMAC 비밀키로 쓴 위조(alg 혼동)는 헤더 단계에서 거부"""
+        codec = _ed25519_codec()
+        public_pem = codec._public_key.public_bytes(Encoding.PEM, PublicFormat.SubjectPublicKeyInfo)
+        forged = HMACCodec(public_pem.decode()).encode(_claims())
+        assert codec.decode(forged) is None
+
+    def test_requires_a_key(self):
+        with pytest.raises(ValueError):
+            AsymmetricCodec("EdDSA")
+
+    def test_from_files(self, tmp_path):
+        private_key = ed25519.Ed25519PrivateKey.generate()
+        private_path = tmp_path / "jwt.pem"
+        public_path = tmp_path / "jwt.pub.pem"
+        private_path.write_bytes(private_key.private_bytes(Encoding.PEM, PrivateFormat.PKCS8, NoEncryption()))
+        public_path.write_bytes(private_key.public_key().public_bytes(Encoding.PEM, PublicFormat.SubjectPublicKeyInfo))
+
+        signer = AsymmetricCodec.from_files("EdDSA", private_key_path=str(private_path))
+        verifier = AsymmetricCodec.from_files("EdDSA", public_key_path=str(public_path))
+
+        assert verifier.decode(signer.encode(_claims())) is not None
+        assert signer.jwk == verifier.jwk
+
+
+class TestJoseCodec:
+    def test_roundtrip_and_invalid(self):
+        codec = JoseCodec(SECRET)
+        claims = _claims()
+        assert codec.decode(codec.encode(claims)) == claims
+        assert codec.decode("invalid") is None
+
+
+class TestJWKS:
+    def test_hmac_exposes_no_keys(self):
+        assert jwks(HMACCodec(SECRET)) == {"keys": []}
+
+    def test_eddsa_key_and_kid_header(self):
+        codec = _ed25519_codec()
+        (key,) = jwks(codec)["keys"]
+
+        assert key["kty"] == "OKP" and key["crv"] == "Ed25519" and key["alg"] == "EdDSA"
+        assert jwt.get_unverified_header(codec.encode(_claims()))["kid"] == key["kid"]
+
+    async def test_endpoint(self, client):
+        """GET /api/.well-known/jwks.json — 기본 HS256 설정에서는 빈 목록"""
+        response = await client.get("/api/.well-known/jwks.json")
+        assert response.status_code == 200
+        assert response.json() == {"keys": []}
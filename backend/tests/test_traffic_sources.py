@@ -0,0 +1,119 @@
+# 파일 목적: 유입 경로(referrer + UTM) 정규화, 사전 캐시, 일별 집계 upsert 테스트
+# 주요 기능: referrer 도메인 정규화(www/l./m. 제거, 자기 사이트 제외), ref 쿼리 우선, UTM 소문자화, LRU 캐시, 임의 샤드 행에 가산 upsert SQL
+# 사용 방법: pytest tests/test_traffic_sources.py
+
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from starlette.requests import Request
+
+from app.services.traffic_sources import (
+    DIRECT,
+    TrafficSourceCache,
+    TrafficSourceKey,
+    normalize_referrer,
+    record_daily_source,
+    source_from_request,
+)
+
+USER_ID = uuid.UUID("00000000-0000-0000-0000-000000000001")
+
+
+def _request(query: str = "", referer: str | None = None) -> Request:
+    headers = [(b"host", b"api.example.com")]
+    if referer is not None:
+        headers.append((b"referer", referer.encode()))
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/api/public/links/x/click",
+            "query_string": query.encode(),
+            "headers": headers,
+            "scheme": "https",
+            "server": ("api.example.com", 443),
+        }
+    )
+
+
+class TestNormalizeReferrer:
+    @pytest.mark.parametrize(
+        ("referrer", "expected"),
+        [
+            ("https://www.google.com/search?q=x", "google.com"),
+            ("https://l.instagram.com/?u=abc", "instagram.com"),
+            ("https://m.youtube.com/watch", "youtube.com"),
+            ("https://t.co/abc", "t.co"),
+            ("HTTPS://News.Ycombinator.com/", "news.ycombinator.com"),
+            ("not a url", ""),
+            ("", ""),
+            (None, ""),
+        ],
+    )
+    def test_normalize(self, referrer, expected):
+        assert normalize_referrer(referrer) == expected
+
+    def test_own_site_is_not_a_source(self):
+        """프로필 페이지 자체에서 온 요청은 유입 경로가 아님"""
+        assert normalize_referrer("http://localhost:3000/testuser") == ""
+        assert normalize_referrer("https://api.example.com/x", "api.example.com") == ""
+
+
+class TestSourceFromRequest:
+    def test_ref_param_overrides_referer_header(self):
+        request = _request("ref=https%3A%2F%2Fwww.tiktok.com%2F&utm_source=TikTok&utm_campaign=Spring",
+                           referer="https://linktree.example/testuser")
+
+        assert source_from_request(request) == TrafficSourceKey("tiktok.com", "tiktok", "", "spring")
+
+    def test_direct(self):
+        assert source_from_request(_request()) == DIRECT
+
+
+class TestTrafficSourceCache:
+    async def test_existing_source_cached(self):
+        cache = TrafficSourceCache()
+        db = MagicMock()
+        db.scalar = AsyncMock(return_value=5)
+
+        assert await cache.resolve(db, DIRECT) == 5
+        assert await cache.resolve(db, DIRECT) == 5
+        assert db.scalar.await_count == 1
+
+    async def test_new_source_upserted_not_cached(self):
+        cache = TrafficSourceCache()
+        db = MagicMock()
+        db.scalar = AsyncMock(side_effect=[None, 8])
+
+        assert await cache.resolve(db, TrafficSourceKey("google.com")) == 8
+        assert len(cache) == 0
+        sql = str(db.scalar.await_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "ON CONFLICT (referrer_domain, utm_source, utm_medium, utm_campaign)" in sql
+
+
+class TestRecordDailySource:
+    async def test_increments_only_matching_counter(self):
+        db = MagicMock()
+        db.execute = AsyncMock()
+
+        await record_daily_source(db, USER_ID, 3, "click")
+
+        stmt = db.execute.await_args.args[0]
+        compiled = stmt.compile(dialect=postgresql.dialect())
+        assert "ON CONFLICT (user_id, day, source_id, shard) DO UPDATE SET click_count" in str(compiled)
+        assert "view_count =" not in str(compiled).split("DO UPDATE", 1)[1]
+        assert compiled.params["click_count"] == 1
+
+    async def test_shard_range_from_settings(self, mocker):
+        randrange = mocker.patch("app.services.traffic_sources.random.randrange", return_value=5)
+        mocker.patch("app.services.traffic_sources.settings.daily_stats_shards", 16)
+        db = MagicMock()
+        db.execute = AsyncMock()
+
+        await record_daily_source(db, USER_ID, 3, "view")
+
+        randrange.assert_called_once_with(16)
+        compiled = db.execute.await_args.args[0].compile(dialect=postgresql.dialect())
+        assert compiled.params["shard"] == 5
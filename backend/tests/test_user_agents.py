@@ -0,0 +1,145 @@
+# 파일 목적: User-Agent 사전 인코딩 캐시 및 분류기 테스트
+# 주요 기능: LRU hit 시 DB 미조회, 기존 UA SELECT 후 캐시, 신규 UA 분류 후 upsert(커밋 전이므로 미캐시), 용량 초과 시 오래된 항목 제거,
+#           기기/브라우저/OS/봇 분류
+# 사용 방법: pytest tests/test_user_agents.py
+
+import hashlib
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from sqlalchemy.dialects import postgresql
+
+import pytest
+
+from app.services.user_agents import (
+    UNKNOWN_USER_AGENT,
+    UAClass,
+    UserAgentCache,
+    UserAgentRef,
+    classify_user_agent,
+    ua_hash,
+    user_agent_values,
+)
+
+UA = "Mozilla/5.0 (X11; Linux x86_64)"
+
+
+def _db(*existing, inserted_id=None):
+    """existing: 순서대로 SELECT 결과 (None이면 미등록), inserted_id: upsert RETURNING id"""
+    db = MagicMock()
+    results = []
+    for row in existing:
+        result = MagicMock()
+        result.one_or_none.return_value = row
+        results.append(result)
+    db.execute = AsyncMock(side_effect=results)
+    db.scalar = AsyncMock(return_value=inserted_id)
+    return db
+
+
+def _row(ua_id: int, is_bot: bool = False) -> SimpleNamespace:
+    return SimpleNamespace(id=ua_id, is_bot=is_bot)
+
+
+class TestUserAgentCache:
+    async def test_empty_user_agent_is_unknown(self):
+        db = _db()
+        assert await UserAgentCache().resolve(db, "") == UNKNOWN_USER_AGENT
+        db.execute.assert_not_awaited()
+
+    async def test_existing_ua_cached_after_select(self):
+        """이미 등록된 UA는 한 번 SELECT 후 LRU에서 바로 반환"""
+        cache = UserAgentCache()
+        db = _db(_row(42))
+
+        assert await cache.resolve(db, UA) == UserAgentRef(42, False)
+        assert await cache.resolve(db, UA) == UserAgentRef(42, False)
+        assert db.execute.await_count == 1
+
+    async def test_new_ua_classified_and_upserted_but_not_cached(self):
+        """처음 보는 UA는 분류 컬럼과 함께 ON CONFLICT upsert — 롤백될 수 있어 캐시하지 않음"""
+        cache = UserAgentCache()
+        db = _db(None, inserted_id=99)
+
+        assert await cache.resolve(db, "Googlebot/2.1") == UserAgentRef(99, True)
+        assert len(cache) == 0
+        upsert = db.scalar.await_args.args[0]
+        compiled = upsert.compile(dialect=postgresql.dialect())
+        assert "ON CONFLICT (ua_hash) DO UPDATE" in str(compiled)
+        assert "RETURNING user_agents.id" in str(compiled)
+        assert compiled.params["device_type"] == "bot"
+        assert compiled.params["is_bot"] is True
+
+    async def test_lru_evicts_least_recent(self):
+        cache = UserAgentCache(maxsize=2)
+        await cache.resolve(_db(_row(1)), "a")
+        await cache.resolve(_db(_row(2)), "b")
+        await cache.resolve(_db(), "a")  # a를 최근 사용으로 갱신
+        await cache.resolve(_db(_row(3)), "c")
+
+        assert len(cache) == 2
+        db = _db(_row(2))
+        assert (await cache.resolve(db, "b")).id == 2
+        assert db.execute.await_count == 1
+
+    def test_hash_matches_migration_md5(self):
+        """마이그레이션 백필의 decode(md5(ua), 'hex')와 같은 키"""
+        assert ua_hash(UA) == bytes.fromhex(hashlib.md5(UA.encode()).hexdigest())
+
+
+class TestUserAgentValues:
+    async def test_skips_query_without_ids(self):
+        db = MagicMock()
+        db.execute = AsyncMock()
+        assert await user_agent_values(db, [None, None]) == {}
+        db.execute.assert_not_awaited()
+
+    async def test_maps_ids_to_strings(self):
+        result = MagicMock()
+        result.all.return_value = [SimpleNamespace(id=1, value=UA)]
+        db = MagicMock()
+        db.execute = AsyncMock(return_value=result)
+
+        assert await user_agent_values(db, [1, 1, None]) == {1: UA}
+
+
+class TestClassifyUserAgent:
+    @pytest.mark.parametrize(
+        ("user_agent", "expected"),
+        [
+            (
+                "Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) AppleWebKit/605.1.15 "
+                "(KHTML, like Gecko) Version/17.0 Mobile/15E148 Safari/604.1",
+                UAClass("mobile", "Safari", "iOS", False),
+            ),
+            (
+                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+                "Chrome/120.0 Safari/537.36 Edg/120.0",
+                UAClass("desktop", "Edge", "Windows", False),
+            ),
+            (
+                "Mozilla/5.0 (Linux; Android 14; SM-X710) AppleWebKit/537.36 (KHTML, like Gecko) "
+                "Chrome/120 Safari/537.36",
+                UAClass("tablet", "Chrome", "Android", False),
+            ),
+            (
+                "Mozilla/5.0 (Linux; Android 13; SM-S918N) AppleWebKit/537.36 (KHTML, like Gecko) "
+                "Chrome/120 Mobile Safari/537.36 KAKAOTALK 10.4.5",
+                UAClass("mobile", "KakaoTalk", "Android", False),
+            ),
+            (
+                "Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)",
+                UAClass("bot", "Other", "Other", True),
+            ),
+            ("facebookexternalhit/1.1", UAClass("bot", "Other", "Other", True)),
+        ],
+    )
+    def test_classification(self, user_agent, expected):
+        assert classify_user_agent(user_agent) == expected
+
+    def test_memoized(self):
+        """같은 UA 문자열은 파싱 결과를 재사용"""
+        classify_user_agent.cache_clear()
+        classify_user_agent(UA)
+        classify_user_agent(UA)
+        assert classify_user_agent.cache_info().hits == 1
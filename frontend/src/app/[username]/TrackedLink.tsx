@@ -1,11 +1,12 @@
 // 파일 목적: 클릭 추적 + 새 탭 열기 링크 컴포넌트 (클라이언트 컴포넌트)
-// 주요 기능: /api/public/links/{id}/click API 호출 후 새 탭에서 URL 열기, is_sensitive 경고 모달
+// 주요 기능: /api/public/links/{id}/click API 호출(유입 경로 ref/utm 쿼리 포함) 후 새 탭에서 URL 열기, is_sensitive 경고 모달
 // 사용 방법: <TrackedLink link={link} />
 
 "use client";
 
 import { useState } from "react";
 import type { Link } from "@/types/api";
+import { trafficQuery } from "@/lib/utils";
 
 interface TrackedLinkProps {
   link: Link;
@@ -13,7 +14,7 @@ interface TrackedLinkProps {
 
 async function trackClick(linkId: string) {
   try {
-    await fetch(`/api/public/links/${linkId}/click`, { method: "GET", redirect: "manual" });
+    await fetch(`/api/public/links/${linkId}/click${trafficQuery()}`, { method: "GET", redirect: "manual" });
   } catch {
     // 추적 실패는 무시
   }
@@ -1,5 +1,5 @@
 // 파일 목적: 공통 유틸리티 함수 모음
-// 주요 기능: cn(className 병합 - clsx + tailwind-merge), formatDate, truncate, getInitials
+// 주요 기능: cn(className 병합 - clsx + tailwind-merge), formatDate, truncate, getInitials, trafficQuery(유입 경로 쿼리)
 // 사용 방법: import { cn } from "@/lib/utils"
 
 import { type ClassValue, clsx } from "clsx";
@@ -31,3 +31,19 @@ export function getInitials(name: string | null): string {
     .toUpperCase()
     .slice(0, 2);
 }
+
+const UTM_PARAMS = ["utm_source", "utm_medium", "utm_campaign"] as const;
+
+// 추적 API는 fetch로 호출되어 Referer가 프로필 페이지 자신이므로, 원래 유입 경로(document.referrer)와 UTM을 쿼리로 전달
+export function trafficQuery(): string {
+  if (typeof window === "undefined") return "";
+  const params = new URLSearchParams();
+  if (document.referrer) params.set("ref", document.referrer);
+  const current = new URLSearchParams(window.location.search);
+  for (const key of UTM_PARAMS) {
+    const value = current.get(key);
+    if (value) params.set(key, value);
+  }
+  const query = params.toString();
+  return query ? `?${query}` : "";
+}
@@ -1,10 +1,11 @@
 // 파일 목적: 프로필 관련 API 호출 함수 모음 (GraphQL 기반)
-// 주요 기능: getMyProfile, updateProfile, getPublicProfile, recordView API 래퍼
+// 주요 기능: getMyProfile, updateProfile, getPublicProfile, recordView(유입 경로 ref/utm 쿼리 포함) API 래퍼
 // 사용 방법: import { profileService } from "@/services/profile"
 
 import { gqlRequest } from "@/lib/graphql-client";
 import { MY_PROFILE_QUERY } from "@/graphql/queries/profile";
 import { UPDATE_PROFILE_MUTATION } from "@/graphql/mutations/profile";
+import { trafficQuery } from "@/lib/utils";
 import type { User, PublicProfile, UpdateProfileRequest } from "@/types/api";
 
 function mapUser(u: Record<string, unknown>): User {
@@ -43,6 +44,6 @@ export const profileService = {
     }).then((r) => r.json()),
 
   recordView: (username: string): void => {
-    fetch(`/api/public/${username}/view`, { method: "POST" }).catch(() => {});
+    fetch(`/api/public/${username}/view${trafficQuery()}`, { method: "POST" }).catch(() => {});
   },
 };